@@ -45,19 +45,37 @@ class ArticulationPromptBuilder:
     Output: Complete prompt string for articulation
     """
 
-    def build_prompt(self, context: ArticulationContext) -> str:
+    def build_static_sections(self, conversation_context: Optional[dict] = None) -> Dict[str, str]:
+        """
+        Build the sections that do not depend on Call 1 output, so they can be
+        prepared while Call 1 is running and passed to build_prompt().
+        """
+        return {
+            "header": self._build_header(),
+            "framework": self._build_framework_section(),
+            "conversation_context": self._build_conversation_context_section(
+                conversation_history_context(conversation_context)
+            ),
+        }
+
+    def build_prompt(self, context: ArticulationContext, prebuilt_sections: Optional[Dict[str, str]] = None) -> str:
         """
         Build the complete articulation prompt from organized values.
 
         UNITY PRINCIPLE: Now includes unity metrics and dual pathway sections.
         CONTINUITY: Now includes conversation history and file context.
+
+        prebuilt_sections: output of build_static_sections() for the same
+        conversation context; missing entries are built here.
         """
         logger.info("[PROMPT_BUILDER] Building articulation prompt")
+        prebuilt = prebuilt_sections or {}
 
         sections = [
-            self._build_header(),
-            self._build_framework_section(),
-            self._build_conversation_context_section(context.conversation_context),  # Conversation history + files
+            prebuilt["header"] if "header" in prebuilt else self._build_header(),
+            prebuilt["framework"] if "framework" in prebuilt else self._build_framework_section(),
+            (prebuilt["conversation_context"] if "conversation_context" in prebuilt
+             else self._build_conversation_context_section(context.conversation_context)),  # Conversation history + files
             self._build_context_section(context.user_context, context.web_research),
             self._build_consciousness_state_section(context.consciousness_state),
             self._build_unity_metrics_section(context.consciousness_state),
@@ -1176,6 +1194,19 @@ Express insights with wisdom and warmth. Speak truth without judgment.
 Guide without controlling. Illuminate without overwhelming."""
 
 
+def conversation_history_context(conversation_context: Optional[dict]) -> Optional[ConversationHistoryContext]:
+    """ConversationHistoryContext from the request's conversation_context dict (None if absent)."""
+    if not conversation_context:
+        return None
+    return ConversationHistoryContext(
+        messages=conversation_context.get('messages', []),
+        file_summaries=conversation_context.get('file_summaries', []),
+        conversation_summary=conversation_context.get('conversation_summary'),
+        question_answers=conversation_context.get('question_answers', []),
+        matrix_state=conversation_context.get('matrix_state')
+    )
+
+
 def build_articulation_context(
     user_identity: str,
     domain: str,
@@ -1236,15 +1267,8 @@ def build_articulation_context(
                 )
 
     # Build conversation history context if provided
-    conv_history_context = None
-    if conversation_context:
-        conv_history_context = ConversationHistoryContext(
-            messages=conversation_context.get('messages', []),
-            file_summaries=conversation_context.get('file_summaries', []),
-            conversation_summary=conversation_context.get('conversation_summary'),
-            question_answers=conversation_context.get('question_answers', []),
-            matrix_state=conversation_context.get('matrix_state')
-        )
+    conv_history_context = conversation_history_context(conversation_context)
+    if conv_history_context:
         msg_count = len(conv_history_context.messages)
         file_count = len(conv_history_context.file_summaries)
         qa_count = len(conv_history_context.question_answers)
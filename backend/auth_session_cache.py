@@ -0,0 +1,332 @@
+"""
+Authenticated-session cache
+===========================
+
+get_current_user used to join UserSession + User and commit a sliding-expiry
+update on every authenticated request, so even read-only GETs and SSE
+reconnects wrote to the database. This module keeps the verified session in
+memory and coalesces the sliding-expiry writes.
+
+- Entries are keyed by a SHA-256 hash of the bearer token (raw tokens are
+  never stored) and hold the session id, user id, created_at and expires_at.
+- Tiers: in-process LRU with a short TTL; while utils.cache.CacheClient
+  reports a live Redis connection, Redis is read instead, so a logout on one
+  instance is seen by every other instance on its next request.
+- Touches queue at most one database update per session per
+  `touch_interval`; a background task writes the queue in one executemany
+  every `flush_interval`.
+- invalidate_token / invalidate_user drop entries immediately (logout,
+  password change).
+
+Only the session is cached. The User row is still loaded per request because
+handlers mutate and commit it (credits, profile, password), and a snapshot
+would lose concurrent updates.
+"""
+
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from logging_config import api_logger
+
+
+DEFAULT_TTL = int(os.getenv("AUTH_SESSION_CACHE_TTL", "60"))
+DEFAULT_TOUCH_INTERVAL = int(os.getenv("AUTH_SESSION_TOUCH_INTERVAL", "60"))
+DEFAULT_FLUSH_INTERVAL = int(os.getenv("AUTH_SESSION_FLUSH_INTERVAL", "15"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("AUTH_SESSION_CACHE_MAX_ENTRIES", "10000"))
+
+_DATETIME_FIELDS = ("created_at", "expires_at", "persisted_at", "cached_at")
+
+
+@dataclass
+class CachedSession:
+    """Verified UserSession state (no user data)."""
+    session_id: str
+    user_id: str
+    created_at: datetime
+    expires_at: datetime
+    persisted_at: datetime  # last_active_at as last written to the database
+    cached_at: datetime
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        for name in _DATETIME_FIELDS:
+            data[name] = data[name].isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CachedSession":
+        values = dict(data)
+        for name in _DATETIME_FIELDS:
+            values[name] = datetime.fromisoformat(values[name])
+        return cls(**values)
+
+
+async def _write_touches(rows: List[Dict[str, Any]]) -> None:
+    """Default writer: one executemany UPDATE of user_sessions."""
+    from sqlalchemy import update, bindparam
+    from database import AsyncSessionLocal, UserSession
+
+    table = UserSession.__table__
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("session_id"))
+        .values(last_active_at=bindparam("last_active_at"), expires_at=bindparam("expires_at"))
+    )
+    async with AsyncSessionLocal() as db:
+        await db.execute(statement, rows)
+        await db.commit()
+
+
+class AuthSessionCache:
+    """
+    Token-hash keyed cache of verified auth sessions with coalesced touches.
+
+    Usage:
+        cache = AuthSessionCache()
+        cache.attach_shared_cache(shared)          # optional Redis tier
+        await cache.start()                        # background flusher
+        entry = await cache.get(token)
+        if entry is None:
+            ...verify against the database...
+            entry = await cache.put(token, session)
+        await cache.touch(entry, window)
+        await cache.aclose()                       # final flush
+    """
+
+    def __init__(
+        self,
+        ttl: int = DEFAULT_TTL,
+        touch_interval: int = DEFAULT_TOUCH_INTERVAL,
+        flush_interval: int = DEFAULT_FLUSH_INTERVAL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        shared_cache: Optional[Any] = None,
+        writer: Optional[Callable[[List[Dict[str, Any]]], Awaitable[None]]] = None,
+        key_prefix: str = "authsess"
+    ):
+        self.ttl = ttl
+        self.touch_interval = timedelta(seconds=touch_interval)
+        self.flush_interval = flush_interval
+        self.max_entries = max_entries
+        self.shared_cache = shared_cache
+        self.key_prefix = key_prefix
+        self._writer = writer or _write_touches
+
+        self._entries: "OrderedDict[str, CachedSession]" = OrderedDict()
+        # session_id -> (last_active_at, expires_at) awaiting the next flush
+        self._pending: Dict[str, Tuple[datetime, datetime]] = {}
+        # session_id -> time of the last queued touch (shared-tier entries are copies)
+        self._touched: Dict[str, datetime] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+
+    def attach_shared_cache(self, shared_cache: Optional[Any]) -> None:
+        """Use `shared_cache` (a CacheClient) as the shared tier."""
+        self.shared_cache = shared_cache
+
+    def _shared_enabled(self) -> bool:
+        return self.shared_cache is not None and getattr(self.shared_cache, "is_connected", False)
+
+    def key(self, token: str) -> str:
+        digest = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        return f"{self.key_prefix}:{digest}"
+
+    def _user_key(self, user_id: str) -> str:
+        return f"{self.key_prefix}:user:{user_id}"
+
+    # -------------------------------------------------------------------------
+    # Lookup
+    # -------------------------------------------------------------------------
+
+    async def get(self, token: str, now: Optional[datetime] = None) -> Optional[CachedSession]:
+        """Cached session for `token`, or None (miss, stale or past expires_at)."""
+        now = now or datetime.utcnow()
+        key = self.key(token)
+
+        entry = None
+        if self._shared_enabled():
+            try:
+                data = await self.shared_cache.get(key)
+                entry = CachedSession.from_dict(data) if isinstance(data, dict) else None
+            except Exception as e:
+                api_logger.warning(f"[AUTH CACHE] Shared read failed ({type(e).__name__}): {e}")
+        else:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if (now - entry.cached_at).total_seconds() > self.ttl:
+                    self._entries.pop(key, None)
+                    entry = None
+                else:
+                    self._entries.move_to_end(key)
+
+        if entry is None or entry.expires_at <= now:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return entry
+
+    async def put(self, token: str, session: Any, now: Optional[datetime] = None) -> CachedSession:
+        """Cache a UserSession row that was just verified against the database."""
+        now = now or datetime.utcnow()
+        entry = CachedSession(
+            session_id=session.id,
+            user_id=session.user_id,
+            created_at=session.created_at,
+            expires_at=session.expires_at,
+            persisted_at=session.last_active_at or session.created_at,
+            cached_at=now,
+        )
+        await self._store(self.key(token), entry)
+        return entry
+
+    async def _store(self, key: str, entry: CachedSession) -> None:
+        if self._shared_enabled():
+            try:
+                await self.shared_cache.set(key, entry.to_dict(), ttl=self.ttl)
+                # Token hashes per user, so invalidate_user reaches other instances
+                user_key = self._user_key(entry.user_id)
+                keys = await self.shared_cache.get(user_key) or []
+                if key not in keys:
+                    await self.shared_cache.set(user_key, keys + [key], ttl=self.ttl)
+                return
+            except Exception as e:
+                api_logger.warning(f"[AUTH CACHE] Shared write failed ({type(e).__name__}): {e}")
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # -------------------------------------------------------------------------
+    # Sliding expiry
+    # -------------------------------------------------------------------------
+
+    async def touch(
+        self,
+        entry: CachedSession,
+        window: timedelta,
+        now: Optional[datetime] = None
+    ) -> bool:
+        """
+        Slide the session's expiry to now + window.
+
+        Returns True when a database update was queued: at most once per
+        touch_interval per session; in between, the stored expires_at (at
+        most touch_interval behind) keeps the session valid. Entries are
+        updated in place and never re-stored, so a touch cannot revive an
+        entry another request just invalidated.
+        """
+        now = now or datetime.utcnow()
+        last = max(entry.persisted_at, self._touched.get(entry.session_id, entry.persisted_at))
+        if now - last < self.touch_interval:
+            return False
+
+        self._touched[entry.session_id] = now
+        entry.persisted_at = now
+        entry.expires_at = now + window
+        self._pending[entry.session_id] = (now, entry.expires_at)
+        return True
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    async def flush(self) -> int:
+        """Write queued touches in one batch. Returns the number of sessions written."""
+        cutoff = datetime.utcnow() - self.touch_interval
+        self._touched = {sid: t for sid, t in self._touched.items() if t > cutoff}
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+        rows = [
+            {"session_id": session_id, "last_active_at": last_active_at, "expires_at": expires_at}
+            for session_id, (last_active_at, expires_at) in pending.items()
+        ]
+        try:
+            await self._writer(rows)
+        except Exception as e:
+            # Requeue; touches queued meanwhile are newer and win
+            for session_id, values in pending.items():
+                self._pending.setdefault(session_id, values)
+            api_logger.warning(f"[AUTH CACHE] Flush of {len(rows)} session touches failed: {e}")
+            return 0
+        self._writes += len(rows)
+        api_logger.debug(f"[AUTH CACHE] Flushed {len(rows)} session touches")
+        return len(rows)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def start(self) -> None:
+        """Start the background flusher."""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def aclose(self) -> None:
+        """Stop the flusher and write what is still queued."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+
+    # -------------------------------------------------------------------------
+    # Invalidation
+    # -------------------------------------------------------------------------
+
+    async def invalidate_token(self, token: str, session_id: Optional[str] = None) -> None:
+        """Drop a token's entry (logout). Its queued touch is dropped too."""
+        key = self.key(token)
+        entry = self._entries.pop(key, None)
+        session_id = session_id or (entry.session_id if entry else None)
+        if session_id:
+            self._pending.pop(session_id, None)
+            self._touched.pop(session_id, None)
+        if self._shared_enabled():
+            try:
+                await self.shared_cache.delete(key)
+            except Exception as e:
+                api_logger.warning(f"[AUTH CACHE] Shared delete failed ({type(e).__name__}): {e}")
+
+    async def invalidate_user(self, user_id: str) -> None:
+        """Drop every cached session of a user (password change)."""
+        for key in [k for k, e in self._entries.items() if e.user_id == user_id]:
+            del self._entries[key]
+        if self._shared_enabled():
+            user_key = self._user_key(user_id)
+            try:
+                for key in await self.shared_cache.get(user_key) or []:
+                    await self.shared_cache.delete(key)
+                await self.shared_cache.delete(user_key)
+            except Exception as e:
+                api_logger.warning(f"[AUTH CACHE] Shared delete failed ({type(e).__name__}): {e}")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+            "pending_touches": len(self._pending),
+            "session_writes": self._writes,
+        }
+
+
+_shared_cache_instance: Optional[AuthSessionCache] = None
+
+
+def get_auth_session_cache() -> AuthSessionCache:
+    """Process-wide cache used by routers.auth and started in the app lifespan."""
+    global _shared_cache_instance
+    if _shared_cache_instance is None:
+        _shared_cache_instance = AuthSessionCache()
+    return _shared_cache_instance
@@ -35,6 +35,10 @@ from .models import (
     ChatConversation,
     ChatMessage,
     ChatSummary,
+    # Matrix
+    MatrixDocument,
+    MatrixOption,
+    MatrixCell,
     # Goal
     Goal,
     MatrixValue,
@@ -114,6 +118,10 @@ __all__ = [
     "ChatConversation",
     "ChatMessage",
     "ChatSummary",
+    # Matrix
+    "MatrixDocument",
+    "MatrixOption",
+    "MatrixCell",
     # Goal
     "Goal",
     "MatrixValue",
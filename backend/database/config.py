@@ -287,6 +287,16 @@ async def _migrate_articulated_insights():
             print(f"[Database] Migrated articulated_insights in {migrated_count} conversations")
 
 
+async def _migrate_generated_documents():
+    """Move generated_documents JSON into matrix document/option/cell rows."""
+    from .matrix_store import materialize_all_legacy_documents
+
+    async with AsyncSessionLocal() as session:
+        moved = await materialize_all_legacy_documents(session)
+        if moved > 0:
+            print(f"[Database] Moved {moved} generated documents to matrix tables")
+
+
 async def init_db():
     """Initialize database tables and run migrations.
 
@@ -311,6 +321,7 @@ async def init_db():
 
             # Run data migrations
             await _migrate_articulated_insights()
+            await _migrate_generated_documents()
             return  # Success
 
         except Exception as e:
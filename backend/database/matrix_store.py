@@ -0,0 +1,475 @@
+"""
+Row-level storage for generated document matrices.
+
+Documents live in MatrixDocument / MatrixOption / MatrixCell rows instead of
+the ChatConversation.generated_documents JSON list, so a selection change,
+cell edit or generated insight updates only the rows it touches rather than
+rewriting every document of the conversation (and locking its row).
+
+Readers get back the same document dicts the JSON column used to hold, so
+response models and LLM prompts are unchanged. Conversations still carrying
+the legacy JSON are moved into rows at startup, or on first access.
+"""
+
+import secrets
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, update, delete, func, inspect
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, undefer
+from sqlalchemy.orm.attributes import set_committed_value
+
+from .models import ChatConversation, MatrixDocument, MatrixOption, MatrixCell
+from logging_config import api_logger
+
+# Keys stored in their own columns; anything else round-trips through `extra`
+DOCUMENT_KEYS = ("id", "name", "description", "matrix_data", "leverage_points",
+                 "risk_analysis", "plays", "presets", "selected_play_id")
+MATRIX_KEYS = ("row_options", "column_options", "selected_rows", "selected_columns",
+               "viewed_insight_indices", "cells")
+OPTION_KEYS = ("id", "label", "insight_title", "description", "articulated_insight", "articulated_outcome")
+
+# Option axis -> matrix_data key
+AXES = {"row": "row_options", "column": "column_options"}
+
+
+def _extra(data: Dict[str, Any], known: Iterable[str]) -> Optional[Dict[str, Any]]:
+    rest = {k: v for k, v in data.items() if k not in known}
+    return rest or None
+
+
+def _present(**fields) -> Dict[str, Any]:
+    """Drop unset fields, so readers see a missing key like they did in the JSON."""
+    return {k: v for k, v in fields.items() if v is not None}
+
+
+# ============================================================================
+# Document dict <-> rows
+# ============================================================================
+
+def build_option(document_id: Optional[str], axis: str, position: int, option: Dict[str, Any]) -> MatrixOption:
+    return MatrixOption(
+        document_id=document_id,
+        axis=axis,
+        position=position,
+        option_id=option.get("id"),
+        label=option.get("label"),
+        insight_title=option.get("insight_title"),
+        description=option.get("description"),
+        articulated_insight=option.get("articulated_insight"),
+        articulated_outcome=option.get("articulated_outcome"),
+        extra=_extra(option, OPTION_KEYS),
+    )
+
+
+def build_cells(document_id: Optional[str], cells: Dict[str, Any]) -> List[MatrixCell]:
+    return [
+        MatrixCell(
+            document_id=document_id,
+            cell_key=key,
+            dimensions=cell.get("dimensions"),
+            extra=_extra(cell, ("dimensions",)),
+        )
+        for key, cell in cells.items()
+    ]
+
+
+def build_document(conversation_id: str, document: Dict[str, Any], position: int) -> List[Any]:
+    """Split a generated document dict into its document, option and cell rows (document first)."""
+    matrix = document.get("matrix_data") or {}
+    cells = matrix.get("cells")
+
+    row = MatrixDocument(
+        id=secrets.token_urlsafe(16),
+        conversation_id=conversation_id,
+        doc_id=document.get("id") or f"doc-{position}",
+        position=position,
+        name=document.get("name"),
+        description=document.get("description"),
+        selected_rows=matrix.get("selected_rows"),
+        selected_columns=matrix.get("selected_columns"),
+        viewed_insight_indices=matrix.get("viewed_insight_indices"),
+        has_cells=cells is not None,
+        leverage_points=document.get("leverage_points"),
+        risk_analysis=document.get("risk_analysis"),
+        plays=document.get("plays"),
+        presets=document.get("presets"),
+        selected_play_id=document.get("selected_play_id"),
+        extra=_extra(document, DOCUMENT_KEYS),
+        matrix_extra=_extra(matrix, MATRIX_KEYS),
+    )
+    options = [
+        build_option(row.id, axis, i, option)
+        for axis, key in AXES.items()
+        for i, option in enumerate(matrix.get(key) or [])
+    ]
+    return [row, *options, *build_cells(row.id, cells or {})]
+
+
+def option_to_dict(option: MatrixOption) -> Dict[str, Any]:
+    return {
+        **(option.extra or {}),
+        **_present(
+            id=option.option_id,
+            label=option.label,
+            insight_title=option.insight_title,
+            description=option.description,
+            articulated_insight=option.articulated_insight,
+            articulated_outcome=option.articulated_outcome,
+        ),
+    }
+
+
+def document_to_dict(row: MatrixDocument) -> Dict[str, Any]:
+    """Reassemble the generated document dict (options and cells must be loaded)."""
+    matrix = dict(row.matrix_extra or {})
+    for axis, key in AXES.items():
+        matrix[key] = [option_to_dict(o) for o in sorted(row.options, key=lambda o: o.position) if o.axis == axis]
+    matrix.update(_present(
+        selected_rows=row.selected_rows,
+        selected_columns=row.selected_columns,
+        viewed_insight_indices=row.viewed_insight_indices,
+    ))
+    if row.has_cells:
+        matrix["cells"] = {
+            cell.cell_key: {**(cell.extra or {}), "dimensions": cell.dimensions}
+            for cell in row.cells
+        }
+
+    return {
+        **(row.extra or {}),
+        "id": row.doc_id,
+        "matrix_data": matrix,
+        **_present(
+            name=row.name,
+            description=row.description,
+            leverage_points=row.leverage_points,
+            risk_analysis=row.risk_analysis,
+            plays=row.plays,
+            presets=row.presets,
+            selected_play_id=row.selected_play_id,
+        ),
+    }
+
+
+# ============================================================================
+# Legacy JSON
+# ============================================================================
+
+async def _legacy_documents(db: AsyncSession, conversation: ChatConversation) -> Optional[list]:
+    """
+    The deferred generated_documents JSON, fetched at most once per session.
+
+    The fetched value is stored on the instance as if it had been loaded, so
+    the later helper calls of a request (and every call after the move) skip
+    the SELECT.
+    """
+    if "generated_documents" not in inspect(conversation).unloaded:
+        return conversation.generated_documents
+    result = await db.execute(
+        select(ChatConversation.generated_documents).where(
+            ChatConversation.id == conversation.id,
+            ChatConversation.generated_documents.isnot(None),
+        )
+    )
+    legacy = result.scalar_one_or_none()
+    set_committed_value(conversation, "generated_documents", legacy)
+    return legacy
+
+
+async def materialize_legacy_documents(
+    db: AsyncSession,
+    conversation: ChatConversation,
+    commit: bool = True
+) -> int:
+    """
+    Move a conversation's generated_documents JSON into rows and clear the column.
+
+    Returns the number of documents moved. The move runs in a savepoint: a
+    concurrent request moving the same conversation wins the unique
+    (conversation_id, doc_id) constraint and this one reads the rows it wrote,
+    without losing anything else pending in the session. commit=False leaves
+    committing to the caller.
+    """
+    legacy = await _legacy_documents(db, conversation)
+    if not legacy:
+        return 0
+
+    existing = set((await db.execute(
+        select(MatrixDocument.doc_id).where(MatrixDocument.conversation_id == conversation.id)
+    )).scalars())
+    position = await _next_position(db, conversation.id)
+
+    moved = 0
+    try:
+        async with db.begin_nested():
+            seen = set()
+            for document in legacy:
+                doc_id = document.get("id") or f"doc-{position}"
+                if doc_id in existing:
+                    continue
+                if doc_id in seen:
+                    # Ids were count-based and could repeat after a delete; the first copy keeps the id
+                    doc_id = f"{doc_id}-{position}"
+                    document = {**document, "id": doc_id}
+                seen.add(doc_id)
+                db.add_all(build_document(conversation.id, document, position))
+                position += 1
+                moved += 1
+            conversation.generated_documents = None
+    except IntegrityError:
+        await db.refresh(conversation)
+        api_logger.info(f"[MATRIX STORE] Conversation {conversation.id} already moved by a concurrent request")
+        return 0
+
+    if commit:
+        await db.commit()
+    if moved:
+        api_logger.info(f"[MATRIX STORE] Moved {moved} documents of conversation {conversation.id} to rows")
+    return moved
+
+
+async def materialize_all_legacy_documents(db: AsyncSession) -> int:
+    """Startup migration: move every conversation still holding generated_documents JSON."""
+    result = await db.execute(
+        select(ChatConversation)
+        .where(ChatConversation.generated_documents.isnot(None))
+        .options(undefer(ChatConversation.generated_documents))
+    )
+    moved = 0
+    for conversation in result.scalars().all():
+        moved += await materialize_legacy_documents(db, conversation)
+    return moved
+
+
+# ============================================================================
+# Reads
+# ============================================================================
+
+def _documents_query(conversation_id: str, children: bool):
+    query = (
+        select(MatrixDocument)
+        .where(MatrixDocument.conversation_id == conversation_id)
+        .order_by(MatrixDocument.position)
+    )
+    if children:
+        # populate_existing: the read-only collections may be stale after targeted writes
+        query = query.options(
+            selectinload(MatrixDocument.options), selectinload(MatrixDocument.cells)
+        ).execution_options(populate_existing=True)
+    return query
+
+
+async def load_document_rows(
+    db: AsyncSession,
+    conversation: ChatConversation,
+    children: bool = True
+) -> List[MatrixDocument]:
+    """Document rows in display order; children=False skips options and cells."""
+    await materialize_legacy_documents(db, conversation)
+    result = await db.execute(_documents_query(conversation.id, children))
+    return list(result.scalars().all())
+
+
+async def load_documents(db: AsyncSession, conversation: ChatConversation) -> List[Dict[str, Any]]:
+    """All documents as generated document dicts (the old generated_documents list)."""
+    return [document_to_dict(row) for row in await load_document_rows(db, conversation)]
+
+
+async def get_document_row(
+    db: AsyncSession,
+    conversation: ChatConversation,
+    doc_id: str,
+    children: bool = False
+) -> Optional[MatrixDocument]:
+    await materialize_legacy_documents(db, conversation)
+    result = await db.execute(
+        _documents_query(conversation.id, children).where(MatrixDocument.doc_id == doc_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def document_count(db: AsyncSession, conversation: ChatConversation) -> int:
+    await materialize_legacy_documents(db, conversation)
+    return await db.scalar(
+        select(func.count()).select_from(MatrixDocument).where(MatrixDocument.conversation_id == conversation.id)
+    ) or 0
+
+
+async def document_names(db: AsyncSession, conversation: ChatConversation) -> List[str]:
+    await materialize_legacy_documents(db, conversation)
+    result = await db.execute(
+        select(MatrixDocument.name)
+        .where(MatrixDocument.conversation_id == conversation.id)
+        .order_by(MatrixDocument.position)
+    )
+    return [name or "" for name in result.scalars().all()]
+
+
+async def next_document_number(db: AsyncSession, conversation: ChatConversation) -> int:
+    """Next N for a "doc-N" id: the document count, or past the highest id after deletions."""
+    await materialize_legacy_documents(db, conversation)
+    result = await db.execute(
+        select(MatrixDocument.doc_id).where(MatrixDocument.conversation_id == conversation.id)
+    )
+    doc_ids = list(result.scalars().all())
+    numbers = [int(d[4:]) for d in doc_ids if d.startswith("doc-") and d[4:].isdigit()]
+    return max([len(doc_ids)] + [n + 1 for n in numbers])
+
+
+async def option_counts(db: AsyncSession, row: MatrixDocument) -> Dict[str, int]:
+    """Number of options per axis ("row", "column")."""
+    result = await db.execute(
+        select(MatrixOption.axis, func.count())
+        .where(MatrixOption.document_id == row.id)
+        .group_by(MatrixOption.axis)
+    )
+    counts = {axis: 0 for axis in AXES}
+    counts.update({axis: count for axis, count in result.all()})
+    return counts
+
+
+async def option_labels(db: AsyncSession, row: MatrixDocument, axis: str, positions: Iterable[int]) -> Dict[int, str]:
+    result = await db.execute(
+        select(MatrixOption.position, MatrixOption.label)
+        .where(MatrixOption.document_id == row.id, MatrixOption.axis == axis, MatrixOption.position.in_(list(positions)))
+    )
+    return {position: label for position, label in result.all()}
+
+
+async def cell_count(db: AsyncSession, row: MatrixDocument) -> int:
+    if not row.has_cells:
+        return 0
+    return await db.scalar(
+        select(func.count()).select_from(MatrixCell).where(MatrixCell.document_id == row.id)
+    ) or 0
+
+
+# ============================================================================
+# Writes (callers commit)
+# ============================================================================
+
+async def _next_position(db: AsyncSession, conversation_id: str) -> int:
+    last = await db.scalar(
+        select(func.max(MatrixDocument.position)).where(MatrixDocument.conversation_id == conversation_id)
+    )
+    return 0 if last is None else last + 1
+
+
+async def append_documents(
+    db: AsyncSession,
+    conversation: ChatConversation,
+    documents: List[Dict[str, Any]]
+) -> List[MatrixDocument]:
+    await materialize_legacy_documents(db, conversation, commit=False)
+    position = await _next_position(db, conversation.id)
+    rows = []
+    for i, document in enumerate(documents):
+        built = build_document(conversation.id, document, position + i)
+        db.add_all(built)
+        rows.append(built[0])
+    return rows
+
+
+async def replace_options(db: AsyncSession, row: MatrixDocument, axis: str, options: List[Dict[str, Any]]) -> None:
+    await db.execute(delete(MatrixOption).where(MatrixOption.document_id == row.id, MatrixOption.axis == axis))
+    db.add_all(build_option(row.id, axis, i, option) for i, option in enumerate(options))
+
+
+async def merge_documents(
+    db: AsyncSession,
+    conversation: ChatConversation,
+    documents: List[Dict[str, Any]]
+) -> None:
+    """
+    Merge documents streamed with a chat response.
+
+    Matching ids get the new name, options and selection (when both sides
+    have a matrix); cells, insights and plays are kept. Unknown ids are appended.
+    """
+    await materialize_legacy_documents(db, conversation, commit=False)
+    result = await db.execute(_documents_query(conversation.id, children=False))
+    rows = {row.doc_id: row for row in result.scalars().all()}
+    new_documents = []
+    for document in documents:
+        row = rows.get(document.get("id"))
+        if row is None:
+            new_documents.append(document)
+            continue
+
+        row.name = document.get("name", row.name)
+        new_matrix = document.get("matrix_data") or {}
+        if new_matrix and await _has_matrix(db, row):
+            for axis, key in AXES.items():
+                if key in new_matrix:
+                    await replace_options(db, row, axis, new_matrix[key] or [])
+            row.selected_rows = new_matrix.get("selected_rows", row.selected_rows or [0, 1, 2, 3, 4])
+            row.selected_columns = new_matrix.get("selected_columns", row.selected_columns or [0, 1, 2, 3, 4])
+
+    if new_documents:
+        await append_documents(db, conversation, new_documents)
+
+
+async def _has_matrix(db: AsyncSession, row: MatrixDocument) -> bool:
+    """Whether the document has any matrix_data (the JSON merge only touched existing matrices)."""
+    if row.matrix_extra or row.has_cells or row.selected_rows is not None or row.selected_columns is not None:
+        return True
+    return any((await option_counts(db, row)).values())
+
+
+async def delete_document(db: AsyncSession, row: MatrixDocument) -> None:
+    # Children are deleted explicitly: SQLite does not enforce ON DELETE CASCADE by default
+    await db.execute(delete(MatrixCell).where(MatrixCell.document_id == row.id))
+    await db.execute(delete(MatrixOption).where(MatrixOption.document_id == row.id))
+    await db.execute(delete(MatrixDocument).where(MatrixDocument.id == row.id))
+
+
+async def replace_cells(db: AsyncSession, row: MatrixDocument, cells: Dict[str, Any]) -> None:
+    await db.execute(delete(MatrixCell).where(MatrixCell.document_id == row.id))
+    db.add_all(build_cells(row.id, cells))
+    row.has_cells = True
+
+
+async def set_option_field(
+    db: AsyncSession,
+    row: MatrixDocument,
+    axis: str,
+    position: int,
+    **values
+) -> None:
+    """Update columns of one option row, e.g. articulated_insight=..."""
+    await db.execute(
+        update(MatrixOption)
+        .where(MatrixOption.document_id == row.id, MatrixOption.axis == axis, MatrixOption.position == position)
+        .values(**values)
+    )
+
+
+async def update_cell_dimensions(
+    db: AsyncSession,
+    row: MatrixDocument,
+    changes: Dict[str, List[Tuple[int, Any]]]
+) -> int:
+    """
+    Set dimension values on the given cells: {cell_key: [(dim_idx, value), ...]}.
+
+    Only the touched cell rows are loaded and written. Returns the number of
+    dimension values applied (unknown cells and out-of-range dimensions are skipped).
+    """
+    if not changes:
+        return 0
+    result = await db.execute(
+        select(MatrixCell).where(MatrixCell.document_id == row.id, MatrixCell.cell_key.in_(list(changes)))
+    )
+
+    applied = 0
+    for cell in result.scalars().all():
+        dimensions = [dict(d) for d in (cell.dimensions or [])]
+        for dim_idx, value in changes[cell.cell_key]:
+            if dim_idx < len(dimensions):
+                dimensions[dim_idx]["value"] = value
+                applied += 1
+        # New list so the JSON column is marked dirty
+        cell.dimensions = dimensions
+    return applied
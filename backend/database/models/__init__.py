@@ -29,6 +29,11 @@ from .chat import (
     ChatMessage,
     ChatSummary,
 )
+from .matrix import (
+    MatrixDocument,
+    MatrixOption,
+    MatrixCell,
+)
 from .goal import (
     Goal,
     MatrixValue,
@@ -106,6 +111,10 @@ __all__ = [
     "ChatConversation",
     "ChatMessage",
     "ChatSummary",
+    # Matrix
+    "MatrixDocument",
+    "MatrixOption",
+    "MatrixCell",
     # Goal
     "Goal",
     "MatrixValue",
@@ -34,16 +34,23 @@ class ChatConversation(Base):
     current_phase: Mapped[int] = mapped_column(Integer, default=1)
 
     # Persistent state
-    question_answers: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    # The JSON columns below are deferred: most endpoints only need ownership
+    # and metadata, so load them explicitly (get_or_404(..., load_columns=...))
+    question_answers: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True, deferred=True)
 
     # REMOVED: matrix_data column - now using generated_documents instead
     # Each document in generated_documents has its own matrix_data
 
     # Generated strategic presets (5 presets from LLM Call 2)
-    generated_presets: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    generated_presets: Mapped[Optional[list]] = mapped_column(
+        JSON, nullable=True, deferred=True, deferred_group="generated"
+    )
 
     # Generated documents (array of document objects from LLM Call 2)
-    generated_documents: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    # Legacy: moved to matrix_documents rows on access (see database/matrix_store.py)
+    generated_documents: Mapped[Optional[list]] = mapped_column(
+        JSON, nullable=True, deferred=True, deferred_group="generated"
+    )
 
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,91 @@
+"""
+Document matrix models.
+
+Row-level storage for the per-conversation documents that used to live in
+ChatConversation.generated_documents: one row per document, per row/column
+option and per cell, so editing a cell or a selection only rewrites that row.
+"""
+
+from datetime import datetime
+from typing import Optional, List
+from sqlalchemy import String, Boolean, Integer, DateTime, ForeignKey, Text, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import JSON  # Use generic JSON for SQLite/PostgreSQL compatibility
+
+from ..config import Base
+
+
+class MatrixDocument(Base):
+    """Generated document with its own 10x10 matrix."""
+    __tablename__ = "matrix_documents"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    conversation_id: Mapped[str] = mapped_column(String, ForeignKey("chat_conversations.id", ondelete="CASCADE"), nullable=False)
+
+    # Public document id ("doc-0") and display order
+    doc_id: Mapped[str] = mapped_column(String, nullable=False)
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # Matrix state
+    selected_rows: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    selected_columns: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    viewed_insight_indices: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    has_cells: Mapped[bool] = mapped_column(Boolean, default=False)  # False = cells not generated yet
+
+    # Design-reality output
+    leverage_points: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    risk_analysis: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    plays: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    presets: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    selected_play_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+
+    # Any other document / matrix_data keys, kept so documents round-trip unchanged
+    extra: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    matrix_extra: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Read-only: options and cells are written with targeted statements (see database/matrix_store.py)
+    options: Mapped[List["MatrixOption"]] = relationship("MatrixOption", viewonly=True)
+    cells: Mapped[List["MatrixCell"]] = relationship("MatrixCell", viewonly=True)
+
+    __table_args__ = (
+        UniqueConstraint("conversation_id", "doc_id", name="uq_matrix_document_doc_id"),
+        Index("ix_matrix_documents_conversation_position", "conversation_id", "position"),
+    )
+
+
+class MatrixOption(Base):
+    """Row or column option of a document matrix."""
+    __tablename__ = "matrix_options"
+
+    document_id: Mapped[str] = mapped_column(String, ForeignKey("matrix_documents.id", ondelete="CASCADE"), primary_key=True)
+    axis: Mapped[str] = mapped_column(String, primary_key=True)  # "row" or "column"
+    position: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    option_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    label: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    insight_title: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # Generated on demand, the largest part of a document
+    articulated_insight: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    articulated_outcome: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+
+    extra: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+
+
+class MatrixCell(Base):
+    """Cell of a document matrix, keyed "row-col" like the legacy cells dict."""
+    __tablename__ = "matrix_cells"
+
+    document_id: Mapped[str] = mapped_column(String, ForeignKey("matrix_documents.id", ondelete="CASCADE"), primary_key=True)
+    cell_key: Mapped[str] = mapped_column(String, primary_key=True)
+
+    dimensions: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    extra: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
@@ -0,0 +1,203 @@
+"""
+Engine Registry - Shared analysis engines with a warm start
+===========================================================
+
+The inference engine, the articulation-bridge components (ValueOrganizer,
+BottleneckDetector, LeverageIdentifier), the reverse causality engine and
+the GoalClassifier hold no per-request state. Without this module they were
+built more than once: main.py had one set, goal classification built a
+GoalClassifier per request (with its own organizer, detectors and reverse
+engine, which recompiles the outcome formula models), and the full health
+check built a whole OOFInferenceEngine per probe.
+
+`EngineRegistry` builds each of them once per process, lazily and under a
+lock. warm() runs one synthetic request through every engine in the app
+lifespan, and in every formula-pool worker, so first-call costs (scheduler
+plans, lazily built tables, solver setup) are paid before traffic arrives.
+status() reports whether the registry is warm, for the readiness probe.
+
+Usage:
+    registry = get_engine_registry()
+    await registry.warm_async()                  # lifespan
+    skeletons = registry.goal_classifier.classify(call1_output)
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from logging_config import inference_logger
+
+
+# Synthetic request used by warm(): mid-range operators, one signal per layer
+WARM_S_LEVEL = 4.0
+WARM_GOAL_CONTEXT = {"goal_text": "Grow the business", "goal_category": "career"}
+
+
+def _observations(operators: Dict[str, float]) -> list:
+    return [{"var": name, "value": value} for name, value in operators.items()]
+
+
+def _warm_call1(operators: Dict[str, float]) -> Dict[str, Any]:
+    return {
+        "observations": _observations(operators),
+        "s_level": f"S{WARM_S_LEVEL}",
+        "signals": [
+            {"category": "strengths", "layer": "LITERAL", "description": "Loyal repeat customers", "magnitude": 0.8},
+            {"category": "weaknesses", "layer": "INFERRED", "description": "Founder bottleneck", "magnitude": 0.6},
+            {"category": "avoidances", "layer": "ABSENT", "description": "No pricing review", "magnitude": 0.5},
+        ],
+        "file_metadata": {"file_types": ["pdf"]},
+    }
+
+
+class EngineRegistry:
+    """
+    Process-wide engine instances.
+
+    Components are built on first access (thread-safe); warm() builds all of
+    them and exercises each once.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._instances: Dict[str, Any] = {}
+        self._warm_ms: Dict[str, float] = {}
+        self._warmed_at: Optional[datetime] = None
+        self._error: Optional[str] = None
+
+    def _get(self, name: str, build: Callable[[], Any]) -> Any:
+        instance = self._instances.get(name)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is None:
+                    instance = self._instances[name] = build()
+        return instance
+
+    # -------------------------------------------------------------------------
+    # Components
+    # -------------------------------------------------------------------------
+
+    @property
+    def memo(self) -> Any:
+        """The process-wide InferenceMemo."""
+        from formulas.memo import get_inference_memo
+        return self._get("memo", get_inference_memo)
+
+    @property
+    def engine(self) -> Any:
+        """The OOFInferenceEngine wrapped by the memo."""
+        return self._get("engine", lambda: self.memo.engine)
+
+    @property
+    def value_organizer(self) -> Any:
+        from value_organizer import ValueOrganizer
+        return self._get("value_organizer", ValueOrganizer)
+
+    @property
+    def bottleneck_detector(self) -> Any:
+        from bottleneck_detector import BottleneckDetector
+        return self._get("bottleneck_detector", BottleneckDetector)
+
+    @property
+    def leverage_identifier(self) -> Any:
+        from leverage_identifier import LeverageIdentifier
+        return self._get("leverage_identifier", LeverageIdentifier)
+
+    @property
+    def reverse_engine(self) -> Any:
+        from reverse_causality import ReverseCausalityEngine
+        return self._get("reverse_engine", ReverseCausalityEngine)
+
+    @property
+    def goal_classifier(self) -> Any:
+        """GoalClassifier sharing the memo and the components above."""
+        def build() -> Any:
+            from goal_classifier import GoalClassifier
+            return GoalClassifier(
+                inference_memo=self.memo,
+                bottleneck_detector=self.bottleneck_detector,
+                leverage_identifier=self.leverage_identifier,
+                value_organizer=self.value_organizer,
+                reverse_engine=self.reverse_engine,
+            )
+        return self._get("goal_classifier", build)
+
+    # -------------------------------------------------------------------------
+    # Warm start
+    # -------------------------------------------------------------------------
+
+    def _timed(self, step: str, fn: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        result = fn()
+        self._warm_ms[step] = round((time.perf_counter() - started) * 1000, 2)
+        return result
+
+    def warm(self) -> bool:
+        """
+        Build every component and run one synthetic request through each.
+        Returns True when warm; failures are logged and reported by status().
+        """
+        with self._lock:
+            if self._warmed_at is not None:
+                return True
+            try:
+                from formulas import CANONICAL_OPERATOR_NAMES
+
+                self._timed("build", lambda: self.goal_classifier)
+                operators = {name: 0.5 for name in sorted(CANONICAL_OPERATOR_NAMES)}
+
+                engine = self.engine
+                posteriors = self._timed("infer", lambda: engine.infer(operators, WARM_S_LEVEL, WARM_GOAL_CONTEXT))
+                state = self._timed(
+                    "value_organizer",
+                    lambda: self.value_organizer.organize(posteriors, {"observations": _observations(operators)}),
+                )
+                self._timed("bottlenecks", lambda: self.bottleneck_detector.detect(state))
+                self._timed("leverage", lambda: self.leverage_identifier.identify(state))
+                self._timed("goal_classifier", lambda: self.goal_classifier.classify(_warm_call1(operators)))
+            except Exception as e:
+                self._error = f"{type(e).__name__}: {e}"
+                inference_logger.error(f"[ENGINE REGISTRY] Warm start failed: {self._error}", exc_info=True)
+                return False
+
+            self._error = None
+            self._warmed_at = datetime.utcnow()
+            inference_logger.info(
+                f"[ENGINE REGISTRY] Warm in {sum(self._warm_ms.values()):.1f}ms: {self._warm_ms}"
+            )
+            return True
+
+    async def warm_async(self) -> bool:
+        """warm() in a worker thread."""
+        return await asyncio.to_thread(self.warm)
+
+    @property
+    def is_warm(self) -> bool:
+        return self._warmed_at is not None
+
+    def status(self) -> Dict[str, Any]:
+        """Warm state for readiness probes."""
+        return {
+            "warm": self.is_warm,
+            "warmed_at": self._warmed_at.isoformat() if self._warmed_at else None,
+            "warm_ms": dict(self._warm_ms),
+            "components": sorted(self._instances),
+            "error": self._error,
+        }
+
+
+_shared_registry: Optional[EngineRegistry] = None
+_shared_registry_lock = threading.Lock()
+
+
+def get_engine_registry() -> EngineRegistry:
+    """Process-wide registry (one per process, including formula-pool workers)."""
+    global _shared_registry
+    with _shared_registry_lock:
+        if _shared_registry is None:
+            _shared_registry = EngineRegistry()
+        return _shared_registry
@@ -3,15 +3,22 @@ File parser for goal discovery.
 
 Extracts text content from various file formats so it can be sent to the LLM.
 Supports: md, txt, json, csv, docx, pptx, xlsx, jpg/jpeg/png (as images), zip.
+
+Images are normalized before they are base64-encoded for session state and
+the vision calls: EXIF orientation applied then stripped, longest edge capped,
+re-encoded as WebP or JPEG. Very large images can optionally be split into an
+overview plus tiles. See ImageSettings for the environment variables.
+parse_service caches the normalized output by SHA-256 of the uploaded bytes.
 """
 
 import base64
 import io
 import json
+import math
 import os
 import zipfile
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import BinaryIO, List, Optional, Tuple, Union
 
 from logging_config import api_logger
 
@@ -81,6 +88,55 @@ MAX_ZIP_FILES = 20
 # Maximum total extracted size from a zip (10 MB of text)
 MAX_ZIP_TOTAL_SIZE = 10 * 1024 * 1024
 
+# Re-encoded image formats
+NORMALIZED_IMAGE_FORMATS = {"webp": ("WEBP", "image/webp"), "jpeg": ("JPEG", "image/jpeg")}
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() not in ("0", "false", "no")
+
+
+@dataclass(frozen=True)
+class ImageSettings:
+    """
+    Image normalization for vision inputs.
+
+    Environment:
+        IMAGE_NORMALIZE         re-encode images (default: on; 0 sends the original bytes)
+        IMAGE_MAX_EDGE          longest edge in pixels (default: 1568)
+        IMAGE_FORMAT            webp | jpeg (default: webp)
+        IMAGE_QUALITY           encoder quality 1-100 (default: 80)
+        IMAGE_TILING            split very large images into tiles (default: off)
+        IMAGE_TILE_THRESHOLD    longest edge above which an image is tiled (default: 4096)
+        IMAGE_MAX_TILES         tiles per image, besides the overview (default: 6)
+    """
+    normalize: bool = True
+    max_edge: int = 1568
+    format: str = "webp"
+    quality: int = 80
+    tiling: bool = False
+    tile_threshold: int = 4096
+    max_tiles: int = 6
+
+    @classmethod
+    def from_env(cls) -> "ImageSettings":
+        image_format = os.getenv("IMAGE_FORMAT", "webp").lower()
+        if image_format not in NORMALIZED_IMAGE_FORMATS:
+            api_logger.warning(f"[FILE_PARSER] Unknown IMAGE_FORMAT {image_format!r}, using webp")
+            image_format = "webp"
+        return cls(
+            normalize=_env_flag("IMAGE_NORMALIZE", "1"),
+            max_edge=int(os.getenv("IMAGE_MAX_EDGE", "1568")),
+            format=image_format,
+            quality=int(os.getenv("IMAGE_QUALITY", "80")),
+            tiling=_env_flag("IMAGE_TILING", "0"),
+            tile_threshold=int(os.getenv("IMAGE_TILE_THRESHOLD", "4096")),
+            max_tiles=int(os.getenv("IMAGE_MAX_TILES", "6")),
+        )
+
+
+IMAGE_SETTINGS = ImageSettings.from_env()
+
 
 @dataclass
 class ParsedFile:
@@ -221,37 +277,202 @@ def parse_xlsx(name: str, raw_bytes: bytes) -> ParsedFile:
         return ParsedFile(name=name, text_content="", parse_error=f"Failed to parse xlsx: {e}")
 
 
+def _image_description(name: str, size: Tuple[int, int], media_type: str, note: str = "") -> str:
+    return f"[Image: {name}, {size[0]}x{size[1]} pixels, {media_type}{note}]"
+
+
+def _image_file(name: str, data: bytes, size: Tuple[int, int], media_type: str, note: str = "") -> ParsedFile:
+    return ParsedFile(
+        name=name,
+        text_content=_image_description(name, size, media_type, note),
+        is_image=True,
+        image_base64=base64.b64encode(data).decode("utf-8"),
+        image_media_type=media_type,
+    )
+
+
+def _encode_image(img, settings: ImageSettings) -> Tuple[bytes, str]:
+    """Re-encode without metadata; alpha is kept for WebP and flattened onto white for JPEG."""
+    image_format = settings.format
+    has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+    if image_format == "webp":
+        img = img.convert("RGBA" if has_alpha else "RGB") if img.mode not in ("RGB", "RGBA") else img
+        options = {"quality": settings.quality, "method": 4}
+    else:
+        if has_alpha:
+            rgba = img.convert("RGBA")
+            flattened = _get_pil().new("RGB", rgba.size, (255, 255, 255))
+            flattened.paste(rgba, mask=rgba.getchannel("A"))
+            img = flattened
+        elif img.mode != "RGB":
+            img = img.convert("RGB")
+        options = {"quality": settings.quality, "optimize": True}
+
+    pil_format, media_type = NORMALIZED_IMAGE_FORMATS[image_format]
+    buffer = io.BytesIO()
+    img.save(buffer, format=pil_format, **options)
+    return buffer.getvalue(), media_type
+
+
+def _fit(size: Tuple[int, int], max_edge: int) -> Tuple[int, int]:
+    width, height = size
+    scale = min(1.0, max_edge / max(width, height))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _tile_grid(size: Tuple[int, int], settings: ImageSettings) -> Tuple[Tuple[int, int], int, int]:
+    """Working size and (columns, rows) so every tile fits max_edge and the count fits max_tiles."""
+    width, height = size
+    edge = settings.max_edge
+    scale = 1.0
+    while True:
+        scaled = (max(1, int(width * scale)), max(1, int(height * scale)))
+        columns, rows = math.ceil(scaled[0] / edge), math.ceil(scaled[1] / edge)
+        if columns * rows <= max(1, settings.max_tiles):
+            return scaled, columns, rows
+        scale *= 0.9
+
+
+def _open_image(raw_bytes: bytes, draft_edge: Optional[int] = None):
+    """
+    Decode and apply the EXIF orientation (the re-encoded copy carries no EXIF).
+    With draft_edge, JPEGs are decoded at the smallest DCT scale that still
+    covers it, which is much faster for multi-megapixel photos.
+    Returns the image and its full-resolution size (after orientation).
+    """
+    pil = _get_pil()
+    from PIL import ImageOps
+
+    img = pil.open(io.BytesIO(raw_bytes))
+    width, height = img.size
+    if draft_edge and img.format == "JPEG":
+        img.draft("RGB", _fit((width, height), draft_edge))
+    img.load()
+    transposed = ImageOps.exif_transpose(img) or img
+    if transposed.size != img.size:
+        width, height = height, width
+    return transposed, (width, height)
+
+
+def normalize_image(
+    name: str,
+    raw_bytes: bytes,
+    settings: Optional[ImageSettings] = None,
+    tiles: bool = True
+) -> List[ParsedFile]:
+    """
+    Vision-ready copies of an image: the whole image capped at
+    settings.max_edge, plus, with tiling enabled and an image larger than
+    tile_threshold, a grid of tiles at up to max_edge each.
+
+    The original bytes are kept when the image needs no resizing, carries no
+    EXIF and re-encoding would not make it smaller.
+    """
+    settings = settings or IMAGE_SETTINGS
+    ext = get_extension(name)
+    original_media_type = IMAGE_MIME_TYPES.get(ext, "image/jpeg")
+    tiling = tiles and settings.tiling
+
+    img, original_size = _open_image(raw_bytes, draft_edge=None if tiling else settings.max_edge)
+    had_exif = bool(img.info.get("exif"))
+
+    overview = img.copy()
+    overview.thumbnail(_fit(original_size, settings.max_edge), _get_pil().LANCZOS)
+    data, media_type = _encode_image(overview, settings)
+    if overview.size == original_size and not had_exif and len(data) >= len(raw_bytes):
+        data, media_type = raw_bytes, original_media_type
+    note = f", downscaled from {original_size[0]}x{original_size[1]}" if overview.size != original_size else ""
+    results = [_image_file(name, data, overview.size, media_type, note)]
+
+    if tiling and max(original_size) > settings.tile_threshold:
+        working_size, columns, rows = _tile_grid(original_size, settings)
+        working = img if working_size == img.size else img.resize(working_size, _get_pil().LANCZOS)
+        tile_width, tile_height = math.ceil(working_size[0] / columns), math.ceil(working_size[1] / rows)
+        count = columns * rows
+        for row in range(rows):
+            for column in range(columns):
+                box = (
+                    column * tile_width,
+                    row * tile_height,
+                    min(working_size[0], (column + 1) * tile_width),
+                    min(working_size[1], (row + 1) * tile_height),
+                )
+                tile = working.crop(box)
+                tile_data, tile_media_type = _encode_image(tile, settings)
+                index = row * columns + column + 1
+                results.append(_image_file(
+                    f"{name} [tile {index}/{count}]", tile_data, tile.size, tile_media_type,
+                    f", row {row + 1} column {column + 1} of {rows}x{columns}",
+                ))
+
+    return results
+
+
 def parse_image(name: str, raw_bytes: bytes) -> ParsedFile:
-    """Prepare an image for LLM vision input."""
+    """Prepare an image for LLM vision input (normalized; see ImageSettings)."""
+    return parse_image_tiles(name, raw_bytes, tiles=False)[0]
+
+
+def parse_image_tiles(name: str, raw_bytes: bytes, tiles: bool = True) -> List[ParsedFile]:
+    """
+    Prepare an image for LLM vision input: the normalized image, followed by
+    its tiles when tiling is enabled and the image is large enough.
+    """
     ext = get_extension(name)
     media_type = IMAGE_MIME_TYPES.get(ext, "image/jpeg")
 
     try:
-        # Validate the image can be opened
         pil = _get_pil()
+        if IMAGE_SETTINGS.normalize:
+            from PIL import UnidentifiedImageError
+            try:
+                return normalize_image(name, raw_bytes, tiles=tiles)
+            except UnidentifiedImageError:
+                raise
+            except Exception as e:
+                # Images that open but do not re-encode (odd modes, truncated
+                # data) are sent as-is rather than dropped
+                api_logger.warning(f"[FILE_PARSER] Could not normalize image {name}, sending original: {e}")
+
+        # Validate the image can be opened
         img = pil.open(io.BytesIO(raw_bytes))
         width, height = img.size
         img.close()
 
-        b64 = base64.b64encode(raw_bytes).decode("utf-8")
-
-        return ParsedFile(
-            name=name,
-            text_content=f"[Image: {name}, {width}x{height} pixels, {media_type}]",
-            is_image=True,
-            image_base64=b64,
-            image_media_type=media_type,
-        )
+        return [_image_file(name, raw_bytes, (width, height), media_type)]
     except Exception as e:
         api_logger.warning(f"[FILE_PARSER] Failed to parse image {name}: {e}")
-        return ParsedFile(name=name, text_content="", parse_error=f"Failed to parse image: {e}")
+        return [ParsedFile(name=name, text_content="", parse_error=f"Failed to parse image: {e}")]
 
 
-def parse_zip(name: str, raw_bytes: bytes) -> List[ParsedFile]:
-    """Extract and parse files from a .zip archive."""
-    results = []
+def parse_zip_entry(entry_name: str, entry_bytes: bytes) -> List[ParsedFile]:
+    """Parse one file extracted from a zip archive (an image may produce tiles)."""
+    ext = get_extension(entry_name)
+    if ext in TEXT_EXTENSIONS:
+        return [parse_text_file(entry_name, entry_bytes.decode("utf-8", errors="replace"))]
+    elif ext == ".docx":
+        return [parse_docx(entry_name, entry_bytes)]
+    elif ext == ".pptx":
+        return [parse_pptx(entry_name, entry_bytes)]
+    elif ext == ".xlsx":
+        return [parse_xlsx(entry_name, entry_bytes)]
+    elif ext in IMAGE_EXTENSIONS:
+        return parse_image_tiles(entry_name, entry_bytes)
+    return [ParsedFile(name=entry_name, parse_error=f"No parser for: {ext}")]
+
+
+def read_zip_entries(name: str, raw_bytes: Union[bytes, BinaryIO]) -> List[Tuple[str, Optional[bytes], Optional[str]]]:
+    """
+    Extract the parseable entries of a .zip archive (bytes or an open binary
+    file), in name order and within MAX_ZIP_FILES / MAX_ZIP_TOTAL_SIZE.
+
+    Returns (entry_name, entry_bytes, error) tuples; entry_bytes is None when
+    the entry (or the archive itself) could not be read.
+    """
+    entries_out = []
+    source = io.BytesIO(raw_bytes) if isinstance(raw_bytes, (bytes, bytearray)) else raw_bytes
     try:
-        with zipfile.ZipFile(io.BytesIO(raw_bytes)) as zf:
+        with zipfile.ZipFile(source) as zf:
             entries = [
                 info for info in zf.infolist()
                 if not info.is_dir()
@@ -272,76 +493,75 @@ def parse_zip(name: str, raw_bytes: bytes) -> List[ParsedFile]:
                     api_logger.info(f"[FILE_PARSER] Zip {name} exceeded total size limit")
                     break
 
+                entry_name = f"{name}/{entry.filename}"
                 try:
                     entry_bytes = zf.read(entry.filename)
                     total_size += len(entry_bytes)
-                    entry_name = f"{name}/{entry.filename}"
-                    ext = get_extension(entry.filename)
-
-                    if ext in TEXT_EXTENSIONS:
-                        text = entry_bytes.decode("utf-8", errors="replace")
-                        results.append(parse_text_file(entry_name, text))
-                    elif ext == ".docx":
-                        results.append(parse_docx(entry_name, entry_bytes))
-                    elif ext == ".pptx":
-                        results.append(parse_pptx(entry_name, entry_bytes))
-                    elif ext == ".xlsx":
-                        results.append(parse_xlsx(entry_name, entry_bytes))
-                    elif ext in IMAGE_EXTENSIONS:
-                        results.append(parse_image(entry_name, entry_bytes))
+                    entries_out.append((entry_name, entry_bytes, None))
                 except Exception as e:
                     api_logger.warning(f"[FILE_PARSER] Failed to parse zip entry {entry.filename}: {e}")
-                    results.append(ParsedFile(
-                        name=f"{name}/{entry.filename}",
-                        parse_error=f"Failed to extract: {e}",
-                    ))
+                    entries_out.append((entry_name, None, f"Failed to extract: {e}"))
 
     except zipfile.BadZipFile:
         api_logger.warning(f"[FILE_PARSER] Invalid zip file: {name}")
-        results.append(ParsedFile(name=name, parse_error="Invalid zip file"))
+        entries_out.append((name, None, "Invalid zip file"))
     except Exception as e:
         api_logger.warning(f"[FILE_PARSER] Failed to parse zip {name}: {e}")
-        results.append(ParsedFile(name=name, parse_error=f"Failed to parse zip: {e}"))
+        entries_out.append((name, None, f"Failed to parse zip: {e}"))
+
+    return entries_out
+
 
+def parse_zip(name: str, raw_bytes: bytes) -> List[ParsedFile]:
+    """Extract and parse files from a .zip archive."""
+    results = []
+    for entry_name, entry_bytes, error in read_zip_entries(name, raw_bytes):
+        if entry_bytes is None:
+            results.append(ParsedFile(name=entry_name, parse_error=error))
+            continue
+        try:
+            results.extend(parse_zip_entry(entry_name, entry_bytes))
+        except Exception as e:
+            api_logger.warning(f"[FILE_PARSER] Failed to parse zip entry {entry_name}: {e}")
+            results.append(ParsedFile(name=entry_name, parse_error=f"Failed to extract: {e}"))
     return results
 
 
-def parse_file(name: str, content: str, encoding: str = "text") -> List[ParsedFile]:
+def decode_upload(name: str, content: str, encoding: str = "text") -> Tuple[Optional[bytes], List[ParsedFile]]:
     """
-    Parse a single uploaded file.
-
-    Args:
-        name: Original filename
-        content: File content (text or base64-encoded)
-        encoding: 'text' for plain text content, 'base64' for base64-encoded binary
+    Validate an uploaded file and decode its content.
 
-    Returns:
-        List of ParsedFile objects (usually 1, but zip can produce multiple)
+    Returns (raw_bytes, []) when the file needs a binary parser, or
+    (None, results) when it is already handled: plain text, unsupported type
+    or undecodable content.
     """
     ext = get_extension(name)
 
     if ext not in SUPPORTED_EXTENSIONS:
-        return [ParsedFile(name=name, parse_error=f"Unsupported file type: {ext}")]
+        return None, [ParsedFile(name=name, parse_error=f"Unsupported file type: {ext}")]
 
     # Text files — content is already plain text
     if ext in TEXT_EXTENSIONS and encoding == "text":
-        return [parse_text_file(name, content)]
+        return None, [parse_text_file(name, content)]
 
     # For all binary formats, decode base64 first
     if encoding == "base64":
         try:
-            raw_bytes = _decode_base64_content(content)
+            return _decode_base64_content(content), []
         except Exception as e:
-            return [ParsedFile(name=name, parse_error=f"Failed to decode base64: {e}")]
-    else:
-        # Text encoding but binary extension — try to handle gracefully
-        # This happens if frontend sent as text (older clients)
-        if ext in TEXT_EXTENSIONS:
-            return [parse_text_file(name, content)]
-        # Can't parse binary from text content
-        return [ParsedFile(name=name, parse_error=f"Binary file {ext} requires base64 encoding")]
-
-    # Route to format-specific parser
+            return None, [ParsedFile(name=name, parse_error=f"Failed to decode base64: {e}")]
+
+    # Text encoding but binary extension — try to handle gracefully
+    # This happens if frontend sent as text (older clients)
+    if ext in TEXT_EXTENSIONS:
+        return None, [parse_text_file(name, content)]
+    # Can't parse binary from text content
+    return None, [ParsedFile(name=name, parse_error=f"Binary file {ext} requires base64 encoding")]
+
+
+def parse_bytes(name: str, raw_bytes: bytes) -> List[ParsedFile]:
+    """Route decoded file content to its format-specific parser."""
+    ext = get_extension(name)
     if ext == ".docx":
         return [parse_docx(name, raw_bytes)]
     elif ext == ".pptx":
@@ -349,29 +569,36 @@ def parse_file(name: str, content: str, encoding: str = "text") -> List[ParsedFi
     elif ext == ".xlsx":
         return [parse_xlsx(name, raw_bytes)]
     elif ext in IMAGE_EXTENSIONS:
-        return [parse_image(name, raw_bytes)]
+        return parse_image_tiles(name, raw_bytes)
     elif ext == ".zip":
         return parse_zip(name, raw_bytes)
     else:
         return [ParsedFile(name=name, parse_error=f"No parser for: {ext}")]
 
 
-def parse_all_files(files: list) -> ParseResult:
+def parse_file(name: str, content: str, encoding: str = "text") -> List[ParsedFile]:
     """
-    Parse all uploaded files from a discovery request.
+    Parse a single uploaded file.
 
     Args:
-        files: List of FileData-like objects with name, content, encoding, type attributes
+        name: Original filename
+        content: File content (text or base64-encoded)
+        encoding: 'text' for plain text content, 'base64' for base64-encoded binary
 
     Returns:
-        ParseResult with separated text files and image files
+        List of ParsedFile objects (usually 1, but zip can produce multiple)
     """
-    result = ParseResult()
+    raw_bytes, handled = decode_upload(name, content, encoding)
+    if raw_bytes is None:
+        return handled
+    return parse_bytes(name, raw_bytes)
 
-    for f in files:
-        encoding = getattr(f, "encoding", None) or "text"
-        parsed_list = parse_file(f.name, f.content, encoding)
 
+def collect_results(parsed_lists: List[List[ParsedFile]]) -> ParseResult:
+    """Split parsed files into text files, images and errors."""
+    result = ParseResult()
+
+    for parsed_list in parsed_lists:
         for parsed in parsed_list:
             if parsed.parse_error and not parsed.text_content and not parsed.is_image:
                 result.errors.append(f"{parsed.name}: {parsed.parse_error}")
@@ -388,3 +615,19 @@ def parse_all_files(files: list) -> ParseResult:
         f"{len(result.image_files)} images, {len(result.errors)} errors"
     )
     return result
+
+
+def parse_all_files(files: list) -> ParseResult:
+    """
+    Parse all uploaded files from a discovery request.
+
+    Args:
+        files: List of FileData-like objects with name, content, encoding, type attributes
+
+    Returns:
+        ParseResult with separated text files and image files
+    """
+    return collect_results([
+        parse_file(f.name, f.content, getattr(f, "encoding", None) or "text")
+        for f in files
+    ])
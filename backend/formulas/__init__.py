@@ -25,6 +25,7 @@ from .panchakritya import PanchakrityaEngine
 
 # Master inference engine
 from .inference import OOFInferenceEngine, IntegratedProfile
+from .module_graph import ModuleScheduler, ModuleNode, ExecutionPlan, MODULE_NODES, DEFAULT_MODULES
 
 # Part XI Advanced Math and additional OOF formulas (from OOF_Math.txt)
 from .advanced_math import AdvancedMathEngine, get_advanced_math_profile
@@ -71,6 +72,12 @@ __all__ = [
     # Master engine
     'OOFInferenceEngine',
     'IntegratedProfile',
+    # Module graph scheduler
+    'ModuleScheduler',
+    'ModuleNode',
+    'ExecutionPlan',
+    'MODULE_NODES',
+    'DEFAULT_MODULES',
     # Part XI Advanced Math (from OOF_Math.txt)
     'AdvancedMathEngine',
     'get_advanced_math_profile',
@@ -0,0 +1,1148 @@
+"""
+OOF Framework - Batched Profile Computation
+===========================================
+
+Columnar evaluation of many operator vectors at once, for re-scoring
+historical CalculationSnapshot rows and sweeping what-if scenarios.
+
+Input is an N x K NumPy array whose columns are canonical operator names
+(NaN = operator missing) plus a length-N s_level vector (NaN = unknown).
+Output is a dict of columns keyed by the same flattened names
+OOFInferenceEngine._flatten_profile produces:
+- numeric columns are float64 arrays, NaN where the scalar path yields None
+  or omits the key
+- text columns (e.g. realism_dominant) are object arrays, None where missing
+- `_error` (object column, only present if a row failed) holds the
+  exception text for rows the scalar engines could not evaluate
+
+Every module has a vectorized kernel that reproduces the flattened values
+(and the summary-metric inputs) of its scalar engine:
+- closed-form element-wise modules: operators, pathways, cascade, death,
+  circles, osafc, distortions, panchakritya, multi_reality, dynamics,
+  quantum, network and unity
+- weighted operator tables: emotions and realism
+- hierarchical is operator-independent and is evaluated once
+- drives, matrices, kosha, advanced_math and timeline need inputs that are
+  not canonical operators (T_temporal, breath_awareness, BN_belief, a
+  timeline context), so they never produce a profile from these columns;
+  collective and platform only produce nested objects, which are not
+  flattened. Their kernels emit no columns.
+
+Rows a kernel cannot reproduce exactly - those where the scalar engine
+raises (matrices, death and multi_reality on some sparse or boundary rows)
+and rows with operators outside [0, 1] - are re-evaluated through
+calculate_full_profile, once per unique row, and scattered back.
+
+Formula: Columns = Summary(Kernels(X, s)) <- Scalar(unique(X_fallback, s_fallback))
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from logging_config import get_logger
+from .operators import CANONICAL_OPERATOR_NAMES
+from .module_graph import DEFAULT_MODULES, MODULE_NODES, UNITY_OPERATORS
+from .unity_principle import UNITY_DIRECTION, UNITY_IMPACT_WEIGHTS
+from .cascade import CascadeCalculator
+from .circles import CircleType
+from .osafc import OSAFC_DEFINITIONS, OSAFCLayer
+from .inference import LIBERATION_WEIGHTS
+
+logger = get_logger('formulas.batch')
+
+
+# Default column order for operator matrices
+OPERATOR_COLUMNS: Tuple[str, ...] = tuple(sorted(CANONICAL_OPERATOR_NAMES))
+
+KLESHA_COLUMNS = ('Av_avidya', 'As_asmita', 'Ra_raga', 'Dv_dvesha', 'Ab_abhinivesha')
+
+# Modules the scheduler skips when s_level is unknown
+_REQUIRES_S_LEVEL = frozenset(node.name for node in MODULE_NODES if node.requires_s_level)
+
+# (module, summary metric name) in _calculate_summary_metrics order. Pathways
+# never contributes: PathwaysProfile has no `overall_progress`.
+_SUMMARY_SOURCES: Tuple[Tuple[str, str], ...] = (
+    ("drives", "drives"),
+    ("matrices", "matrices"),
+    ("cascade", "cascade"),
+    ("circles", "circles"),
+    ("kosha", "kosha"),
+    ("osafc", "osafc"),
+    ("distortions", "distortion"),
+    ("panchakritya", "panchakritya"),
+)
+
+SUMMARY_COLUMNS = ('overall_health', 'liberation_index', 'integration_score', 'transformation_potential')
+
+
+# =============================================================================
+# INPUT HELPERS
+# =============================================================================
+
+def to_operator_matrix(
+    operator_dicts: Iterable[Mapping[str, Optional[float]]],
+    columns: Sequence[str] = OPERATOR_COLUMNS
+) -> np.ndarray:
+    """
+    Build an N x K operator matrix from operator dicts.
+
+    Missing or None operators become NaN. Useful for re-scoring stored
+    snapshots whose `metrics` column holds canonical operator dicts.
+    """
+    rows = [
+        [np.nan if d.get(name) is None else float(d.get(name)) for name in columns]
+        for d in operator_dicts
+    ]
+    return np.asarray(rows, dtype=np.float64).reshape(len(rows), len(columns))
+
+
+def _as_s_levels(s_levels: Union[float, None, Sequence[Optional[float]], np.ndarray], n: int) -> np.ndarray:
+    """Normalize scalar / sequence s_levels to a float64 vector (NaN = missing)."""
+    if s_levels is None:
+        return np.full(n, np.nan)
+    if np.isscalar(s_levels):
+        return np.full(n, float(s_levels))
+    arr = np.asarray(
+        [np.nan if s is None else s for s in s_levels] if not isinstance(s_levels, np.ndarray) else s_levels,
+        dtype=np.float64
+    )
+    if arr.shape != (n,):
+        raise ValueError(f"s_levels must have shape ({n},), got {arr.shape}")
+    return arr
+
+
+# =============================================================================
+# VECTORIZED KERNELS
+# =============================================================================
+
+class _Columns:
+    """Column accessor over the operator matrix (all-NaN for absent columns)."""
+
+    def __init__(self, matrix: np.ndarray, columns: Sequence[str]):
+        self._matrix = matrix
+        self._index = {name: i for i, name in enumerate(columns)}
+        self._missing = np.full(matrix.shape[0], np.nan)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        i = self._index.get(name)
+        return self._missing if i is None else self._matrix[:, i]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+
+@dataclass
+class _KernelOutput:
+    """
+    What a kernel contributes for one module.
+
+    columns: flattened value name -> length-N column
+    summary: the module's _calculate_summary_metrics input (NaN where the
+             profile is absent), for modules listed in _SUMMARY_SOURCES
+    fallback: rows the kernel cannot reproduce (the scalar engine raises)
+    """
+    columns: Dict[str, np.ndarray]
+    summary: Optional[np.ndarray] = None
+    fallback: Optional[np.ndarray] = None
+
+
+Kernel = Callable[[_Columns, np.ndarray], _KernelOutput]
+
+
+def _present(*arrays: np.ndarray) -> np.ndarray:
+    """Rows where every array is available."""
+    mask = ~np.isnan(arrays[0])
+    for values in arrays[1:]:
+        mask &= ~np.isnan(values)
+    return mask
+
+
+def _where(mask: np.ndarray, values: Any) -> np.ndarray:
+    """`values` where mask holds, NaN elsewhere."""
+    return np.where(mask, values, np.nan)
+
+
+def _sum(arrays: Sequence[np.ndarray]) -> np.ndarray:
+    """Left-to-right sum, matching the builtin sum() over scalars."""
+    total = arrays[0]
+    for values in arrays[1:]:
+        total = total + values
+    return total
+
+
+def _alignment(scores: Sequence[np.ndarray]) -> np.ndarray:
+    """PathwaysEngine._calculate_alignment: 1 - normalized spread, 0 for all-zero scores."""
+    mean = _sum(scores) / len(scores)
+    variance = _sum([(s - mean) ** 2 for s in scores]) / len(scores)
+    return np.where(mean == 0, 0.0, 1 - np.sqrt(variance / 0.25))
+
+
+def _nan_mean(arrays: List[np.ndarray]) -> np.ndarray:
+    """Mean over available (non-NaN) entries, NaN if none are available."""
+    stacked = np.vstack(arrays)
+    counts = np.sum(~np.isnan(stacked), axis=0)
+    sums = np.nansum(stacked, axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def _available_mean(arrays: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Sequential sum / count over available entries (scalar summation order)."""
+    total = np.zeros(len(arrays[0]))
+    count = np.zeros(len(arrays[0]), dtype=int)
+    for values in arrays:
+        present = ~np.isnan(values)
+        total += np.where(present, values, 0.0)
+        count += present
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / count, np.nan), count
+
+
+def _text(n: int, choices: Sequence[Tuple[np.ndarray, str]], default: Optional[str] = None) -> np.ndarray:
+    """Object column picking the first matching (mask, text), else `default`."""
+    column = np.full(n, default, dtype=object)
+    unset = np.ones(n, dtype=bool)
+    for mask, text in choices:
+        hit = unset & mask
+        column[hit] = text
+        unset &= ~hit
+    return column
+
+
+def _kernel_operators(ops: _Columns, s_level: np.ndarray) -> _KernelOutput:
+    """OperatorEngine.calculate_all_derived, vectorized (prefix `op`)."""
+    at, se, as_, w = ops['At_attachment'], ops['Se_service'], ops['As_asmita'], ops['W_witness']
+    m, p, ce, k = ops['M_maya'], ops['P_presence'], ops['Ce_cleaning'], ops['K_karma']
+    hf, e, ab = ops['Hf_habit'], ops['E_equanimity'], ops['Ab_abhinivesha']
+
+    kl = _nan_mean([ops[name] for name in KLESHA_COLUMNS])
+    m_eff = m * (1 - w) * (1 + kl) / 2
+    psi = p * w * (1 - m_eff) * (1 - at)
+    grace = (1 - at) * ce * (p * w) * (1 - at)
+    k_bind = k * hf * (1 - ce * grace)
+    ego_sep = at * (1 - se) * as_ * (1 - w)
+    resistance = (at + hf + (1 - e)) / 3
+    evolution = 0.3 * (w * p) + 0.25 * ce + 0.35 * grace - 0.4 * resistance
+    love = 1 - at
+    fear = ab * (1 - p)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        lf = np.where(love + fear == 0, np.nan, love / (love + fear))
+
+    result = {f"op_{name}": ops[name] for name in ops._index}
+    result.update({
+        "op_KL_klesha": kl,
+        "op_M_maya_effective": m_eff,
+        "op_Psi_quality_computed": psi,
+        "op_G_grace_computed": grace,
+        "op_K_binding": k_bind,
+        "op_Ego_separation": ego_sep,
+        "op_Resistance": resistance,
+        "op_Evolution_rate": evolution,
+        "op_Lf_lovefear_computed": lf,
+    })
+    return _KernelOutput(result)
+
+
+def _kernel_unity(ops: _Columns, s_level: np.ndarray) -> _KernelOutput:
+    """unity_principle.get_unity_metrics over UNITY_OPERATORS, vectorized."""
+    has_s = ~np.isnan(s_level)
+    separation = 0.92 * np.exp(-0.45 * s_level)
+    distortion = 1.0 - np.exp(-separation / 0.35)
+    percolation = (1.0 - distortion) * (ops['W_witness'] * ops['A_aware'] * ops['P_presence']) * (1.0 - ops['M_maya'])
+
+    weighted = np.zeros(len(s_level))
+    weights = np.zeros(len(s_level))
+    for name in UNITY_OPERATORS:
+        if name not in UNITY_DIRECTION or name not in UNITY_IMPACT_WEIGHTS:
+            continue
+        values = ops[name]
+        present = ~np.isnan(values)
+        weight = UNITY_IMPACT_WEIGHTS[name]
+        weighted += np.where(present, values * UNITY_DIRECTION[name] * weight, 0.0)
+        weights += np.where(present, weight, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        unity_vector = np.where(weights > 0, np.clip(weighted / weights, -1.0, 1.0), np.nan)
+
+    net_direction = np.full(len(s_level), None, dtype=object)
+    net_direction[has_s] = "neutral"
+    return _KernelOutput({
+        "unity_separation_distance": separation,
+        "unity_distortion_field": distortion,
+        "unity_percolation_quality": percolation,
+        "unity_vector": np.where(has_s, unity_vector, np.nan),
+        "unity_net_direction": net_direction,
+    })
+
+
+def _kernel_network(engine: Any) -> Kernel:
+    """NetworkEmergenceCalculator.calculate_network_state for one node, vectorized."""
+    network = engine.network_engine
+    # Everything except the coherence multiplier depends only on the fixed
+    # network defaults, so evaluate the scalar engine once for those.
+    reference = network.calculate_network_state(
+        individual_coherence=0.5, individual_s_level=1.0, connected_nodes=1
+    )
+
+    def kernel(ops: _Columns, s_level: np.ndarray) -> _KernelOutput:
+        coherence = ops['Co_coherence']
+        valid = ~np.isnan(coherence) & ~np.isnan(s_level)
+        avg_resonance = (coherence + 0.5) / 2
+        multiplier = np.minimum(10.0, 1 + (avg_resonance ** network.COHERENCE_POWER) * 0.1)
+        return _KernelOutput({
+            "network_emergence": np.where(valid, reference.collective_breakthrough_prob, np.nan),
+            "network_field_strength": np.where(valid, reference.morphic_field_strength, np.nan),
+            "network_coherence_multiplier": np.where(valid, multiplier, np.nan),
+            "network_critical_mass": np.where(valid, reference.critical_mass_proximity, np.nan),
+        })
+
+    return kernel
+
+
+def _weighted_intensity(ops: _Columns, weights: Mapping[str, float]) -> np.ndarray:
+    """EmotionAnalyzer._calculate_emotion intensity, NaN if any operator is missing."""
+    aversion = ops['Av_aversion']
+    derived_aversion = np.where(np.isnan(aversion), ops['F_fear'] * 0.7 + ops['R_resistance'] * 0.3, aversion)
+    n = len(aversion)
+    weighted = np.zeros(n)
+    present = np.ones(n, dtype=bool)
+    total = 0.0
+    for name, weight in weights.items():
+        values = derived_aversion if name == 'Av_aversion' else ops[name]
+        abs_weight = abs(weight)
+        contribution = (1.0 - values) * abs_weight if weight < 0 else values * abs_weight
+        present &= ~np.isnan(values)
+        weighted += np.where(np.isnan(values), 0.0, contribution)
+        total += abs_weight
+    if total <= 0:
+        return np.full(n, np.nan)
+    return np.where(present, weighted / total, np.nan)
+
+
+def _kernel_emotions(engine: Any) -> Kernel:
+    """EmotionAnalyzer.analyze flattened values (dominant rasa, coherence), vectorized."""
+    analyzer = engine.emotion_analyzer
+    rasa_names = list(analyzer.RASAS)
+    conflict_pairs = (
+        ('rasas', 'hasya', 'bhayanaka'),
+        ('rasas', 'shanta', 'raudra'),
+        ('rasas', 'shringara', 'bibhatsa'),
+        ('secondary', 'hope', 'despair'),
+    )
+
+    def kernel(ops: _Columns, s_level: np.ndarray) -> _KernelOutput:
+        n = len(s_level)
+        rasas = {name: _weighted_intensity(ops, analyzer.RASAS[name]['operators']) for name in rasa_names}
+        tables = {'rasas': (analyzer.RASAS, rasas), 'secondary': (analyzer.SECONDARY_EMOTIONS, {})}
+
+        intensities = np.vstack([rasas[name] for name in rasa_names])
+        calculable = ~np.isnan(intensities)
+        has_dominant = calculable.any(axis=0)
+        dominant_index = np.where(calculable, intensities, -np.inf).argmax(axis=0)
+        dominant = np.full(n, None, dtype=object)
+        dominant[has_dominant] = np.array(rasa_names, dtype=object)[dominant_index[has_dominant]]
+
+        conflicts = np.zeros(n)
+        checked = np.zeros(n, dtype=int)
+        for table, first, second in conflict_pairs:
+            definitions, computed = tables[table]
+            if first not in definitions or second not in definitions:
+                continue
+            for name in (first, second):
+                if name not in computed:
+                    computed[name] = _weighted_intensity(ops, definitions[name]['operators'])
+            both = ~np.isnan(computed[first]) & ~np.isnan(computed[second])
+            conflicts += np.where(both, computed[first] * computed[second], 0.0)
+            checked += both
+
+        return _KernelOutput({
+            "emotion_dominant_rasa": dominant,
+            "emotion_emotional_coherence": np.where(checked > 0, np.maximum(0.0, 1.0 - conflicts), np.nan),
+            "emotion_calculable_rasas": calculable.sum(axis=0).astype(np.float64),
+        })
+
+    return kernel
+
+
+def _kernel_realism(engine: Any) -> Kernel:
+    """RealismEngine.calculate_realism_profile flattened values, vectorized."""
+    realism_engine = engine.realism_engine
+    names = list(realism_engine.REALISM_TYPES)
+    types = [realism_engine.REALISM_TYPES[name] for name in names]
+    category_order = list(realism_engine.CATEGORIES)
+    # First listed category per realism, as _calculate_realism_coherence reads it
+    category_index = np.array([
+        next((i for i, members in enumerate(realism_engine.CATEGORIES.values()) if name in members), -1)
+        for name in names
+    ])
+    max_s = np.array([realism.s_level_range[1] for realism in types])
+    # Evolution direction only depends on s_level through `s_level >= max_s`
+    beyond = np.array([realism_engine._determine_evolution_direction(m, name) for m, name in zip(max_s, names)], dtype=object)
+    deepening = np.array([realism_engine._determine_evolution_direction(m - 1.0, name) for m, name in zip(max_s, names)], dtype=object)
+
+    def kernel(ops: _Columns, s_level: np.ndarray) -> _KernelOutput:
+        n = len(s_level)
+        weights = np.empty((len(types), n))
+        for t, realism in enumerate(types):
+            min_s, top_s = realism.s_level_range
+            s_fit = np.where(
+                (s_level < min_s - 0.5) | (s_level > top_s + 0.5), 0.1,
+                np.where(
+                    (min_s <= s_level) & (s_level <= top_s), 1.0,
+                    np.where(
+                        s_level < min_s,
+                        0.5 + 0.5 * (s_level - (min_s - 0.5)) / 0.5,
+                        0.5 + 0.5 * ((top_s + 0.5) - s_level) / 0.5,
+                    )
+                )
+            )
+            match = np.zeros(n)
+            matched = np.zeros(n)
+            for name, expected in realism.operator_signature.items():
+                actual = ops[name]
+                present = ~np.isnan(actual)
+                match += np.where(present, 1 - np.abs(actual - expected), 0.0)
+                matched += present
+            with np.errstate(invalid="ignore", divide="ignore"):
+                weights[t] = np.where(matched > 0, s_fit * (match / matched), np.nan)
+
+        included = weights > 0.1
+        total = np.zeros(n)
+        for t in range(len(types)):
+            total += np.where(included[t], weights[t], 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            blend = np.where(included, weights / total, -np.inf)
+        has_dominant = included.any(axis=0) & ~np.isnan(s_level)
+        dominant_index = blend.argmax(axis=0)
+        columns = np.arange(n)
+
+        active = included & (blend > 0.05)
+        active_count = active.sum(axis=0)
+        category_present = np.vstack([
+            active[category_index == c].any(axis=0) for c in range(len(category_order))
+        ])
+        category_count = category_present.sum(axis=0)
+        first = category_present.argmax(axis=0)
+        last = len(category_order) - 1 - category_present[::-1].argmax(axis=0)
+        spread = last - first
+        coherence = np.where(
+            (active_count <= 1) | (category_count == 1), 1.0,
+            np.where(category_count == 0, np.nan,
+                     np.maximum(0.2, 1.0 - (spread / len(category_order)) * 0.7))
+        )
+
+        has_s = ~np.isnan(s_level)
+        dominant = np.full(n, None, dtype=object)
+        dominant[has_s] = "unknown"
+        dominant[has_dominant] = np.array(names, dtype=object)[dominant_index[has_dominant]]
+        direction = np.full(n, None, dtype=object)
+        direction[has_s] = "undefined"
+        at_top = s_level >= max_s[dominant_index]
+        direction[has_dominant] = np.where(
+            at_top, beyond[dominant_index], deepening[dominant_index]
+        )[has_dominant]
+        return _KernelOutput({
+            "realism_dominant": dominant,
+            "realism_dominant_weight": np.where(
+                has_dominant, blend[dominant_index, columns], np.where(has_s, 0.0, np.nan)
+            ),
+            "realism_coherence": np.where(has_s & (active_count > 0), coherence, np.nan),
+            "realism_evolution_direction": direction,
+        })
+
+    return kernel
+
+
+
+
+def _kernel_pathways(ops: _Columns, s_level: np.ndarray) -> _KernelOutput:
+    """PathwaysEngine.calculate_all_pathways flattened values, vectorized."""
+    w, m, p, psi = ops['W_witness'], ops['M_maya'], ops['P_presence'], ops['Psi_quality']
+    e, at, i, v = ops['E_equanimity'], ops['At_attachment'], ops['I_intention'], ops['V_void']
+    d, se, ce, hf = ops['D_dharma'], ops['Se_service'], ops['Ce_cleaning'], ops['Hf_habit']
+    valid = _present(w, m, p, psi, e, at, i, v, d, se, ce, hf)
+
+    # (observation, perception, expression), (intention, attention, manifestation),
+    # (thoughts, words, actions)
+    dimensions = (
+        (
+            w * (1 - m) * p,
+            w * psi * (1 - m * (1 - w)),
+            w * (e * (1 - at * 0.5)) * (psi * (1 - m)) * 0.8,
+        ),
+        (
+            i * ((1 - at * 0.7) * (1 - m * 0.5)) * (d * (1 - (1 - se) * 0.3)),
+            (p * psi) * p * (1 - (1 - p) * m),
+            (v * i * psi) * (1 - m) * ((1 - at * 0.5) * ce + 0.5) * 0.8,
+        ),
+        (
+            (psi * w * (1 - hf * 0.5)) * (1 - m) * ((1 - m) * w),
+            np.minimum(1.0, (e * (1 - at * 0.5) * psi) * ((1 - m) * d) * (w * p) * 1.2),
+            (se * (1 - at) * d) * d * ((1 - hf * 0.3) * p),
+        ),
+    )
+    scores = [_sum(values) / len(values) for values in dimensions]
+    alignments = [_alignment(values) for values in dimensions]
+    overall = _sum(scores) / len(scores)
+    return _KernelOutput({
+        "pathways_overall_perfection": _where(valid, overall),
+        "pathways_pathway_balance": _where(valid, _alignment(scores)),
+        "pathways_integration_score": _where(valid, (_sum(alignments) / len(alignments)) * overall),
+        "pathways_s_level": _where(valid, s_level),
+    })
+
+
+def _kernel_cascade(ops: _Columns, s_level: np.ndarray) -> _KernelOutput:
+    """CascadeCalculator.calculate_full_cascade flattened values, vectorized."""
+    w, a, ce, at, m = ops['W_witness'], ops['A_aware'], ops['Ce_cleaning'], ops['At_attachment'], ops['M_maya']
+    hf, sa, k, p, f = ops['Hf_habit'], ops['Sa_samskara'], ops['K_karma'], ops['P_presence'], ops['F_fear']
+    r, g = ops['R_resistance'], ops['G_grace']
+    n = len(s_level)
+
+    # Level cleanliness in CascadeCalculator.LEVELS order (Self .. Body)
+    cleanliness = [
+        w * (1 - m * 0.7) * np.sqrt(a),
+        (1 - at * 0.8) * (1 - at * m * 0.8) * (w ** 0.7),
+        ce * (1 - sa * 0.7) * (1 - k * 0.4),
+        a * (1 - m * 0.8) * np.sqrt(w),
+        (1 - hf * 0.7) * p * (1 - f * 0.4),
+        p * (1 - f * 0.6) * np.sqrt(ce),
+        ((ce + p + (1 - at * 0.5)) / 3) * (1 - (at * 0.3 + f * 0.3 + hf * 0.2)),
+    ]
+    flows = np.vstack([np.minimum(1.0, c * (1 - r * 0.6) * (1 + g * 0.3)) for c in cleanliness])
+    blockages = np.vstack([1.0 - c for c in cleanliness])
+    overall, calculable = _available_mean(cleanliness)
+    any_level = calculable > 0
+
+    has_flow = ~np.isnan(flows)
+    min_flow = np.where(has_flow, flows, np.inf).min(axis=0)
+    avg_flow, _ = _available_mean(list(flows))
+    flow_efficiency = _where(has_flow.any(axis=0), 0.7 * min_flow + 0.3 * avg_flow)
+
+    most = np.where(np.isnan(blockages), -np.inf, blockages).argmax(axis=0)
+    max_blockage = blockages[most, np.arange(n)]
+    levels = CascadeCalculator.LEVELS
+    names = np.array([level['name'] for level in levels], dtype=object)
+    urgent = np.array([f"Urgent: {level['name']} ({level['sanskrit']}) severely blocked" for level in levels], dtype=object)
+    priority = np.array([f"Priority: {level['name']} - most significant blockage" for level in levels], dtype=object)
+    upper = (blockages[:3] > 0.4).any(axis=0)
+    lower = (blockages[4:] > 0.4).any(axis=0)
+
+    primary = np.where(max_blockage > 0.3, names[most], "None significant").astype(object)
+    primary[~any_level] = "Cannot determine - insufficient data"
+    cleaning = priority[most]
+    for mask, text in (
+        (upper & ~lower, "Focus on subtle levels (Self, Ego, Memory) - root causes"),
+        (lower & ~upper, "Focus on gross levels (Mind, Breath, Body) - symptoms"),
+    ):
+        cleaning[mask] = text
+    cleaning[max_blockage > 0.6] = urgent[most][max_blockage > 0.6]
+    cleaning[max_blockage < 0.2] = "Maintenance only - cascade relatively clean"
+    cleaning[~any_level] = "Cannot determine priority - insufficient operator data"
+
+    return _KernelOutput(
+        {
+            "cascade_overall_cleanliness": overall,
+            "cascade_primary_blockage": primary,
+            "cascade_flow_efficiency": flow_efficiency,
+            "cascade_cleaning_priority": cleaning,
+            "cascade_calculable_levels": calculable.astype(np.float64),
+        },
+        summary=_sum([np.where(np.isnan(c), 0.0, c) for c in cleanliness]) / len(cleanliness),
+    )
+
+
+def _kernel_death(ops: _Columns, s_level: np.ndarray) -> _KernelOutput:
+    """DeathEngine.calculate_death_profile flattened values, vectorized."""
+    at, se, as_, w = ops['At_attachment'], ops['Se_service'], ops['As_asmita'], ops['W_witness']
+    ab, v, p, g = ops['Ab_abhinivesha'], ops['V_void'], ops['P_presence'], ops['G_grace']
+    m, e, psi, bn = ops['M_maya'], ops['E_equanimity'], ops['Psi_quality'], ops['BN_belief']
+    ra, dv = ops['Ra_raga'], ops['Dv_dvesha']
+    valid = _present(g, w, at, psi)
+
+    ego = at * (1 - se) * as_ * (1 - w)
+    s_factor = np.maximum(0, s_level - 6) / 2
+    # (level, required operators, intensity) per DeathEngine.calculate_d1 .. d7
+    deaths = (
+        (1, _present(ab, v, p, g, at, m, w), (ab * (1 - m) + (1 - v) * (1 - p) + (1 - v) * ab) / 3),
+        (2, _present(at, se, e, w, g, as_), (at * (1 - se) + ego * 0.8 + (1 - e) * at) / 3),
+        (3, _present(at, as_, w, m, g, se),
+         np.minimum(1.0, ego * (at * as_) * ((1 - as_) * w) * (1 - w * (1 - m)) * 4)),
+        (4, _present(m, w, psi, at, g, bn), ((1 - m) * w + bn * (1 - psi) + w * (1 - m)) / 3),
+        (5, _present(at, ra, dv, w, g, p), ((1 - at) * w + (1 - ra) * w + (1 - dv) * w) / 3),
+        (6, _present(at, m, w, psi, g, se, as_), ((1 - ego) * w + (1 - m) * psi + se * (1 - at) * w) / 3),
+        (7, _present(at, as_, w, psi, g, m, se),
+         np.minimum(1.0, ((1 - ego) * w) * (1 - as_) * (w * psi * (1 - m)) * s_factor * 3)),
+    )
+    intensities = [_where(computed, intensity) for _, computed, intensity in deaths]
+    readiness = [
+        _where(computed, np.where(s_level < level, 0.0, np.where(s_level < level + 1, s_level - level, 1.0)))
+        for level, computed, _ in deaths
+    ]
+    intensity, count = _available_mean(intensities)
+    death_readiness, _ = _available_mean(readiness)
+
+    return _KernelOutput(
+        {
+            "death_overall_transformation_intensity": _where(valid, intensity),
+            "death_death_readiness": _where(valid, death_readiness),
+            "death_grace_support": _where(valid, g),
+            "death_rebirth_potential": _where(valid, w * (1 - at) * psi * g),
+            "death_s_level": _where(valid, s_level),
+        },
+        # Averaging an empty list of deaths raises in the scalar engine
+        fallback=valid & (count == 0),
+    )
+
+
+def _kernel_circles(ops: _Columns, s_level: np.ndarray) -> _KernelOutput:
+    """CirclesEngine.calculate_circles_profile flattened values, vectorized."""
+    p, at, se, w = ops['P_presence'], ops['At_attachment'], ops['Se_service'], ops['W_witness']
+    e, d, m, i = ops['E_equanimity'], ops['D_dharma'], ops['M_maya'], ops['I_intention']
+    valid = _present(p, at, se, w, e, d, m, i, ops['Hf_habit']) & (s_level > 4)
+
+    radius = {
+        CircleType.PERSONAL: p * w * (1 - at * 0.3),
+        CircleType.FAMILY: e * (1 - at * 0.2),
+        CircleType.SOCIAL: se * (1 - at * 0.3),
+        CircleType.PROFESSIONAL: d * i,
+        CircleType.UNIVERSAL: se * (1 - at) * ((s_level - 4) / 4),
+    }
+    radii = [radius[circle] for circle in CircleType]
+    mean = _sum(radii) / len(radii)
+    balance = 1 - np.sqrt(_sum([(r - mean) ** 2 for r in radii]) / len(radii))
+
+    return _KernelOutput(
+        {
+            "circles_overall_balance": _where(valid, balance),
+            "circles_center_integration": _where(valid, (w * (1 - m)) * balance),
+            "circles_s_level": _where(valid, s_level),
+        },
+        summary=_where(valid, balance),
+    )
+
+
+def _kernel_osafc(ops: _Columns, s_level: np.ndarray) -> _KernelOutput:
+    """OSAFCEngine.calculate_osafc_profile flattened values, vectorized."""
+    p, w, e, at = ops['P_presence'], ops['W_witness'], ops['E_equanimity'], ops['At_attachment']
+    m, ce, d, i = ops['M_maya'], ops['Ce_cleaning'], ops['D_dharma'], ops['I_intention']
+    valid = _present(p, w, e, at, m, ce, d, i)
+    s = s_level
+
+    def s_factor(layer: OSAFCLayer) -> np.ndarray:
+        return np.minimum(1.0, np.maximum(0.1, (s - OSAFC_DEFINITIONS[layer]["min_s"] + 1) / 2))
+
+    s_access = np.maximum(0, (s - 6) / 2)
+    # Per-layer values OSAFCEngine.calculate_layer produces that the profile reads
+    layers = {
+        OSAFCLayer.PHYSICAL: {"integration": ce * p, "dominance": (1 - s / 8) * 0.5 + 0.3},
+        OSAFCLayer.ENERGETIC: {
+            "activation": p * 0.7 + 0.2,
+            "integration": p * 0.6 + ce * 0.4,
+            "dominance": np.where(s < 4, 0.4, 0.3),
+        },
+        OSAFCLayer.EMOTIONAL: {"integration": e * 0.5 + w * 0.5, "dominance": np.where(s < 4.5, 0.5, 0.3 * e)},
+        OSAFCLayer.MENTAL: {"integration": d * 0.6 + i * 0.4, "dominance": np.where(s < 5, 0.6, 0.4)},
+        OSAFCLayer.INTELLECT: {
+            "refinement": d * w * (1 - m * 0.3),
+            "integration": d * 0.5 + w * 0.5,
+            "dominance": np.where(s >= 4.5, 0.3 + d * 0.2, 0.2),
+        },
+        OSAFCLayer.EGO: {"integration": ce * 0.5 + (1 - at) * 0.5, "dominance": at * 0.4 + (1 - w) * 0.3},
+        OSAFCLayer.WITNESS: {
+            "activation": w * s_factor(OSAFCLayer.WITNESS),
+            "refinement": w * (1 - at) * (1 - m * 0.5),
+            "integration": w * 0.6 + p * 0.4,
+            "dominance": np.where(s >= 5.5, w * 0.5, w * 0.2),
+        },
+        OSAFCLayer.SOURCE: {
+            "activation": s_access * (1 - at) * (1 - m),
+            "integration": s_access * w * (1 - at),
+            "dominance": s_access * 0.3,
+        },
+    }
+    ordered = [layers[layer] for layer in OSAFCLayer]
+    total_weight = _sum([layers[layer]["dominance"] * OSAFC_DEFINITIONS[layer]["level"] for layer in OSAFCLayer])
+    total_dominance = _sum([layer["dominance"] for layer in ordered])
+    center = np.where(total_dominance > 0, np.round(total_weight / total_dominance), 4)
+    integration = _sum([layer["integration"] for layer in ordered]) / len(ordered)
+    witness = layers[OSAFCLayer.WITNESS]
+
+    return _KernelOutput(
+        {
+            "osafc_center_of_gravity": _where(valid, center),
+            "osafc_integration_score": _where(valid, integration),
+            "osafc_ascent_capability": _where(valid, witness["activation"] * layers[OSAFCLayer.INTELLECT]["refinement"]),
+            "osafc_descent_capability": _where(
+                valid, layers[OSAFCLayer.PHYSICAL]["integration"] * layers[OSAFCLayer.ENERGETIC]["activation"]
+            ),
+            "osafc_witness_stability": _where(valid, witness["refinement"] * witness["integration"]),
+            "osafc_source_access": _where(valid, layers[OSAFCLayer.SOURCE]["activation"]),
+            "osafc_s_level": _where(valid, s_level),
+        },
+        summary=_where(valid, integration),
+    )
+
+
+def _kernel_distortions(ops: _Columns, s_level: np.ndarray) -> _KernelOutput:
+    """DistortionEngine.calculate_distortion_profile flattened values, vectorized."""
+    m, w, at, p = ops['M_maya'], ops['W_witness'], ops['At_attachment'], ops['P_presence']
+    e = ops['E_equanimity']
+    valid = _present(m, w, at, p, e, ops['Se_service'])
+
+    s_maya = np.maximum(0.2, 1 - (s_level - 4) / 8)
+    avarana = m * s_maya * (1 - w * 0.5)
+    vikshepa = e * at * s_maya * (1 - p * 0.3)
+    total_maya = (avarana * 0.6 + vikshepa * 0.4) * s_maya
+    s_klesha = np.maximum(0.1, 1 - (s_level - 4) / 6)
+    # avidya, asmita, raga, dvesha, abhinivesha
+    kleshas = [
+        m * s_klesha * (1 - w * 0.6),
+        at * (1 - w * 0.5) * s_klesha,
+        at * e * s_klesha,
+        e * (1 - e * 0.3) * s_klesha * 0.8,
+        at * (1 - p * 0.4) * s_klesha,
+    ]
+    total = total_maya * _sum(kleshas) / (1 + w)
+    liberation = 1 - total / 5
+
+    return _KernelOutput(
+        {
+            "distortion_total_distortion": _where(valid, total),
+            "distortion_liberation_index": _where(valid, liberation),
+            "distortion_s_level": _where(valid, s_level),
+        },
+        summary=_where(valid, liberation),
+    )
+
+
+def _kernel_panchakritya(ops: _Columns, s_level: np.ndarray) -> _KernelOutput:
+    """PanchakrityaEngine.calculate_panchakritya_profile flattened values, vectorized."""
+    i, p, w, at = ops['I_intention'], ops['P_presence'], ops['W_witness'], ops['At_attachment']
+    m, d, se = ops['M_maya'], ops['D_dharma'], ops['Se_service']
+    valid = _present(i, p, w, at, m, ops['E_equanimity'], d, se)
+
+    srishti = i * se * (1 - at * 0.3)
+    sthiti = d * p * (1 - m * 0.2)
+    samhara = w * (1 - at) * np.where(s_level > 3, (s_level - 3) / 5, 0.2)
+    alignment = w * 0.4 + se * 0.3 + (1 - at) * 0.3
+    resistance = at * 0.5 + m * 0.3
+    grace = alignment * (1 - resistance)
+
+    phase = _text(len(s_level), (
+        ((srishti > sthiti) & (srishti > samhara), "Creation ascending"),
+        ((sthiti > srishti) & (sthiti > samhara), "Maintenance/stability"),
+        ((samhara > srishti) & (samhara > sthiti), "Dissolution/transformation"),
+    ), default="Dynamic equilibrium")
+    phase[~valid] = None
+
+    return _KernelOutput(
+        {
+            "panchakritya_cycle_phase": phase,
+            "panchakritya_grace_receptivity": _where(valid, grace),
+            "panchakritya_creative_flow": _where(valid, (srishti + samhara) / 2 * (1 - np.abs(srishti - samhara))),
+            "panchakritya_s_level": _where(valid, s_level),
+        },
+        summary=_where(valid, grace),
+    )
+
+
+def _kernel_multi_reality(ops: _Columns, s_level: np.ndarray) -> _KernelOutput:
+    """calculate_full_multi_reality_state for a single participant, vectorized."""
+    ce, at, p = ops['Ce_cleaning'], ops['At_attachment'], ops['P_presence']
+    valid = _present(ce, at, p)
+
+    x = s_level / 8.0
+    overlap = np.minimum(1.0, ce * x * 0.5 / 1)
+    weight = x ** x
+    stability = overlap / np.maximum(0.1, 1.0 - overlap)
+
+    return _KernelOutput(
+        {
+            "multi_reality_overlap_coefficient": _where(valid, overlap),
+            "multi_reality_consensus_reality": _where(valid, x * weight / weight),
+            "multi_reality_morphic_resonance": _where(valid, p * overlap * x),
+            "multi_reality_transmission_rate": _where(valid, overlap * x),
+            "multi_reality_stability": _where(valid, stability),
+        },
+        # psi_power is undefined for s <= 0 and total coherence for At >= 1;
+        # the scalar engine raises on both
+        fallback=valid & ((s_level <= 0) | (at >= 1)),
+    )
+
+
+def _kernel_dynamics(ops: _Columns, s_level: np.ndarray) -> _KernelOutput:
+    """Grace, karma and momentum values of the dynamics module, vectorized."""
+    g, s, ce, at = ops['G_grace'], ops['S_surrender'], ops['Ce_cleaning'], ops['At_attachment']
+    r, se, d, p = ops['R_resistance'], ops['Se_service'], ops['D_dharma'], ops['P_presence']
+    k, a, hf, i = ops['K_karma'], ops['A_aware'], ops['Hf_habit'], ops['I_intention']
+    sh, co = ops['Sh_shakti'], ops['Co_coherence']
+    grace_valid = _present(g, s, ce, at, r, se, d, p)
+    karma_valid = _present(k, at, a, ce, g, hf, i)
+    both = grace_valid & karma_valid
+
+    readiness = (ce + p + se) / 3
+    availability = np.minimum(1.0, g * s * (1 - at * 0.4) * readiness)
+    multiplication = 1.0 + (g * s * d * 3)
+    prarabdha = np.minimum(1.0, k * ((at + hf) / 2))
+    kriyamana = (i * (at + 0.2)) * (1 + hf * 0.5) * (1 - a * 0.7)
+    burn = ce * g * a
+    karma_factor = prarabdha * (1 - np.minimum(1.0, g * (1 - at * 0.5) * ce))
+    ratio = np.where(
+        karma_factor < 0.01, 10.0,
+        np.minimum(10.0, (availability * multiplication) / np.maximum(0.1, karma_factor))
+    )
+    momentum = np.minimum(1.0, i * sh * co * (1 + (multiplication - 1.0)) * (1 - karma_factor * 0.3))
+
+    return _KernelOutput({
+        "grace_availability": _where(grace_valid, availability),
+        "grace_effectiveness": _where(grace_valid, np.minimum(1.0, g * (1 - r * 0.5) * ce * readiness)),
+        "karma_burn_rate": _where(karma_valid, np.minimum(1.0, burn)),
+        "karma_net_change": _where(karma_valid, kriyamana - burn),
+        "grace_karma_ratio": _where(both, ratio),
+        "transformation_momentum": _where(both & _present(i, sh, co), momentum),
+    })
+
+
+def _kernel_quantum(engine: Any) -> Kernel:
+    """QuantumMechanics coherence, tunneling, entanglement and collapse, vectorized."""
+    quantum = engine.quantum_engine
+    enhancers = list(quantum.TUNNELING_ENHANCERS)
+    inhibitors = list(quantum.TUNNELING_INHIBITORS)
+
+    def kernel(ops: _Columns, s_level: np.ndarray) -> _KernelOutput:
+        w, p, co, a = ops['W_witness'], ops['P_presence'], ops['Co_coherence'], ops['A_aware']
+        at, f, hf, i = ops['At_attachment'], ops['F_fear'], ops['Hf_habit'], ops['I_intention']
+        enhancement = w * 0.3 + p * 0.25 + co * 0.25 + a * 0.2
+        decoherence = at * 0.2 + f * 0.15 + hf * 0.15
+        enhance = _sum([ops[name] for name in enhancers]) / len(enhancers)
+        inhibit = _sum([ops[name] for name in inhibitors]) / len(inhibitors)
+        # Missing inputs propagate as NaN, matching each method's None
+        return _KernelOutput({
+            "quantum_coherence_time": 1.0 * (1 + enhancement) * (1 - decoherence) * (1 + (s_level - 3) * 0.2),
+            "quantum_tunneling": enhance * (1 - inhibit * 0.5),
+            "quantum_entanglement": (
+                (co * 0.35 + ops['Se_service'] * 0.25 + ops['G_grace'] * 0.25 + ops['O_openness'] * 0.15)
+                * (1 - at * 0.3)
+            ),
+            "quantum_collapse_readiness": i * 0.35 + w * 0.3 + ops['Sh_shakti'] * 0.2 + p * 0.15,
+        })
+
+    return kernel
+
+
+def _kernel_hierarchical(engine: Any) -> Kernel:
+    """Hierarchical module: operator-independent, so flatten its profile once."""
+    node = next(node for node in MODULE_NODES if node.name == "hierarchical")
+    profile = engine.assemble_profile({}, None, {node.output: node.compute(engine, {}, None)}, [node.name], [])
+    reference = {
+        key: value for key, value in engine._flatten_profile(profile, {}).items()
+        if key.startswith("hierarchical_")
+    }
+
+    def kernel(ops: _Columns, s_level: np.ndarray) -> _KernelOutput:
+        n = len(s_level)
+        return _KernelOutput({
+            key: np.full(n, value, dtype=object if isinstance(value, str) else np.float64)
+            for key, value in reference.items()
+        })
+
+    return kernel
+
+
+def _kernel_matrices(ops: _Columns, s_level: np.ndarray) -> _KernelOutput:
+    """
+    MatricesEngine.calculate_all_matrices: fallback rows only.
+
+    The freedom and time matrices need KL_klesha and T_temporal, which are
+    not canonical operators, so the profile is never produced from operator
+    columns. The other matrices still run first and raise when all four raw
+    state scores are zero (no dominant position to format).
+    """
+    at, se, as_, w = ops['At_attachment'], ops['Se_service'], ops['As_asmita'], ops['W_witness']
+    m, psi, ab, e = ops['M_maya'], ops['Psi_quality'], ops['Ab_abhinivesha'], ops['E_equanimity']
+    i, d, v, hf = ops['I_intention'], ops['D_dharma'], ops['V_void'], ops['Hf_habit']
+    ce, g, ss = ops['Ce_cleaning'], ops['G_grace'], ops['Ss_struct']
+    s = s_level
+    ego = at * (1 - se) * as_ * (1 - w)
+    clarity = (1 - m) * w
+    separation = at * (1 - se) * ((at + as_) / 2) * ab
+    blame = (1 - w) * at
+    mastery = (ce * (1 - hf)) * ((1 - ab) * i) * (d * se)
+    clinging = at * ab * (1 - w)
+
+    # (required operators, raw state scores) for truth, love, power, creation, death
+    matrices = (
+        (_present(m, w, at, psi), (
+            m * (1 - w) * (1 - psi * 0.5),
+            (m * psi * 0.5) * (1 - clarity),
+            (1 - m) * w * psi * 0.5 * (1 - (1 - m) * w * psi * (s / 8)),
+            (1 - m) * w * psi * s / 8,
+        )),
+        (_present(at, se, w, m, psi, as_, ab, e), (
+            separation,
+            (1 - separation) * ((1 - at) * e) * ((1 - ego) * se) * 0.5,
+            se * (1 - at) * ((1 - at) * se * (1 - ego)),
+            (1 - m * (1 - w * psi)) * psi * (np.maximum(0, s - 6) / 2),
+        )),
+        (_present(at, se, m, i, w, d, v, hf, ce, ab, as_), (
+            ((1 - m) * (1 - i)) * ((1 - i) * (1 - v)) * blame,
+            (m * i) * (1 - blame) * ((1 - hf) * w) * 0.5,
+            mastery,
+            se * mastery * (1 - at * as_),
+        )),
+        (_present(m, i, psi, g, at, ce, ss, v), (
+            ((1 - at) * ce) * (1 - m) * 0.5,
+            at * (1 - i * 0.5) * ss,
+            (i * psi * v) * (1 - at * 0.5),
+            g * psi * (np.maximum(0, s - 5) / 3) * (1 - m),
+        )),
+        (_present(at, ab, w, g, psi, e), (
+            clinging,
+            w * e * (1 - ab * 0.5) * (1 - clinging),
+            (1 - at) * (1 - ab) * g * 0.5,
+            ((1 - at) * (1 - ab) * psi) * (s / 8),
+        )),
+    )
+    fallback = np.zeros(len(s), dtype=bool)
+    for computed, scores in matrices:
+        fallback |= computed & (_sum(list(scores)) == 0)
+    return _KernelOutput({}, fallback=fallback)
+
+
+def _kernel_empty(ops: _Columns, s_level: np.ndarray) -> _KernelOutput:
+    """Module that contributes no flattened values (see module docstring)."""
+    return _KernelOutput({})
+
+
+# Kernels that need the engine's component instances are built per call
+_KERNELS: Dict[str, Kernel] = {
+    "operators": _kernel_operators,
+    "drives": _kernel_empty,
+    "matrices": _kernel_matrices,
+    "pathways": _kernel_pathways,
+    "cascade": _kernel_cascade,
+    "death": _kernel_death,
+    "collective": _kernel_empty,
+    "circles": _kernel_circles,
+    "kosha": _kernel_empty,
+    "osafc": _kernel_osafc,
+    "distortions": _kernel_distortions,
+    "panchakritya": _kernel_panchakritya,
+    "advanced_math": _kernel_empty,
+    "platform": _kernel_empty,
+    "multi_reality": _kernel_multi_reality,
+    "timeline": _kernel_empty,
+    "dynamics": _kernel_dynamics,
+    "unity": _kernel_unity,
+}
+
+_KERNEL_FACTORIES: Dict[str, Callable[[Any], Kernel]] = {
+    "emotions": _kernel_emotions,
+    "hierarchical": _kernel_hierarchical,
+    "network": _kernel_network,
+    "quantum": _kernel_quantum,
+    "realism": _kernel_realism,
+}
+
+
+def _vectorized_kernels(engine: Any, modules: Sequence[str]) -> Dict[str, Kernel]:
+    """Kernels for the requested modules, in request order (unknown names skipped)."""
+    kernels: Dict[str, Kernel] = {}
+    for name in modules:
+        if name in _KERNELS:
+            kernels[name] = _KERNELS[name]
+        elif name in _KERNEL_FACTORIES:
+            kernels[name] = _KERNEL_FACTORIES[name](engine)
+    return kernels
+
+
+def _summary_columns(
+    summaries: Dict[str, np.ndarray],
+    result: Dict[str, np.ndarray],
+    n: int
+) -> Dict[str, np.ndarray]:
+    """OOFInferenceEngine._calculate_summary_metrics, vectorized."""
+    metrics = [(name, summaries[module]) for module, name in _SUMMARY_SOURCES if module in summaries]
+    total = np.zeros(n)
+    count = np.zeros(n, dtype=int)
+    lib_sum = np.zeros(n)
+    lib_weight = np.zeros(n)
+    for name, values in metrics:
+        present = ~np.isnan(values)
+        total += np.where(present, values, 0.0)
+        count += present
+        if name in LIBERATION_WEIGHTS:
+            lib_sum += np.where(present, values * LIBERATION_WEIGHTS[name], 0.0)
+            lib_weight += np.where(present, LIBERATION_WEIGHTS[name], 0.0)
+
+    computed = count > 0
+    overall = total / np.maximum(count, 1)
+    variance = np.zeros(n)
+    for _, values in metrics:
+        variance += np.where(np.isnan(values), 0.0, (values - overall) ** 2)
+    variance = variance / np.maximum(count, 1)
+    liberation = np.where(lib_weight > 0, lib_sum / np.where(lib_weight > 0, lib_weight, 1.0), 0.0)
+
+    missing = np.full(n, np.nan)
+    creative = result.get("panchakritya_creative_flow", missing)
+    has_death = ~np.isnan(result.get("death_grace_support", missing))
+    transformation = np.where(
+        ~np.isnan(creative) & has_death,
+        creative * 0.4 + result.get("death_death_readiness", missing) * 0.3 + liberation * 0.3,
+        liberation
+    )
+    return {
+        "overall_health": _where(computed, overall),
+        "liberation_index": _where(computed, liberation),
+        "integration_score": _where(computed, np.where(count > 1, 1 - np.sqrt(variance), 0.0)),
+        "transformation_potential": _where(computed, transformation),
+    }
+
+
+# =============================================================================
+# SCALAR FALLBACK
+# =============================================================================
+
+def _to_column(values: List[Any]) -> np.ndarray:
+    """Numeric values -> float64 (NaN for None); anything else -> object."""
+    if all(v is None or (isinstance(v, (int, float)) and not isinstance(v, bool)) for v in values):
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
+
+
+def _scalar_rows(
+    engine: Any,
+    matrix: np.ndarray,
+    s_level: np.ndarray,
+    columns: Sequence[str],
+    modules: List[str]
+) -> List[Dict[str, Any]]:
+    """Flattened scalar profiles for the given rows, computed once per unique row."""
+    keys = np.column_stack([
+        np.isnan(matrix), np.nan_to_num(matrix, nan=0.0),
+        np.isnan(s_level), np.nan_to_num(s_level, nan=0.0),
+    ])
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    logger.debug(f"[_scalar_rows] rows={len(keys)} unique={len(first)} modules={len(modules)}")
+
+    unique_values: List[Dict[str, Any]] = []
+    for row in first:
+        operators = {name: float(v) for name, v in zip(columns, matrix[row]) if not np.isnan(v)}
+        s = None if np.isnan(s_level[row]) else float(s_level[row])
+        try:
+            profile = engine.calculate_full_profile(operators, s, include_modules=modules)
+        except Exception as e:
+            # One bad historical row must not abort a re-scoring run
+            logger.warning(f"[_scalar_rows] row failed ({type(e).__name__}): {e}")
+            unique_values.append({"_error": f"{type(e).__name__}: {e}"})
+            continue
+        unique_values.append(engine._flatten_profile(profile, {}))
+    return [unique_values[i] for i in inverse]
+
+
+def _as_object(column: np.ndarray) -> np.ndarray:
+    """Copy of a column as an object array (None for NaN)."""
+    if column.dtype == object:
+        return column.copy()
+    converted = np.empty(len(column), dtype=object)
+    converted[:] = [None if np.isnan(v) else float(v) for v in column]
+    return converted
+
+
+def _scatter(result: Dict[str, np.ndarray], rows: np.ndarray, values: List[Dict[str, Any]], n: int) -> None:
+    """Overwrite `rows` of every column with the scalar values (missing key = None)."""
+    keys: Dict[str, None] = dict.fromkeys(result)
+    for row_values in values:
+        keys.update(dict.fromkeys(row_values))
+
+    for key in keys:
+        update = _to_column([row_values.get(key) for row_values in values])
+        column = result.get(key)
+        if column is None:
+            column = np.full(n, None, dtype=object) if update.dtype == object else np.full(n, np.nan)
+        if column.dtype == update.dtype:
+            column = column.copy()
+        else:
+            column, update = _as_object(column), _as_object(update)
+        column[rows] = update
+        result[key] = column
+
+
+# =============================================================================
+# BATCH ENTRY POINT
+# =============================================================================
+
+def calculate_profiles_batch(
+    engine: Any,
+    operator_matrix: np.ndarray,
+    s_levels: Union[float, None, Sequence[Optional[float]], np.ndarray],
+    columns: Sequence[str] = OPERATOR_COLUMNS,
+    include_modules: Optional[Sequence[str]] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Compute flattened profiles for N operator vectors.
+
+    Every module runs as a vectorized kernel over all rows. Rows a kernel
+    cannot reproduce (the scalar engine raises, or an operator lies outside
+    [0, 1]) are recomputed through calculate_full_profile once per unique
+    row; a row whose scalar evaluation raises gets the exception text in
+    `_error` and no other values.
+
+    Args:
+        engine: OOFInferenceEngine providing the component engines
+        operator_matrix: N x K array, column j holds operator `columns[j]`
+        s_levels: length-N vector (or a scalar applied to every row)
+        columns: Canonical operator names for the matrix columns
+        include_modules: Optional list of modules (default: all modules)
+
+    Returns:
+        Dict of flattened value name -> length-N column
+    """
+    matrix = np.asarray(operator_matrix, dtype=np.float64)
+    if matrix.ndim != 2 or matrix.shape[1] != len(columns):
+        raise ValueError(f"operator_matrix must have shape (N, {len(columns)}), got {matrix.shape}")
+    unknown = [name for name in columns if name not in CANONICAL_OPERATOR_NAMES]
+    if unknown:
+        raise ValueError(f"Unknown operator columns: {unknown}")
+
+    n = matrix.shape[0]
+    s_level = _as_s_levels(s_levels, n)
+    modules = list(include_modules) if include_modules is not None else list(DEFAULT_MODULES)
+    logger.info(f"[calculate_profiles_batch] entry: rows={n} columns={len(columns)} modules={len(modules)}")
+
+    result: Dict[str, np.ndarray] = {}
+    if n == 0:
+        return result
+
+    ops = _Columns(matrix, columns)
+    has_s = ~np.isnan(s_level)
+    # Kernels assume operators in [0, 1]; anything else takes the scalar path
+    fallback = np.any((matrix < 0) | (matrix > 1), axis=1)
+    summaries: Dict[str, np.ndarray] = {}
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        for name, kernel in _vectorized_kernels(engine, modules).items():
+            output = kernel(ops, s_level)
+            gated = name in _REQUIRES_S_LEVEL
+            for key, column in output.columns.items():
+                if gated:
+                    column = np.where(has_s, column, None if column.dtype == object else np.nan).astype(column.dtype)
+                result[key] = column
+            if output.summary is not None:
+                summaries[name] = _where(has_s, output.summary) if gated else output.summary
+            if output.fallback is not None:
+                fallback |= (output.fallback & has_s) if gated else output.fallback
+        result.update(_summary_columns(summaries, result, n))
+
+    if fallback.any():
+        rows = np.flatnonzero(fallback)
+        _scatter(result, rows, _scalar_rows(engine, matrix[rows], s_level[rows], columns, modules), n)
+
+    logger.info(
+        f"[calculate_profiles_batch] result: rows={n} columns={len(result)} scalar_rows={int(fallback.sum())}"
+    )
+    return result
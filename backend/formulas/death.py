@@ -25,6 +25,7 @@ from typing import Dict, Optional, Any
 from enum import Enum
 
 from logging_config import get_logger
+from .intermediates import shared_intermediate
 logger = get_logger('formulas.death')
 
 
@@ -173,6 +174,7 @@ class DeathEngine:
     def __init__(self):
         self.definitions = DEATH_DEFINITIONS
 
+    @shared_intermediate("ego_separation")
     def _calculate_ego_separation(self, ops: Dict[str, float]) -> Optional[float]:
         """Calculate ego separation factor."""
         at = ops.get("At_attachment")
@@ -23,6 +23,7 @@ from typing import Dict, List, Any, Optional
 from enum import Enum
 
 from logging_config import get_logger
+from .intermediates import shared_intermediate
 logger = get_logger('formulas.drives')
 
 
@@ -340,6 +341,7 @@ class DrivesEngine:
     def __init__(self):
         self.components = ALL_DRIVE_COMPONENTS
 
+    @shared_intermediate("ego_separation")
     def _calculate_ego_separation(self, ops: Dict[str, float]) -> float:
         """Calculate ego separation factor."""
         at = ops.get("At_attachment")
@@ -0,0 +1,378 @@
+"""
+OOF Framework - Incremental Re-inference
+========================================
+
+A constellation answer usually moves only a handful of operators, yet a
+full run_inference recomputes every module. This module records, during a
+run, which operators every shared intermediate and every module actually
+read, and on the next turn recomputes only the modules whose reads overlap
+the changed operators.
+
+Dependencies are traced dynamically rather than declared: engines receive
+a TracingSnapshot that logs every key lookup. A module whose control flow
+depends on an operator necessarily read it, so the recorded read set is a
+sound dependency set for the run that produced it, and it is re-recorded
+whenever the module is recomputed. Reads that depend on the whole mapping
+(items(), values(), copy()) mark the module as depending on ALL operators;
+iteration over keys only marks it as depending on the key set.
+
+A changed S-level triggers a full traced run.
+
+Formula: Profile' = Profile - stale(Δoperators) + recompute(stale)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from logging_config import inference_logger
+from .intermediates import OperatorSnapshot
+from .module_graph import DEFAULT_MODULES, NOT_COMPUTED, ExecutionPlan
+
+
+# Read markers
+ALL_KEYS = "*"      # value of every key was (or may have been) read
+KEY_SET = "#keys"   # only the set of present keys was observed
+
+
+class _ReadTracking:
+    """Mixin for dict subclasses that records the keys looked up in `reads`."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        self.reads.add(key)
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        self.reads.add(key)
+        return dict.get(self, key, default)
+
+    def __contains__(self, key):
+        self.reads.add(key)
+        return dict.__contains__(self, key)
+
+    def __iter__(self):
+        self.reads.add(KEY_SET)
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self.reads.add(KEY_SET)
+        return dict.__len__(self)
+
+    def keys(self):
+        self.reads.add(KEY_SET)
+        return dict.keys(self)
+
+    def items(self):
+        self.reads.add(ALL_KEYS)
+        return dict.items(self)
+
+    def values(self):
+        self.reads.add(ALL_KEYS)
+        return dict.values(self)
+
+    def copy(self):
+        # Reads on the (plain) copy are invisible, so assume all were read
+        self.reads.add(ALL_KEYS)
+        return dict.copy(self)
+
+
+class TracingDict(_ReadTracking, dict):
+    """Plain dict that records which keys were read."""
+
+    __slots__ = ("reads",)
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        self.reads: Set[str] = set()
+        super().__init__(data or {})
+
+
+class TracingSnapshot(_ReadTracking, OperatorSnapshot):
+    """OperatorSnapshot that records operator reads and intermediate reads."""
+
+    __slots__ = ("reads",)
+
+    def __init__(self, operators: Dict[str, Any], intermediates: Dict[str, Optional[float]]):
+        super().__init__(operators, TracingDict(intermediates))
+        self.reads: Set[str] = set()
+
+
+def is_stale(reads: FrozenSet[str], changed: Set[str], key_set_changed: bool) -> bool:
+    """True if a node with recorded `reads` must be recomputed for `changed`."""
+    if not changed:
+        return False
+    if ALL_KEYS in reads or (key_set_changed and KEY_SET in reads):
+        return True
+    return not reads.isdisjoint(changed)
+
+
+@dataclass
+class InferenceTrace:
+    """One traced inference run, reusable as the base of an incremental update."""
+    operators: Dict[str, float]
+    s_level: Optional[float]
+    plan: ExecutionPlan
+    intermediate_values: Dict[str, Optional[float]]
+    # Operator reads, transitively including the reads of consumed intermediates
+    intermediate_reads: Dict[str, FrozenSet[str]]
+    module_outputs: Dict[str, Any]
+    module_reads: Dict[str, FrozenSet[str]]
+    result: dict
+    recomputed: Tuple[str, ...] = ()
+    elapsed_ms: float = 0.0
+    # Duration of each module computed by this run (seconds)
+    module_seconds: Dict[str, float] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+
+    def value_dependencies(self) -> Dict[str, FrozenSet[str]]:
+        """Operators each flattened value depends on, via its producing module."""
+        deps: Dict[str, FrozenSet[str]] = {}
+        for key in self.result.get("values", {}):
+            module = module_for_value(key)
+            deps[key] = self.module_reads.get(module, frozenset({ALL_KEYS}))
+        return deps
+
+
+# Flattened value prefix -> producing module (summary values depend on all)
+_PREFIX_TO_MODULE = {
+    "op": "operators", "drives": "drives", "matrices": "matrices",
+    "pathways": "pathways", "cascade": "cascade", "emotion": "emotions",
+    "death": "death", "collective": "collective", "circles": "circles",
+    "kosha": "kosha", "osafc": "osafc", "distortion": "distortions",
+    "panchakritya": "panchakritya", "advmath": "advanced_math",
+    "hierarchical": "hierarchical", "platform": "platform",
+    "multi": "multi_reality", "timeline": "timeline",
+    "grace": "dynamics", "karma": "dynamics", "transformation": "dynamics",
+    "network": "network", "quantum": "quantum", "realism": "realism", "unity": "unity",
+}
+
+
+def module_for_value(key: str) -> Optional[str]:
+    """Name of the module that produces flattened value `key`, if any."""
+    return _PREFIX_TO_MODULE.get(key.split("_", 1)[0])
+
+
+class IncrementalInference:
+    """
+    Traced run_inference with delta updates.
+
+    Usage:
+        incremental = IncrementalInference(engine)
+        trace = incremental.run(operators, s_level, goal_context)
+        trace = incremental.update(trace, new_operators, s_level, goal_context)
+        posteriors = trace.result
+    """
+
+    def __init__(self, engine: Any):
+        self.engine = engine
+        self.scheduler = engine.scheduler
+
+    def _compute_intermediate(
+        self,
+        name: str,
+        operators: Dict[str, float],
+        values: Dict[str, Optional[float]],
+        reads: Dict[str, FrozenSet[str]]
+    ) -> None:
+        # Hide the previous value, or the shared_intermediate hook would return it
+        snapshot = TracingSnapshot(operators, {k: v for k, v in values.items() if k != name})
+        values[name] = self.scheduler.intermediates[name].compute(self.engine, snapshot)
+        reads[name] = self._closure(snapshot, reads)
+
+    def _compute_module(
+        self,
+        name: str,
+        operators: Dict[str, float],
+        s_level: Optional[float],
+        intermediate_values: Dict[str, Optional[float]],
+        intermediate_reads: Dict[str, FrozenSet[str]],
+        timings: Dict[str, float]
+    ) -> Tuple[Any, FrozenSet[str]]:
+        started = time.perf_counter()
+        snapshot = TracingSnapshot(operators, intermediate_values)
+        output = self.scheduler.modules[name].compute(self.engine, snapshot, s_level)
+        timings[name] = time.perf_counter() - started
+        return output, self._closure(snapshot, intermediate_reads)
+
+    @staticmethod
+    def _closure(snapshot: TracingSnapshot, intermediate_reads: Dict[str, FrozenSet[str]]) -> FrozenSet[str]:
+        reads = set(snapshot.reads)
+        provided = snapshot.intermediates
+        for name in provided.reads:
+            # Intermediates absent from the snapshot were computed inline, so
+            # their operator reads are already recorded directly
+            if dict.__contains__(provided, name):
+                reads |= intermediate_reads.get(name, {ALL_KEYS})
+        return frozenset(reads)
+
+    def run(
+        self,
+        operators: Dict[str, float],
+        s_level: Optional[float],
+        goal_context: Optional[Dict[str, Any]] = None
+    ) -> InferenceTrace:
+        """Full traced run. The result equals engine.infer(operators, s_level, goal_context)."""
+        start = time.perf_counter()
+        plan = self.scheduler.plan(DEFAULT_MODULES, has_s_level=s_level is not None)
+
+        intermediate_values: Dict[str, Optional[float]] = {}
+        intermediate_reads: Dict[str, FrozenSet[str]] = {}
+        for name in plan.intermediates:
+            self._compute_intermediate(name, operators, intermediate_values, intermediate_reads)
+
+        module_outputs: Dict[str, Any] = {}
+        module_reads: Dict[str, FrozenSet[str]] = {}
+        module_seconds: Dict[str, float] = {}
+        for name in plan.modules:
+            module_outputs[name], module_reads[name] = self._compute_module(
+                name, operators, s_level, intermediate_values, intermediate_reads, module_seconds
+            )
+
+        trace = InferenceTrace(
+            operators=dict(operators),
+            s_level=s_level,
+            plan=plan,
+            intermediate_values=intermediate_values,
+            intermediate_reads=intermediate_reads,
+            module_outputs=module_outputs,
+            module_reads=module_reads,
+            result={},
+            recomputed=plan.modules,
+            module_seconds=module_seconds,
+        )
+        trace.result = self._build_result(trace, goal_context)
+        trace.elapsed_ms = (time.perf_counter() - start) * 1000
+        inference_logger.info(
+            f"[IncrementalInference.run] modules={len(plan.modules)} elapsed_ms={trace.elapsed_ms:.2f}"
+        )
+        return trace
+
+    def update(
+        self,
+        previous: Optional[InferenceTrace],
+        operators: Dict[str, float],
+        s_level: Optional[float],
+        goal_context: Optional[Dict[str, Any]] = None
+    ) -> InferenceTrace:
+        """
+        Recompute only what the operator delta invalidates.
+
+        Falls back to a full run when there is no previous trace or the
+        S-level changed.
+        """
+        if previous is None or previous.s_level != s_level:
+            return self.run(operators, s_level, goal_context)
+
+        start = time.perf_counter()
+        old = previous.operators
+        changed = {
+            name for name in set(old) | set(operators)
+            if old.get(name) != operators.get(name) or (name in old) != (name in operators)
+        }
+        key_set_changed = old.keys() != operators.keys()
+
+        intermediate_values = dict(previous.intermediate_values)
+        intermediate_reads = dict(previous.intermediate_reads)
+        refreshed_intermediates = set()
+        for name in previous.plan.intermediates:
+            if is_stale(intermediate_reads[name], changed, key_set_changed):
+                self._compute_intermediate(name, operators, intermediate_values, intermediate_reads)
+                refreshed_intermediates.add(name)
+
+        module_outputs = dict(previous.module_outputs)
+        module_reads = dict(previous.module_reads)
+        recomputed: List[str] = []
+        module_seconds: Dict[str, float] = {}
+        for name in previous.plan.modules:
+            node = self.scheduler.modules[name]
+            if is_stale(module_reads[name], changed, key_set_changed) or any(
+                dep in recomputed for dep in node.after
+            ):
+                module_outputs[name], module_reads[name] = self._compute_module(
+                    name, operators, s_level, intermediate_values, intermediate_reads, module_seconds
+                )
+                recomputed.append(name)
+
+        trace = InferenceTrace(
+            operators=dict(operators),
+            s_level=s_level,
+            plan=previous.plan,
+            intermediate_values=intermediate_values,
+            intermediate_reads=intermediate_reads,
+            module_outputs=module_outputs,
+            module_reads=module_reads,
+            result={},
+            recomputed=tuple(recomputed),
+            module_seconds=module_seconds,
+        )
+        trace.result = self._build_result(trace, goal_context)
+        trace.elapsed_ms = (time.perf_counter() - start) * 1000
+        inference_logger.info(
+            f"[IncrementalInference.update] changed={sorted(changed)} "
+            f"intermediates={sorted(refreshed_intermediates)} "
+            f"recomputed={len(recomputed)}/{len(previous.plan.modules)} "
+            f"elapsed_ms={trace.elapsed_ms:.2f}"
+        )
+        return trace
+
+    def _build_result(self, trace: InferenceTrace, goal_context: Optional[Dict[str, Any]]) -> dict:
+        results: Dict[str, Any] = {}
+        computed: List[str] = []
+        for name in trace.plan.modules:
+            output = trace.module_outputs[name]
+            if output is NOT_COMPUTED:
+                continue
+            results[self.scheduler.modules[name].output] = output
+            computed.append(name)
+        computed.sort(key=DEFAULT_MODULES.index)
+
+        profile = self.engine.assemble_profile(
+            trace.operators, trace.s_level, results, computed, list(trace.plan.skipped)
+        )
+        return self.engine.build_result(profile, goal_context)
+
+
+class TraceStore:
+    """
+    Bounded in-process store of per-session incremental state.
+
+    Entries are plain dicts (trace, posteriors, consciousness state, ...)
+    keyed by session id; the oldest entries are evicted first and entries
+    older than `ttl` seconds are dropped on access.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            stored_at, entry = item
+            if time.time() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._entries.pop(key, None)
+            return item[1] if item else None
+
+    def __len__(self) -> int:
+        return len(self._entries)
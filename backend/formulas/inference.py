@@ -21,8 +21,10 @@ Provides unified interface for:
 Formula: Integrated_Profile = f(operators, s_level, context)
 """
 
+import re
+from concurrent.futures import Executor
 from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 from logging_config import inference_logger
 
@@ -46,12 +48,11 @@ from .dynamics import GraceKarmaDynamics
 from .network import NetworkEmergenceCalculator
 from .quantum import QuantumMechanics
 from .realism import RealismEngine
-from .unity_principle import get_unity_metrics
 from .dual_pathway_calculator import calculate_dual_pathways
 
 # Part XI Advanced Math and additional OOF formulas
 from .advanced_math import AdvancedMathEngine
-from .hierarchical import HierarchicalResolutionEngine, HLevel
+from .hierarchical import HierarchicalResolutionEngine
 from .platform_specific import PlatformSpecificEngine, IntelligenceAdaptationEngine
 from .multi_reality import MultiRealityEngine
 from .timeline_prediction import (
@@ -60,6 +61,18 @@ from .timeline_prediction import (
     EvolutionDynamicsEngine
 )
 
+# Declarative module graph + scheduler
+from .module_graph import DEFAULT_MODULES, UNITY_OPERATORS, default_scheduler
+
+# Summary liberation index weights (keyed by summary metric name)
+LIBERATION_WEIGHTS: Dict[str, float] = {
+    "distortion": 0.3,
+    "kosha": 0.2,
+    "osafc": 0.2,
+    "cascade": 0.15,
+    "matrices": 0.15
+}
+
 
 @dataclass
 class IntegratedProfile:
@@ -112,8 +125,14 @@ class IntegratedProfile:
 class OOFInferenceEngine:
     """Master inference engine integrating all OOF modules."""
 
-    def __init__(self):
-        """Initialize all component engines."""
+    def __init__(self, module_executor: Optional[Executor] = None):
+        """
+        Initialize all component engines.
+
+        Args:
+            module_executor: Optional executor used to run independent
+                modules of a wave concurrently (default: inline)
+        """
         self.operator_engine = OperatorEngine()
         self.drives_engine = DrivesEngine()
         self.matrices_engine = MatricesEngine()
@@ -144,6 +163,10 @@ class OOFInferenceEngine:
         self.quantum_engine = QuantumMechanics()
         self.realism_engine = RealismEngine()
 
+        # Module graph scheduler
+        self.scheduler = default_scheduler
+        self.module_executor = module_executor
+
         # API compatibility attributes
         self.formula_count = 287  # Total formulas across all modules
         self.is_loaded = True  # Always ready - pure Python
@@ -157,6 +180,11 @@ class OOFInferenceEngine:
         """
         Calculate complete integrated profile.
 
+        Modules are executed through the declarative module graph (see
+        formulas/module_graph.py): shared intermediates are computed once,
+        independent modules run as one wave, and modules that were not
+        requested are pruned.
+
         Args:
             operators: Dict of operator values (0.0-1.0)
             s_level: Sacred chain level (1.0-8.0)
@@ -173,213 +201,42 @@ class OOFInferenceEngine:
 
         # Default to all modules if not specified
         if include_modules is None:
-            include_modules = [
-                "operators", "drives", "matrices", "pathways",
-                "cascade", "emotions", "death", "collective",
-                "circles", "kosha", "osafc", "distortions", "panchakritya",
-                "advanced_math", "hierarchical", "platform", "multi_reality", "timeline",
-                "dynamics", "network", "quantum", "realism", "unity"
-            ]
+            include_modules = DEFAULT_MODULES
 
         inference_logger.debug(f"[calculate_full_profile] modules to execute: {len(include_modules)}")
 
-        # Modules that require s_level — skip if s_level is None
-        s_level_required_modules = {
-            "drives", "matrices", "pathways", "death", "circles", "kosha",
-            "osafc", "distortions", "panchakritya", "advanced_math",
-            "platform", "multi_reality", "timeline", "network",
-            "quantum", "realism", "unity", "collective"
-        }
-        skipped_modules = []
-        if s_level is None:
-            skipped_modules = [m for m in include_modules if m in s_level_required_modules]
-            include_modules = [m for m in include_modules if m not in s_level_required_modules]
-            if skipped_modules:
-                inference_logger.warning(
-                    f"[calculate_full_profile] s_level is None — skipping {len(skipped_modules)} modules: {skipped_modules}"
-                )
+        # Modules that require s_level are skipped by the planner if s_level is None
+        plan = self.scheduler.plan(include_modules, has_s_level=s_level is not None)
+        skipped_modules = list(plan.skipped)
+        if skipped_modules:
+            inference_logger.warning(
+                f"[calculate_full_profile] s_level is None — skipping {len(skipped_modules)} modules: {skipped_modules}"
+            )
 
+        # Calculate each requested module
+        results, computed_modules = self.scheduler.execute(
+            self, operators, s_level, plan, executor=self.module_executor
+        )
+        return self.assemble_profile(operators, s_level, results, computed_modules, skipped_modules)
+
+    def assemble_profile(
+        self,
+        operators: Dict[str, float],
+        s_level: Optional[float],
+        results: Dict[str, Any],
+        computed_modules: List[str],
+        skipped_modules: List[str]
+    ) -> IntegratedProfile:
+        """
+        Build an IntegratedProfile from module results keyed by profile field
+        and compute the summary metrics.
+        """
         profile = IntegratedProfile(
             operators=operators,
             s_level=s_level
         )
-
-        # Calculate each requested module
-        computed_modules = []
-
-        if "operators" in include_modules:
-            profile.operator_scores = self.operator_engine.calculate_all_derived(
-                operators
-            )
-            computed_modules.append("operators")
-
-        if "drives" in include_modules:
-            profile.drives_profile = self.drives_engine.calculate_all_drives(
-                operators, s_level
-            )
-            computed_modules.append("drives")
-
-        if "matrices" in include_modules:
-            profile.matrices_profile = self.matrices_engine.calculate_all_matrices(
-                operators, s_level
-            )
-            computed_modules.append("matrices")
-
-        if "pathways" in include_modules:
-            profile.pathways_profile = self.pathways_engine.calculate_all_pathways(
-                operators, s_level
-            )
-            computed_modules.append("pathways")
-
-        if "cascade" in include_modules:
-            profile.cascade_profile = self.cascade_calculator.calculate_cascade(
-                operators
-            )
-            computed_modules.append("cascade")
-
-        if "emotions" in include_modules:
-            profile.emotion_profile = self.emotion_analyzer.analyze(operators)
-            computed_modules.append("emotions")
-
-        if "death" in include_modules:
-            profile.death_profile = self.death_engine.calculate_death_profile(
-                operators, s_level
-            )
-            computed_modules.append("death")
-
-        if "collective" in include_modules:
-            # Default network parameters
-            profile.collective_profile = {
-                "network_effect": self.collective_engine.calculate_network_effect(
-                    network_size=10,
-                    base_resonance=operators.get("Se_service"),
-                    coherence=operators.get("Ce_cleaning"),
-                    population=1000
-                ) if operators.get("Se_service") is not None and operators.get("Ce_cleaning") is not None else None,
-                "we_space": self.collective_engine.calculate_we_space(
-                    operators=operators,
-                    network_coherence=operators.get("Ce_cleaning"),
-                    shared_s_level=s_level
-                ) if operators.get("Ce_cleaning") is not None else None
-            }
-            computed_modules.append("collective")
-
-        if "circles" in include_modules:
-            profile.circles_profile = self.circles_engine.calculate_circles_profile(
-                operators, s_level
-            )
-            computed_modules.append("circles")
-
-        if "kosha" in include_modules:
-            profile.kosha_profile = self.kosha_engine.calculate_kosha_profile(
-                operators, s_level
-            )
-            computed_modules.append("kosha")
-
-        if "osafc" in include_modules:
-            profile.osafc_profile = self.osafc_engine.calculate_osafc_profile(
-                operators, s_level
-            )
-            computed_modules.append("osafc")
-
-        if "distortions" in include_modules:
-            profile.distortion_profile = self.distortion_engine.calculate_distortion_profile(
-                operators, s_level
-            )
-            computed_modules.append("distortions")
-
-        if "panchakritya" in include_modules:
-            profile.panchakritya_profile = self.panchakritya_engine.calculate_panchakritya_profile(
-                operators, s_level
-            )
-            computed_modules.append("panchakritya")
-
-        # Part XI Advanced Math modules
-        if "advanced_math" in include_modules:
-            profile.advanced_math_profile = self.advanced_math_engine.calculate_full_profile(
-                operators, s_level
-            )
-            computed_modules.append("advanced_math")
-
-        if "hierarchical" in include_modules:
-            # H-level detection requires text context - use operator-based defaults
-            profile.hierarchical_profile = self.hierarchical_engine.get_h_level_info(
-                HLevel.H1_PERSONAL  # Default to personal level without text
-            )
-            computed_modules.append("hierarchical")
-
-        if "platform" in include_modules:
-            # Platform profiles for common platforms
-            profile.platform_profile = {
-                "intelligence_level": self.intelligence_adaptation_engine.detect_intelligence_level(
-                    complexity_handled=operators.get("W_witness"),
-                    abstraction_comfort=s_level / 8.0,
-                    technical_literacy=operators.get("D_dharma")
-                ) if operators.get("W_witness") is not None and operators.get("D_dharma") is not None else None
-            }
-            computed_modules.append("platform")
-
-        if "multi_reality" in include_modules:
-            ce = operators.get("Ce_cleaning")
-            at_val = operators.get("At_attachment")
-            p_val = operators.get("P_presence")
-            if ce is not None and at_val is not None and p_val is not None:
-                profile.multi_reality_profile = self.multi_reality_engine.calculate_full_multi_reality_state(
-                    shared_beliefs=ce,
-                    shared_consciousness=s_level / 8.0,
-                    interaction_frequency=0.5,
-                    num_participants=1,
-                    individual_realities=[s_level / 8.0],
-                    consciousness_levels=[s_level / 8.0],
-                    attachments=[at_val],
-                    resonance=p_val
-                )
-                computed_modules.append("multi_reality")
-
-        if "timeline" in include_modules:
-            profile.timeline_profile = self.evolution_engine.calculate_full_evolution_dynamics(
-                operators, s_level
-            )
-            computed_modules.append("timeline")
-
-        # Additional calculation modules
-        if "dynamics" in include_modules:
-            profile.dynamics_profile = self.dynamics_engine.calculate_all(operators)
-            computed_modules.append("dynamics")
-
-        if "network" in include_modules:
-            coherence = operators.get('Co_coherence')
-            if coherence is not None:
-                profile.network_profile = self.network_engine.calculate_network_state(
-                    individual_coherence=coherence,
-                    individual_s_level=s_level,
-                    connected_nodes=1
-                )
-                computed_modules.append("network")
-
-        if "quantum" in include_modules:
-            profile.quantum_profile = self.quantum_engine.calculate_quantum_state(operators, s_level)
-            computed_modules.append("quantum")
-
-        if "realism" in include_modules:
-            profile.realism_profile = self.realism_engine.calculate_realism_profile(operators, s_level)
-            computed_modules.append("realism")
-
-        if "unity" in include_modules:
-            unity_ops = {
-                'W_witness': operators.get('W_witness'),
-                'A_aware': operators.get('A_aware'),
-                'P_presence': operators.get('P_presence'),
-                'G_grace': operators.get('G_grace'),
-                'S_surrender': operators.get('S_surrender'),
-                'At_attachment': operators.get('At_attachment'),
-                'F_fear': operators.get('F_fear'),
-                'M_maya': operators.get('M_maya'),
-                'R_resistance': operators.get('R_resistance'),
-                'Co_coherence': operators.get('Co_coherence'),
-            }
-            profile.unity_profile = get_unity_metrics(unity_ops, s_level)
-            computed_modules.append("unity")
+        for field_name, value in results.items():
+            setattr(profile, field_name, value)
 
         inference_logger.debug(f"[calculate_full_profile] computed modules: {computed_modules}")
 
@@ -401,6 +258,39 @@ class OOFInferenceEngine:
 
         return profile
 
+    def calculate_profiles_batch(
+        self,
+        operator_matrix: Any,
+        s_levels: Any,
+        columns: Optional[List[str]] = None,
+        include_modules: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Calculate flattened profiles for many operator vectors at once.
+
+        Args:
+            operator_matrix: N x K NumPy array of canonical operator values
+                           (NaN = missing)
+            s_levels: Length-N array of S-levels (NaN = missing) or a scalar
+            columns: Operator name per matrix column
+                   (default: formulas.batch.OPERATOR_COLUMNS)
+            include_modules: Optional list of modules to include
+                           (default: all modules)
+
+        Returns:
+            Dict of flattened value name (as produced by _flatten_profile)
+            -> length-N NumPy column
+        """
+        # NumPy is only needed for batch work; import lazily
+        from .batch import calculate_profiles_batch, OPERATOR_COLUMNS
+        return calculate_profiles_batch(
+            self,
+            operator_matrix,
+            s_levels,
+            columns=columns if columns is not None else OPERATOR_COLUMNS,
+            include_modules=include_modules
+        )
+
     def _calculate_summary_metrics(
         self,
         profile: IntegratedProfile
@@ -455,19 +345,12 @@ class OOFInferenceEngine:
                 profile.overall_health = sum(values) / len(values)
 
                 # Liberation index (weighted toward distortion and kosha)
-                lib_weights = {
-                    "distortion": 0.3,
-                    "kosha": 0.2,
-                    "osafc": 0.2,
-                    "cascade": 0.15,
-                    "matrices": 0.15
-                }
                 lib_sum = 0
                 lib_weight_total = 0
                 for name, value in metrics:
-                    if name in lib_weights and value is not None:
-                        lib_sum += value * lib_weights[name]
-                        lib_weight_total += lib_weights[name]
+                    if name in LIBERATION_WEIGHTS and value is not None:
+                        lib_sum += value * LIBERATION_WEIGHTS[name]
+                        lib_weight_total += LIBERATION_WEIGHTS[name]
                 if lib_weight_total > 0:
                     profile.liberation_index = lib_sum / lib_weight_total
 
@@ -590,11 +473,19 @@ class OOFInferenceEngine:
             f"has_goal_context={has_goal}"
         )
 
-        # Extract operators from observations
+        operators, confidence, s_level = self.parse_evidence(evidence)
+        return self.infer(operators, s_level, evidence.get('goal_context'), confidence)
+
+    def parse_evidence(self, evidence: dict) -> Tuple[Dict[str, float], Dict[str, Optional[float]], Optional[float]]:
+        """
+        Extract canonical operators, observation confidences and S-level from
+        API-format evidence.
+
+        Returns:
+            (operators, confidence, s_level)
+        """
         operators: Dict[str, float] = {}
-        confidence: Dict[str, float] = {}
-        populated_operators = set()
-        missing_operators = set()
+        confidence: Dict[str, Optional[float]] = {}
 
         observations = evidence.get('observations')
         for obs in observations:
@@ -619,19 +510,12 @@ class OOFInferenceEngine:
 
             operators[canonical_name] = float(value)
             confidence[canonical_name] = float(conf) if conf is not None else None
-            populated_operators.add(canonical_name)
-
-        # Track missing operators
-        for op in CANONICAL_OPERATOR_NAMES:
-            if op not in operators:
-                missing_operators.add(op)
 
         s_level = operators.get('S_level') or operators.get('s_level')
         if s_level is None:
             # Also check top-level evidence field (LLM Call 1 returns s_level as "S3", "S5", etc.)
             s_level_str = evidence.get('s_level')
             if isinstance(s_level_str, str):
-                import re
                 match = re.search(r'S(\d+\.?\d*)', s_level_str)
                 if match:
                     s_level = float(match.group(1))
@@ -639,23 +523,54 @@ class OOFInferenceEngine:
             elif isinstance(s_level_str, (int, float)):
                 s_level = float(s_level_str)
                 inference_logger.info(f"[run_inference] S_level from evidence top-level field: {s_level}")
-        if s_level is None:
-            inference_logger.warning("[run_inference] S_level not found in operators or evidence — missing from LLM extraction")
-            missing_operators.add('S_level')
 
+        return operators, confidence, s_level
+
+    def infer(
+        self,
+        operators: Dict[str, float],
+        s_level: Optional[float],
+        goal_context: Optional[Dict[str, Any]] = None,
+        confidence: Optional[Dict[str, Optional[float]]] = None
+    ) -> dict:
+        """
+        Compute the run_inference result from already-parsed operators.
+
+        The result depends only on the operator values, s_level and the
+        goal_text/goal_category of goal_context, which is what makes it safe
+        to memoize (see formulas.memo).
+        """
         # Run full calculation
         profile = self.calculate_full_profile(operators, s_level)
+        return self.build_result(profile, goal_context, confidence)
+
+    def build_result(
+        self,
+        profile: IntegratedProfile,
+        goal_context: Optional[Dict[str, Any]] = None,
+        confidence: Optional[Dict[str, Optional[float]]] = None
+    ) -> dict:
+        """Flatten a computed profile into the run_inference result format."""
+        operators = profile.operators
+        s_level = profile.s_level
+        confidence = dict(confidence) if confidence else {}
+        populated_operators = set(operators)
+
+        # Track missing operators
+        missing_operators = set()
+        for op in CANONICAL_OPERATOR_NAMES:
+            if op not in operators:
+                missing_operators.add(op)
+        if s_level is None:
+            inference_logger.warning("[run_inference] S_level not found in operators or evidence — missing from LLM extraction")
+            missing_operators.add('S_level')
 
         # Flatten profile to values dict
         values = self._flatten_profile(profile, confidence)
 
         # Handle dual pathways if goal_context provided
-        goal_context = evidence.get('goal_context')
         if goal_context and profile.unity_profile:
-            unity_ops = {k: operators.get(k) for k in [
-                'W_witness', 'A_aware', 'P_presence', 'G_grace', 'S_surrender',
-                'At_attachment', 'F_fear', 'M_maya', 'R_resistance', 'Co_coherence'
-            ]}
+            unity_ops = {k: operators.get(k) for k in UNITY_OPERATORS}
             dual = calculate_dual_pathways(
                 goal=goal_context.get('goal_text'),
                 goal_category=goal_context.get('goal_category'),
@@ -0,0 +1,57 @@
+"""
+OOF Framework - Shared Intermediates
+====================================
+
+Several modules derive the same intermediate quantities from the operators
+(ego separation in drives, matrices, death and the operator engine; klesha
+total and grace availability inside the operator engine). The module
+scheduler computes these once per profile and hands every engine an
+OperatorSnapshot carrying the results.
+
+Engines called with a plain dict (tests, direct callers) keep computing the
+value themselves, so the snapshot is purely an optimization.
+"""
+
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+
+class OperatorSnapshot(dict):
+    """
+    Operator dict carrying precomputed shared intermediates.
+
+    Behaves exactly like the operator dict it wraps; engines that know about
+    shared intermediates read them from `intermediates` instead of
+    recomputing.
+    """
+
+    __slots__ = ("intermediates",)
+
+    def __init__(
+        self,
+        operators: Dict[str, Any],
+        intermediates: Optional[Dict[str, Optional[float]]] = None
+    ):
+        super().__init__(operators)
+        self.intermediates: Dict[str, Optional[float]] = (
+            intermediates if intermediates is not None else {}
+        )
+
+
+def shared_intermediate(name: str) -> Callable:
+    """
+    Decorate an engine method `(self, ops)` that computes intermediate `name`.
+
+    When `ops` is an OperatorSnapshot that already holds `name`, the stored
+    value is returned without calling the method.
+    """
+    def decorator(method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(self, ops: Dict[str, Any]) -> Optional[float]:
+            intermediates = getattr(ops, "intermediates", None)
+            if intermediates is not None and name in intermediates:
+                return intermediates[name]
+            return method(self, ops)
+        wrapper.intermediate_name = name
+        return wrapper
+    return decorator
@@ -24,6 +24,7 @@ from typing import Dict, List, Tuple, Any, Optional
 from enum import Enum
 
 from logging_config import get_logger
+from .intermediates import shared_intermediate
 logger = get_logger('formulas.matrices')
 
 
@@ -216,6 +217,7 @@ class MatricesEngine:
         self.matrix_states = MATRIX_STATES
         self.state_descriptions = STATE_DESCRIPTIONS
 
+    @shared_intermediate("ego_separation")
     def _calculate_ego_separation(self, ops: Dict[str, float]) -> float:
         """Calculate ego separation factor."""
         at = ops.get("At_attachment")
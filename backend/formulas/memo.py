@@ -0,0 +1,305 @@
+"""
+OOF Framework - Inference Memoization
+=====================================
+
+OOFInferenceEngine.infer is a pure function of the operator values, the
+S-level and the goal_text/goal_category of the goal context. Repeat
+questions, constellation-answer continuations and goal discovery often
+produce the same (or nearly the same) operator vector, so results are
+memoized under a content hash of the quantized inputs.
+
+Two tiers:
+- L1: in-process LRU (OrderedDict), always on
+- L2: optional shared tier through utils.cache.CacheClient, only used
+  while the client reports a live Redis connection (its in-memory fallback
+  has no eviction and would grow without bound)
+
+Only the key is quantized: operators and S-level are rounded to `precision`
+decimals to address an entry, but entries are computed from the caller's
+exact inputs. A miss is therefore exactly the engine result; a hit for a
+nearby vector in the same bucket returns the result of the vector that
+filled it, which differs from a fresh computation only by the formulas'
+response to a sub-`precision` change. Observation confidences are not part
+of the key:
+entries are computed without them and each caller's confidences are applied
+to the copy it gets back, as build_result would have.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from logging_config import inference_logger
+
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("OOF_MEMO_MAX_ENTRIES", "1024"))
+DEFAULT_PRECISION = int(os.getenv("OOF_MEMO_PRECISION", "3"))
+DEFAULT_L2_TTL = int(os.getenv("OOF_MEMO_L2_TTL", "3600"))
+
+# Bump when the formula set changes so stale shared-tier entries are ignored
+MEMO_VERSION = "1"
+
+
+class InferenceMemo:
+    """
+    Content-addressed LRU cache in front of an OOFInferenceEngine.
+
+    Usage:
+        memo = InferenceMemo(engine)
+        memo.attach_shared_cache(cache)                  # optional L2
+        posteriors = await memo.run_inference_async(evidence)
+        profile, values = memo.profile(operators, s_level)
+    """
+
+    def __init__(
+        self,
+        engine: Any,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        precision: int = DEFAULT_PRECISION,
+        l2_ttl: int = DEFAULT_L2_TTL,
+        shared_cache: Optional[Any] = None,
+        key_prefix: str = "oofmemo"
+    ):
+        self.engine = engine
+        self.max_entries = max_entries
+        self.precision = precision
+        self.l2_ttl = l2_ttl
+        self.shared_cache = shared_cache
+        self.key_prefix = f"{key_prefix}:v{MEMO_VERSION}"
+
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._l2_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def attach_shared_cache(self, shared_cache: Optional[Any]) -> None:
+        """Use `shared_cache` (a CacheClient) as the L2 tier."""
+        self.shared_cache = shared_cache
+
+    # -------------------------------------------------------------------------
+    # Keys
+    # -------------------------------------------------------------------------
+
+    def quantize(
+        self,
+        operators: Dict[str, float],
+        s_level: Optional[float]
+    ) -> Tuple[Dict[str, float], Optional[float]]:
+        """Round operators and S-level to the memo precision (cache keys only)."""
+        ops = {name: round(float(value), self.precision) for name, value in operators.items()}
+        return ops, (round(float(s_level), self.precision) if s_level is not None else None)
+
+    def make_key(
+        self,
+        kind: str,
+        operators: Dict[str, float],
+        s_level: Optional[float],
+        goal_context: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Canonical hash of already-quantized inputs."""
+        goal = None
+        if goal_context:
+            goal = [goal_context.get('goal_text'), goal_context.get('goal_category')]
+        payload = json.dumps(
+            [sorted(operators.items()), s_level, goal],
+            separators=(",", ":"),
+            ensure_ascii=False
+        )
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return f"{self.key_prefix}:{kind}:{digest}"
+
+    # -------------------------------------------------------------------------
+    # L1
+    # -------------------------------------------------------------------------
+
+    def _l1_get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _l1_put(self, key: str, entry: Any) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def _count(self, field_name: str) -> None:
+        with self._lock:
+            setattr(self, field_name, getattr(self, field_name) + 1)
+
+    def _l2_enabled(self) -> bool:
+        return self.shared_cache is not None and getattr(self.shared_cache, "is_connected", False)
+
+    # -------------------------------------------------------------------------
+    # run_inference
+    # -------------------------------------------------------------------------
+
+    def _prepare(self, evidence: dict) -> Tuple[str, Dict[str, float], Dict[str, Optional[float]], Optional[float], Optional[Dict[str, Any]]]:
+        operators, confidence, s_level = self.engine.parse_evidence(evidence)
+        goal_context = evidence.get('goal_context')
+        key = self.make_key("inference", *self.quantize(operators, s_level), goal_context)
+        return key, operators, confidence, s_level, goal_context
+
+    @staticmethod
+    def _with_confidence(result: dict, confidence: Dict[str, Optional[float]]) -> dict:
+        """
+        Apply observation confidences to a result computed without them.
+
+        build_result starts from the observation confidences and overwrites
+        computed values with 1.0, so only keys still None can take an
+        observation confidence.
+        """
+        if not confidence:
+            return result
+        # Shallow copy: a compute hook may return a result it keeps (traces)
+        return {**result, "confidence": {
+            k: v if v is not None else confidence.get(k)
+            for k, v in result["confidence"].items()
+        }}
+
+    def run_inference(self, evidence: dict) -> dict:
+        """Memoized OOFInferenceEngine.run_inference (L1 only, synchronous)."""
+        key, operators, confidence, s_level, goal_context = self._prepare(evidence)
+
+        encoded = self._l1_get(key)
+        if encoded is not None:
+            self._count("_hits")
+            return self._with_confidence(json.loads(encoded), confidence)
+
+        self._count("_misses")
+        result = self.engine.infer(operators, s_level, goal_context)
+        self._l1_put(key, json.dumps(result))
+        return self._with_confidence(result, confidence)
+
+    async def run_inference_async(
+        self,
+        evidence: dict,
+        compute: Optional[Callable[[Dict[str, float], Optional[float], Optional[Dict[str, Any]]], Any]] = None
+    ) -> dict:
+        """
+        Memoized run_inference for async callers.
+
+        Checks L1, then the shared tier, and only then runs the computation
+        in a worker thread. Results are stored JSON-encoded, so every caller
+        gets its own copy.
+
+        `compute(operators, s_level, goal_context)` replaces engine.infer on
+        a miss (e.g. a traced or incremental run); it must return the same
+        result engine.infer would (without confidences). A coroutine function is awaited on the
+        loop (e.g. FormulaPool.infer, which does its own offloading).
+        """
+        key, operators, confidence, s_level, goal_context = self._prepare(evidence)
+
+        encoded = self._l1_get(key)
+        if encoded is not None:
+            self._count("_hits")
+            inference_logger.debug(f"[InferenceMemo] L1 hit: key={key[-12:]}")
+            return self._with_confidence(json.loads(encoded), confidence)
+
+        if self._l2_enabled():
+            try:
+                encoded = await self.shared_cache.get(key)
+            except Exception as e:
+                inference_logger.warning(f"[InferenceMemo] L2 read failed ({type(e).__name__}): {e}")
+                encoded = None
+            if isinstance(encoded, str):
+                self._count("_l2_hits")
+                self._l1_put(key, encoded)
+                inference_logger.debug(f"[InferenceMemo] L2 hit: key={key[-12:]}")
+                return self._with_confidence(json.loads(encoded), confidence)
+
+        self._count("_misses")
+        if asyncio.iscoroutinefunction(compute):
+            result = await compute(operators, s_level, goal_context)
+        else:
+            result = await asyncio.to_thread(compute or self.engine.infer, operators, s_level, goal_context)
+        encoded = json.dumps(result)
+        self._l1_put(key, encoded)
+
+        if self._l2_enabled():
+            try:
+                await self.shared_cache.set(key, encoded, ttl=self.l2_ttl)
+            except Exception as e:
+                inference_logger.warning(f"[InferenceMemo] L2 write failed ({type(e).__name__}): {e}")
+        return self._with_confidence(result, confidence)
+
+    # -------------------------------------------------------------------------
+    # Profile + flattened values (goal discovery / classification)
+    # -------------------------------------------------------------------------
+
+    def profile(self, operators: Dict[str, float], s_level: Optional[float]) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Memoized calculate_full_profile + _flatten_profile.
+
+        In-process only: the IntegratedProfile holds engine dataclasses that
+        do not round-trip through JSON. Returns deep copies.
+        """
+        key = self.make_key("profile", *self.quantize(operators, s_level))
+
+        entry = self._l1_get(key)
+        if entry is not None:
+            self._count("_hits")
+            return copy.deepcopy(entry)
+
+        self._count("_misses")
+        profile = self.engine.calculate_full_profile(operators, s_level)
+        values = self.engine._flatten_profile(profile, {})
+        entry = (profile, values)
+        self._l1_put(key, entry)
+        return copy.deepcopy(entry)
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            lookups = self._hits + self._l2_hits + self._misses
+            return {
+                "hits": self._hits,
+                "l2_hits": self._l2_hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": round((self._hits + self._l2_hits) / lookups, 4) if lookups else 0.0,
+                "l2_enabled": self._l2_enabled(),
+            }
+
+    def clear(self) -> None:
+        """Drop all L1 entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._l2_hits = self._misses = self._evictions = 0
+
+
+_shared_memo: Optional[InferenceMemo] = None
+_shared_memo_lock = threading.Lock()
+
+
+def get_inference_memo(engine: Optional[Any] = None) -> InferenceMemo:
+    """
+    Process-wide memo shared by the SSE endpoints, goal discovery and the
+    goal classifier. The first caller may supply the engine to wrap;
+    otherwise a new OOFInferenceEngine is created.
+    """
+    global _shared_memo
+    with _shared_memo_lock:
+        if _shared_memo is None:
+            if engine is None:
+                from .inference import OOFInferenceEngine
+                engine = OOFInferenceEngine()
+            _shared_memo = InferenceMemo(engine)
+        return _shared_memo
@@ -0,0 +1,400 @@
+"""
+OOF Framework - Module Dependency Graph
+=======================================
+
+Declarative description of the modules run by OOFInferenceEngine and a
+scheduler that executes them.
+
+Each ModuleNode declares:
+- inputs: the shared intermediates it reads, whether it needs an s_level,
+  and any other modules whose results it consumes
+- output: the IntegratedProfile field it fills
+
+The scheduler turns a set of requested modules into an ExecutionPlan:
+- shared intermediates (klesha total, effective maya, ego separation, ...)
+  are computed once, and only when a scheduled module consumes them
+- modules are grouped into waves of mutually independent nodes
+- modules nobody asked for (directly or through `after`) are pruned
+- modules that need an s_level are skipped when none is available
+
+Plans are cached per (requested modules, s_level available), so the graph
+walk happens once per distinct request shape rather than once per call.
+
+Formula: Profile = Schedule(Graph, requested_modules)(operators, s_level)
+"""
+
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from logging_config import get_logger
+from .intermediates import OperatorSnapshot
+from .hierarchical import HLevel
+from .unity_principle import get_unity_metrics
+
+logger = get_logger('formulas.module_graph')
+
+
+# Sentinel returned by a module when its own inputs are missing and it should
+# not be reported as computed (network, multi_reality).
+NOT_COMPUTED = object()
+
+UNITY_OPERATORS = (
+    'W_witness', 'A_aware', 'P_presence', 'G_grace', 'S_surrender',
+    'At_attachment', 'F_fear', 'M_maya', 'R_resistance', 'Co_coherence',
+)
+
+
+@dataclass(frozen=True)
+class IntermediateNode:
+    """A shared intermediate computed once per profile."""
+    name: str
+    compute: Callable[[Any, OperatorSnapshot], Optional[float]]
+    after: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class ModuleNode:
+    """A calculation module and its declared inputs/outputs."""
+    name: str
+    output: str
+    compute: Callable[[Any, OperatorSnapshot, Optional[float]], Any]
+    intermediates: Tuple[str, ...] = ()
+    requires_s_level: bool = False
+    after: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """Resolved schedule for one request shape."""
+    intermediates: Tuple[str, ...]
+    waves: Tuple[Tuple[str, ...], ...]
+    skipped: Tuple[str, ...]
+
+    @property
+    def modules(self) -> Tuple[str, ...]:
+        return tuple(name for wave in self.waves for name in wave)
+
+
+# =============================================================================
+# SHARED INTERMEDIATES
+# =============================================================================
+
+INTERMEDIATE_NODES: Tuple[IntermediateNode, ...] = (
+    IntermediateNode("klesha_total", lambda eng, ops: eng.operator_engine.calculate_klesha_total(ops)),
+    IntermediateNode("maya_effective", lambda eng, ops: eng.operator_engine.calculate_maya_effective(ops),
+                     after=("klesha_total",)),
+    IntermediateNode("ego_separation", lambda eng, ops: eng.operator_engine.calculate_ego_separation(ops)),
+    IntermediateNode("grace_availability", lambda eng, ops: eng.operator_engine.calculate_grace_availability(ops)),
+    IntermediateNode("resistance", lambda eng, ops: eng.operator_engine.calculate_resistance(ops)),
+)
+
+
+# =============================================================================
+# MODULE COMPUTE FUNCTIONS
+# =============================================================================
+
+def _compute_collective(eng, ops: OperatorSnapshot, s_level: Optional[float]) -> Dict[str, Any]:
+    se = ops.get("Se_service")
+    ce = ops.get("Ce_cleaning")
+    return {
+        "network_effect": eng.collective_engine.calculate_network_effect(
+            network_size=10,
+            base_resonance=se,
+            coherence=ce,
+            population=1000
+        ) if se is not None and ce is not None else None,
+        "we_space": eng.collective_engine.calculate_we_space(
+            operators=ops,
+            network_coherence=ce,
+            shared_s_level=s_level
+        ) if ce is not None else None
+    }
+
+
+def _compute_hierarchical(eng, ops: OperatorSnapshot, s_level: Optional[float]) -> Any:
+    # H-level detection requires text context - use operator-based defaults
+    return eng.hierarchical_engine.get_h_level_info(HLevel.H1_PERSONAL)
+
+
+def _compute_platform(eng, ops: OperatorSnapshot, s_level: Optional[float]) -> Dict[str, Any]:
+    w = ops.get("W_witness")
+    d = ops.get("D_dharma")
+    return {
+        "intelligence_level": eng.intelligence_adaptation_engine.detect_intelligence_level(
+            complexity_handled=w,
+            abstraction_comfort=s_level / 8.0,
+            technical_literacy=d
+        ) if w is not None and d is not None else None
+    }
+
+
+def _compute_multi_reality(eng, ops: OperatorSnapshot, s_level: Optional[float]) -> Any:
+    ce = ops.get("Ce_cleaning")
+    at_val = ops.get("At_attachment")
+    p_val = ops.get("P_presence")
+    if ce is None or at_val is None or p_val is None:
+        return NOT_COMPUTED
+    return eng.multi_reality_engine.calculate_full_multi_reality_state(
+        shared_beliefs=ce,
+        shared_consciousness=s_level / 8.0,
+        interaction_frequency=0.5,
+        num_participants=1,
+        individual_realities=[s_level / 8.0],
+        consciousness_levels=[s_level / 8.0],
+        attachments=[at_val],
+        resonance=p_val
+    )
+
+
+def _compute_network(eng, ops: OperatorSnapshot, s_level: Optional[float]) -> Any:
+    coherence = ops.get('Co_coherence')
+    if coherence is None:
+        return NOT_COMPUTED
+    return eng.network_engine.calculate_network_state(
+        individual_coherence=coherence,
+        individual_s_level=s_level,
+        connected_nodes=1
+    )
+
+
+def _compute_unity(eng, ops: OperatorSnapshot, s_level: Optional[float]) -> Any:
+    unity_ops = {name: ops.get(name) for name in UNITY_OPERATORS}
+    return get_unity_metrics(unity_ops, s_level)
+
+
+# =============================================================================
+# MODULE GRAPH
+# =============================================================================
+
+# Declaration order is the canonical reporting order for computed_modules.
+MODULE_NODES: Tuple[ModuleNode, ...] = (
+    ModuleNode("operators", "operator_scores",
+               lambda eng, ops, s: eng.operator_engine.calculate_all_derived(ops),
+               intermediates=("klesha_total", "maya_effective", "ego_separation",
+                              "grace_availability", "resistance")),
+    ModuleNode("drives", "drives_profile",
+               lambda eng, ops, s: eng.drives_engine.calculate_all_drives(ops, s),
+               intermediates=("ego_separation",), requires_s_level=True),
+    ModuleNode("matrices", "matrices_profile",
+               lambda eng, ops, s: eng.matrices_engine.calculate_all_matrices(ops, s),
+               intermediates=("ego_separation",), requires_s_level=True),
+    ModuleNode("pathways", "pathways_profile",
+               lambda eng, ops, s: eng.pathways_engine.calculate_all_pathways(ops, s),
+               requires_s_level=True),
+    ModuleNode("cascade", "cascade_profile",
+               lambda eng, ops, s: eng.cascade_calculator.calculate_cascade(ops)),
+    ModuleNode("emotions", "emotion_profile",
+               lambda eng, ops, s: eng.emotion_analyzer.analyze(ops)),
+    ModuleNode("death", "death_profile",
+               lambda eng, ops, s: eng.death_engine.calculate_death_profile(ops, s),
+               intermediates=("ego_separation",), requires_s_level=True),
+    ModuleNode("collective", "collective_profile", _compute_collective,
+               requires_s_level=True),
+    ModuleNode("circles", "circles_profile",
+               lambda eng, ops, s: eng.circles_engine.calculate_circles_profile(ops, s),
+               requires_s_level=True),
+    ModuleNode("kosha", "kosha_profile",
+               lambda eng, ops, s: eng.kosha_engine.calculate_kosha_profile(ops, s),
+               requires_s_level=True),
+    ModuleNode("osafc", "osafc_profile",
+               lambda eng, ops, s: eng.osafc_engine.calculate_osafc_profile(ops, s),
+               requires_s_level=True),
+    ModuleNode("distortions", "distortion_profile",
+               lambda eng, ops, s: eng.distortion_engine.calculate_distortion_profile(ops, s),
+               requires_s_level=True),
+    ModuleNode("panchakritya", "panchakritya_profile",
+               lambda eng, ops, s: eng.panchakritya_engine.calculate_panchakritya_profile(ops, s),
+               requires_s_level=True),
+    # Part XI Advanced Math modules
+    ModuleNode("advanced_math", "advanced_math_profile",
+               lambda eng, ops, s: eng.advanced_math_engine.calculate_full_profile(ops, s),
+               requires_s_level=True),
+    ModuleNode("hierarchical", "hierarchical_profile", _compute_hierarchical),
+    ModuleNode("platform", "platform_profile", _compute_platform,
+               requires_s_level=True),
+    ModuleNode("multi_reality", "multi_reality_profile", _compute_multi_reality,
+               requires_s_level=True),
+    ModuleNode("timeline", "timeline_profile",
+               lambda eng, ops, s: eng.evolution_engine.calculate_full_evolution_dynamics(ops, s),
+               requires_s_level=True),
+    # Additional calculation modules
+    ModuleNode("dynamics", "dynamics_profile",
+               lambda eng, ops, s: eng.dynamics_engine.calculate_all(ops)),
+    ModuleNode("network", "network_profile", _compute_network,
+               requires_s_level=True),
+    ModuleNode("quantum", "quantum_profile",
+               lambda eng, ops, s: eng.quantum_engine.calculate_quantum_state(ops, s),
+               requires_s_level=True),
+    ModuleNode("realism", "realism_profile",
+               lambda eng, ops, s: eng.realism_engine.calculate_realism_profile(ops, s),
+               requires_s_level=True),
+    ModuleNode("unity", "unity_profile", _compute_unity,
+               requires_s_level=True),
+)
+
+DEFAULT_MODULES: Tuple[str, ...] = tuple(node.name for node in MODULE_NODES)
+
+
+# =============================================================================
+# SCHEDULER
+# =============================================================================
+
+class ModuleScheduler:
+    """
+    Plans and executes module graphs for OOFInferenceEngine.
+
+    Independent modules within a wave are submitted together when an
+    executor is supplied; without one they run inline, which is the fastest
+    option for pure-Python formulas under the GIL.
+    """
+
+    def __init__(
+        self,
+        modules: Iterable[ModuleNode] = MODULE_NODES,
+        intermediates: Iterable[IntermediateNode] = INTERMEDIATE_NODES
+    ):
+        self.modules: Dict[str, ModuleNode] = {node.name: node for node in modules}
+        self.intermediates: Dict[str, IntermediateNode] = {node.name: node for node in intermediates}
+        self._order = {name: i for i, name in enumerate(self.modules)}
+        self._plans: Dict[Tuple[FrozenSet[str], bool], ExecutionPlan] = {}
+        self._validate()
+
+    def _validate(self) -> None:
+        """Reject unknown references and cycles at construction time."""
+        for node in self.modules.values():
+            for dep in node.after:
+                if dep not in self.modules:
+                    raise ValueError(f"Module '{node.name}' depends on unknown module '{dep}'")
+            for name in node.intermediates:
+                if name not in self.intermediates:
+                    raise ValueError(f"Module '{node.name}' reads unknown intermediate '{name}'")
+        for node in self.intermediates.values():
+            for dep in node.after:
+                if dep not in self.intermediates:
+                    raise ValueError(f"Intermediate '{node.name}' depends on unknown intermediate '{dep}'")
+        self._topological(self.modules, set(self.modules))
+        self._topological(self.intermediates, set(self.intermediates))
+
+    @staticmethod
+    def _topological(nodes: Dict[str, Any], selected: set) -> List[Tuple[str, ...]]:
+        """Group selected nodes into dependency waves (Kahn's algorithm)."""
+        remaining = {name: {d for d in nodes[name].after if d in selected} for name in selected}
+        waves: List[Tuple[str, ...]] = []
+        done: set = set()
+        order = {name: i for i, name in enumerate(nodes)}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if deps <= done]
+            if not ready:
+                raise ValueError(f"Dependency cycle among: {sorted(remaining)}")
+            ready.sort(key=order.__getitem__)
+            waves.append(tuple(ready))
+            done.update(ready)
+            for name in ready:
+                del remaining[name]
+        return waves
+
+    def plan(self, include_modules: Iterable[str], has_s_level: bool) -> ExecutionPlan:
+        """
+        Resolve the execution plan for a set of requested modules.
+
+        Unknown module names are ignored. Dependencies declared via `after`
+        are pulled in; modules needing an s_level (and anything depending on
+        them) are skipped when `has_s_level` is False.
+        """
+        key = (frozenset(include_modules), has_s_level)
+        plan = self._plans.get(key)
+        if plan is not None:
+            return plan
+
+        # Close over `after` dependencies
+        selected: set = set()
+        stack = [name for name in key[0] if name in self.modules]
+        while stack:
+            name = stack.pop()
+            if name in selected:
+                continue
+            selected.add(name)
+            stack.extend(self.modules[name].after)
+
+        # Prune anything that cannot run without an s_level
+        skipped: set = set()
+        if not has_s_level:
+            changed = True
+            while changed:
+                changed = False
+                for name in selected - skipped:
+                    node = self.modules[name]
+                    if node.requires_s_level or any(dep in skipped for dep in node.after):
+                        skipped.add(name)
+                        changed = True
+        runnable = selected - skipped
+
+        # Only the intermediates that a runnable module consumes (plus their deps)
+        needed: set = set()
+        stack = [i for name in runnable for i in self.modules[name].intermediates]
+        while stack:
+            name = stack.pop()
+            if name in needed:
+                continue
+            needed.add(name)
+            stack.extend(self.intermediates[name].after)
+
+        plan = ExecutionPlan(
+            intermediates=tuple(n for wave in self._topological(self.intermediates, needed) for n in wave),
+            waves=tuple(self._topological(self.modules, runnable)),
+            skipped=tuple(sorted((n for n in skipped if n in key[0]), key=self._order.__getitem__)),
+        )
+        self._plans[key] = plan
+        logger.debug(
+            f"[plan] modules={len(plan.modules)} waves={len(plan.waves)} "
+            f"intermediates={list(plan.intermediates)} skipped={list(plan.skipped)}"
+        )
+        return plan
+
+    def compute_intermediates(self, engine: Any, snapshot: OperatorSnapshot, plan: ExecutionPlan) -> None:
+        """Fill snapshot.intermediates in dependency order."""
+        for name in plan.intermediates:
+            snapshot.intermediates[name] = self.intermediates[name].compute(engine, snapshot)
+
+    def execute(
+        self,
+        engine: Any,
+        operators: Dict[str, float],
+        s_level: Optional[float],
+        plan: ExecutionPlan,
+        executor: Optional[Executor] = None
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Run a plan.
+
+        Returns:
+            (results keyed by IntegratedProfile field, computed module names
+            in canonical order)
+        """
+        snapshot = OperatorSnapshot(operators)
+        self.compute_intermediates(engine, snapshot, plan)
+
+        results: Dict[str, Any] = {}
+        computed: List[str] = []
+        for wave in plan.waves:
+            if executor is not None and len(wave) > 1:
+                futures = {
+                    name: executor.submit(self.modules[name].compute, engine, snapshot, s_level)
+                    for name in wave
+                }
+                outputs = {name: future.result() for name, future in futures.items()}
+            else:
+                outputs = {name: self.modules[name].compute(engine, snapshot, s_level) for name in wave}
+            for name, value in outputs.items():
+                if value is NOT_COMPUTED:
+                    continue
+                results[self.modules[name].output] = value
+                computed.append(name)
+
+        computed.sort(key=self._order.__getitem__)
+        return results, computed
+
+
+# Shared scheduler over the default graph (plans are cached per request shape)
+default_scheduler = ModuleScheduler()
@@ -22,6 +22,7 @@ from typing import Dict, List, Optional, Tuple
 from enum import Enum
 
 from logging_config import get_logger
+from .intermediates import shared_intermediate
 logger = get_logger('formulas.operators')
 
 
@@ -822,6 +823,7 @@ class OperatorEngine:
         return [name for name, op in self.operators.items()
                 if op.category == category]
 
+    @shared_intermediate("klesha_total")
     def calculate_klesha_total(self, values: Dict[str, float]) -> Optional[float]:
         """
         Calculate total Klesha (KL) from five sub-components.
@@ -845,6 +847,7 @@ class OperatorEngine:
         logger.debug(f"[calculate_klesha_total] result: kl_total={result:.3f}, available={len(available)}/5")
         return result
 
+    @shared_intermediate("maya_effective")
     def calculate_maya_effective(self, values: Dict[str, float]) -> Optional[float]:
         """
         Calculate effective Maya distortion.
@@ -892,6 +895,7 @@ class OperatorEngine:
         logger.debug(f"[calculate_consciousness_quality] result: psi_quality={result:.3f}")
         return result
 
+    @shared_intermediate("grace_availability")
     def calculate_grace_availability(self, values: Dict[str, float]) -> Optional[float]:
         """
         Calculate Grace availability.
@@ -937,6 +941,7 @@ class OperatorEngine:
         logger.debug(f"[calculate_karma_binding] result: k_bind={result:.3f}")
         return result
 
+    @shared_intermediate("ego_separation")
     def calculate_ego_separation(self, values: Dict[str, float]) -> Optional[float]:
         """
         Calculate ego separation factor.
@@ -957,6 +962,7 @@ class OperatorEngine:
         logger.debug(f"[calculate_ego_separation] result: ego_sep={result:.3f}")
         return result
 
+    @shared_intermediate("resistance")
     def calculate_resistance(self, values: Dict[str, float]) -> Optional[float]:
         """
         Calculate resistance to evolution.
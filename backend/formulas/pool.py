@@ -0,0 +1,421 @@
+"""
+OOF Framework - Process Pool for Formula Work
+=============================================
+
+Formula evaluation is pure-Python CPU work. asyncio.to_thread keeps it off
+the event loop, but concurrent inferences still share one core through
+the GIL. `FormulaPool` runs it in warm worker processes instead. Each
+worker builds its engines once, through engine_registry, and warms them
+with one synthetic request in the initializer.
+
+- Requests are compact: operators travel as a float tuple in
+  OPERATOR_COLUMNS order (NaN = missing), plus the S-level and the
+  goal_text/goal_category pair. Results come back as the same plain
+  dicts/lists the in-process calls return.
+- Each worker is its own single-process executor, so calls for one session
+  are routed to the same worker (crc32 of the key). The session's
+  incremental-inference trace stays in that worker and continuations
+  recompute only what changed. Calls without a session key go to the
+  least-loaded worker.
+- Backpressure: at most `max_pending` calls are submitted at once; further
+  callers wait (asynchronously) and are counted as queued.
+- With no workers configured (or after a worker dies) calls run in-process
+  in a thread, exactly as before.
+
+Configuration (environment):
+    OOF_PROCESS_WORKERS          worker processes (default: cores - 1; 0 disables)
+    OOF_PROCESS_MAX_PENDING      in-flight calls across the pool (default: 4 per worker)
+    OOF_PROCESS_START_METHOD     multiprocessing start method (default: spawn)
+"""
+
+import asyncio
+import math
+import multiprocessing
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from logging_config import inference_logger
+from pipeline_metrics import get_pipeline_metrics
+from .batch import OPERATOR_COLUMNS
+
+
+OperatorVector = Tuple[float, ...]
+GoalKey = Optional[Tuple[Optional[str], Optional[str]]]
+
+_COLUMN_INDEX = MappingProxyType({name: i for i, name in enumerate(OPERATOR_COLUMNS)})
+
+
+# =============================================================================
+# WIRE FORMAT
+# =============================================================================
+
+def encode_operators(operators: Dict[str, float]) -> Tuple[OperatorVector, Optional[Dict[str, float]]]:
+    """
+    Operators as a float tuple in OPERATOR_COLUMNS order (NaN = missing).
+    Names outside the canonical columns are returned separately.
+    """
+    values = [math.nan] * len(OPERATOR_COLUMNS)
+    extras: Optional[Dict[str, float]] = None
+    for name, value in operators.items():
+        index = _COLUMN_INDEX.get(name)
+        if index is None:
+            extras = extras or {}
+            extras[name] = value
+        elif value is not None:
+            values[index] = float(value)
+    return tuple(values), extras
+
+
+def decode_operators(values: Sequence[float], extras: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    """Inverse of encode_operators."""
+    operators = {name: value for name, value in zip(OPERATOR_COLUMNS, values) if not math.isnan(value)}
+    if extras:
+        operators.update(extras)
+    return operators
+
+
+def _goal_key(goal_context: Optional[Dict[str, Any]]) -> GoalKey:
+    if not goal_context:
+        return None
+    return goal_context.get('goal_text'), goal_context.get('goal_category')
+
+
+def _goal_context(goal: GoalKey) -> Optional[Dict[str, Any]]:
+    if goal is None:
+        return None
+    return {'goal_text': goal[0], 'goal_category': goal[1]}
+
+
+# =============================================================================
+# WORKER SIDE (module-level so they pickle by reference)
+# =============================================================================
+
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker() -> None:
+    """Import formulas, then build and warm the engines once per worker process."""
+    from engine_registry import get_engine_registry
+    from .incremental import IncrementalInference, TraceStore
+
+    registry = get_engine_registry()
+    registry.warm()
+    _worker['engine'] = registry.engine
+    _worker['memo'] = registry.memo
+    _worker['classifier'] = registry.goal_classifier
+    _worker['incremental'] = IncrementalInference(registry.engine)
+    _worker['traces'] = TraceStore()
+
+
+def _worker_ping() -> int:
+    return os.getpid()
+
+
+def _worker_infer(
+    values: OperatorVector,
+    extras: Optional[Dict[str, float]],
+    s_level: Optional[float],
+    goal: GoalKey,
+    session_key: Optional[str]
+) -> Tuple[dict, Optional[Dict[str, float]]]:
+    """
+    engine.infer; with a session key, an incremental update of that
+    session's trace. Returns the result and, for traced runs, the per-module
+    durations (recorded in the parent, where the metrics are served).
+    """
+    operators = decode_operators(values, extras)
+    goal_context = _goal_context(goal)
+    if session_key is None:
+        return _worker['engine'].infer(operators, s_level, goal_context), None
+    traces = _worker['traces']
+    entry = traces.get(session_key) or {}
+    trace = _worker['incremental'].update(entry.get('trace'), operators, s_level, goal_context)
+    traces.put(session_key, {'trace': trace})
+    return trace.result, trace.module_seconds
+
+
+def _worker_forget(session_key: str) -> bool:
+    return _worker['traces'].pop(session_key) is not None
+
+
+def _worker_profile_values(values: OperatorVector, extras: Optional[Dict[str, float]], s_level: Optional[float]) -> dict:
+    """Flattened profile values (the IntegratedProfile itself stays in the worker)."""
+    _profile, flat_values = _worker['memo'].profile(decode_operators(values, extras), s_level)
+    return flat_values
+
+
+def _worker_classify_goals(call1_output: dict, existing_goals: Optional[list]) -> list:
+    return _worker['classifier'].classify(call1_output, existing_goals=existing_goals)
+
+
+# =============================================================================
+# POOL
+# =============================================================================
+
+def _default_workers() -> int:
+    configured = os.getenv("OOF_PROCESS_WORKERS")
+    if configured is not None:
+        return max(0, int(configured))
+    return max(0, (os.cpu_count() or 1) - 1)
+
+
+class _Worker:
+    """One single-process executor plus its load counters."""
+
+    def __init__(self, index: int, mp_context: Any):
+        self.index = index
+        self.mp_context = mp_context
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.restarts = 0
+
+    def ensure(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=1, mp_context=self.mp_context, initializer=_init_worker
+            )
+        return self.executor
+
+    def reset(self) -> None:
+        """Drop a broken executor; the next call starts a fresh process."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = None
+        self.restarts += 1
+
+
+class FormulaPool:
+    """
+    Warm worker processes for formula evaluation.
+
+    Usage:
+        pool = get_formula_pool()
+        await pool.start()                                     # in lifespan
+        result = await pool.infer(operators, s_level, goal_context, session_key=session_id)
+        values = await pool.profile_values(operators, s_level)
+        skeletons = await pool.classify_goals(call1_output, existing_goals)
+        pool.shutdown()
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        start_method: Optional[str] = None,
+        local_engine: Optional[Any] = None
+    ):
+        self.workers = _default_workers() if workers is None else max(0, workers)
+        default_pending = int(os.getenv("OOF_PROCESS_MAX_PENDING", "0")) or 4 * max(1, self.workers)
+        self.max_pending = max_pending or default_pending
+        self.start_method = start_method or os.getenv("OOF_PROCESS_START_METHOD", "spawn")
+        self._local_engine = local_engine
+
+        self._workers: List[_Worker] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._queued = 0
+        self._max_queued = 0
+        self._queue_wait_total = 0.0
+        self._run_time_total = 0.0
+        self._submitted = 0
+        self._local_runs = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    def _ensure_workers(self) -> None:
+        if self._workers or not self.enabled:
+            return
+        mp_context = multiprocessing.get_context(self.start_method)
+        self._workers = [_Worker(i, mp_context) for i in range(self.workers)]
+
+    async def start(self) -> None:
+        """Spawn the workers and wait until each has built its engines."""
+        if not self.enabled:
+            inference_logger.info("[FormulaPool] Disabled (OOF_PROCESS_WORKERS=0), formulas run in-process")
+            return
+        self._ensure_workers()
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        pids = await asyncio.gather(*(
+            loop.run_in_executor(worker.ensure(), _worker_ping) for worker in self._workers
+        ))
+        inference_logger.info(
+            f"[FormulaPool] {len(pids)} warm workers ready in {time.perf_counter() - started:.2f}s "
+            f"(pids={pids}, max_pending={self.max_pending}, start_method={self.start_method})"
+        )
+
+    def shutdown(self) -> None:
+        for worker in self._workers:
+            if worker.executor is not None:
+                worker.executor.shutdown(wait=False, cancel_futures=True)
+                worker.executor = None
+
+    # -------------------------------------------------------------------------
+    # Dispatch
+    # -------------------------------------------------------------------------
+
+    def _pick(self, session_key: Optional[str]) -> _Worker:
+        if session_key is not None:
+            return self._workers[zlib.crc32(session_key.encode("utf-8")) % len(self._workers)]
+        return min(self._workers, key=lambda w: w.in_flight)
+
+    async def _submit(
+        self,
+        fn: Callable[..., Any],
+        args: tuple,
+        local: Callable[[], Any],
+        session_key: Optional[str] = None
+    ) -> Any:
+        """Run `fn(*args)` in a worker, or `local()` in a thread when the pool is off."""
+        if not self.enabled:
+            self._local_runs += 1
+            return await asyncio.to_thread(local)
+
+        self._ensure_workers()
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+
+        queued_at = time.perf_counter()
+        self._queued += 1
+        self._max_queued = max(self._max_queued, self._queued)
+        try:
+            await self._slots.acquire()
+        finally:
+            self._queued -= 1
+        self._queue_wait_total += time.perf_counter() - queued_at
+
+        worker = self._pick(session_key)
+        worker.in_flight += 1
+        self._submitted += 1
+        started = time.perf_counter()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(worker.ensure(), fn, *args)
+            worker.completed += 1
+            return result
+        except BrokenProcessPool:
+            worker.failed += 1
+            worker.reset()
+            inference_logger.error(f"[FormulaPool] Worker {worker.index} died; running this call in-process")
+            self._local_runs += 1
+            return await asyncio.to_thread(local)
+        except Exception:
+            worker.failed += 1
+            raise
+        finally:
+            worker.in_flight -= 1
+            self._run_time_total += time.perf_counter() - started
+            self._slots.release()
+
+    def _engine(self) -> Any:
+        if self._local_engine is None:
+            from .memo import get_inference_memo
+            self._local_engine = get_inference_memo().engine
+        return self._local_engine
+
+    async def infer(
+        self,
+        operators: Dict[str, float],
+        s_level: Optional[float],
+        goal_context: Optional[Dict[str, Any]] = None,
+        session_key: Optional[str] = None,
+        local: Optional[Callable[[], dict]] = None
+    ) -> dict:
+        """
+        engine.infer in a worker. With `session_key` the worker keeps the
+        session's trace and continuations update it incrementally.
+        `local` replaces the in-process fallback (default: engine.infer).
+        """
+        values, extras = encode_operators(operators)
+        fallback = local or (lambda: self._engine().infer(operators, s_level, goal_context))
+        result, module_seconds = await self._submit(
+            _worker_infer,
+            (values, extras, s_level, _goal_key(goal_context), session_key),
+            lambda: (fallback(), None),
+            session_key=session_key
+        )
+        if module_seconds:
+            get_pipeline_metrics().observe_modules(module_seconds)
+        return result
+
+    async def profile_values(self, operators: Dict[str, float], s_level: Optional[float]) -> dict:
+        """Flattened full profile (engine._flatten_profile) in a worker."""
+        values, extras = encode_operators(operators)
+
+        def local() -> dict:
+            from .memo import get_inference_memo
+            return get_inference_memo().profile(operators, s_level)[1]
+
+        return await self._submit(_worker_profile_values, (values, extras, s_level), local)
+
+    async def classify_goals(self, call1_output: dict, existing_goals: Optional[list] = None) -> list:
+        """GoalClassifier.classify in a worker."""
+        def local() -> list:
+            from engine_registry import get_engine_registry
+            return get_engine_registry().goal_classifier.classify(call1_output, existing_goals=existing_goals)
+
+        return await self._submit(_worker_classify_goals, (call1_output, existing_goals), local)
+
+    async def forget(self, session_key: str) -> None:
+        """Drop a finished session's trace from its worker."""
+        if not self.enabled or not self._workers:
+            return
+        worker = self._pick(session_key)
+        if worker.executor is None:
+            return
+        try:
+            await asyncio.get_running_loop().run_in_executor(worker.executor, _worker_forget, session_key)
+        except BrokenProcessPool:
+            worker.reset()
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, per-worker load and average wait/run times."""
+        submitted = self._submitted
+        return {
+            "enabled": self.enabled,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "queued": self._queued,
+            "max_queued": self._max_queued,
+            "in_flight": sum(w.in_flight for w in self._workers),
+            "submitted": submitted,
+            "local_runs": self._local_runs,
+            "avg_queue_wait_ms": round(self._queue_wait_total / submitted * 1000, 3) if submitted else 0.0,
+            "avg_run_ms": round(self._run_time_total / submitted * 1000, 3) if submitted else 0.0,
+            "per_worker": [
+                {
+                    "in_flight": w.in_flight,
+                    "completed": w.completed,
+                    "failed": w.failed,
+                    "restarts": w.restarts,
+                    "alive": w.executor is not None,
+                }
+                for w in self._workers
+            ],
+        }
+
+
+_shared_pool: Optional[FormulaPool] = None
+
+
+def get_formula_pool() -> FormulaPool:
+    """Process-wide pool shared by the SSE endpoints and goal discovery."""
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = FormulaPool()
+    return _shared_pool
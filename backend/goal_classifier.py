@@ -14,15 +14,18 @@ classification decisions.
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any, Set, Tuple
 from enum import Enum
+import copy
 import hashlib
 import re
 
 from formulas.inference import OOFInferenceEngine, IntegratedProfile
+from formulas.memo import InferenceMemo
 from formulas.operators import CANONICAL_OPERATOR_NAMES, SHORT_TO_CANONICAL
 from bottleneck_detector import BottleneckDetector
 from leverage_identifier import LeverageIdentifier
 from value_organizer import ValueOrganizer
 from consciousness_state import ConsciousnessState, Bottleneck, LeveragePoint
+from reverse_causality import ReverseCausalityEngine
 
 
 class GoalType(Enum):
@@ -94,6 +97,8 @@ class GoalSkeleton:
     source_files: List[str]
     classification_reason: str
     consciousness_context: Optional[Dict[str, Any]] = None
+    # Reverse-mapped operator shift toward the goal's outcome (not sent to Call 2)
+    transformation: Optional[Dict[str, Any]] = None
     # Call 2 will fill these
     identity: Optional[str] = None
     first_move: Optional[str] = None
@@ -118,6 +123,31 @@ THRESHOLDS = {
     # S-level thresholds
     "S_LEVEL_TRANSITION": 5.0,
     "S_LEVEL_ADVANCED": 6.5,
+    # Reverse-mapping targets
+    "OUTCOME_TARGET": 0.70,
+    "OUTCOME_MIN_LIFT": 0.10,
+    "OUTCOME_MAX": 0.95,
+}
+
+# Reverse-causality outcome each goal type moves toward
+GOAL_TYPE_OUTCOMES = {
+    GoalType.OPTIMIZE: "manifestation_power",
+    GoalType.TRANSFORM: "transformation_velocity",
+    GoalType.DISCOVER: "wisdom_access",
+    GoalType.PROTECT: "peace_depth",
+    GoalType.RESOLVE: "peace_depth",
+    GoalType.BUILD: "manifestation_power",
+    GoalType.ALIGN: "grace_availability",
+    GoalType.LEVERAGE: "manifestation_power",
+    GoalType.RELEASE: "karma_burn_rate",
+    GoalType.QUANTUM: "breakthrough_probability",
+    GoalType.HIDDEN: "wisdom_access",
+    GoalType.INTEGRATION: "s_level_potential",
+    GoalType.DIFFERENTIATION: "creative_flow",
+    GoalType.ANTI_SILOING: "love_capacity",
+    GoalType.SYNTHESIS: "creative_flow",
+    GoalType.RECONCILIATION: "peace_depth",
+    GoalType.ARBITRAGE: "manifestation_power",
 }
 
 
@@ -130,11 +160,21 @@ class GoalClassifier:
     - Full OOF inference engine derived values (287 formulas)
     """
 
-    def __init__(self):
-        self.inference_engine = OOFInferenceEngine()
-        self.bottleneck_detector = BottleneckDetector()
-        self.leverage_identifier = LeverageIdentifier()
-        self.value_organizer = ValueOrganizer()
+    def __init__(
+        self,
+        inference_memo: Optional[InferenceMemo] = None,
+        bottleneck_detector: Optional[BottleneckDetector] = None,
+        leverage_identifier: Optional[LeverageIdentifier] = None,
+        value_organizer: Optional[ValueOrganizer] = None,
+        reverse_engine: Optional[ReverseCausalityEngine] = None
+    ):
+        """Components default to new instances; engine_registry passes its shared ones."""
+        self.inference_memo = inference_memo
+        self.inference_engine = inference_memo.engine if inference_memo is not None else OOFInferenceEngine()
+        self.bottleneck_detector = bottleneck_detector or BottleneckDetector()
+        self.leverage_identifier = leverage_identifier or LeverageIdentifier()
+        self.value_organizer = value_organizer or ValueOrganizer()
+        self.reverse_engine = reverse_engine or ReverseCausalityEngine()
 
     def classify(
         self,
@@ -188,6 +228,9 @@ class GoalClassifier:
             goal_candidates, indexed_signals, consciousness_state, profile
         )
 
+        # Step 9: Reverse-map every skeleton in one batch
+        self._attach_transformations(skeletons, profile)
+
         return [self._skeleton_to_dict(s) for s in skeletons]
 
     # =========================================================================
@@ -221,12 +264,15 @@ class GoalClassifier:
         # Extract S-level
         s_level = self._parse_s_level(call1_output.get("s_level"))
 
-        # Run full OOF inference
-        profile = self.inference_engine.calculate_full_profile(operators, s_level)
+        # Run full OOF inference (memoized when a shared memo is attached)
+        if self.inference_memo is not None and self.inference_memo.engine is self.inference_engine:
+            profile, flat_values = self.inference_memo.profile(operators, s_level)
+        else:
+            profile = self.inference_engine.calculate_full_profile(operators, s_level)
+            flat_values = self.inference_engine._flatten_profile(profile, {})
 
         # Build ConsciousnessState using value organizer
         # Wrap in {'values': ...} format expected by ValueOrganizer._organize_tierN
-        flat_values = self.inference_engine._flatten_profile(profile, {})
         raw_values = {'values': flat_values}
         tier1_values = self._extract_tier1_values(profile)
         consciousness_state = self.value_organizer.organize(raw_values, tier1_values)
@@ -1074,6 +1120,63 @@ class GoalClassifier:
 
         return context
 
+    def _attach_transformations(
+        self,
+        skeletons: List[GoalSkeleton],
+        profile: IntegratedProfile
+    ) -> None:
+        """
+        Required operator shift toward each goal type's outcome, solved as one
+        batch. Skipped for outcomes whose operators were not observed.
+        """
+        current_operators = {
+            op: value for op, value in (profile.operators or {}).items()
+            if isinstance(value, (int, float))
+        }
+
+        # Skeletons of the same type share an outcome, so solve each outcome once
+        targets: Dict[str, Tuple[float, float]] = {}
+        for skeleton in skeletons:
+            outcome = GOAL_TYPE_OUTCOMES[skeleton.type]
+            if outcome in targets:
+                continue
+            current = self.reverse_engine.OUTCOME_FORMULAS[outcome]["formula"](current_operators)
+            if current is None:
+                continue
+            targets[outcome] = (current, min(
+                THRESHOLDS["OUTCOME_MAX"],
+                max(THRESHOLDS["OUTCOME_TARGET"], current + THRESHOLDS["OUTCOME_MIN_LIFT"])
+            ))
+
+        results = self.reverse_engine.solve_batch(
+            current_operators, [(outcome, target) for outcome, (_current, target) in targets.items()]
+        )
+
+        transformations: Dict[str, Dict[str, Any]] = {}
+        for (outcome, (current, target)), result in zip(targets.items(), results):
+            if result is None:
+                continue
+            transformations[outcome] = {
+                "outcome": outcome,
+                "current": round(current, 3),
+                "target": round(target, 3),
+                "achievable": result.goal_achievable,
+                "achievement_probability": round(result.achievement_probability, 3),
+                "operator_changes": [
+                    {
+                        "operator": change.operator,
+                        "from": round(change.current_value, 3),
+                        "to": round(change.required_value, 3),
+                    }
+                    for change in result.operator_changes[:3]
+                ],
+            }
+
+        for skeleton in skeletons:
+            transformation = transformations.get(GOAL_TYPE_OUTCOMES[skeleton.type])
+            if transformation is not None:
+                skeleton.transformation = copy.deepcopy(transformation)
+
     def _skeleton_to_dict(self, skeleton: GoalSkeleton) -> Dict[str, Any]:
         """Convert GoalSkeleton to dict for JSON serialization."""
         return {
@@ -1097,6 +1200,7 @@ class GoalClassifier:
             "sourceFiles": skeleton.source_files,
             "classification_reason": skeleton.classification_reason,
             "consciousness_context": skeleton.consciousness_context,
+            "transformation": skeleton.transformation,
         }
 
 
@@ -1115,5 +1219,5 @@ def classify_goals(
     Returns:
         List of goal skeletons ready for Call 2
     """
-    classifier = GoalClassifier()
-    return classifier.classify(call1_output, existing_goals)
+    from engine_registry import get_engine_registry
+    return get_engine_registry().goal_classifier.classify(call1_output, existing_goals)
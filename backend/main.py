@@ -64,6 +64,7 @@ from typing import Optional, AsyncGenerator, Dict, Any, Tuple, List
 
 from fastapi import FastAPI, Query, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from sse_starlette.sse import EventSourceResponse
 from dotenv import load_dotenv
@@ -75,10 +76,15 @@ from security.audit_logger import AuditLogger, set_audit_logger
 from security.guardrails import classify_zone, get_crisis_response, detect_locale_from_context
 from security.types import SecurityConfig
 
-from formulas import OOFInferenceEngine, CANONICAL_OPERATOR_NAMES, SHORT_TO_CANONICAL
-from value_organizer import ValueOrganizer
-from bottleneck_detector import BottleneckDetector
-from leverage_identifier import LeverageIdentifier
+from formulas import CANONICAL_OPERATOR_NAMES, SHORT_TO_CANONICAL
+from formulas.pool import get_formula_pool
+from formulas.incremental import IncrementalInference, TraceStore
+from utils.llm_client import llm_transport, get_adapter, iter_sse_json
+from structured_stream import StructuredBlockSplitter, StructuredDataParser, repair_truncated_json
+from pipeline_stages import StagePipeline
+from pipeline_metrics import get_pipeline_metrics
+from engine_registry import get_engine_registry
+from parse_service import get_parse_service
 from articulation_prompt_builder import ArticulationPromptBuilder, build_articulation_context
 from consciousness_state import ConsciousnessState
 
@@ -109,7 +115,8 @@ from reverse_causality import (
 )
 
 # SSE utilities for standardized streaming events
-from utils import sse_status, sse_token, sse_error, sse_done, sse_event
+from utils import sse_status, sse_error, sse_done, sse_event
+from sse_frames import Event, StreamEvent, TextDelta, encode_frames
 from llm_schemas import CALL1_SCHEMA, CALL1_OPENAI_SCHEMA, validate_and_log_call1, validate_and_log_call2
 
 # Load environment variables
@@ -198,6 +205,32 @@ async def lifespan(app: FastAPI):
     else:
         api_logger.info("[CACHE] No REDIS_URL found, using in-memory cache")
 
+    # Shared inference memo tier (only consulted while Redis is connected)
+    inference_memo.attach_shared_cache(cache)
+
+    # Verified auth sessions (shared tier while Redis is connected) and the
+    # background flusher for coalesced sliding-expiry writes
+    from auth_session_cache import get_auth_session_cache
+    auth_session_cache = get_auth_session_cache()
+    auth_session_cache.attach_shared_cache(cache)
+    await auth_session_cache.start()
+
+    # Audit events are queued per request and written in batches
+    await _audit_logger.start()
+
+    # Pooled LLM connections shared by every provider call
+    await llm_transport.start()
+
+    # Run one synthetic request through the shared engines so the first
+    # real request does not pay for lazily built tables
+    await engine_registry.warm_async()
+
+    # Warm formula worker processes (no-op when OOF_PROCESS_WORKERS=0)
+    await formula_pool.start()
+
+    # Upload parsing worker processes (no-op when FILE_PARSE_WORKERS=0)
+    await parse_service.start()
+
     # Connect session store to Redis if available
     if _redis_url:
         connected = await api_session_store.connect_redis(_redis_url)
@@ -225,6 +258,22 @@ async def lifespan(app: FastAPI):
     # Disconnect session store
     await api_session_store.disconnect()
 
+    # Write pending session expiry extensions
+    await auth_session_cache.aclose()
+
+    # Write queued audit events
+    await _audit_logger.aclose()
+    api_logger.info(f"[AUDIT] Audit queue drained: {_audit_logger.stats()}")
+
+    # Close pooled LLM connections
+    await llm_transport.aclose()
+
+    # Stop formula worker processes
+    formula_pool.shutdown()
+
+    # Stop upload parsing worker processes
+    parse_service.shutdown()
+
     # Disconnect cache
     await cache.disconnect()
 
@@ -499,62 +548,6 @@ def is_retryable_streaming_error(error: Exception) -> bool:
     return False
 
 
-def repair_truncated_json(text: str) -> str:
-    """
-    Repair truncated JSON from LLM responses.
-
-    LLMs sometimes produce JSON that gets cut off mid-value, leaving
-    unclosed strings, arrays, or objects. This scans the JSON structure
-    and closes anything left open.
-
-    Returns the original text if already structurally valid.
-    """
-    in_string = False
-    escape = False
-    stack = []
-
-    for ch in text:
-        if escape:
-            escape = False
-            continue
-        if in_string:
-            if ch == '\\':
-                escape = True
-            elif ch == '"':
-                in_string = False
-            continue
-        if ch == '"':
-            in_string = True
-        elif ch == '{':
-            stack.append('}')
-        elif ch == '[':
-            stack.append(']')
-        elif ch in ('}', ']') and stack and stack[-1] == ch:
-            stack.pop()
-
-    if not stack and not in_string:
-        return text
-
-    repaired = text
-
-    # Close truncated string
-    if in_string:
-        if repaired.endswith('\\'):
-            repaired = repaired[:-1]
-        repaired += '"'
-
-    # Strip trailing comma/colon left from truncation
-    repaired = repaired.rstrip()
-    while repaired and repaired[-1] in (',', ':'):
-        repaired = repaired[:-1].rstrip()
-
-    # Close all open structures
-    for closer in reversed(stack):
-        repaired += closer
-
-    return repaired
-
-
 # API Configuration - Multi-model support
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
@@ -607,13 +600,87 @@ def get_model_config(model: str) -> dict:
         raise ValueError(f"Unknown model: {model}. Available models: {list(MODEL_CONFIGS.keys())}")
     return {"model": model, **MODEL_CONFIGS[model]}
 
+# Shared engines (inference, articulation bridge, goal classifier), warmed in lifespan
+engine_registry = get_engine_registry()
+
 # Initialize inference engine (single unified engine)
-inference_engine = OOFInferenceEngine()
+inference_engine = engine_registry.engine
+
+# Memoized run_inference shared with goal discovery (L2 attached in lifespan)
+inference_memo = engine_registry.memo
+
+# Incremental re-inference for constellation continuations: the first turn
+# records which operators each module and state section read, so /run/continue
+# recomputes only what the answer changed
+incremental_inference = IncrementalInference(inference_engine)
+continuation_state = TraceStore()
+
+# Warm worker processes for CPU-bound formula work. Sessions are pinned to a
+# worker, which keeps their incremental trace; disabled -> in-process threads
+formula_pool = get_formula_pool()
+
+# Process pool + content-hash cache for uploaded files (chat and goal discovery)
+parse_service = get_parse_service()
+
+# Per-stage latency and token histograms, served at /health/metrics
+pipeline_metrics = get_pipeline_metrics()
+
+
+def _traced_compute(session_id: str):
+    """Memo compute hook that runs, or incrementally updates, the session's traced inference."""
+    def compute(operators: Dict[str, float], s_level: Optional[float], goal_context: Optional[dict]) -> dict:
+        entry = continuation_state.get(session_id) or {}
+        trace = incremental_inference.update(entry.get('trace'), operators, s_level, goal_context)
+        continuation_state.put(session_id, {**entry, 'trace': trace})
+        pipeline_metrics.observe_modules(trace.module_seconds)
+        return trace.result
+
+    if not formula_pool.enabled:
+        return compute
+
+    async def pooled_compute(operators: Dict[str, float], s_level: Optional[float], goal_context: Optional[dict]) -> dict:
+        return await formula_pool.infer(
+            operators, s_level, goal_context, session_key=session_id,
+            local=lambda: compute(operators, s_level, goal_context)
+        )
+    return pooled_compute
+
+
+def _organize_for_session(
+    session_id: str,
+    posteriors: dict,
+    evidence: dict,
+    state_session_id: str = ""
+) -> ConsciousnessState:
+    """Organize posteriors, patching the session's previous state when there is one."""
+    entry = continuation_state.get(session_id) or {}
+    state = entry.get('state')
+    value_reads = entry.get('value_reads') or {}
+    if state is not None:
+        value_organizer.patch(
+            state, posteriors, evidence, entry.get('values') or {}, value_reads,
+            session_id=state_session_id
+        )
+    else:
+        state = value_organizer.organize(
+            raw_values=posteriors,
+            tier1_values=evidence,
+            user_id="",
+            session_id=state_session_id,
+            value_reads=value_reads
+        )
+    continuation_state.put(session_id, {
+        **entry,
+        'state': state,
+        'values': dict(posteriors.get('values') or {}),
+        'value_reads': value_reads,
+    })
+    return state
 
 # Initialize Articulation Bridge components
-value_organizer = ValueOrganizer()
-bottleneck_detector = BottleneckDetector()
-leverage_identifier = LeverageIdentifier()
+value_organizer = engine_registry.value_organizer
+bottleneck_detector = engine_registry.bottleneck_detector
+leverage_identifier = engine_registry.leverage_identifier
 prompt_builder = ArticulationPromptBuilder()
 
 # Load LLM Call 1 context (for operator extraction)
@@ -908,7 +975,7 @@ async def run_inference(
     api_logger.info(f"[WEB SEARCH] Get Data: {web_search_data}, Mine Insights: {web_search_insights}")
     # Use ping interval to keep connection alive during long LLM operations
     return EventSourceResponse(
-        inference_stream(prompt, model_config, web_search_data, web_search_insights),
+        encode_frames(inference_stream(prompt, model_config, web_search_data, web_search_insights)),
         media_type="text/event-stream",
         ping=15
     )
@@ -964,6 +1031,36 @@ async def process_constellation_answer(
     }
 
 
+@app.get("/pathways/rerank")
+async def rerank_pathways(
+    frontier_id: str = Query(..., description="frontier_id from the pathways event"),
+    speed: Optional[float] = Query(None, ge=0),
+    stability: Optional[float] = Query(None, ge=0),
+    effort: Optional[float] = Query(None, ge=0),
+    side_effects: Optional[float] = Query(None, ge=0),
+    success: Optional[float] = Query(None, ge=0)
+):
+    """
+    Re-rank previously generated pathways for new preference weights.
+
+    Backs the preference sliders: the dimension scores were computed when the
+    pathways were generated, so this only re-weights the cached vectors.
+    """
+    preferences = {
+        k: v for k, v in {
+            'speed': speed, 'stability': stability, 'effort': effort,
+            'side_effects': side_effects, 'success': success
+        }.items() if v is not None
+    }
+    try:
+        result = pathway_optimizer.rerank(frontier_id, preferences)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Pathways expired, rerun the analysis")
+    return _pathway_ranking_payload(result)
+
+
 @app.get("/run/continue")
 async def continue_inference(
     session_id: str = Query(..., description="Session ID to continue")
@@ -988,7 +1085,7 @@ async def continue_inference(
 
     # Use ping interval to keep connection alive during long LLM operations
     return EventSourceResponse(
-        inference_stream_continue(
+        encode_frames(inference_stream_continue(
             session_id=session_id,
             prompt=prompt,
             evidence=evidence,
@@ -997,7 +1094,7 @@ async def continue_inference(
             web_search_insights=web_search_insights,
             answer_text=selected_answer_text,
             question_text=question_text
-        ),
+        )),
         media_type="text/event-stream",
         ping=15
     )
@@ -1012,7 +1109,7 @@ async def inference_stream_continue(
     web_search_insights: bool = True,
     answer_text: str = '',
     question_text: str = ''
-) -> AsyncGenerator[dict, None]:
+) -> AsyncGenerator[Event, None]:
     """
     Continue inference pipeline after question has been answered.
 
@@ -1117,10 +1214,7 @@ especially operators that were uncertain (low confidence) in the initial extract
         api_logger.info("[STEP 2 CONTINUED] Running inference engine with enriched operators")
         yield sse_status(f"Running consciousness inference ({inference_engine.formula_count} formulas)...")
 
-        posteriors = await asyncio.to_thread(
-            inference_engine.run_inference,
-            evidence
-        )
+        posteriors = await inference_memo.run_inference_async(evidence, compute=_traced_compute(session_id))
 
         # Check for inference errors
         if posteriors.get('error'):
@@ -1140,12 +1234,8 @@ especially operators that were uncertain (low confidence) in the initial extract
         api_logger.info("[STEP 3] Articulation Bridge processing")
         yield sse_status("Organizing consciousness state into semantic categories...")
 
-        # Organize values into semantic structure
-        consciousness_state = value_organizer.organize(
-            raw_values=posteriors,
-            tier1_values=evidence,
-            session_id=session_id
-        )
+        # Organize values into semantic structure (patches the first turn's state in place)
+        consciousness_state = _organize_for_session(session_id, posteriors, evidence, state_session_id=session_id)
 
         # Detect bottlenecks
         bottlenecks = bottleneck_detector.detect(consciousness_state)
@@ -1186,7 +1276,7 @@ especially operators that were uncertain (low confidence) in the initial extract
                 api_logger.info(f"[CALL 2 TOKENS] Input: {input_tokens}, Output: {output_tokens}, Total: {total_tokens}")
             else:
                 token_count += 1
-                yield sse_token(token)
+                yield TextDelta(token)
 
         api_logger.info(f"[ARTICULATION] Streamed {token_count} tokens")
 
@@ -1202,7 +1292,7 @@ especially operators that were uncertain (low confidence) in the initial extract
         cost = (total_in * pricing["input"] + total_out * pricing["output"]) / 1_000_000
         api_logger.info(f"[TOKEN USAGE] Call 1: {c1_in}+{c1_out}={c1_in+c1_out} | Call 2: {c2_in}+{c2_out}={c2_in+c2_out} | Total: {total_in}+{total_out}={total_all} | Cost: ${cost:.6f}")
 
-        yield sse_event("usage", {
+        yield StreamEvent("usage", {
             "call1": {"input_tokens": c1_in, "output_tokens": c1_out, "total_tokens": c1_in + c1_out},
             "call2": {"input_tokens": c2_in, "output_tokens": c2_out, "total_tokens": c2_in + c2_out},
             "input_tokens": total_in,
@@ -1213,6 +1303,8 @@ especially operators that were uncertain (low confidence) in the initial extract
 
         # Cleanup
         await api_session_store.delete(session_id)
+        continuation_state.pop(session_id)
+        await formula_pool.forget(session_id)
 
         elapsed = time.time() - start_time
         api_logger.info(f"[PIPELINE COMPLETE] Total time: {elapsed:.2f}s")
@@ -1305,7 +1397,7 @@ async def inference_stream(
     web_search_data: bool = True,
     web_search_insights: bool = True,
     conversation_context: Optional[dict] = None
-) -> AsyncGenerator[dict, None]:
+) -> AsyncGenerator[Event, None]:
     """Generate SSE events for the inference pipeline with evidence enrichment and optional reverse mapping.
 
     Args:
@@ -1341,6 +1433,8 @@ async def inference_stream(
 
     # Start pipeline logging
     pipeline_logger.start_pipeline(prompt)
+    stages = StagePipeline("PIPELINE STAGES")
+    pipeline_succeeded = False
 
     try:
         # Step 0: Detect if query is future-oriented
@@ -1350,6 +1444,7 @@ async def inference_stream(
         pipeline_logger.log_step("Query Analysis", {"future_oriented": is_future_oriented, "mode": query_mode})
 
         # Build context-enhanced prompt for Call 1
+        stages.begin("context_build")
         context_enhanced_prompt = _build_context_enhanced_prompt(prompt, conversation_context)
         api_logger.info(f"[CONTEXT] Conversation context: {'provided' if conversation_context else 'none'}")
 
@@ -1368,20 +1463,36 @@ async def inference_stream(
                     })
             if context_images:
                 api_logger.info(f"[CONTEXT] Images for vision: {len(context_images)}")
+        stages.end("context_build")
+
+        # Work that does not depend on Call 1 runs alongside it
+        stages.start("prompt_scaffold", prompt_builder.build_static_sections, conversation_context)
 
         # Step 1: Parse query with OpenAI + Web Research
         api_logger.info(f"[STEP 1] Parsing query (web_search_data={web_search_data})")
         yield sse_status(f"{'Researching context and parsing' if web_search_data else 'Parsing'} query...")
 
-        evidence = await parse_query_with_web_research(context_enhanced_prompt, model_config, web_search_data, context_images)
+        stages.begin("call1")
+        evidence = await parse_query_with_web_research(
+            context_enhanced_prompt, model_config, web_search_data, context_images, stages=stages
+        )
+        stages.end("call1")
         call1_token_usage = evidence.pop('_call1_token_usage', None)
+        if call1_token_usage:
+            # Call 1 is not streamed: tokens/s over the whole response
+            pipeline_metrics.observe_llm(
+                "call1",
+                input_tokens=call1_token_usage.get("input_tokens"),
+                output_tokens=call1_token_usage.get("output_tokens"),
+                generation_seconds=stages.duration("call1.network"),
+            )
 
         # Extract and emit conversation title (generated in Call 1)
         conversation_title = evidence.pop('conversation_title', None)
         if conversation_title:
             conversation_title = conversation_title.strip().strip('"\'')  # Clean up quotes
             api_logger.info(f"[TITLE] Generated: {conversation_title}")
-            yield sse_event("title", {"title": conversation_title})
+            yield StreamEvent("title", {"title": conversation_title})
 
         obs_count = len(evidence.get('observations') or [])
         api_logger.info(f"[EVIDENCE] Extracted {obs_count} observations")
@@ -1485,10 +1596,9 @@ async def inference_stream(
         api_logger.info("[STEP 2] Running inference engine")
         yield sse_status(f"Running consciousness inference ({inference_engine.formula_count} formulas)...")
 
-        posteriors = await asyncio.to_thread(
-            inference_engine.run_inference,
-            evidence
-        )
+        stages.begin("inference")
+        posteriors = await inference_memo.run_inference_async(evidence, compute=_traced_compute(session_id))
+        stages.end("inference")
 
         # Check for inference errors
         if posteriors.get('error'):
@@ -1510,13 +1620,11 @@ async def inference_stream(
         yield sse_status("Organizing consciousness state into semantic categories...")
 
         # Organize values into semantic structure
+        stages.begin("articulation_bridge")
         articulation_logger.info("[VALUE ORGANIZER] Organizing posteriors into consciousness state")
-        consciousness_state = value_organizer.organize(
-            raw_values=posteriors,
-            tier1_values=evidence,
-            user_id="",
-            session_id=""
-        )
+        stages.begin("value_organizer")
+        consciousness_state = _organize_for_session(session_id, posteriors, evidence)
+        stages.end("value_organizer")
 
         # PURE ARCHITECTURE: Log that ALL values are being sent to LLM
         posteriors_values = posteriors.get('values')
@@ -1528,9 +1636,22 @@ async def inference_stream(
         articulation_logger.info(f"[VALUE ORGANIZER] S-Level: {f'{s_current:.1f}' if s_current is not None else 'N/C'} ({consciousness_state.tier1.s_level.label})")
         articulation_logger.debug(f"[VALUE ORGANIZER] Tier1 operators: {len(vars(consciousness_state.tier1))} fields")
 
+        # Step 3.5 starts here: reverse mapping only reads tier-1 values, so it
+        # runs in worker threads alongside bottleneck/leverage analysis
+        if is_future_oriented:
+            reverse_logger.info("[REVERSE MAPPING] Starting future-oriented transformation analysis")
+            yield sse_status("Computing transformation pathways (reverse causality mapping)...")
+            stages.start(
+                "reverse_mapping", run_reverse_mapping_for_articulation,
+                goal=evidence.get('goal'),
+                evidence=evidence,
+                consciousness_state=consciousness_state,
+                stages=stages
+            )
+
         # Detect bottlenecks
         articulation_logger.info("[BOTTLENECK DETECTOR] Analyzing bottlenecks")
-        bottlenecks = bottleneck_detector.detect(consciousness_state)
+        bottlenecks = await stages.timed("bottleneck_detection", bottleneck_detector.detect, consciousness_state)
         consciousness_state.bottlenecks = bottlenecks
         bottleneck_summary = bottleneck_detector.get_summary(bottlenecks)
         articulation_logger.info(f"[BOTTLENECK DETECTOR] Found {bottleneck_summary['total_count']} bottlenecks")
@@ -1540,28 +1661,22 @@ async def inference_stream(
 
         # Identify leverage points
         articulation_logger.info("[LEVERAGE IDENTIFIER] Identifying leverage points")
-        leverage_points = leverage_identifier.identify(consciousness_state)
+        leverage_points = await stages.timed("leverage_identification", leverage_identifier.identify, consciousness_state)
         consciousness_state.leverage_points = leverage_points
         leverage_summary = leverage_identifier.get_summary(leverage_points)
         articulation_logger.info(f"[LEVERAGE IDENTIFIER] Found {leverage_summary['total_count']} leverage points (max {leverage_summary['max_multiplier']}x)")
         for lp in leverage_points[:3]:
             articulation_logger.debug(f"  - {lp.description[:50]}... (multiplier: {lp.multiplier:.2f}x)")
         pipeline_logger.log_step("Leverage Identification", {"count": leverage_summary['total_count'], "max_mult": leverage_summary['max_multiplier']})
+        stages.end("articulation_bridge")
 
         yield sse_status(f"Analysis complete: {bottleneck_summary['total_count']} bottlenecks, {leverage_summary['total_count']} leverage points (max {leverage_summary['max_multiplier']}x)")
 
-        # Step 3.5: Run reverse mapping if future-oriented
+        # Step 3.5: Collect reverse mapping (started before bottleneck detection)
         reverse_mapping_data = None
         if is_future_oriented:
-            reverse_logger.info("[REVERSE MAPPING] Starting future-oriented transformation analysis")
-            yield sse_status("Computing transformation pathways (reverse causality mapping)...")
-
             try:
-                reverse_mapping_data = await run_reverse_mapping_for_articulation(
-                    goal=evidence.get('goal'),
-                    evidence=evidence,
-                    consciousness_state=consciousness_state
-                )
+                reverse_mapping_data = await stages.result("reverse_mapping", reraise=True)
 
                 pathway_count = reverse_mapping_data.get('pathways_generated')
                 mvt_count = reverse_mapping_data.get('mvt_operators')
@@ -1569,6 +1684,8 @@ async def inference_stream(
                 pipeline_logger.log_step("Reverse Mapping", {"pathways": pathway_count, "mvt_operators": mvt_count})
 
                 yield sse_status(f"Reverse mapping complete: {pathway_count} pathways, {mvt_count} key operators identified")
+                if reverse_mapping_data.get('pathway_ranking'):
+                    yield sse_event("pathways", reverse_mapping_data['pathway_ranking'])
             except Exception as e:
                 reverse_logger.error(f"[REVERSE MAPPING] Error: {e}", exc_info=True)
                 # Emit warning to user - pipeline can continue but reverse mapping failed
@@ -1583,17 +1700,23 @@ async def inference_stream(
         api_logger.info("[STEP 4] Generating articulation response")
         yield sse_status(f"Generating articulation with evidence enrichment ({query_mode})...")
 
-        token_count = 0
-        full_content = ""  # Collect full response for structured data extraction
-        pending_buffer = ""  # Buffer for tokens that might be part of structured data prefix
-        in_structured_block = False  # Flag to track if we're inside structured data markers
+        # Normally finished long ago; None falls back to building the sections inline
+        prebuilt_sections = await stages.result("prompt_scaffold", logger=api_logger)
+
         response_truncated = False  # Track if LLM response was truncated at max_tokens
-        # Markers to detect - look for the code block that precedes structured data
-        STRUCT_BLOCK_MARKERS = ["```json\n===", "```\n===", "===STRUCTURED_DATA_START"]
+        # Holds back the structured-data block (and any partial marker) from the token stream
+        splitter = StructuredBlockSplitter()
+        # Parses the withheld block as it arrives, one top-level member at a time
+        structured_parser = StructuredDataParser()
         call2_token_usage = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+        first_token_at = None
+        structured_parse_seconds = 0.0  # Incremental parsing, interleaved with the stream
+        stages.begin("call2")
+        stages.begin("call2.ttft")
         async for token in format_results_streaming_bridge(
             prompt, evidence, posteriors, consciousness_state, reverse_mapping_data, model_config, web_search_insights,
-            conversation_context=conversation_context
+            conversation_context=conversation_context,
+            prebuilt_sections=prebuilt_sections
         ):
             # Check if this is a token usage object (yielded at end of stream)
             if isinstance(token, dict) and token.get("__token_usage__"):
@@ -1621,65 +1744,57 @@ async def inference_stream(
                         "output_tokens": output_tokens
                     })
             else:
-                token_count += 1
-                full_content += token  # Always collect for parsing
-
-                # If already in structured block, just collect don't stream
-                if in_structured_block:
-                    continue
-
-                # Add token to pending buffer
-                pending_buffer += token
-
-                # Check if buffer contains any structured data marker
-                marker_found = False
-                marker_pos = -1
-                for marker in STRUCT_BLOCK_MARKERS:
-                    pos = pending_buffer.find(marker)
-                    if pos != -1:
-                        marker_found = True
-                        marker_pos = pos
-                        break
-
-                if marker_found:
-                    # Found marker - stream everything before it, then stop
-                    in_structured_block = True
-                    content_before_marker = pending_buffer[:marker_pos].rstrip()
-                    if content_before_marker:
-                        yield sse_token(content_before_marker)
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                    stages.end("call2.ttft")
+                # Always collected for parsing; only the safe-to-show part is streamed
+                was_in_structured_block = splitter.in_structured_block
+                span = splitter.feed(token)
+                if span:
+                    yield TextDelta(span)
+                if splitter.in_structured_block and not was_in_structured_block:
                     api_logger.debug("[STRUCTURED DATA] Detected start marker, stopping token stream")
-                else:
-                    # Check if buffer might be building toward a marker (partial match)
-                    might_be_marker = False
-                    for marker in STRUCT_BLOCK_MARKERS:
-                        # Check if end of buffer could be start of marker
-                        for i in range(1, min(len(marker), len(pending_buffer)) + 1):
-                            if pending_buffer.endswith(marker[:i]):
-                                might_be_marker = True
-                                break
-                        if might_be_marker:
-                            break
-
-                    if might_be_marker:
-                        # Hold buffer - don't stream yet, might be start of marker
-                        pass
-                    else:
-                        # Safe to stream the buffer
-                        yield sse_token(pending_buffer)
-                        pending_buffer = ""
+                if splitter.in_structured_block:
+                    # Emit each member (matrix_data, paths, documents, ...) as soon as it closes
+                    parse_started = time.perf_counter()
+                    parts = structured_parser.feed(splitter.block_text)
+                    structured_parse_seconds += time.perf_counter() - parse_started
+                    for key, value in parts:
+                        if key == "documents":
+                            normalize_dimension_values({"documents": value})
+                        yield sse_event("structured_data_part", {"key": key, "value": value})
 
         # Stream any remaining buffer that wasn't part of structured data
-        if pending_buffer and not in_structured_block:
-            yield sse_token(pending_buffer)
+        tail = splitter.finish()
+        if tail:
+            yield TextDelta(tail)
 
+        stages.end("call2")
+        token_count = splitter.token_count
         api_logger.info(f"[ARTICULATION] Streamed {token_count} tokens")
+        pipeline_metrics.observe_llm(
+            "call2",
+            input_tokens=call2_token_usage.get("input_tokens"),
+            output_tokens=call2_token_usage.get("output_tokens"),
+            generation_seconds=time.perf_counter() - first_token_at if first_token_at is not None else None,
+        )
+        pipeline_metrics.observe_stage("structured_parse.incremental", structured_parse_seconds)
 
         # Extract and emit structured data if present (with post-hoc validation)
         provider = model_config.get("provider", "LLM")
-        structured_data = extract_structured_data(full_content, provider)
+        stages.begin("structured_parse")
+        structured_data = structured_parser.result()
+        if structured_data is not None:
+            api_logger.info(f"[STRUCTURED DATA] Parsed incrementally from stream ({structured_parser.phase})")
+            structured_data = normalize_dimension_values(structured_data)
+            validate_and_log_call2(structured_data, provider)
+        else:
+            # No block seen or not parseable incrementally - full-text extraction with repair
+            structured_data = extract_structured_data(splitter.content, provider)
+        stages.end("structured_parse")
         if structured_data:
             api_logger.info(f"[STRUCTURED DATA] Extracted: matrix={bool(structured_data.get('matrix_data'))}, paths={len(structured_data.get('paths', []))}, docs={len(structured_data.get('documents', []))}")
-            yield sse_event("structured_data", structured_data)
+            yield StreamEvent("structured_data", structured_data)
         pipeline_logger.log_step("Articulation", {"tokens": token_count})
 
         # Log comprehensive evidence-grounding metrics
@@ -1717,7 +1832,7 @@ Articulation Tokens: {token_count}
         api_logger.info(f"[TOKEN USAGE] Call 1: {c1_in}+{c1_out}={c1_in+c1_out} | Call 2: {c2_in}+{c2_out}={c2_in+c2_out} | Total: {total_in}+{total_out}={total_all} | Cost: ${cost:.6f}")
 
         # Send token usage event with per-call breakdown
-        yield sse_event("usage", {
+        yield StreamEvent("usage", {
             "call1": {"input_tokens": c1_in, "output_tokens": c1_out, "total_tokens": c1_in + c1_out},
             "call2": {"input_tokens": c2_in, "output_tokens": c2_out, "total_tokens": c2_in + c2_out},
             "input_tokens": total_in,
@@ -1766,7 +1881,7 @@ Articulation Tokens: {token_count}
                     session_data['_question_asked'] = True
                     await api_session_store.update(session_id, session_data)
 
-                    yield sse_event("question", {
+                    yield StreamEvent("question", {
                         "session_id": session_id,
                         "question_id": question.question_id,
                         "question_text": question.question_text,
@@ -1790,22 +1905,35 @@ Articulation Tokens: {token_count}
             api_logger.warning(f"[PIPELINE COMPLETE] Total time: {elapsed:.2f}s | Mode: {query_mode} | RESPONSE WAS TRUNCATED")
         else:
             api_logger.info(f"[PIPELINE COMPLETE] Total time: {elapsed:.2f}s | Mode: {query_mode} | Reverse mapping: {reverse_mapping_data is not None}")
+        stages.log_summary(pipeline_logger.logger)
         pipeline_logger.end_pipeline(success=True)
+        pipeline_succeeded = True
 
         yield sse_done(
             elapsed_ms=int(elapsed * 1000),
             mode=query_mode,
             reverse_mapping_applied=reverse_mapping_data is not None,
-            truncated=response_truncated
+            truncated=response_truncated,
+            stages=stages.summary()
         )
 
     except Exception as e:
         api_logger.error(f"[PIPELINE ERROR] {type(e).__name__}: {e}", exc_info=True)
+        stages.log_summary(pipeline_logger.logger)
         pipeline_logger.end_pipeline(success=False)
         yield sse_error(str(e))
+    finally:
+        stages.cancel()
+        pipeline_metrics.record_pipeline(stages, success=pipeline_succeeded)
 
 
-async def parse_query_with_web_research(prompt: str, model_config: dict, use_web_search: bool = True, images: Optional[List[dict]] = None) -> dict:
+async def parse_query_with_web_research(
+    prompt: str,
+    model_config: dict,
+    use_web_search: bool = True,
+    images: Optional[List[dict]] = None,
+    stages: Optional[StagePipeline] = None
+) -> dict:
     """
     Use LLM API with optional web_search tool to:
     1. Research relevant context about user's query (if web search enabled)
@@ -1820,6 +1948,7 @@ async def parse_query_with_web_research(prompt: str, model_config: dict, use_web
         model_config: Model configuration (provider, api_key, model)
         use_web_search: Enable web search for data gathering
         images: Optional list of image dicts with 'name', 'base64', 'media_type' for vision support
+        stages: Optional StagePipeline; the HTTP round trip is timed as "call1.network"
     """
     provider = model_config.get("provider")
     api_key = model_config.get("api_key")
@@ -2039,7 +2168,7 @@ CRITICAL REQUIREMENTS FOR TARGET SELECTION:
             break
 
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
+            async with llm_transport.session(provider, timeout=120.0) as client:
                 if provider == "anthropic":
                     # Anthropic Claude API with optional web search and prompt caching
                     user_content_text = f"User query:\n{prompt}"
@@ -2219,19 +2348,17 @@ CRITICAL REQUIREMENTS FOR TARGET SELECTION:
                             "max_uses": 10
                         }]
 
-                    headers = {
-                        "x-api-key": api_key,
-                        "anthropic-version": "2023-06-01",
-                        "Content-Type": "application/json"
-                    }
-                    # Add web-search beta header if enabled
-                    if use_web_search:
-                        headers["anthropic-beta"] = "web-search-2025-03-05"
+                    # Web-search beta header is added by the adapter when enabled
+                    headers = get_adapter(provider).headers(api_key, web_search=use_web_search)
 
                     endpoint = model_config.get("endpoint")
 
                     api_logger.info(f"[PARSE] Calling Anthropic {model} (web_search={use_web_search}, prompt_caching=enabled)")
+                    if stages is not None:
+                        stages.begin("call1.network")
                     response = await client.post(endpoint, headers=headers, json=request_body)
+                    if stages is not None:
+                        stages.end("call1.network")
 
                     if response.status_code != 200:
                         error_text = response.text
@@ -2315,14 +2442,15 @@ CRITICAL REQUIREMENTS FOR TARGET SELECTION:
                         }]
                         request_body["tool_choice"] = "auto"
 
-                    headers = {
-                        "Authorization": f"Bearer {api_key}",
-                        "Content-Type": "application/json"
-                    }
+                    headers = get_adapter(provider).headers(api_key)
                     endpoint = model_config.get("endpoint")
 
                     api_logger.info(f"[PARSE] Calling OpenAI {model} (web_search={use_web_search})")
+                    if stages is not None:
+                        stages.begin("call1.network")
                     response = await client.post(endpoint, headers=headers, json=request_body)
+                    if stages is not None:
+                        stages.end("call1.network")
 
                     if response.status_code != 200:
                         error_text = response.text
@@ -2495,35 +2623,6 @@ CRITICAL REQUIREMENTS FOR TARGET SELECTION:
     raise RuntimeError(f"parse_query_with_web_research failed after {STREAMING_MAX_RETRIES + 1} attempts: {last_error}")
 
 
-def _extract_anthropic_text(data: dict) -> str:
-    """Extract text from Anthropic API response, handling thinking blocks."""
-    content_blocks = data.get("content", [])
-    # Find the first text block (skip thinking blocks)
-    for block in content_blocks:
-        if block.get("type") == "text":
-            return block.get("text", "")
-    # Fallback: grab first block's text if no typed blocks
-    if content_blocks:
-        return content_blocks[0].get("text", "")
-    return ""
-
-
-def _extract_openai_response_text(data: dict) -> str:
-    """Extract text from OpenAI Responses API response."""
-    # Path 1: Direct output_text field
-    if data.get("output_text"):
-        return data["output_text"]
-    # Path 2: output array with message type
-    for item in data.get("output", []):
-        if item.get("type") == "message":
-            for c in item.get("content", []):
-                if c.get("type") in ("output_text", "text"):
-                    text = c.get("text", "")
-                    if text:
-                        return text
-    return ""
-
-
 def _strip_markdown_json(text: str) -> str:
     """Strip markdown code fences from LLM JSON responses (including truncated ones)."""
     text = text.strip()
@@ -2660,66 +2759,24 @@ REQUIREMENTS:
         raise ValueError(f"No API key configured for provider: {provider}. Set {'ANTHROPIC_API_KEY' if provider == 'anthropic' else 'OPENAI_API_KEY'} in environment variables.")
 
     try:
-        async with httpx.AsyncClient(timeout=300.0) as client:
-            if provider == "anthropic":
-                headers = {
-                    "x-api-key": api_key,
-                    "anthropic-version": "2023-06-01",
-                    "Content-Type": "application/json"
-                }
-                request_body = {
-                    "model": model,
-                    "max_tokens": 4096,
-                    "messages": [{"role": "user", "content": prompt_text}]
-                }
-                response = await client.post(endpoint, headers=headers, json=request_body)
+        response_text = await llm_transport.complete_json_text(
+            provider, endpoint, api_key, model, prompt_text, 4096,
+            timeout=300.0, log_tag="DOC_PREVIEW"
+        )
 
-                if response.status_code != 200:
-                    error_detail = response.text[:500]
-                    api_logger.error(f"[DOC_PREVIEW] Anthropic error: {response.status_code} - {error_detail}")
-                    raise RuntimeError(f"Anthropic API {response.status_code}: {error_detail}")
+        # Parse JSON response (strip markdown fences if present)
+        response_text = _strip_markdown_json(response_text)
+        if not response_text:
+            api_logger.error(f"[DOC_PREVIEW] Empty response text from LLM")
+            return None
+        result = json.loads(response_text)
+        documents = result.get("documents", [])
 
-                data = response.json()
-                response_text = _extract_anthropic_text(data)
-                usage = data.get("usage", {})
-                api_logger.info(f"[DOC_PREVIEW] Tokens - Input: {usage.get('input_tokens')}, Output: {usage.get('output_tokens')}")
-            else:
-                # OpenAI-compatible
-                headers = {
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json"
-                }
-                request_body = {
-                    "model": model,
-                    "max_output_tokens": 4096,
-                    "input": [{"type": "message", "role": "user", "content": prompt_text}],
-                    "text": {"format": {"type": "json_object"}}
-                }
-                response = await client.post(endpoint, headers=headers, json=request_body)
-
-                if response.status_code != 200:
-                    error_detail = response.text[:500]
-                    api_logger.error(f"[DOC_PREVIEW] OpenAI error: {response.status_code} - {error_detail}")
-                    raise RuntimeError(f"OpenAI API {response.status_code}: {error_detail}")
-
-                data = response.json()
-                response_text = _extract_openai_response_text(data)
-                usage = data.get("usage", {})
-                api_logger.info(f"[DOC_PREVIEW] Tokens - Input: {usage.get('input_tokens')}, Output: {usage.get('output_tokens')}")
-
-            # Parse JSON response (strip markdown fences if present)
-            response_text = _strip_markdown_json(response_text)
-            if not response_text:
-                api_logger.error(f"[DOC_PREVIEW] Empty response text from LLM")
-                return None
-            result = json.loads(response_text)
-            documents = result.get("documents", [])
+        if len(documents) < count:
+            api_logger.warning(f"[DOC_PREVIEW] Only got {len(documents)} documents, expected {count}")
 
-            if len(documents) < count:
-                api_logger.warning(f"[DOC_PREVIEW] Only got {len(documents)} documents, expected {count}")
-
-            api_logger.info(f"[DOC_PREVIEW] Generated {len(documents)} documents: {[d.get('name') for d in documents]}")
-            return documents
+        api_logger.info(f"[DOC_PREVIEW] Generated {len(documents)} documents: {[d.get('name') for d in documents]}")
+        return documents
 
     except json.JSONDecodeError as e:
         api_logger.error(f"[DOC_PREVIEW] JSON parse error: {e} | raw text: {response_text[:200] if response_text else '(empty)'}")
@@ -2924,111 +2981,69 @@ REQUIREMENTS:
         raise ValueError(f"No API key configured for provider: {provider}. Set {'ANTHROPIC_API_KEY' if provider == 'anthropic' else 'OPENAI_API_KEY'} in environment variables.")
 
     try:
-        async with httpx.AsyncClient(timeout=300.0) as client:
-            if provider == "anthropic":
-                headers = {
-                    "x-api-key": api_key,
-                    "anthropic-version": "2023-06-01",
-                    "Content-Type": "application/json"
-                }
-                request_body = {
-                    "model": model,
-                    "max_tokens": 64000,
-                    "messages": [{"role": "user", "content": prompt_text}]
-                }
-                response = await client.post(endpoint, headers=headers, json=request_body)
-
-                if response.status_code != 200:
-                    error_detail = response.text[:500]
-                    api_logger.error(f"[MATRIX_GEN] Anthropic error: {response.status_code} - {error_detail}")
-                    raise RuntimeError(f"Anthropic API {response.status_code}: {error_detail}")
+        response_text = await llm_transport.complete_json_text(
+            provider, endpoint, api_key, model, prompt_text, 64000,
+            timeout=300.0, log_tag="MATRIX_GEN"
+        )
 
-                data = response.json()
-                response_text = _extract_anthropic_text(data)
-                usage = data.get("usage", {})
-                api_logger.info(f"[MATRIX_GEN] Tokens - Input: {usage.get('input_tokens')}, Output: {usage.get('output_tokens')}")
-            else:
-                # OpenAI-compatible
-                headers = {
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json"
-                }
-                request_body = {
-                    "model": model,
-                    "max_output_tokens": 64000,
-                    "input": [{"type": "message", "role": "user", "content": prompt_text}],
-                    "text": {"format": {"type": "json_object"}}
-                }
-                response = await client.post(endpoint, headers=headers, json=request_body)
-
-                if response.status_code != 200:
-                    error_detail = response.text[:500]
-                    api_logger.error(f"[MATRIX_GEN] OpenAI error: {response.status_code} - {error_detail}")
-                    raise RuntimeError(f"OpenAI API {response.status_code}: {error_detail}")
-
-                data = response.json()
-                response_text = _extract_openai_response_text(data)
-                usage = data.get("usage", {})
-                api_logger.info(f"[MATRIX_GEN] Tokens - Input: {usage.get('input_tokens')}, Output: {usage.get('output_tokens')}")
-
-            # Parse JSON response (strip markdown fences if present)
-            response_text = _strip_markdown_json(response_text)
-            if not response_text:
-                api_logger.error(f"[MATRIX_GEN] Empty response text from LLM")
-                return None
-            result = json.loads(response_text)
-            cells = result.get("cells", {})
-            leverage_points = result.get("leverage_points", [])
-            risk_analysis = result.get("risk_analysis", [])
-            plays = result.get("plays", [])
-            presets = result.get("presets", [])
-
-            # Merge: when LLM returned values-only dimensions, restore names/explanations from existing cells
-            if has_existing_dims and existing_cells:
-                for cell_key, cell_data in cells.items():
-                    dims = cell_data.get("dimensions", [])
-                    existing = existing_cells.get(cell_key, {}).get("dimensions", [])
-                    if dims and existing and isinstance(dims[0], (int, float)):
-                        # Values-only array → reconstruct full dimension objects
-                        merged = []
-                        for i, val in enumerate(dims):
-                            if i < len(existing) and isinstance(existing[i], dict):
-                                merged.append({**existing[i], "value": int(val)})
-                            else:
-                                merged.append({"name": f"Dimension {i+1}", "value": int(val), "explanation": ""})
-                        cell_data["dimensions"] = merged
-
-            cell_count = len(cells)
-            leverage_count = len(leverage_points)
-            risk_count = len(risk_analysis)
-            plays_count = len(plays)
-            presets_count = len(presets)
-
-            api_logger.info(
-                f"[MATRIX_GEN] Generated {cell_count} cells, "
-                f"{leverage_count} leverage points, {risk_count} risk points, "
-                f"{plays_count} plays, {presets_count} presets "
-                f"for document '{document_stub.get('name')}'"
-            )
+        # Parse JSON response (strip markdown fences if present)
+        response_text = _strip_markdown_json(response_text)
+        if not response_text:
+            api_logger.error(f"[MATRIX_GEN] Empty response text from LLM")
+            return None
+        result = json.loads(response_text)
+        cells = result.get("cells", {})
+        leverage_points = result.get("leverage_points", [])
+        risk_analysis = result.get("risk_analysis", [])
+        plays = result.get("plays", [])
+        presets = result.get("presets", [])
+
+        # Merge: when LLM returned values-only dimensions, restore names/explanations from existing cells
+        if has_existing_dims and existing_cells:
+            for cell_key, cell_data in cells.items():
+                dims = cell_data.get("dimensions", [])
+                existing = existing_cells.get(cell_key, {}).get("dimensions", [])
+                if dims and existing and isinstance(dims[0], (int, float)):
+                    # Values-only array → reconstruct full dimension objects
+                    merged = []
+                    for i, val in enumerate(dims):
+                        if i < len(existing) and isinstance(existing[i], dict):
+                            merged.append({**existing[i], "value": int(val)})
+                        else:
+                            merged.append({"name": f"Dimension {i+1}", "value": int(val), "explanation": ""})
+                    cell_data["dimensions"] = merged
+
+        cell_count = len(cells)
+        leverage_count = len(leverage_points)
+        risk_count = len(risk_analysis)
+        plays_count = len(plays)
+        presets_count = len(presets)
+
+        api_logger.info(
+            f"[MATRIX_GEN] Generated {cell_count} cells, "
+            f"{leverage_count} leverage points, {risk_count} risk points, "
+            f"{plays_count} plays, {presets_count} presets "
+            f"for document '{document_stub.get('name')}'"
+        )
 
-            if cell_count < 100:
-                api_logger.warning(f"[MATRIX_GEN] Only got {cell_count} cells, expected 100")
-            if leverage_count < 3:
-                api_logger.warning(f"[MATRIX_GEN] Only got {leverage_count} leverage points, expected 3-5")
-            if risk_count < 3:
-                api_logger.warning(f"[MATRIX_GEN] Only got {risk_count} risk points, expected 3-6")
-            if plays_count < 3:
-                api_logger.warning(f"[MATRIX_GEN] Only got {plays_count} plays, expected 3-5")
-            if presets_count < 5:
-                api_logger.warning(f"[MATRIX_GEN] Only got {presets_count} presets, expected 5")
-
-            return {
-                "cells": cells,
-                "leverage_points": leverage_points,
-                "risk_analysis": risk_analysis,
-                "plays": plays,
-                "presets": presets
-            }
+        if cell_count < 100:
+            api_logger.warning(f"[MATRIX_GEN] Only got {cell_count} cells, expected 100")
+        if leverage_count < 3:
+            api_logger.warning(f"[MATRIX_GEN] Only got {leverage_count} leverage points, expected 3-5")
+        if risk_count < 3:
+            api_logger.warning(f"[MATRIX_GEN] Only got {risk_count} risk points, expected 3-6")
+        if plays_count < 3:
+            api_logger.warning(f"[MATRIX_GEN] Only got {plays_count} plays, expected 3-5")
+        if presets_count < 5:
+            api_logger.warning(f"[MATRIX_GEN] Only got {presets_count} presets, expected 5")
+
+        return {
+            "cells": cells,
+            "leverage_points": leverage_points,
+            "risk_analysis": risk_analysis,
+            "plays": plays,
+            "presets": presets
+        }
 
     except json.JSONDecodeError as e:
         api_logger.error(f"[MATRIX_GEN] JSON parse error: {e} | raw text: {response_text[:200] if response_text else '(empty)'}")
@@ -3257,67 +3272,25 @@ REQUIREMENTS:
         raise ValueError(f"No API key configured for provider: {provider}. Set {'ANTHROPIC_API_KEY' if provider == 'anthropic' else 'OPENAI_API_KEY'} in environment variables.")
 
     try:
-        async with httpx.AsyncClient(timeout=300.0) as client:
-            if provider == "anthropic":
-                headers = {
-                    "x-api-key": api_key,
-                    "anthropic-version": "2023-06-01",
-                    "Content-Type": "application/json"
-                }
-                request_body = {
-                    "model": model,
-                    "max_tokens": 32000,
-                    "messages": [{"role": "user", "content": prompt_text}]
-                }
-                response = await client.post(endpoint, headers=headers, json=request_body)
-
-                if response.status_code != 200:
-                    error_detail = response.text[:500]
-                    api_logger.error(f"[INSIGHT_GEN] Anthropic error: {response.status_code} - {error_detail}")
-                    raise RuntimeError(f"Anthropic API {response.status_code}: {error_detail}")
+        response_text = await llm_transport.complete_json_text(
+            provider, endpoint, api_key, model, prompt_text, 32000,
+            timeout=300.0, log_tag="INSIGHT_GEN"
+        )
 
-                data = response.json()
-                response_text = _extract_anthropic_text(data)
-                usage = data.get("usage", {})
-                api_logger.info(f"[INSIGHT_GEN] Tokens - Input: {usage.get('input_tokens')}, Output: {usage.get('output_tokens')}")
-            else:
-                # OpenAI-compatible
-                headers = {
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json"
-                }
-                request_body = {
-                    "model": model,
-                    "max_output_tokens": 32000,
-                    "input": [{"type": "message", "role": "user", "content": prompt_text}],
-                    "text": {"format": {"type": "json_object"}}
-                }
-                response = await client.post(endpoint, headers=headers, json=request_body)
-
-                if response.status_code != 200:
-                    error_detail = response.text[:500]
-                    api_logger.error(f"[INSIGHT_GEN] OpenAI error: {response.status_code} - {error_detail}")
-                    raise RuntimeError(f"OpenAI API {response.status_code}: {error_detail}")
-
-                data = response.json()
-                response_text = _extract_openai_response_text(data)
-                usage = data.get("usage", {})
-                api_logger.info(f"[INSIGHT_GEN] Tokens - Input: {usage.get('input_tokens')}, Output: {usage.get('output_tokens')}")
-
-            # Parse JSON response (strip markdown fences if present)
-            response_text = _strip_markdown_json(response_text)
-            if not response_text:
-                api_logger.error(f"[INSIGHT_GEN] Empty response text from LLM")
-                return None
-            result = json.loads(response_text)
-            insights = result.get("insights", {})
+        # Parse JSON response (strip markdown fences if present)
+        response_text = _strip_markdown_json(response_text)
+        if not response_text:
+            api_logger.error(f"[INSIGHT_GEN] Empty response text from LLM")
+            return None
+        result = json.loads(response_text)
+        insights = result.get("insights", {})
 
-            api_logger.info(f"[INSIGHT_GEN] Generated {len(insights)} items for document '{document.get('name')}' using {model}")
+        api_logger.info(f"[INSIGHT_GEN] Generated {len(insights)} items for document '{document.get('name')}' using {model}")
 
-            if len(insights) < len(missing_indices):
-                api_logger.warning(f"[INSIGHT_GEN] Only got {len(insights)} items, expected {len(missing_indices)}")
+        if len(insights) < len(missing_indices):
+            api_logger.warning(f"[INSIGHT_GEN] Only got {len(insights)} items, expected {len(missing_indices)}")
 
-            return {"insights": insights}
+        return {"insights": insights}
 
     except json.JSONDecodeError as e:
         api_logger.error(f"[INSIGHT_GEN] JSON parse error: {e} | raw text: {response_text[:200] if response_text else '(empty)'}")
@@ -3336,7 +3309,8 @@ async def format_results_streaming_bridge(
     model_config: Optional[dict] = None,
     use_web_search: bool = True,
     conversation_context: Optional[dict] = None,
-    include_question: bool = True
+    include_question: bool = True,
+    prebuilt_sections: Optional[Dict[str, str]] = None
 ) -> AsyncGenerator[str, None]:
     """
     Unified articulation with evidence enrichment and optional reverse mapping.
@@ -3347,6 +3321,9 @@ async def format_results_streaming_bridge(
     3. Integrates reverse mapping data when available (future-oriented queries)
     4. Produces natural, domain-appropriate insights
     5. Uses conversation history and file context for continuity
+
+    prebuilt_sections: prompt sections prepared while Call 1 was running
+    (ArticulationPromptBuilder.build_static_sections)
     """
     articulation_logger.info(f"[ARTICULATION BRIDGE] Web search enabled: {use_web_search}")
     # Get model config
@@ -3439,7 +3416,7 @@ async def format_results_streaming_bridge(
     )
 
     # Build the structured articulation prompt
-    articulation_prompt = prompt_builder.build_prompt(articulation_context)
+    articulation_prompt = prompt_builder.build_prompt(articulation_context, prebuilt_sections=prebuilt_sections)
     articulation_logger.info(f"[ARTICULATION BRIDGE] Built prompt: {len(articulation_prompt)} characters")
 
     # Log evidence grounding configuration for Call 2
@@ -3645,7 +3622,7 @@ SECTION 5: FIRST STEPS
 
     for attempt in range(STREAMING_MAX_RETRIES + 1):
         try:
-            async with httpx.AsyncClient(timeout=180.0) as client:
+            async with llm_transport.session(provider, timeout=180.0) as client:
                 if provider == "anthropic":
                     # Anthropic Claude streaming API with prompt caching.
                     # SHARED_LLM_CONTEXT is the EXACT same cached block used in Call 1.
@@ -3834,11 +3811,7 @@ SECTION 5: FIRST STEPS
                         }],
                         "stream": True
                     }
-                    headers = {
-                        "x-api-key": api_key,
-                        "anthropic-version": "2023-06-01",
-                        "Content-Type": "application/json"
-                    }
+                    headers = get_adapter(provider).headers(api_key)
                     endpoint = model_config.get("streaming_endpoint")
 
                     api_logger.info(f"[ARTICULATION] Calling Anthropic {model} streaming (prompt_caching=enabled)")
@@ -3856,44 +3829,36 @@ SECTION 5: FIRST STEPS
                         cache_read_tokens = 0
                         stop_reason = None  # Track if response was truncated
 
-                        async for line in response.aiter_lines():
-                            if line.startswith("data: "):
-                                data_str = line[6:]
-                                if data_str == "[DONE]":
-                                    break
-                                try:
-                                    data = json.loads(data_str)
-                                    if isinstance(data, dict):
-                                        event_type = data.get("type")
-                                        # Handle Anthropic streaming events
-                                        if event_type == "message_start":
-                                            # Input tokens and cache metrics come in message_start
-                                            usage = data["message"]["usage"]
-                                            input_tokens = usage.get("input_tokens")
-                                            cache_creation_tokens = usage.get("cache_creation_input_tokens")
-                                            cache_read_tokens = usage.get("cache_read_input_tokens")
-                                            # Log cache activity
-                                            if cache_read_tokens > 0:
-                                                api_logger.info(f"[ARTICULATION CACHE] Cache HIT: {cache_read_tokens} tokens read from cache")
-                                            elif cache_creation_tokens > 0:
-                                                api_logger.info(f"[ARTICULATION CACHE] Cache WRITE: {cache_creation_tokens} tokens written to cache")
-                                        elif event_type == "content_block_delta":
-                                            delta = data.get("delta")
-                                            if delta.get("type") == "text_delta":
-                                                text = delta.get("text")
-                                                if text:
-                                                    content_yielded = True
-                                                    tokens_streamed += 1
-                                                    yield text
-                                        elif event_type == "message_delta":
-                                            # Output tokens and stop_reason come in message_delta
-                                            usage = data.get("usage")
-                                            output_tokens = usage.get("output_tokens")
-                                            # Capture stop_reason to detect truncation
-                                            delta = data.get("delta", {})
-                                            stop_reason = delta.get("stop_reason")
-                                except json.JSONDecodeError:
-                                    continue
+                        async for data in iter_sse_json(response):
+                            if isinstance(data, dict):
+                                event_type = data.get("type")
+                                # Handle Anthropic streaming events
+                                if event_type == "message_start":
+                                    # Input tokens and cache metrics come in message_start
+                                    usage = data["message"]["usage"]
+                                    input_tokens = usage.get("input_tokens")
+                                    cache_creation_tokens = usage.get("cache_creation_input_tokens")
+                                    cache_read_tokens = usage.get("cache_read_input_tokens")
+                                    # Log cache activity
+                                    if cache_read_tokens > 0:
+                                        api_logger.info(f"[ARTICULATION CACHE] Cache HIT: {cache_read_tokens} tokens read from cache")
+                                    elif cache_creation_tokens > 0:
+                                        api_logger.info(f"[ARTICULATION CACHE] Cache WRITE: {cache_creation_tokens} tokens written to cache")
+                                elif event_type == "content_block_delta":
+                                    delta = data.get("delta")
+                                    if delta.get("type") == "text_delta":
+                                        text = delta.get("text")
+                                        if text:
+                                            content_yielded = True
+                                            tokens_streamed += 1
+                                            yield text
+                                elif event_type == "message_delta":
+                                    # Output tokens and stop_reason come in message_delta
+                                    usage = data.get("usage")
+                                    output_tokens = usage.get("output_tokens")
+                                    # Capture stop_reason to detect truncation
+                                    delta = data.get("delta", {})
+                                    stop_reason = delta.get("stop_reason")
 
                         # Log stop reason and warn if truncated
                         if stop_reason == "max_tokens":
@@ -3935,10 +3900,7 @@ SECTION 5: FIRST STEPS
                             "user_location": {"type": "approximate", "timezone": "UTC"}
                         }]
                         request_body["tool_choice"] = "auto"
-                    headers = {
-                        "Authorization": f"Bearer {api_key}",
-                        "Content-Type": "application/json"
-                    }
+                    headers = get_adapter(provider).headers(api_key)
                     endpoint = model_config.get("streaming_endpoint")
 
                     async with client.stream("POST", endpoint, headers=headers, json=request_body) as response:
@@ -3951,71 +3913,62 @@ SECTION 5: FIRST STEPS
                         input_tokens = 0
                         output_tokens = 0
 
-                        async for line in response.aiter_lines():
-                            if line.startswith("data: "):
-                                data_str = line[6:]
-                                if data_str == "[DONE]":
-                                    break
-                                try:
-                                    data = json.loads(data_str)
-
-                                    # Log evidence searches and results (with type safety)
-                                    if isinstance(data, dict):
-                                        # Log web search queries
-                                        if "tool_calls" in data:
-                                            tool_calls = data.get("tool_calls")
-                                            if isinstance(tool_calls, list):
-                                                for tool in tool_calls:
-                                                    if isinstance(tool, dict) and tool.get("type") == "web_search":
-                                                        query = tool.get("query")
-                                                        if not query and "arguments" in tool:
-                                                            args = tool.get("arguments")
-                                                            if isinstance(args, dict):
-                                                                query = args.get("query")
-                                                        if query:
-                                                            articulation_logger.info(f"[ARTICULATION SEARCH] Query: {query}")
-
-                                        # Log web search results for grounding
-                                        event_type = data.get("type")
-                                        if event_type == "web_search_call" or "web_search" in str(data.get("tool")):
-                                            articulation_logger.debug("[ARTICULATION SEARCH] Initiated web search")
-                                        if "search_results" in data or "results" in data:
-                                            results = data.get("search_results")
-                                            if isinstance(results, list) and results:
-                                                articulation_logger.info(f"[ARTICULATION SEARCH] Retrieved {len(results)} results")
-                                                for r in results[:3]:
-                                                    if isinstance(r, dict):
-                                                        title = r.get("title")
-                                                        url = r.get("url")
-                                                        articulation_logger.debug(f"[ARTICULATION SEARCH]   - {title}: {url}")
-
-                                    # Extract text from streaming response - ONLY handle delta events
-                                    # Do NOT handle final/complete events to avoid duplication
-                                    if isinstance(data, dict):
-                                        event_type = data.get("type")
-
-                                        # ONLY handle incremental delta events - ignore complete/done events
-                                        if event_type == "response.output_text.delta":
-                                            # Primary OpenAI Responses API streaming format
-                                            if "delta" in data:
-                                                content_yielded = True
-                                                tokens_streamed += 1
-                                                yield data["delta"]
-                                        elif event_type == "response.content_part.delta":
-                                            if "delta" in data and "text" in data["delta"]:
-                                                content_yielded = True
-                                                tokens_streamed += 1
-                                                yield data["delta"]["text"]
-                                        # Capture token usage from response.completed event
-                                        elif event_type == "response.completed":
-                                            usage = data["response"]["usage"]
-                                            input_tokens = usage.get("input_tokens")
-                                            output_tokens = usage.get("output_tokens")
-                                        # Skip all other events - they contain duplicates or metadata
-                                        elif event_type and "error" in event_type.lower():
-                                            articulation_logger.error(f"[STREAM ERROR] {data}")
-                                except json.JSONDecodeError:
-                                    continue
+                        async for data in iter_sse_json(response):
+                            # Log evidence searches and results (with type safety)
+                            if isinstance(data, dict):
+                                # Log web search queries
+                                if "tool_calls" in data:
+                                    tool_calls = data.get("tool_calls")
+                                    if isinstance(tool_calls, list):
+                                        for tool in tool_calls:
+                                            if isinstance(tool, dict) and tool.get("type") == "web_search":
+                                                query = tool.get("query")
+                                                if not query and "arguments" in tool:
+                                                    args = tool.get("arguments")
+                                                    if isinstance(args, dict):
+                                                        query = args.get("query")
+                                                if query:
+                                                    articulation_logger.info(f"[ARTICULATION SEARCH] Query: {query}")
+
+                                # Log web search results for grounding
+                                event_type = data.get("type")
+                                if event_type == "web_search_call" or "web_search" in str(data.get("tool")):
+                                    articulation_logger.debug("[ARTICULATION SEARCH] Initiated web search")
+                                if "search_results" in data or "results" in data:
+                                    results = data.get("search_results")
+                                    if isinstance(results, list) and results:
+                                        articulation_logger.info(f"[ARTICULATION SEARCH] Retrieved {len(results)} results")
+                                        for r in results[:3]:
+                                            if isinstance(r, dict):
+                                                title = r.get("title")
+                                                url = r.get("url")
+                                                articulation_logger.debug(f"[ARTICULATION SEARCH]   - {title}: {url}")
+
+                            # Extract text from streaming response - ONLY handle delta events
+                            # Do NOT handle final/complete events to avoid duplication
+                            if isinstance(data, dict):
+                                event_type = data.get("type")
+
+                                # ONLY handle incremental delta events - ignore complete/done events
+                                if event_type == "response.output_text.delta":
+                                    # Primary OpenAI Responses API streaming format
+                                    if "delta" in data:
+                                        content_yielded = True
+                                        tokens_streamed += 1
+                                        yield data["delta"]
+                                elif event_type == "response.content_part.delta":
+                                    if "delta" in data and "text" in data["delta"]:
+                                        content_yielded = True
+                                        tokens_streamed += 1
+                                        yield data["delta"]["text"]
+                                # Capture token usage from response.completed event
+                                elif event_type == "response.completed":
+                                    usage = data["response"]["usage"]
+                                    input_tokens = usage.get("input_tokens")
+                                    output_tokens = usage.get("output_tokens")
+                                # Skip all other events - they contain duplicates or metadata
+                                elif event_type and "error" in event_type.lower():
+                                    articulation_logger.error(f"[STREAM ERROR] {data}")
 
                         # Stream completed successfully
                         api_logger.info(f"[ARTICULATION] Streamed {tokens_streamed} tokens")
@@ -4053,16 +4006,11 @@ SECTION 5: FIRST STEPS
     raise RuntimeError(error_msg)
 
 
-async def run_reverse_mapping_for_articulation(
-    goal: str,
-    evidence: dict,
-    consciousness_state: ConsciousnessState
-) -> Dict[str, Any]:
+def _reverse_mapping_targets(goal: str, consciousness_state: ConsciousnessState) -> Dict[str, Any]:
     """
-    Run reverse causality mapping and return structured data for articulation.
-
-    This extracts the key information from reverse mapping without streaming,
-    so it can be passed to the unified articulation call.
+    Derive the target state for reverse mapping: signature match (or reverse
+    solve), constraint check and coherence corrections. Each step feeds the
+    next, so this part is sequential.
     """
     reverse_logger.info("=" * 50)
     reverse_logger.info("[REVERSE MAPPING] Starting reverse causality analysis")
@@ -4134,6 +4082,24 @@ async def run_reverse_mapping_for_articulation(
         for op, val in coherence_result.suggested_adjustments.items():
             required_operators[op] = val
 
+    return {
+        "current_operators": current_operators,
+        "current_s_level": current_s_level,
+        "required_operators": required_operators,
+        "target_s_level": target_s_level,
+        "primary_signature": matching_signatures[0] if matching_signatures else None,
+        "constraint_result": constraint_result,
+        "coherence_result": coherence_result,
+    }
+
+
+def _reverse_mapping_pathways(
+    current_operators: Dict[str, float],
+    required_operators: Dict[str, float],
+    current_s_level: Optional[float],
+    target_s_level: Optional[float]
+) -> tuple:
+    """Pathway generation -> optimization -> monitoring plan for the best pathway."""
     # Generate pathways
     reverse_logger.debug("[REVERSE MAPPING] Generating transformation pathways...")
     pathways = pathway_generator.generate_pathways(
@@ -4149,6 +4115,42 @@ async def run_reverse_mapping_for_articulation(
     reverse_logger.debug("[REVERSE MAPPING] Optimizing pathways...")
     optimization_result = pathway_optimizer.optimize_pathways(pathways)
 
+    # Generate monitoring plan
+    best_pathway = pathways[0] if pathways else None
+    monitoring_plan = None
+    if best_pathway:
+        reverse_logger.debug("[REVERSE MAPPING] Generating monitoring plan...")
+        monitoring_plan = progress_tracker.generate_monitoring_plan(
+            best_pathway, current_operators, required_operators
+        )
+
+    return pathways, optimization_result, monitoring_plan
+
+
+def _pathway_ranking_payload(optimization_result) -> Dict[str, Any]:
+    """Ranked pathways with their cached dimension scores, for the preference sliders."""
+    frontier = set(optimization_result.pareto_frontier)
+    return {
+        "frontier_id": optimization_result.frontier_id,
+        "best_pathway": optimization_result.best_pathway.pathway_id,
+        "pathways": [
+            {
+                "id": s.pathway_id,
+                "name": s.pathway_name,
+                "total_score": s.total_score,
+                "dimensions": {
+                    d.dimension: d.score
+                    for d in (s.speed_score, s.stability_score, s.effort_score, s.side_effect_score, s.success_score)
+                },
+                "pareto_optimal": s.pathway_id in frontier,
+                "recommendation_reason": s.recommendation_reason,
+            }
+            for s in optimization_result.scored_pathways
+        ],
+    }
+
+
+def _reverse_mapping_mvt(current_operators: Dict[str, float], required_operators: Dict[str, float]):
     # Calculate MVT
     reverse_logger.debug("[REVERSE MAPPING] Calculating minimum viable transformation...")
     mvt = mvt_calculator.calculate_mvt(
@@ -4157,7 +4159,10 @@ async def run_reverse_mapping_for_articulation(
     reverse_logger.info(f"[REVERSE MAPPING] MVT: {mvt.total_operators_changed} operators, efficiency={f'{mvt.mvt_efficiency:.2f}' if mvt.mvt_efficiency is not None else 'N/C'}")
     for change in mvt.changes[:3]:
         reverse_logger.debug(f"  - {change.operator}: {f'{change.current_value:.2f}' if change.current_value is not None else 'N/C'} → {f'{change.target_value:.2f}' if change.target_value is not None else 'N/C'}")
+    return mvt
+
 
+def _reverse_mapping_deaths(current_operators: Dict[str, float], required_operators: Dict[str, float], goal: str):
     # Analyze death requirements
     reverse_logger.debug("[REVERSE MAPPING] Analyzing death requirements...")
     death_sequence = death_sequencer.analyze_death_requirements(
@@ -4165,7 +4170,10 @@ async def run_reverse_mapping_for_articulation(
     )
     death_count = len(death_sequence.deaths_required)
     reverse_logger.info(f"[REVERSE MAPPING] Death sequence: {death_count} identity deaths required")
+    return death_sequence
+
 
+def _reverse_mapping_grace(current_operators: Dict[str, float], required_operators: Dict[str, float], goal: str):
     # Calculate grace requirements
     reverse_logger.debug("[REVERSE MAPPING] Calculating grace requirements...")
     grace_req = grace_calculator.calculate_grace_requirements(
@@ -4175,15 +4183,43 @@ async def run_reverse_mapping_for_articulation(
         reverse_logger.info(f"[REVERSE MAPPING] Grace: current={f'{grace_req.current_grace_availability:.2f}' if grace_req.current_grace_availability is not None else 'N/C'}, required={f'{grace_req.required_grace_availability:.2f}' if grace_req.required_grace_availability is not None else 'N/C'}")
     else:
         reverse_logger.warning("[REVERSE MAPPING] Grace requirements could not be computed (missing operators)")
+    return grace_req
 
-    # Generate monitoring plan
-    best_pathway = pathways[0] if pathways else None
-    monitoring_plan = None
-    if best_pathway:
-        reverse_logger.debug("[REVERSE MAPPING] Generating monitoring plan...")
-        monitoring_plan = progress_tracker.generate_monitoring_plan(
-            best_pathway, current_operators, required_operators
-        )
+
+async def run_reverse_mapping_for_articulation(
+    goal: str,
+    evidence: dict,
+    consciousness_state: ConsciousnessState,
+    stages: Optional[StagePipeline] = None
+) -> Dict[str, Any]:
+    """
+    Run reverse causality mapping and return structured data for articulation.
+
+    This extracts the key information from reverse mapping without streaming,
+    so it can be passed to the unified articulation call.
+
+    All work runs in worker threads so other streams on this worker keep
+    flowing. Once the target state is known, the pathway chain, MVT, death
+    sequencing and grace requirements only read it and run concurrently.
+    With `stages`, each step is timed as a "reverse_mapping.*" stage.
+    """
+    stages = stages or StagePipeline("reverse_mapping")
+    targets = await stages.timed("reverse_mapping.targets", _reverse_mapping_targets, goal, consciousness_state)
+    current_operators = targets["current_operators"]
+    required_operators = targets["required_operators"]
+    current_s_level = targets["current_s_level"]
+    target_s_level = targets["target_s_level"]
+    primary_signature = targets["primary_signature"]
+    constraint_result = targets["constraint_result"]
+    coherence_result = targets["coherence_result"]
+
+    (pathways, optimization_result, monitoring_plan), mvt, death_sequence, grace_req = await asyncio.gather(
+        stages.timed("reverse_mapping.pathways", _reverse_mapping_pathways,
+                     current_operators, required_operators, current_s_level, target_s_level),
+        stages.timed("reverse_mapping.mvt", _reverse_mapping_mvt, current_operators, required_operators),
+        stages.timed("reverse_mapping.deaths", _reverse_mapping_deaths, current_operators, required_operators, goal),
+        stages.timed("reverse_mapping.grace", _reverse_mapping_grace, current_operators, required_operators, goal),
+    )
 
     reverse_logger.info("[REVERSE MAPPING] Analysis complete")
     reverse_logger.info("=" * 50)
@@ -4205,13 +4241,14 @@ async def run_reverse_mapping_for_articulation(
         },
         "best_pathway": optimization_result.best_pathway.pathway_name if optimization_result else "Direct",
         "pathways_generated": len(pathways),
+        "pathway_ranking": _pathway_ranking_payload(optimization_result) if optimization_result else None,
         "grace_dependency": grace_req.grace_dependency if grace_req else None,
         "grace_availability": grace_req.current_grace_availability if grace_req else None,
         "deaths_required": len(death_sequence.deaths_required),
         "death_sequence": death_sequence.sequence_order,
         "void_tolerance_required": death_sequence.void_tolerance_required,
         "check_in_schedule": monitoring_plan.check_in_schedule if monitoring_plan else None,
-        "timeline": primary_signature.typical_timeline if matching_signatures else None,
+        "timeline": primary_signature.typical_timeline if primary_signature else None,
         "mvt_operators": mvt.total_operators_changed,
         "blocking_constraints": constraint_result.blocking_count,
         "prerequisites": constraint_result.prerequisites[:3] if constraint_result.prerequisites else []
@@ -4415,6 +4452,14 @@ def detect_future_oriented_language(text: str) -> bool:
 # HEALTH AND UTILITY ENDPOINTS
 # =============================================================================
 
+@app.get("/health/metrics")
+async def pipeline_metrics_endpoint(format: str = "prometheus"):
+    """Per-stage latency, inference module and LLM token histograms (Prometheus text or JSON)."""
+    if format == "json":
+        return pipeline_metrics.snapshot()
+    return PlainTextResponse(pipeline_metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -4424,6 +4469,12 @@ async def health_check():
         "model": DEFAULT_MODEL,
         "engine_loaded": inference_engine.is_loaded,
         "formula_count": inference_engine.formula_count,
+        "inference_memo": inference_memo.stats(),
+        "continuation_sessions": len(continuation_state),
+        "llm_transport": llm_transport.stats(),
+        "formula_pool": formula_pool.stats(),
+        "parse_service": parse_service.stats(),
+        "engines": engine_registry.status(),
         "openai_configured": OPENAI_API_KEY is not None,
         "anthropic_configured": ANTHROPIC_API_KEY is not None,
         "oof_framework_loaded": len(LLM_CALL2_CONTEXT) > 0,
@@ -0,0 +1,559 @@
+"""
+Parse Service - Process-isolated file parsing with a content-hash cache
+=======================================================================
+
+file_parser's docx/pptx/xlsx/image parsers are synchronous and CPU-bound;
+openpyxl alone can take seconds on a 2000-row sheet. Called directly from
+send_message, upload_files and discover_goals_from_files they ran serially
+on the event loop and stalled every other request on the worker.
+
+`FileParseService` runs them in a bounded pool of worker processes:
+
+- Each binary file is one task; a zip is extracted in a worker and its
+  entries are fanned out as separate tasks. Plain text never leaves the
+  parent.
+- Per-file timeout: the worker arms SIGALRM around each parse and returns a
+  timeout error for that file. If a worker is stuck in C code past the
+  timeout plus a grace period, the pool is torn down and rebuilt.
+- Memory cap: each worker limits its address space (RLIMIT_AS), so a
+  decompression bomb fails that one file with MemoryError instead of
+  taking the host down.
+- A worker that dies (or is killed after a timeout) breaks the whole pool:
+  every task in flight on it fails with BrokenProcessPool. Each of those
+  tasks is rerun alone in a fresh single-worker pool (at most `workers` such
+  reruns at once), so only the file that actually crashes is reported as a
+  crash; other callers' files parse normally, just later.
+- Results are cached by SHA-256 of the raw bytes (plus the extension, which
+  picks the parser), so the same spreadsheet attached in chat and uploaded
+  again to goal discovery is parsed once. Hits are relabelled with the
+  caller's filename. Timeouts and crashes are not cached.
+- With no workers configured, parsing runs in a thread (no caps), still
+  off the event loop and still cached. Base64 decoding and hashing of
+  uploads also run in a thread.
+- Multipart uploads (upload_stream) arrive as spooled files: parse_paths
+  passes the path to the worker, which opens it (zips are read through the
+  open file), and the SHA-256 computed while spooling keys the cache.
+
+Configuration (environment):
+    FILE_PARSE_WORKERS           worker processes (default: min(4, cores); 0 disables)
+    FILE_PARSE_TIMEOUT           seconds per file (default: 30)
+    FILE_PARSE_MEMORY_MB         address-space cap per worker (default: 1024; 0 disables)
+    FILE_PARSE_CACHE_MB          result cache size (default: 64)
+    FILE_PARSE_START_METHOD      multiprocessing start method (default: spawn)
+
+Usage:
+    service = get_parse_service()
+    await service.start()                                  # lifespan
+    parsed_list = await service.parse_file(name, content, encoding)
+    parse_result = await service.parse_all(request.files)
+    parsed_lists = await service.parse_paths(form.parse_inputs())    # multipart
+    service.shutdown()
+"""
+
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import signal
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import resource
+    _HAS_RESOURCE = True
+except ImportError:
+    _HAS_RESOURCE = False
+
+from file_parser import (
+    MAX_TEXT_LENGTH,
+    ParsedFile,
+    ParseResult,
+    SUPPORTED_EXTENSIONS,
+    TEXT_EXTENSIONS,
+    collect_results,
+    decode_upload,
+    get_extension,
+    parse_bytes,
+    parse_text_file,
+    parse_zip_entry,
+    read_zip_entries,
+)
+from logging_config import api_logger
+
+
+# Extra time the parent waits past the per-file timeout before it assumes
+# the worker is stuck somewhere SIGALRM cannot interrupt
+KILL_GRACE_SECONDS = 5.0
+
+# Longest start() waits for every worker to spawn and check in
+WARMUP_TIMEOUT_SECONDS = 60.0
+
+CacheKey = Tuple[str, str]
+
+
+# =============================================================================
+# WORKER SIDE (module-level so they pickle by reference)
+# =============================================================================
+
+class _ParseTimeout(BaseException):
+    """Raised by SIGALRM; a BaseException so the parsers' `except Exception` cannot swallow it."""
+
+
+def _on_alarm(signum, frame):
+    raise _ParseTimeout()
+
+
+def _init_worker(memory_mb: int) -> None:
+    """Cap the worker's address space and install the timeout handler."""
+    if memory_mb > 0 and _HAS_RESOURCE:
+        limit = memory_mb * 1024 * 1024
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError):
+            pass  # Not permitted here; timeouts still apply
+    if hasattr(signal, "setitimer"):
+        signal.signal(signal.SIGALRM, _on_alarm)
+
+
+def _with_alarm(timeout: float, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+    """fn() under a per-call alarm; returns (result, timed_out)."""
+    armed = timeout > 0 and hasattr(signal, "setitimer")
+    if armed:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return fn(), False
+    except _ParseTimeout:
+        return None, True
+    finally:
+        if armed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _worker_parse(name: str, raw_bytes: bytes, timeout: float) -> Tuple[Optional[List[ParsedFile]], bool]:
+    return _with_alarm(timeout, lambda: parse_bytes(name, raw_bytes))
+
+
+def _worker_parse_entry(entry_name: str, entry_bytes: bytes, timeout: float) -> Tuple[Optional[List[ParsedFile]], bool]:
+    return _with_alarm(timeout, lambda: parse_zip_entry(entry_name, entry_bytes))
+
+
+def _worker_read_zip(name: str, raw_bytes: bytes, timeout: float) -> Tuple[Optional[list], bool]:
+    return _with_alarm(timeout, lambda: read_zip_entries(name, raw_bytes))
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _worker_parse_path(name: str, path: str, timeout: float) -> Tuple[Optional[List[ParsedFile]], bool]:
+    return _with_alarm(timeout, lambda: parse_bytes(name, _read_file(path)))
+
+
+def _worker_read_zip_path(name: str, path: str, timeout: float) -> Tuple[Optional[list], bool]:
+    def extract() -> list:
+        with open(path, "rb") as f:
+            return read_zip_entries(name, f)
+    return _with_alarm(timeout, extract)
+
+
+def _worker_ping(rendezvous: str, workers: int, deadline: float) -> int:
+    """
+    Check in under `rendezvous` and hold this worker until `workers` have
+    (or `deadline` passes), so every ping needs its own process.
+    """
+    pid = os.getpid()
+    open(os.path.join(rendezvous, str(pid)), "w").close()
+    while len(os.listdir(rendezvous)) < workers and time.time() < deadline:
+        time.sleep(0.01)
+    return pid
+
+
+# =============================================================================
+# SPOOLED UPLOADS (parent side)
+# =============================================================================
+
+def _read_text_file(name: str, path: str) -> ParsedFile:
+    """A spooled text upload, read only as far as MAX_TEXT_LENGTH needs."""
+    with open(path, "rb") as f:
+        raw = f.read(MAX_TEXT_LENGTH * 4)
+    return parse_text_file(name, raw.decode("utf-8", errors="replace"))
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(256 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+def _size(parsed_list: List[ParsedFile]) -> int:
+    return sum(len(p.text_content) + len(p.image_base64) + 256 for p in parsed_list)
+
+
+def _relabel(parsed_list: List[ParsedFile], old: str, new: str) -> List[ParsedFile]:
+    """Results cached under filename `old`, as if parsed under `new`."""
+    if old == new:
+        return [replace(parsed) for parsed in parsed_list]
+    relabelled = []
+    for parsed in parsed_list:
+        name = new + parsed.name[len(old):] if parsed.name.startswith(old) else parsed.name
+        text = parsed.text_content
+        if parsed.is_image and text.startswith(f"[Image: {parsed.name},"):
+            text = f"[Image: {name}," + text[len(parsed.name) + 9:]
+        relabelled.append(replace(parsed, name=name, text_content=text))
+    return relabelled
+
+
+class ParseCache:
+    """LRU of parse results keyed by (sha256, extension), bounded in bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, Tuple[str, List[ParsedFile], int]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(name: str, raw_bytes: bytes) -> CacheKey:
+        return hashlib.sha256(raw_bytes).hexdigest(), get_extension(name)
+
+    def get(self, key: CacheKey, name: str) -> Optional[List[ParsedFile]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return _relabel(entry[1], entry[0], name)
+
+    def put(self, key: CacheKey, name: str, parsed_list: List[ParsedFile]) -> None:
+        size = _size(parsed_list)
+        if size > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous[2]
+        self._entries[key] = (name, parsed_list, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+
+def _decode_keyed(name: str, content: str, encoding: str) -> Tuple[Optional[bytes], List[ParsedFile], Optional[CacheKey]]:
+    """decode_upload plus the cache key for binary files, in one thread hop."""
+    raw_bytes, handled = decode_upload(name, content, encoding)
+    if raw_bytes is None:
+        return None, handled, None
+    return raw_bytes, handled, ParseCache.key(name, raw_bytes)
+
+
+# =============================================================================
+# SERVICE
+# =============================================================================
+
+def _default_workers() -> int:
+    configured = os.getenv("FILE_PARSE_WORKERS")
+    if configured is not None:
+        return max(0, int(configured))
+    return min(4, os.cpu_count() or 1)
+
+
+def _terminate(executor: ProcessPoolExecutor) -> None:
+    """
+    Kill an executor's worker processes. ProcessPoolExecutor cannot cancel a
+    running task, so a parse stuck in C code would otherwise hold its slot.
+    """
+    for process in list((getattr(executor, "_processes", None) or {}).values()):
+        process.terminate()
+
+
+class FileParseService:
+    """
+    Bounded process pool for file_parser, with a content-hash result cache.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        memory_mb: Optional[int] = None,
+        cache_mb: Optional[float] = None,
+        start_method: Optional[str] = None
+    ):
+        self.workers = _default_workers() if workers is None else max(0, workers)
+        self.timeout = float(os.getenv("FILE_PARSE_TIMEOUT", "30")) if timeout is None else timeout
+        self.memory_mb = int(os.getenv("FILE_PARSE_MEMORY_MB", "1024")) if memory_mb is None else memory_mb
+        cache_mb = float(os.getenv("FILE_PARSE_CACHE_MB", "64")) if cache_mb is None else cache_mb
+        self.start_method = start_method or os.getenv("FILE_PARSE_START_METHOD", "spawn")
+        self.cache = ParseCache(int(cache_mb * 1024 * 1024))
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Reruns after a broken pool, one single-worker pool each, at most `workers` at once
+        self._isolation = asyncio.Semaphore(max(1, self.workers))
+        self._counters = {"tasks": 0, "local_runs": 0, "timeouts": 0, "crashes": 0, "restarts": 0, "isolated_runs": 0}
+        self._run_time_total = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    def _new_executor(self, workers: int) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=_init_worker,
+            initargs=(self.memory_mb,),
+        )
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = self._new_executor(self.workers)
+        return self._executor
+
+    async def start(self) -> None:
+        """
+        Spawn the worker processes. Each warm-up ping holds its worker until
+        all have checked in, so the pool has to start every one of them.
+        """
+        if not self.enabled:
+            api_logger.info("[FILE_PARSER] Parse pool disabled (FILE_PARSE_WORKERS=0), parsing in threads")
+            return
+        executor = self._ensure_executor()
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        with tempfile.TemporaryDirectory(prefix="parse-warmup-") as rendezvous:
+            deadline = time.time() + WARMUP_TIMEOUT_SECONDS
+            pids = await asyncio.gather(*(
+                loop.run_in_executor(executor, _worker_ping, rendezvous, self.workers, deadline)
+                for _ in range(self.workers)
+            ))
+        if len(set(pids)) != self.workers:
+            api_logger.warning(
+                f"[FILE_PARSER] Only {len(set(pids))} of {self.workers} parse workers started "
+                f"within {WARMUP_TIMEOUT_SECONDS:g}s"
+            )
+        api_logger.info(
+            f"[FILE_PARSER] Parse pool ready in {time.perf_counter() - started:.2f}s "
+            f"(workers={self.workers}, pids={sorted(set(pids))}, timeout={self.timeout:g}s, "
+            f"memory_mb={self.memory_mb})"
+        )
+
+    def _reset(self, kill: bool) -> None:
+        """Drop the executor; the next task starts fresh workers."""
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        if kill:
+            _terminate(executor)
+        # Queued tasks are not cancelled: the broken pool fails them with
+        # BrokenProcessPool, and _run reruns them in isolation
+        executor.shutdown(wait=False)
+        self._counters["restarts"] += 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    # -------------------------------------------------------------------------
+    # Dispatch
+    # -------------------------------------------------------------------------
+
+    async def _submit(self, executor: ProcessPoolExecutor, fn: Callable[..., Tuple[Any, bool]], *args: Any) -> Tuple[Any, bool]:
+        """fn(*args, timeout) on `executor`; asyncio.TimeoutError once the kill grace has passed too."""
+        future = asyncio.get_running_loop().run_in_executor(executor, fn, *args, self.timeout)
+        return await asyncio.wait_for(future, self.timeout + KILL_GRACE_SECONDS)
+
+    async def _run_isolated(self, fn: Callable[..., Tuple[Any, bool]], *args: Any) -> Tuple[Any, bool]:
+        """Rerun a task whose pool broke under it, alone in a fresh single-worker pool."""
+        async with self._isolation:
+            self._counters["isolated_runs"] += 1
+            executor = self._new_executor(1)
+            try:
+                return await self._submit(executor, fn, *args)
+            except asyncio.TimeoutError:
+                return None, True
+            finally:
+                _terminate(executor)
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, name: str, fn: Callable[..., Tuple[Any, bool]], *args: Any) -> Tuple[Any, Optional[str]]:
+        """
+        fn(*args, timeout) in a worker, or in a thread when the pool is off.
+        Returns (result, error); error is set on timeout or worker death.
+        """
+        self._counters["tasks"] += 1
+        started = time.perf_counter()
+        try:
+            if not self.enabled:
+                self._counters["local_runs"] += 1
+                result, timed_out = await asyncio.to_thread(fn, *args, 0)
+            else:
+                executor = self._ensure_executor()
+                try:
+                    result, timed_out = await self._submit(executor, fn, *args)
+                except asyncio.TimeoutError:
+                    if self._executor is executor:
+                        self._reset(kill=True)
+                    result, timed_out = None, True
+                except BrokenProcessPool:
+                    # This file may only have shared the pool with the one that broke it
+                    if self._executor is executor:
+                        self._reset(kill=False)
+                    try:
+                        result, timed_out = await self._run_isolated(fn, *args)
+                    except BrokenProcessPool:
+                        self._counters["crashes"] += 1
+                        api_logger.error(f"[FILE_PARSER] Parse worker died while parsing {name}")
+                        return None, "Parser process crashed (file too large or malformed)"
+        finally:
+            self._run_time_total += time.perf_counter() - started
+
+        if timed_out:
+            self._counters["timeouts"] += 1
+            api_logger.warning(f"[FILE_PARSER] Parsing {name} timed out after {self.timeout:g}s")
+            return None, f"Parsing timed out after {self.timeout:g}s"
+        return result, None
+
+    async def _parse_cached(
+        self,
+        name: str,
+        key: CacheKey,
+        fn: Callable[..., Tuple[Any, bool]],
+        source: Any
+    ) -> Tuple[List[ParsedFile], bool]:
+        """fn(name, source) through the cache; returns (results, cacheable)."""
+        cached = self.cache.get(key, name)
+        if cached is not None:
+            return cached, True
+        parsed_list, error = await self._run(name, fn, name, source)
+        if error:
+            return [ParsedFile(name=name, parse_error=error)], False
+        self.cache.put(key, name, parsed_list)
+        return parsed_list, True
+
+    async def _parse_zip(
+        self,
+        name: str,
+        key: CacheKey,
+        extract: Callable[..., Tuple[Any, bool]],
+        source: Any
+    ) -> Tuple[List[ParsedFile], bool]:
+        """Extract in a worker, then parse the entries in parallel (each cached)."""
+        cached = self.cache.get(key, name)
+        if cached is not None:
+            return cached, True
+
+        entries, error = await self._run(name, extract, name, source)
+        if error:
+            return [ParsedFile(name=name, parse_error=error)], False
+
+        async def parse_entry(entry_name: str, entry_bytes: Optional[bytes], entry_error: Optional[str]):
+            if entry_bytes is None:
+                return [ParsedFile(name=entry_name, parse_error=entry_error)], True
+            if get_extension(entry_name) in TEXT_EXTENSIONS:
+                return parse_zip_entry(entry_name, entry_bytes), True
+            entry_key = self.cache.key(entry_name, entry_bytes)
+            return await self._parse_cached(entry_name, entry_key, _worker_parse_entry, entry_bytes)
+
+        parsed = await asyncio.gather(*(parse_entry(*entry) for entry in entries))
+        results = [p for parsed_list, _ in parsed for p in parsed_list]
+        cacheable = all(ok for _, ok in parsed)
+        if cacheable:
+            self.cache.put(key, name, results)
+        return results, cacheable
+
+    async def parse_file(self, name: str, content: str, encoding: str = "text") -> List[ParsedFile]:
+        """Async file_parser.parse_file."""
+        raw_bytes, handled, key = await asyncio.to_thread(_decode_keyed, name, content, encoding)
+        if raw_bytes is None:
+            return handled
+        if get_extension(name) == ".zip":
+            parsed_list, _ = await self._parse_zip(name, key, _worker_read_zip, raw_bytes)
+        else:
+            parsed_list, _ = await self._parse_cached(name, key, _worker_parse, raw_bytes)
+        return parsed_list
+
+    async def parse_path(self, name: str, path: str, sha256: Optional[str] = None) -> List[ParsedFile]:
+        """
+        parse_file for an upload spooled to disk (upload_stream). Workers open
+        the file themselves; `sha256` (computed while spooling) keys the cache.
+        """
+        ext = get_extension(name)
+        if ext not in SUPPORTED_EXTENSIONS:
+            return [ParsedFile(name=name, parse_error=f"Unsupported file type: {ext}")]
+        if ext in TEXT_EXTENSIONS:
+            return [await asyncio.to_thread(_read_text_file, name, path)]
+        if sha256 is None:
+            sha256 = await asyncio.to_thread(_hash_file, path)
+        key = (sha256, ext)
+        if ext == ".zip":
+            parsed_list, _ = await self._parse_zip(name, key, _worker_read_zip_path, path)
+        else:
+            parsed_list, _ = await self._parse_cached(name, key, _worker_parse_path, path)
+        return parsed_list
+
+    async def parse_paths(self, uploads: List[Tuple[str, str, Optional[str]]]) -> List[List[ParsedFile]]:
+        """parse_path for (name, path, sha256) triples, in parallel, results in order."""
+        return list(await asyncio.gather(*(self.parse_path(*upload) for upload in uploads)))
+
+    async def parse_many(self, uploads: List[Tuple[str, str, str]]) -> List[List[ParsedFile]]:
+        """parse_file for (name, content, encoding) triples, in parallel, results in order."""
+        return list(await asyncio.gather(*(self.parse_file(*upload) for upload in uploads)))
+
+    async def parse_all(self, files: list) -> ParseResult:
+        """Async file_parser.parse_all_files."""
+        return collect_results(await self.parse_many([
+            (f.name, f.content, getattr(f, "encoding", None) or "text") for f in files
+        ]))
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        tasks = self._counters["tasks"]
+        return {
+            "enabled": self.enabled,
+            "workers": self.workers,
+            "alive": self._executor is not None,
+            "timeout": self.timeout,
+            "memory_mb": self.memory_mb,
+            **self._counters,
+            "avg_run_ms": round(self._run_time_total / tasks * 1000, 3) if tasks else 0.0,
+            "cache": self.cache.stats(),
+        }
+
+
+_shared_service: Optional[FileParseService] = None
+
+
+def get_parse_service() -> FileParseService:
+    """Process-wide parse service shared by chat and goal discovery."""
+    global _shared_service
+    if _shared_service is None:
+        _shared_service = FileParseService()
+    return _shared_service
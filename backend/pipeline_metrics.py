@@ -0,0 +1,311 @@
+"""
+Pipeline Metrics - Latency and token histograms for inference_stream
+====================================================================
+
+StagePipeline already records when each stage of a request ran, but only
+into log lines and the `done` event. `PipelineMetrics` folds every finished
+pipeline into process-wide histograms so "where do the seconds go under
+load" is a scrape away instead of a log grep:
+
+- oof_pipeline_stage_seconds{stage}          every inline and background stage
+                                             (context_build, call1, call1.network,
+                                             inference, value_organizer,
+                                             reverse_mapping.*, call2.ttft, ...)
+- oof_pipeline_stage_wait_seconds{stage}     time the critical path blocked on a
+                                             background stage
+- oof_inference_module_seconds{module}       per OOF module, when it was recomputed
+- oof_llm_tokens_per_second{call}            output tokens / generation time
+- oof_llm_tokens_total{call,kind}            input / output tokens
+- oof_pipeline_seconds{outcome}              whole pipeline, success / error
+
+render() returns the Prometheus text exposition format (served at
+/health/metrics); snapshot() returns counts, sums and bucket-estimated
+p50/p95 as JSON.
+
+With opentelemetry-api installed, each finished pipeline is also exported as
+a trace: one root span with a child span per stage, stamped with the stage's
+real start and end times. Without an SDK/exporter configured the API is a
+no-op. Set PIPELINE_OTEL_EXPORT=0 to skip it.
+"""
+
+import math
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from opentelemetry import trace as otel_trace
+    _HAS_OTEL = True
+except ImportError:
+    _HAS_OTEL = False
+
+
+OTEL_EXPORT = os.getenv("PIPELINE_OTEL_EXPORT", "1") not in ("0", "false", "no")
+
+# Seconds; LLM calls take tens of seconds, formula modules fractions of a millisecond
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+MODULE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+TOKENS_PER_SECOND_BUCKETS = (5, 10, 20, 30, 40, 50, 60, 80, 100, 150, 200, 300)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+# ============================================================================
+# Metric types
+# ============================================================================
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def lines(self) -> Iterable[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self.label_names, key)} {_format_number(value)}"
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {",".join(key) or "_": value for key, value in sorted(self._values.items())}
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram with labels (Prometheus semantics).
+
+    Quantiles in snapshot() are estimated by linear interpolation inside the
+    bucket holding the rank, as histogram_quantile() does.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = STAGE_BUCKETS
+    ):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # labels -> [bucket counts (non-cumulative)..., sum, count]
+        self._series: Dict[LabelValues, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.label_names)
+        index = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def _copy(self) -> List[Tuple[LabelValues, List[float]]]:
+        with self._lock:
+            return [(key, list(series)) for key, series in sorted(self._series.items())]
+
+    def quantile(self, q: float, series: List[float]) -> Optional[float]:
+        count = series[-1]
+        if not count:
+            return None
+        rank = q * count
+        cumulative = 0.0
+        lower = 0.0
+        for bound, bucket_count in zip(self.buckets, series):
+            if cumulative + bucket_count >= rank and bucket_count:
+                if bound == math.inf:
+                    return lower
+                return lower + (bound - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+            lower = bound
+        return lower
+
+    def lines(self) -> Iterable[str]:
+        for key, series in self._copy():
+            cumulative = 0.0
+            for bound, bucket_count in zip(self.buckets, series):
+                cumulative += bucket_count
+                le = _format_labels(self.label_names, key, f'le="{_format_number(bound)}"')
+                yield f"{self.name}_bucket{le} {_format_number(cumulative)}"
+            labels = _format_labels(self.label_names, key)
+            yield f"{self.name}_sum{labels} {_format_number(series[-2])}"
+            yield f"{self.name}_count{labels} {_format_number(series[-1])}"
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        for key, series in self._copy():
+            p50, p95 = self.quantile(0.5, series), self.quantile(0.95, series)
+            result[",".join(key) or "_"] = {
+                "count": int(series[-1]),
+                "sum": round(series[-2], 6),
+                "p50": round(p50, 6) if p50 is not None else None,
+                "p95": round(p95, 6) if p95 is not None else None,
+            }
+        return result
+
+
+# ============================================================================
+# Registry
+# ============================================================================
+
+class PipelineMetrics:
+    """
+    Process-wide inference pipeline metrics.
+
+    Usage:
+        metrics = get_pipeline_metrics()
+        metrics.observe_llm("call2", output_tokens=812, generation_seconds=9.4)
+        metrics.record_pipeline(stages, success=True)
+        text = metrics.render()
+    """
+
+    def __init__(self, otel_export: bool = OTEL_EXPORT):
+        self.stage_seconds = Histogram(
+            "oof_pipeline_stage_seconds", "Duration of each inference_stream stage.", ("stage",))
+        self.stage_wait_seconds = Histogram(
+            "oof_pipeline_stage_wait_seconds", "Time the critical path waited on a background stage.", ("stage",))
+        self.module_seconds = Histogram(
+            "oof_inference_module_seconds", "Duration of each recomputed OOF inference module.", ("module",),
+            buckets=MODULE_BUCKETS)
+        self.tokens_per_second = Histogram(
+            "oof_llm_tokens_per_second", "LLM output tokens per second of generation.", ("call",),
+            buckets=TOKENS_PER_SECOND_BUCKETS)
+        self.tokens = Counter(
+            "oof_llm_tokens_total", "LLM tokens by call and kind (input/output).", ("call", "kind"))
+        self.pipeline_seconds = Histogram(
+            "oof_pipeline_seconds", "End-to-end inference_stream duration.", ("outcome",))
+        self._metrics = [
+            self.stage_seconds, self.stage_wait_seconds, self.module_seconds,
+            self.tokens_per_second, self.tokens, self.pipeline_seconds,
+        ]
+        self.otel_export = otel_export and _HAS_OTEL
+
+    # -------------------------------------------------------------------------
+    # Recording
+    # -------------------------------------------------------------------------
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        self.stage_seconds.observe(seconds, stage=stage)
+
+    def observe_modules(self, module_seconds: Dict[str, float]) -> None:
+        """Per-module durations of one inference run (seconds)."""
+        for module, seconds in module_seconds.items():
+            self.module_seconds.observe(seconds, module=module)
+
+    def observe_llm(
+        self,
+        call: str,
+        input_tokens: Optional[int] = None,
+        output_tokens: Optional[int] = None,
+        generation_seconds: Optional[float] = None
+    ) -> None:
+        """Token counts of one LLM call; tokens/s when the generation time is known."""
+        if input_tokens:
+            self.tokens.inc(input_tokens, call=call, kind="input")
+        if output_tokens:
+            self.tokens.inc(output_tokens, call=call, kind="output")
+            if generation_seconds and generation_seconds > 0:
+                self.tokens_per_second.observe(output_tokens / generation_seconds, call=call)
+
+    def record_pipeline(self, stages: Any, success: bool) -> None:
+        """Fold a finished StagePipeline into the histograms (and export its trace)."""
+        elapsed = stages.elapsed()
+        for timing in stages.timings():
+            if timing.duration is not None:
+                self.stage_seconds.observe(timing.duration, stage=timing.name)
+            if timing.background:
+                self.stage_wait_seconds.observe(timing.waited, stage=timing.name)
+        self.pipeline_seconds.observe(elapsed, outcome="success" if success else "error")
+
+        if self.otel_export:
+            try:
+                self._export_trace(stages, success, elapsed)
+            except Exception:
+                pass  # Tracing must never fail a request
+
+    def _export_trace(self, stages: Any, success: bool, elapsed: float) -> None:
+        tracer = otel_trace.get_tracer("oof.pipeline")
+        origin = stages.started_ns
+
+        def ns(offset: float) -> int:
+            return origin + int(offset * 1e9)
+
+        root = tracer.start_span(stages.name, start_time=origin, attributes={"pipeline.success": success})
+        context = otel_trace.set_span_in_context(root)
+        for timing in stages.timings():
+            span = tracer.start_span(
+                timing.name,
+                context=context,
+                start_time=ns(timing.started),
+                attributes={
+                    "stage.background": timing.background,
+                    "stage.waited_ms": int(timing.waited * 1000),
+                    "stage.failed": timing.failed,
+                },
+            )
+            span.end(end_time=ns(timing.finished if timing.finished is not None else elapsed))
+        root.end(end_time=ns(elapsed))
+
+    # -------------------------------------------------------------------------
+    # Reporting
+    # -------------------------------------------------------------------------
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        out = []
+        for metric in self._metrics:
+            out.append(f"# HELP {metric.name} {metric.help}")
+            out.append(f"# TYPE {metric.name} {metric.kind}")
+            out.extend(metric.lines())
+        return "\n".join(out) + "\n"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counts, sums and estimated p50/p95 per series."""
+        return {metric.name: metric.snapshot() for metric in self._metrics}
+
+
+_shared_metrics: Optional[PipelineMetrics] = None
+
+
+def get_pipeline_metrics() -> PipelineMetrics:
+    """Process-wide metrics recorded by inference_stream and the formula pool."""
+    global _shared_metrics
+    if _shared_metrics is None:
+        _shared_metrics = PipelineMetrics()
+    return _shared_metrics
@@ -0,0 +1,191 @@
+"""
+Pipeline Stages - Overlapped stage execution with per-stage timing
+==================================================================
+
+inference_stream is mostly a chain of dependent steps (Call 1 -> inference ->
+organize -> reverse mapping -> Call 2), but some work for Call 2 only needs
+the request itself. `StagePipeline` starts that work as background stages
+while the critical path runs. It hands back the results when they are
+needed, and records when every stage ran so the critical path shows up in
+the logs.
+
+Usage:
+    stages = StagePipeline("inference_stream")
+    stages.start("prompt_scaffold", prompt_builder.build_static_sections, conversation_context)
+
+    stages.begin("call1")
+    evidence = await parse_query_with_web_research(...)
+    stages.end("call1")
+
+    bottlenecks = await stages.timed("bottleneck_detection", detector.detect, state)
+
+    sections = await stages.result("prompt_scaffold")   # None if it failed
+    stages.log_summary(api_logger)
+
+pipeline_metrics.PipelineMetrics folds the finished timings into histograms.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class StageTiming:
+    """When one stage ran, relative to the pipeline start (seconds)."""
+    name: str
+    background: bool
+    started: float
+    finished: Optional[float] = None
+    waited: float = 0.0          # Time the critical path blocked on this stage
+    failed: bool = False
+
+    @property
+    def duration(self) -> Optional[float]:
+        return self.finished - self.started if self.finished is not None else None
+
+
+class StagePipeline:
+    """Background stages plus timing for the inline (critical-path) ones."""
+
+    def __init__(self, name: str = "pipeline"):
+        self.name = name
+        self._origin = time.perf_counter()
+        self.started_ns = time.time_ns()  # Wall clock at the origin, for trace export
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._timings: Dict[str, StageTiming] = {}
+
+    def _now(self) -> float:
+        return time.perf_counter() - self._origin
+
+    def elapsed(self) -> float:
+        """Seconds since the pipeline started."""
+        return self._now()
+
+    # -------------------------------------------------------------------------
+    # Background stages
+    # -------------------------------------------------------------------------
+
+    def start(self, name: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        """
+        Run `fn(*args, **kwargs)` concurrently with the caller.
+
+        Coroutine functions run as tasks on the loop; plain callables run in
+        a worker thread so they never block streaming.
+        """
+        timing = StageTiming(name=name, background=True, started=self._now())
+        self._timings[name] = timing
+
+        async def run() -> Any:
+            try:
+                if asyncio.iscoroutinefunction(fn):
+                    return await fn(*args, **kwargs)
+                return await asyncio.to_thread(fn, *args, **kwargs)
+            except Exception:
+                timing.failed = True
+                raise
+            finally:
+                timing.finished = self._now()
+
+        self._tasks[name] = asyncio.create_task(run(), name=f"{self.name}:{name}")
+
+    async def result(self, name: str, default: Any = None, logger: Any = None, reraise: bool = False) -> Any:
+        """
+        Result of background stage `name`; `default` if it failed or was never
+        started, so the caller can fall back to computing it inline.
+        With `reraise`, a failed stage raises its exception instead.
+        """
+        task = self._tasks.get(name)
+        if task is None:
+            return default
+        timing = self._timings[name]
+        waited_from = self._now()
+        try:
+            return await task
+        except Exception as e:
+            if reraise:
+                raise
+            if logger is not None:
+                logger.warning(f"[{self.name}] Stage '{name}' failed ({type(e).__name__}): {e}")
+            return default
+        finally:
+            timing.waited += self._now() - waited_from
+
+    def cancel(self) -> None:
+        """Cancel background stages that are still running (pipeline aborted)."""
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
+
+    # -------------------------------------------------------------------------
+    # Inline stages
+    # -------------------------------------------------------------------------
+
+    def begin(self, name: str) -> None:
+        """Mark the start of an inline stage."""
+        self._timings[name] = StageTiming(name=name, background=False, started=self._now())
+
+    def end(self, name: str) -> None:
+        """Mark the end of an inline stage started with begin()."""
+        timing = self._timings.get(name)
+        if timing is not None and timing.finished is None:
+            timing.finished = self._now()
+
+    async def timed(self, name: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run `fn` as inline stage `name` and return its result. Plain
+        callables run in a worker thread, like background stages.
+        """
+        self.begin(name)
+        try:
+            if asyncio.iscoroutinefunction(fn):
+                return await fn(*args, **kwargs)
+            return await asyncio.to_thread(fn, *args, **kwargs)
+        except Exception:
+            self._timings[name].failed = True
+            raise
+        finally:
+            self.end(name)
+
+    # -------------------------------------------------------------------------
+    # Reporting
+    # -------------------------------------------------------------------------
+
+    def duration(self, name: str) -> Optional[float]:
+        """Seconds stage `name` took; None if it never ran or has not finished."""
+        timing = self._timings.get(name)
+        return timing.duration if timing is not None else None
+
+    def timings(self) -> List[StageTiming]:
+        """Stage timings in start order."""
+        return sorted(self._timings.values(), key=lambda t: t.started)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per-stage timing in start order (milliseconds)."""
+        def ms(value: Optional[float]) -> Optional[int]:
+            return int(value * 1000) if value is not None else None
+
+        return [
+            {
+                "stage": t.name,
+                "background": t.background,
+                "start_ms": ms(t.started),
+                "end_ms": ms(t.finished),
+                "duration_ms": ms(t.duration),
+                **({"waited_ms": ms(t.waited)} if t.background else {}),
+                **({"failed": True} if t.failed else {}),
+            }
+            for t in self.timings()
+        ]
+
+    def log_summary(self, logger: Any) -> None:
+        """One line per stage; background stages show how long they were waited on."""
+        for row in self.summary():
+            kind = "bg" if row["background"] else "cp"
+            waited = f" waited={row['waited_ms']}ms" if row["background"] else ""
+            failed = " FAILED" if row.get("failed") else ""
+            logger.info(
+                f"[{self.name}] {kind} {row['stage']}: {row['start_ms']}→{row['end_ms']}ms "
+                f"({row['duration_ms']}ms){waited}{failed}"
+            )
@@ -4,6 +4,7 @@ Works backward from desired future states to calculate required consciousness co
 
 Core Components:
 - ReverseCausalityEngine: Multi-dimensional optimization solver
+- OutcomeSolver: Analytic / closed-form solver backends for the engine
 - ConsciousnessSignatures: Templates for common transformation goals
 - PathwayGenerator: Generate multiple viable transformation paths
 - PathwayOptimizer: Score and rank pathways by trade-offs
@@ -16,9 +17,10 @@ Core Components:
 """
 
 from .reverse_causality_engine import ReverseCausalityEngine, RequiredState, ReverseMappingResult
+from .outcome_solver import OutcomeSolver, SolveDiagnostics
 from .consciousness_signatures import ConsciousnessSignatureLibrary, ConsciousnessSignature
 from .pathway_generator import PathwayGenerator, TransformationPathway
-from .pathway_optimizer import PathwayOptimizer, PathwayScore
+from .pathway_optimizer import PathwayOptimizer, PathwayScore, PathwayFrontier
 from .constraint_checker import ConstraintChecker, ConstraintResult
 from .death_sequencer import DeathSequencer, DeathSequence
 from .grace_calculator import GraceCalculator, GraceRequirement
@@ -30,12 +32,15 @@ __all__ = [
     'ReverseCausalityEngine',
     'RequiredState',
     'ReverseMappingResult',
+    'OutcomeSolver',
+    'SolveDiagnostics',
     'ConsciousnessSignatureLibrary',
     'ConsciousnessSignature',
     'PathwayGenerator',
     'TransformationPathway',
     'PathwayOptimizer',
     'PathwayScore',
+    'PathwayFrontier',
     'ConstraintChecker',
     'ConstraintResult',
     'DeathSequencer',
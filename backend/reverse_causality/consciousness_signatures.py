@@ -8,13 +8,27 @@ Each signature specifies:
 - S-level requirements
 - Key death processes that may be needed
 - Grace dependency level
+
+Goal matching runs one multi-pattern pass over the goal text (Aho-Corasick
+via pyahocorasick when available, the pure-Python automaton otherwise) and
+maps the keywords it finds to signatures through an inverted index.
 """
 
-from typing import Dict, List, Optional
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass
 import json
+import threading
+
+try:
+    import ahocorasick
+    _HAS_AHOCORASICK = True
+except ImportError:
+    _HAS_AHOCORASICK = False
 
 from logging_config import get_logger
+from structured_stream import MarkerAutomaton
 logger = get_logger('reverse_causality.signatures')
 
 
@@ -76,12 +90,70 @@ class ConsciousnessSignature:
 class ConsciousnessSignatureLibrary:
     """
     Library of consciousness signatures for common transformation goals.
+
+    Add signatures with add_signature() or load_from_json() so the keyword
+    index stays current; after editing `signatures` directly, call
+    rebuild_index().
     """
 
+    # Ranked matches cached per (lowercased goal, S-level bucket)
+    MATCH_CACHE_SIZE = 512
+
     def __init__(self):
         """Initialize with built-in signatures"""
         self.signatures: Dict[str, ConsciousnessSignature] = {}
+        self._match_cache: "OrderedDict[Tuple[str, int], Tuple[str, ...]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
         self._load_builtin_signatures()
+        self.rebuild_index()
+
+    def rebuild_index(self):
+        """Rebuild the keyword matcher and inverted keyword -> signature index"""
+        index: Dict[str, List[str]] = {}
+        for sig_id, sig in self.signatures.items():
+            for kw in sig.keywords:
+                if kw:
+                    index.setdefault(kw.lower(), []).append(sig_id)
+
+        keywords = list(index)
+        if not keywords:
+            automaton = None
+        elif _HAS_AHOCORASICK:
+            automaton = ahocorasick.Automaton()
+            for kw in keywords:
+                automaton.add_word(kw, kw)
+            automaton.make_automaton()
+        else:
+            automaton = MarkerAutomaton(keywords)
+
+        # Relevance depends on the S-level only through these cut points
+        thresholds = sorted({
+            t for sig in self.signatures.values()
+            for t in (sig.min_s_level - 1.5, sig.min_s_level)
+        })
+
+        with self._cache_lock:
+            self._keyword_index = index
+            self._keywords = keywords
+            self._automaton = automaton
+            self._order = {sig_id: i for i, sig_id in enumerate(self.signatures)}
+            self._s_level_thresholds = thresholds
+            self._match_cache.clear()
+        logger.debug(f"[rebuild_index] {len(self.signatures)} signatures, {len(keywords)} keywords")
+
+    def _matched_keywords(self, text: str) -> Set[str]:
+        """Index keywords occurring anywhere in `text`, in one pass"""
+        automaton = self._automaton
+        if automaton is None:
+            return set()
+        if _HAS_AHOCORASICK:
+            return {kw for _end, kw in automaton.iter(text)}
+        found: Set[int] = set()
+        state = 0
+        for ch in text:
+            state = automaton.step(state, ch)
+            found.update(automaton.matches(state))
+        return {self._keywords[i] for i in found}
 
     def _load_builtin_signatures(self):
         """Load all built-in signatures"""
@@ -685,33 +757,48 @@ class ConsciousnessSignatureLibrary:
         """
         logger.debug(f"[find_signatures_for_goal] goal='{goal_text[:50]}' s_level={current_s_level:.3f}")
         goal_lower = goal_text.lower()
-        matches = []
+        cache_key = (goal_lower, bisect_right(self._s_level_thresholds, current_s_level))
+
+        with self._cache_lock:
+            cached = self._match_cache.get(cache_key)
+            if cached is not None:
+                self._match_cache.move_to_end(cache_key)
+        if cached is not None:
+            result = [self.signatures[sig_id] for sig_id in cached]
+            logger.debug(f"[find_signatures_for_goal] result: {len(result)} matching signatures (cached)")
+            return result
+
+        # Keyword match score per signature
+        keyword_counts: Dict[str, int] = {}
+        for kw in self._matched_keywords(goal_lower):
+            for sig_id in self._keyword_index[kw]:
+                keyword_counts[sig_id] = keyword_counts.get(sig_id, 0) + 1
 
-        for sig in self.signatures.values():
-            # Calculate keyword match score
-            keyword_matches = sum(
-                1 for kw in sig.keywords
-                if kw in goal_lower
-            )
+        matches = []
+        for sig_id in sorted(keyword_counts, key=self._order.__getitem__):
+            sig = self.signatures[sig_id]
 
-            if keyword_matches > 0:
-                # Check S-level accessibility
-                s_level_gap = sig.min_s_level - current_s_level
-                accessible = s_level_gap <= 1.5  # Can reach 1.5 levels up
+            # Check S-level accessibility
+            s_level_gap = sig.min_s_level - current_s_level
+            accessible = s_level_gap <= 1.5  # Can reach 1.5 levels up
 
-                # Calculate relevance score
-                relevance = keyword_matches * 10
-                if accessible:
-                    relevance += 20
-                if s_level_gap <= 0:
-                    relevance += 10
+            # Calculate relevance score
+            relevance = keyword_counts[sig_id] * 10
+            if accessible:
+                relevance += 20
+            if s_level_gap <= 0:
+                relevance += 10
 
-                matches.append((sig, relevance))
+            matches.append((sig, relevance))
 
         # Sort by relevance
         matches.sort(key=lambda x: -x[1])
 
         result = [sig for sig, _ in matches]
+        with self._cache_lock:
+            self._match_cache[cache_key] = tuple(sig.id for sig in result)
+            if len(self._match_cache) > self.MATCH_CACHE_SIZE:
+                self._match_cache.popitem(last=False)
         logger.debug(f"[find_signatures_for_goal] result: {len(result)} matching signatures")
         return result
 
@@ -797,3 +884,29 @@ class ConsciousnessSignatureLibrary:
 
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(export_data, f, indent=2)
+
+    def add_signature(self, signature: ConsciousnessSignature):
+        """Add or replace a signature and refresh the keyword index"""
+        self.signatures[signature.id] = signature
+        self.rebuild_index()
+
+    def load_from_json(self, filepath: str) -> int:
+        """
+        Load a signature pack written by export_to_json. Signatures with an
+        existing id are replaced. Returns the number of signatures loaded.
+        """
+        with open(filepath, 'r', encoding='utf-8') as f:
+            pack = json.load(f)
+
+        for sig_id, data in pack.items():
+            self.signatures[sig_id] = ConsciousnessSignature(
+                **{
+                    **data,
+                    'matrix_requirements': [MatrixRequirement(**mr) for mr in data['matrix_requirements']],
+                    'death_requirements': [DeathRequirement(**dr) for dr in data['death_requirements']],
+                }
+            )
+
+        self.rebuild_index()
+        logger.info(f"[load_from_json] loaded {len(pack)} signatures from {filepath}")
+        return len(pack)
@@ -0,0 +1,475 @@
+"""
+Outcome Solver
+Solver backends for ReverseCausalityEngine
+
+The registered outcome formulas are weighted sums of operators, so their
+gradients are constant and known exactly. The solver works on operator
+arrays instead of copying the operator dict per finite difference:
+
+- Single linear outcome: the smallest mobility-weighted change that hits the
+  target, projected onto the operator bounds. This is closed form, using a
+  breakpoint search on the Lagrange multiplier. Many targets from one
+  current state are solved together as one array problem (solve_batch).
+- Several linear outcomes: bounded least squares on the weighted outcome
+  errors. The solve is direct when the unconstrained optimum lies inside the
+  bounds; otherwise it uses accelerated projected gradient with the exact
+  Hessian.
+- Outcomes given only as a callable: projected gradient with
+  finite-difference gradients and backtracking.
+
+Every solve returns SolveDiagnostics (method, iterations, residual,
+convergence) next to the required operator values.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from logging_config import get_logger
+logger = get_logger('reverse_causality.solver')
+
+
+@dataclass
+class SolveDiagnostics:
+    """How a solve went"""
+    method: str  # "closed_form", "least_squares", "projected_gradient"
+    converged: bool
+    iterations: int
+    residual: float  # |outcome - target| (single) or weighted squared error (multi)
+    gradient_norm: float = 0.0  # Projected gradient norm at the solution
+    active_bounds: List[str] = field(default_factory=list)  # Operators pinned at a bound
+
+
+class LinearOutcome:
+    """Outcome = intercept + sum(coefficient * operator)"""
+
+    __slots__ = ('operators', 'coefficients', 'intercept')
+
+    def __init__(self, operators: Sequence[str], coefficients: Sequence[float], intercept: float = 0.0):
+        merged: Dict[str, float] = {}
+        for op, coef in zip(operators, coefficients):
+            merged[op] = merged.get(op, 0.0) + coef
+        self.operators: Tuple[str, ...] = tuple(merged)
+        self.coefficients = np.array(list(merged.values()), dtype=float)
+        self.intercept = float(intercept)
+
+    @classmethod
+    def from_terms(cls, terms: Sequence[Tuple[str, float, bool]]) -> 'LinearOutcome':
+        """From _safe_weighted_sum terms: (operator, weight, invert); invert uses 1 - value."""
+        operators, coefficients, intercept = [], [], 0.0
+        for op, weight, invert in terms:
+            operators.append(op)
+            coefficients.append(-weight if invert else weight)
+            if invert:
+                intercept += weight
+        return cls(operators, coefficients, intercept)
+
+    def value(self, x: np.ndarray) -> float:
+        return self.intercept + float(self.coefficients @ x)
+
+    def evaluate(self, ops: Dict[str, float]) -> Optional[float]:
+        """Outcome for an operator dict; None if any operator is missing."""
+        values = [ops.get(op) for op in self.operators]
+        if any(v is None for v in values):
+            return None
+        return self.value(np.array(values, dtype=float))
+
+    def coefficients_for(self, names: Sequence[str]) -> np.ndarray:
+        """Coefficient vector over `names` (0 for operators the outcome ignores)."""
+        index = {op: i for i, op in enumerate(self.operators)}
+        return np.array([self.coefficients[index[n]] if n in index else 0.0 for n in names])
+
+
+class CallableOutcome:
+    """Outcome known only as formula(ops) over `operators`"""
+
+    __slots__ = ('operators', 'formula')
+
+    def __init__(self, formula: Callable[[Dict[str, float]], Optional[float]], operators: Sequence[str]):
+        self.formula = formula
+        self.operators: Tuple[str, ...] = tuple(dict.fromkeys(operators))
+
+    def evaluate(self, ops: Dict[str, float]) -> Optional[float]:
+        return self.formula(ops)
+
+
+OutcomeModel = Union[LinearOutcome, CallableOutcome]
+
+
+def outcome_model(config: Dict[str, Any]) -> OutcomeModel:
+    """Model for an OUTCOME_FORMULAS entry: linear when it declares its terms."""
+    if config.get('terms'):
+        return LinearOutcome.from_terms(config['terms'])
+    return CallableOutcome(config['formula'], config['operators'])
+
+
+class OutcomeSolver:
+    """
+    Find operator values that produce desired outcomes.
+
+    `mobility` (0-1 per operator) scales how far an operator is allowed to
+    move relative to the others; operators with mobility 0, or missing from
+    `mobility`, are held fixed. Bounds are [0, 1], narrowed by
+    `{op}_min` / `{op}_max` constraints.
+    """
+
+    def __init__(self, max_iterations: int = 500, gradient_tolerance: float = 1e-9,
+                 regularization: float = 1e-4):
+        self.max_iterations = max_iterations
+        self.gradient_tolerance = gradient_tolerance
+        # Weight of the change penalty in multi-outcome solves; picks the
+        # smallest change among equally good solutions
+        self.regularization = regularization
+
+    # -------------------------------------------------------------------------
+    # Single outcome
+    # -------------------------------------------------------------------------
+
+    def solve(
+        self,
+        outcome: OutcomeModel,
+        target: float,
+        current_operators: Dict[str, float],
+        mobility: Dict[str, float],
+        constraints: Optional[Dict[str, Any]] = None,
+        tolerance: float = 0.01,
+        max_iterations: Optional[int] = None
+    ) -> Optional[Tuple[Dict[str, float], SolveDiagnostics]]:
+        """
+        Operator values that bring `outcome` to `target` with the smallest
+        mobility-weighted change. Returns None if an operator value is missing.
+        """
+        names = list(outcome.operators)
+        problem = _Problem.build(names, current_operators, mobility, constraints)
+        if problem is None:
+            return None
+
+        if isinstance(outcome, LinearOutcome):
+            [(x, diagnostics)] = self._closed_form(
+                outcome.coefficients_for(names)[None, :], np.array([target - outcome.intercept]),
+                problem, tolerance
+            )
+        else:
+            def error(x: np.ndarray) -> Optional[float]:
+                value = outcome.evaluate(problem.as_dict(x))
+                return None if value is None else (value - target) ** 2
+
+            result = self._projected_gradient(error, problem, max_iterations or self.max_iterations)
+            if result is None:
+                return None
+            x, diagnostics = result
+            diagnostics.residual = abs(outcome.evaluate(problem.as_dict(x)) - target)
+            diagnostics.converged = diagnostics.residual < tolerance
+
+        logger.debug(
+            f"[solve] method={diagnostics.method} converged={diagnostics.converged} "
+            f"iterations={diagnostics.iterations} residual={diagnostics.residual:.4f}"
+        )
+        return problem.as_dict(x), diagnostics
+
+    def solve_batch(
+        self,
+        targets: Sequence[Tuple[LinearOutcome, float]],
+        current_operators: Dict[str, float],
+        mobility: Dict[str, float],
+        constraints: Optional[Dict[str, Any]] = None,
+        tolerance: float = 0.01
+    ) -> List[Optional[Tuple[Dict[str, float], SolveDiagnostics]]]:
+        """
+        solve() for many (linear outcome, target) pairs from one current state,
+        as a single array problem. Entries are None where an operator value
+        is missing.
+        """
+        solvable = [
+            i for i, (model, _target) in enumerate(targets)
+            if all(current_operators.get(op) is not None for op in model.operators)
+        ]
+        results: List[Optional[Tuple[Dict[str, float], SolveDiagnostics]]] = [None] * len(targets)
+        if not solvable:
+            return results
+
+        names = list(dict.fromkeys(op for i in solvable for op in targets[i][0].operators))
+        problem = _Problem.build(names, current_operators, mobility, constraints)
+        A = np.array([targets[i][0].coefficients_for(names) for i in solvable])
+        b = np.array([targets[i][1] - targets[i][0].intercept for i in solvable])
+        for i, (x, diagnostics) in zip(solvable, self._closed_form(A, b, problem, tolerance)):
+            results[i] = (problem.as_dict(x), diagnostics)
+
+        logger.debug(
+            f"[solve_batch] targets={len(targets)} solved={len(solvable)} operators={len(names)} "
+            f"converged={sum(results[i][1].converged for i in solvable)}"
+        )
+        return results
+
+    def _closed_form(self, A: np.ndarray, b: np.ndarray, problem: '_Problem',
+                     tolerance: float) -> List[Tuple[np.ndarray, SolveDiagnostics]]:
+        """
+        For each row a of A (with target b):
+            min sum((x - x0)^2 / m)  s.t.  a.x = b,  lo <= x <= hi
+
+        The solution is x(lam) = clip(x0 + lam * m * a, lo, hi) for the
+        multiplier lam where a.x(lam) = b. a.x(lam) is nondecreasing and
+        piecewise linear between the points where coordinates hit a bound,
+        so lam is found exactly by evaluating those breakpoints.
+        When b is out of reach, the closest end is returned. Operators a row
+        does not involve keep their current values.
+        """
+        x0, lo, hi = problem.x0, problem.lo, problem.hi
+        involved = A != 0
+        direction = np.where(problem.free, problem.mobility * A, 0.0)
+        moving = direction != 0
+
+        # Breakpoints per row (padded with 0 where a coordinate does not move)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            to_lo = np.where(moving, (lo - x0) / direction, 0.0)
+            to_hi = np.where(moving, (hi - x0) / direction, 0.0)
+        breakpoints = np.sort(np.concatenate((to_lo, to_hi, np.zeros((len(A), 1))), axis=1), axis=1)
+
+        def position(lam: np.ndarray) -> np.ndarray:
+            """x(lam) for every row; lam has shape (rows,) or (rows, points)."""
+            lam = lam[..., None]
+            step = x0 + lam * (direction[:, None, :] if lam.ndim == 3 else direction)
+            clipped = np.clip(step, lo, hi)
+            mask = involved[:, None, :] if lam.ndim == 3 else involved
+            return np.where(mask, clipped, x0)
+
+        reached = np.einsum('rpn,rn->rp', position(breakpoints), A)
+
+        # First breakpoint reaching b; rows outside the reachable range stop at an end
+        k = (reached < b[:, None]).sum(axis=1)
+        last = breakpoints.shape[1] - 1
+        upper = np.minimum(k, last)
+        lower = np.maximum(k - 1, 0)
+        take = lambda values, index: np.take_along_axis(values, index[:, None], axis=1)[:, 0]
+        lam_lo, lam_hi = take(breakpoints, lower), take(breakpoints, upper)
+        reached_lo, reached_hi = take(reached, lower), take(reached, upper)
+        span = reached_hi - reached_lo
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lam = np.where(
+                (k == 0) | (k > last) | (span <= 0),
+                np.where(k == 0, breakpoints[:, 0], breakpoints[:, last]),
+                lam_lo + (b - reached_lo) * (lam_hi - lam_lo) / span
+            )
+
+        X = position(lam)
+        residuals = np.abs(np.einsum('rn,rn->r', X, A) - b)
+        return [
+            (X[r], SolveDiagnostics(
+                'closed_form', bool(residuals[r] < tolerance), int(2 * moving[r].sum() + 1),
+                float(residuals[r]), active_bounds=problem.active_bounds(X[r], moving[r])
+            ))
+            for r in range(len(A))
+        ]
+
+    # -------------------------------------------------------------------------
+    # Several outcomes
+    # -------------------------------------------------------------------------
+
+    def solve_multi(
+        self,
+        outcomes: Sequence[Tuple[OutcomeModel, float, float]],
+        current_operators: Dict[str, float],
+        mobility: Dict[str, float],
+        constraints: Optional[Dict[str, Any]] = None,
+        tolerance: float = 0.001
+    ) -> Optional[Tuple[Dict[str, float], SolveDiagnostics]]:
+        """
+        Operator values minimizing sum(weight * (outcome - target)^2) over
+        (model, target, weight) triples. Returns None if an operator value is
+        missing.
+        """
+        names = list(dict.fromkeys(op for model, _t, _w in outcomes for op in model.operators))
+        problem = _Problem.build(names, current_operators, mobility, constraints)
+        if problem is None:
+            return None
+
+        if all(isinstance(model, LinearOutcome) for model, _t, _w in outcomes):
+            A = np.array([model.coefficients_for(names) for model, _t, _w in outcomes])
+            b = np.array([target - model.intercept for model, target, _w in outcomes])
+            w = np.array([weight for _m, _t, weight in outcomes])
+            x, diagnostics = self._least_squares(A, b, w, problem)
+        else:
+            def loss(x: np.ndarray) -> Optional[float]:
+                ops = problem.as_dict(x)
+                total = 0.0
+                for model, target, weight in outcomes:
+                    value = model.evaluate(ops)
+                    if value is None:
+                        return None
+                    total += weight * (value - target) ** 2
+                return total
+
+            result = self._projected_gradient(loss, problem, self.max_iterations)
+            if result is None:
+                return None
+            x, diagnostics = result
+
+        diagnostics.converged = diagnostics.converged or diagnostics.residual < tolerance
+        logger.debug(
+            f"[solve_multi] outcomes={len(outcomes)} method={diagnostics.method} "
+            f"converged={diagnostics.converged} iterations={diagnostics.iterations} "
+            f"loss={diagnostics.residual:.5f}"
+        )
+        return problem.as_dict(x), diagnostics
+
+    def _least_squares(self, A: np.ndarray, b: np.ndarray, w: np.ndarray,
+                       problem: '_Problem') -> Tuple[np.ndarray, SolveDiagnostics]:
+        """
+        min sum(w * (A x - b)^2) + mu * sum((x - x0)^2 / m)  s.t.  lo <= x <= hi
+        """
+        x0, lo, hi = problem.x0, problem.lo, problem.hi
+        free = problem.free
+        penalty = np.where(free, self.regularization / problem.mobility, 0.0)
+        AtW = A.T * w
+        hessian = AtW @ A + np.diag(penalty)
+        linear = AtW @ b + penalty * x0
+
+        def loss(x: np.ndarray) -> float:
+            r = A @ x - b
+            return float(w @ (r * r))
+
+        def projected_gradient_norm(x: np.ndarray) -> float:
+            gradient = np.where(free, hessian @ x - linear, 0.0)
+            return float(np.linalg.norm(x - np.clip(x - gradient, lo, hi)))
+
+        # Unconstrained optimum over the free operators
+        x = x0.copy()
+        if free.any():
+            H = hessian[np.ix_(free, free)]
+            rhs = linear[free] - hessian[np.ix_(free, ~free)] @ x0[~free]
+            x[free] = np.linalg.solve(H, rhs)
+        if np.all(x >= lo - 1e-12) and np.all(x <= hi + 1e-12):
+            x = np.clip(x, lo, hi)
+            return x, SolveDiagnostics('least_squares', True, 1, loss(x), projected_gradient_norm(x))
+
+        # Accelerated projected gradient with step 1/L (L = largest Hessian eigenvalue)
+        step = 1.0 / max(float(np.linalg.eigvalsh(hessian).max()), 1e-12)
+        x = np.clip(x0, lo, hi)
+        y, momentum = x.copy(), 1.0
+        converged = False
+        iteration = 0
+        for iteration in range(1, self.max_iterations + 1):
+            gradient = np.where(free, hessian @ y - linear, 0.0)
+            x_next = np.clip(y - step * gradient, lo, hi)
+            momentum_next = (1.0 + np.sqrt(1.0 + 4.0 * momentum * momentum)) / 2.0
+            y = x_next + ((momentum - 1.0) / momentum_next) * (x_next - x)
+            x, momentum = x_next, momentum_next
+            if projected_gradient_norm(x) < self.gradient_tolerance:
+                converged = True
+                break
+
+        return x, SolveDiagnostics(
+            'least_squares', converged, iteration, loss(x), projected_gradient_norm(x),
+            active_bounds=problem.active_bounds(x, free)
+        )
+
+    # -------------------------------------------------------------------------
+    # Nonlinear fallback
+    # -------------------------------------------------------------------------
+
+    def _projected_gradient(self, objective: Callable[[np.ndarray], Optional[float]],
+                            problem: '_Problem', max_iterations: int,
+                            epsilon: float = 1e-6) -> Optional[Tuple[np.ndarray, SolveDiagnostics]]:
+        """
+        Projected gradient with forward-difference gradients and backtracking,
+        on objective(x) + mu * sum((x - x0)^2 / m). None if the objective
+        cannot be evaluated.
+        """
+        x0, lo, hi, free = problem.x0, problem.lo, problem.hi, problem.free
+        penalty = np.where(free, self.regularization / problem.mobility, 0.0)
+        basis = np.eye(len(x0))
+
+        def total(x: np.ndarray) -> Optional[float]:
+            value = objective(x)
+            if value is None:
+                return None
+            return value + float(penalty @ ((x - x0) ** 2))
+
+        x = np.clip(x0, lo, hi)
+        fx = total(x)
+        if fx is None:
+            return None
+        step, gradient_norm, converged = 1.0, 0.0, False
+        iteration = 0
+        for iteration in range(1, max_iterations + 1):
+            gradient = np.zeros_like(x)
+            for i in np.flatnonzero(free):
+                h = epsilon if x[i] + epsilon <= hi[i] else -epsilon
+                shifted = total(x + h * basis[i])
+                if shifted is None:
+                    return None
+                gradient[i] = (shifted - fx) / h
+
+            gradient_norm = float(np.linalg.norm(x - np.clip(x - gradient, lo, hi)))
+            if gradient_norm < max(self.gradient_tolerance, epsilon):
+                converged = True
+                break
+
+            # Backtracking (Armijo) along the projected path
+            while True:
+                x_next = np.clip(x - step * gradient, lo, hi)
+                f_next = total(x_next)
+                if f_next is None:
+                    return None
+                if f_next <= fx - 1e-4 * float(gradient @ (x - x_next)) or step < 1e-10:
+                    break
+                step *= 0.5
+            if abs(fx - f_next) < 1e-15:
+                x, fx = x_next, f_next
+                converged = True
+                break
+            x, fx = x_next, f_next
+            step = min(step * 2.0, 1.0)
+
+        residual = objective(x)
+        return x, SolveDiagnostics(
+            'projected_gradient', converged, iteration, residual if residual is not None else fx,
+            gradient_norm, active_bounds=problem.active_bounds(x, free)
+        )
+
+
+class _Problem:
+    """Operator arrays for one solve"""
+
+    __slots__ = ('names', 'x0', 'lo', 'hi', 'mobility', 'free', 'base')
+
+    @classmethod
+    def build(cls, names: List[str], current_operators: Dict[str, float],
+              mobility: Dict[str, float], constraints: Optional[Dict[str, Any]]) -> Optional['_Problem']:
+        values = [current_operators.get(op) for op in names]
+        missing = [op for op, v in zip(names, values) if v is None]
+        if missing:
+            logger.warning(f"[OutcomeSolver] missing operators: {missing}")
+            return None
+
+        problem = cls()
+        problem.names = names
+        problem.base = current_operators
+        problem.x0 = np.array(values, dtype=float)
+        m = np.array([mobility.get(op, 0.0) or 0.0 for op in names], dtype=float)
+        problem.free = m > 0
+        problem.mobility = np.where(problem.free, m, 1.0)
+
+        lo = np.zeros(len(names))
+        hi = np.ones(len(names))
+        if constraints:
+            for i, op in enumerate(names):
+                if f"{op}_min" in constraints:
+                    lo[i] = max(lo[i], constraints[f"{op}_min"])
+                if f"{op}_max" in constraints:
+                    hi[i] = min(hi[i], constraints[f"{op}_max"])
+        lo = np.minimum(lo, hi)  # A max below the min wins, as before
+        # Fixed operators stay where they are
+        problem.lo = np.where(problem.free, lo, problem.x0)
+        problem.hi = np.where(problem.free, hi, problem.x0)
+        return problem
+
+    def as_dict(self, x: np.ndarray) -> Dict[str, float]:
+        ops = dict(self.base)
+        ops.update(zip(self.names, x.tolist()))
+        return ops
+
+    def active_bounds(self, x: np.ndarray, considered: np.ndarray) -> List[str]:
+        at_bound = considered & ((x <= self.lo + 1e-12) | (x >= self.hi - 1e-12))
+        return [self.names[i] for i in np.flatnonzero(at_bound)]
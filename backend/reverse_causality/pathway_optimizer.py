@@ -10,10 +10,17 @@ Scoring Dimensions:
 5. Success Probability - Likelihood of achieving goal
 
 Outputs trade-off analysis for decision making.
+
+Each pathway's dimension vector is scored once and cached together with
+the Pareto frontier of the set, so re-ranking for new preference weights
+(e.g. the UI's sliders) is a dot product per pathway instead of a rescore.
 """
 
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, field, replace
 from .pathway_generator import TransformationPathway
 
 from logging_config import get_logger
@@ -79,6 +86,23 @@ class OptimizationResult:
     # User preference matching
     preference_match: Dict[str, PathwayScore]
 
+    # Cached scoring this ranking came from (pass to PathwayOptimizer.rerank)
+    frontier_id: Optional[str] = None
+    pareto_frontier: List[str] = field(default_factory=list)  # Non-dominated pathway ids
+
+
+@dataclass
+class PathwayFrontier:
+    """Dimension vectors for a pathway set, scored once and re-weighted per ranking"""
+    frontier_id: str
+    scores: List[PathwayScore]  # Unweighted dimension scores, in generation order
+    vectors: List[Tuple[float, ...]]  # Dimension scores in DIMENSIONS order (None -> 0.0)
+    frontier: List[int]  # Indices of non-dominated pathways
+
+    @property
+    def frontier_ids(self) -> List[str]:
+        return [self.scores[i].pathway_id for i in self.frontier]
+
 
 class PathwayOptimizer:
     """
@@ -94,6 +118,16 @@ class PathwayOptimizer:
         'success': 0.25
     }
 
+    # Dimension order of the cached vectors
+    DIMENSIONS = ('speed', 'stability', 'effort', 'side_effects', 'success')
+
+    # Frontiers kept for preference re-ranking (LRU)
+    FRONTIER_CACHE_SIZE = 256
+
+    def __init__(self):
+        self._frontiers: "OrderedDict[str, PathwayFrontier]" = OrderedDict()
+        self._frontier_lock = threading.Lock()
+
     def optimize_pathways(
         self,
         pathways: List[TransformationPathway],
@@ -112,25 +146,85 @@ class PathwayOptimizer:
             OptimizationResult with scored and ranked pathways
         """
         logger.debug(f"[optimize_pathways] pathways={len(pathways)} user_prefs={user_preferences is not None}")
-        # Merge user preferences with defaults
-        weights = self.DEFAULT_WEIGHTS.copy()
-        if user_preferences:
-            for k, v in user_preferences.items():
-                if k in weights:
-                    weights[k] = v
+        frontier = self.build_frontier(pathways, current_capacity)
+        return self.rank_frontier(frontier, user_preferences)
 
-            # Normalize weights
-            total = sum(weights.values())
-            weights = {k: v / total for k, v in weights.items()}
+    def build_frontier(
+        self,
+        pathways: List[TransformationPathway],
+        current_capacity: Optional[Dict[str, float]] = None
+    ) -> PathwayFrontier:
+        """
+        Score every pathway's dimensions once and find the Pareto frontier.
+
+        The frontier is cached under its frontier_id for rerank().
+        """
+        scores = [self._score_pathway(pathway, current_capacity) for pathway in pathways]
+        vectors = [
+            tuple(d.score if d.score is not None else 0.0 for d in self._dimension_scores(s))
+            for s in scores
+        ]
+        frontier = [
+            i for i, v in enumerate(vectors)
+            if not any(self._dominates(other, v) for j, other in enumerate(vectors) if j != i)
+        ]
+
+        result = PathwayFrontier(
+            frontier_id=uuid.uuid4().hex,
+            scores=scores,
+            vectors=vectors,
+            frontier=frontier
+        )
+        with self._frontier_lock:
+            self._frontiers[result.frontier_id] = result
+            while len(self._frontiers) > self.FRONTIER_CACHE_SIZE:
+                self._frontiers.popitem(last=False)
+
+        logger.debug(f"[build_frontier] pathways={len(scores)} frontier={len(frontier)}")
+        return result
+
+    def rerank(
+        self,
+        frontier_id: str,
+        user_preferences: Optional[Dict[str, float]] = None
+    ) -> Optional[OptimizationResult]:
+        """
+        Re-rank a cached pathway set for new preference weights.
 
-        # Score each pathway
+        Returns None if the frontier is unknown or has been evicted.
+        """
+        with self._frontier_lock:
+            frontier = self._frontiers.get(frontier_id)
+            if frontier is not None:
+                self._frontiers.move_to_end(frontier_id)
+        if frontier is None:
+            logger.debug(f"[rerank] frontier {frontier_id} not cached")
+            return None
+        return self.rank_frontier(frontier, user_preferences)
+
+    def rank_frontier(
+        self,
+        frontier: PathwayFrontier,
+        user_preferences: Optional[Dict[str, float]] = None
+    ) -> OptimizationResult:
+        """
+        Rank a scored pathway set for the given preference weights.
+
+        Totals are a dot product of each cached vector with the weights.
+        Ties keep generation order, as the original stable sort did.
+        """
+        weights = self._weights(user_preferences)
+        weight_vector = [weights[d] for d in self.DIMENSIONS]
         scored = []
-        for pathway in pathways:
-            score = self._score_pathway(pathway, weights, current_capacity)
-            scored.append(score)
+        for i, (base, vector) in enumerate(zip(frontier.scores, frontier.vectors)):
+            total = 0.0
+            for score, weight in zip(vector, weight_vector):
+                total += score * weight
+            scored.append((total, i, self._weighted(base, weights, total)))
 
-        # Sort by total score
-        scored.sort(key=lambda x: -x.total_score)
+        # Sort by total score (ties by generation order)
+        scored.sort(key=lambda x: (-x[0], x[1]))
+        scored = [s for _, _, s in scored]
 
         # Assign percentile ranks
         for i, s in enumerate(scored):
@@ -161,24 +255,82 @@ class PathwayOptimizer:
             'ease': easiest
         }
 
-        logger.debug(f"[optimize_pathways] result: best={scored[0].pathway_name} score={scored[0].total_score:.3f}")
+        logger.debug(f"[rank_frontier] result: best={scored[0].pathway_name} score={scored[0].total_score:.3f}")
         return OptimizationResult(
             scored_pathways=scored,
             best_pathway=scored[0],
             fastest_pathway=fastest,
             most_stable_pathway=most_stable,
             easiest_pathway=easiest,
-            preference_match=preference_match
+            preference_match=preference_match,
+            frontier_id=frontier.frontier_id,
+            pareto_frontier=frontier.frontier_ids
+        )
+
+    def _weights(self, user_preferences: Optional[Dict[str, float]]) -> Dict[str, float]:
+        """
+        Merge user preferences with the default weights.
+        """
+        # Merge user preferences with defaults
+        weights = self.DEFAULT_WEIGHTS.copy()
+        if user_preferences:
+            for k, v in user_preferences.items():
+                if k in weights:
+                    weights[k] = v
+
+            # Normalize weights
+            total = sum(weights.values())
+            if total <= 0:
+                raise ValueError("Preference weights must sum to a positive value")
+            weights = {k: v / total for k, v in weights.items()}
+        return weights
+
+    @staticmethod
+    def _dominates(a: Tuple[float, ...], b: Tuple[float, ...]) -> bool:
+        """True if a is at least as good as b on every dimension and better on one."""
+        return all(x >= y for x, y in zip(a, b)) and any(x > y for x, y in zip(a, b))
+
+    @staticmethod
+    def _dimension_scores(score: PathwayScore) -> Tuple[WeightedDimensionScore, ...]:
+        return (
+            score.speed_score,
+            score.stability_score,
+            score.effort_score,
+            score.side_effect_score,
+            score.success_score
+        )
+
+    def _weighted(self, base: PathwayScore, weights: Dict[str, float], total: float) -> PathwayScore:
+        """
+        Copy a cached score with weights applied (the cached one stays unweighted).
+        """
+        # Apply weights (guard None scores — uncomputable dimensions stay None)
+        dimensions = {}
+        for dim in self._dimension_scores(base):
+            weight = weights[dim.dimension]
+            dimensions[dim.dimension] = replace(
+                dim,
+                weight=weight,
+                weighted_score=dim.score * weight if dim.score is not None else None
+            )
+
+        return replace(
+            base,
+            speed_score=dimensions['speed'],
+            stability_score=dimensions['stability'],
+            effort_score=dimensions['effort'],
+            side_effect_score=dimensions['side_effects'],
+            success_score=dimensions['success'],
+            total_score=total
         )
 
     def _score_pathway(
         self,
         pathway: TransformationPathway,
-        weights: Dict[str, float],
         capacity: Optional[Dict[str, float]]
     ) -> PathwayScore:
         """
-        Score a single pathway on all dimensions.
+        Score a single pathway on all dimensions (unweighted).
         """
         logger.debug(f"[_score_pathway] scoring pathway={pathway.id}")
         # Speed score
@@ -196,32 +348,6 @@ class PathwayOptimizer:
         # Success probability score
         success = self._score_success(pathway)
 
-        # Apply weights (guard None scores — uncomputable dimensions stay None)
-        speed.weight = weights['speed']
-        speed.weighted_score = speed.score * speed.weight if speed.score is not None else None
-
-        stability.weight = weights['stability']
-        stability.weighted_score = stability.score * stability.weight if stability.score is not None else None
-
-        effort.weight = weights['effort']
-        effort.weighted_score = effort.score * effort.weight if effort.score is not None else None
-
-        side_effects.weight = weights['side_effects']
-        side_effects.weighted_score = side_effects.score * side_effects.weight if side_effects.score is not None else None
-
-        success.weight = weights['success']
-        success.weighted_score = success.score * success.weight if success.score is not None else None
-
-        # Calculate total score (skip None weighted scores)
-        weighted_scores = [ws for ws in [
-            speed.weighted_score,
-            stability.weighted_score,
-            effort.weighted_score,
-            side_effects.weighted_score,
-            success.weighted_score
-        ] if ws is not None]
-        total = sum(weighted_scores) if weighted_scores else 0.0
-
         # Generate trade-off analysis
         tradeoffs = self._analyze_tradeoffs(pathway, speed, stability, effort)
 
@@ -233,10 +359,10 @@ class PathwayOptimizer:
             effort_score=effort,
             side_effect_score=side_effects,
             success_score=success,
-            total_score=total,
-            percentile_rank=0,  # Will be set later
+            total_score=0.0,  # Set per ranking
+            percentile_rank=0,  # Set per ranking
             tradeoffs=tradeoffs,
-            recommended=False,  # Will be set later
+            recommended=False,  # Set per ranking
             recommendation_reason=""
         )
 
@@ -9,14 +9,16 @@ Mathematical Approach:
 - Such that: F(X) ≈ O* where F is the forward inference function
 - Subject to: Constraints (Sacred Chain, karma, belief compatibility)
 
-Uses gradient descent with constraint satisfaction for non-linear optimization.
+Outcomes are linear in the operators, so solves use exact gradients on
+operator arrays (see outcome_solver.py) with bound constraints.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 import math
 
 from logging_config import get_logger
+from .outcome_solver import LinearOutcome, OutcomeSolver, SolveDiagnostics, outcome_model
 logger = get_logger('reverse_causality.engine')
 
 
@@ -40,6 +42,16 @@ def _safe_weighted_sum(ops: dict, terms: list) -> Optional[float]:
     return total
 
 
+def _outcome_config(terms: list) -> dict:
+    """OUTCOME_FORMULAS entry for a weighted sum of (operator_name, weight, invert) terms."""
+    return {
+        'terms': terms,
+        'formula': lambda ops: _safe_weighted_sum(ops, terms),
+        'operators': [op_name for op_name, _weight, _invert in terms],
+        'inverse': [op_name for op_name, _weight, invert in terms if invert],
+    }
+
+
 @dataclass
 class RequiredState:
     """Required consciousness state for a desired outcome"""
@@ -82,6 +94,8 @@ class ReverseMappingResult:
 
     sensitivity_analysis: Dict[str, float]  # Which operators matter most
 
+    solver_diagnostics: Optional[SolveDiagnostics] = None  # How the required state was solved
+
 
 class ReverseCausalityEngine:
     """
@@ -122,127 +136,90 @@ class ReverseCausalityEngine:
     }
 
     # Outcome formulas (simplified representations of forward inference)
-    # Maps outcome names to functions of operators
+    # Maps outcome names to weighted sums of operators; an entry with only
+    # 'formula' and 'operators' is solved numerically
     OUTCOME_FORMULAS = {
-        'breakthrough_probability': {
-            'formula': lambda ops: _safe_weighted_sum(ops, [
-                ('G_grace', 0.25, False),
-                ('S_surrender', 0.2, False),
-                ('Co_coherence', 0.15, False),
-                ('I_intention', 0.15, False),
-                ('At_attachment', 0.1, True),
-                ('R_resistance', 0.1, True),
-                ('V_void', 0.05, False),
-            ]),
-            'operators': ['G_grace', 'S_surrender', 'Co_coherence', 'I_intention',
-                         'At_attachment', 'R_resistance', 'V_void'],
-            'inverse': ['At_attachment', 'R_resistance']
-        },
-        'manifestation_power': {
-            'formula': lambda ops: _safe_weighted_sum(ops, [
-                ('I_intention', 0.3, False),
-                ('Co_coherence', 0.2, False),
-                ('Sh_shakti', 0.2, False),
-                ('M_maya', 0.15, True),
-                ('D_dharma', 0.15, False),
-            ]),
-            'operators': ['I_intention', 'Co_coherence', 'Sh_shakti', 'M_maya', 'D_dharma'],
-            'inverse': ['M_maya']
-        },
-        'transformation_velocity': {
-            'formula': lambda ops: _safe_weighted_sum(ops, [
-                ('G_grace', 0.2, False),
-                ('S_surrender', 0.2, False),
-                ('A_aware', 0.15, False),
-                ('Hf_habit', 0.15, True),
-                ('K_karma', 0.15, True),
-                ('Ce_cleaning', 0.15, False),
-            ]),
-            'operators': ['G_grace', 'S_surrender', 'A_aware', 'Hf_habit', 'K_karma', 'Ce_cleaning'],
-            'inverse': ['Hf_habit', 'K_karma']
-        },
-        'peace_depth': {
-            'formula': lambda ops: _safe_weighted_sum(ops, [
-                ('P_presence', 0.25, False),
-                ('E_equanimity', 0.25, False),
-                ('F_fear', 0.15, True),
-                ('At_attachment', 0.15, True),
-                ('W_witness', 0.2, False),
-            ]),
-            'operators': ['P_presence', 'E_equanimity', 'F_fear', 'At_attachment', 'W_witness'],
-            'inverse': ['F_fear', 'At_attachment']
-        },
-        'love_capacity': {
-            'formula': lambda ops: _safe_weighted_sum(ops, [
-                ('O_openness', 0.25, False),
-                ('F_fear', 0.2, True),
-                ('Se_service', 0.2, False),
-                ('Tr_trust', 0.2, False),
-                ('At_attachment', 0.15, True),
-            ]),
-            'operators': ['O_openness', 'F_fear', 'Se_service', 'Tr_trust', 'At_attachment'],
-            'inverse': ['F_fear', 'At_attachment']
-        },
-        'creative_flow': {
-            'formula': lambda ops: _safe_weighted_sum(ops, [
-                ('O_openness', 0.2, False),
-                ('J_joy', 0.2, False),
-                ('Sh_shakti', 0.2, False),
-                ('R_resistance', 0.2, True),
-                ('V_void', 0.2, False),
-            ]),
-            'operators': ['O_openness', 'J_joy', 'Sh_shakti', 'R_resistance', 'V_void'],
-            'inverse': ['R_resistance']
-        },
-        'wisdom_access': {
-            'formula': lambda ops: _safe_weighted_sum(ops, [
-                ('W_witness', 0.25, False),
-                ('A_aware', 0.2, False),
-                ('M_maya', 0.2, True),
-                ('P_presence', 0.2, False),
-                ('Co_coherence', 0.15, False),
-            ]),
-            'operators': ['W_witness', 'A_aware', 'M_maya', 'P_presence', 'Co_coherence'],
-            'inverse': ['M_maya']
-        },
-        'grace_availability': {
-            'formula': lambda ops: _safe_weighted_sum(ops, [
-                ('S_surrender', 0.3, False),
-                ('Se_service', 0.2, False),
-                ('D_dharma', 0.2, False),
-                ('At_attachment', 0.15, True),
-                ('Ce_cleaning', 0.15, False),
-            ]),
-            'operators': ['S_surrender', 'Se_service', 'D_dharma', 'At_attachment', 'Ce_cleaning'],
-            'inverse': ['At_attachment']
-        },
-        's_level_potential': {
-            'formula': lambda ops: _safe_weighted_sum(ops, [
-                ('A_aware', 0.2, False),
-                ('G_grace', 0.2, False),
-                ('Co_coherence', 0.15, False),
-                ('K_karma', 0.15, True),
-                ('At_attachment', 0.15, True),
-                ('S_surrender', 0.15, False),
-            ]),
-            'operators': ['A_aware', 'G_grace', 'Co_coherence', 'K_karma', 'At_attachment', 'S_surrender'],
-            'inverse': ['K_karma', 'At_attachment']
-        },
-        'karma_burn_rate': {
-            'formula': lambda ops: _safe_weighted_sum(ops, [
-                ('Ce_cleaning', 0.3, False),
-                ('G_grace', 0.3, False),
-                ('A_aware', 0.2, False),
-                ('At_attachment', 0.2, True),
-            ]),
-            'operators': ['Ce_cleaning', 'G_grace', 'A_aware', 'At_attachment'],
-            'inverse': ['At_attachment']
-        }
+        'breakthrough_probability': _outcome_config([
+            ('G_grace', 0.25, False),
+            ('S_surrender', 0.2, False),
+            ('Co_coherence', 0.15, False),
+            ('I_intention', 0.15, False),
+            ('At_attachment', 0.1, True),
+            ('R_resistance', 0.1, True),
+            ('V_void', 0.05, False),
+        ]),
+        'manifestation_power': _outcome_config([
+            ('I_intention', 0.3, False),
+            ('Co_coherence', 0.2, False),
+            ('Sh_shakti', 0.2, False),
+            ('M_maya', 0.15, True),
+            ('D_dharma', 0.15, False),
+        ]),
+        'transformation_velocity': _outcome_config([
+            ('G_grace', 0.2, False),
+            ('S_surrender', 0.2, False),
+            ('A_aware', 0.15, False),
+            ('Hf_habit', 0.15, True),
+            ('K_karma', 0.15, True),
+            ('Ce_cleaning', 0.15, False),
+        ]),
+        'peace_depth': _outcome_config([
+            ('P_presence', 0.25, False),
+            ('E_equanimity', 0.25, False),
+            ('F_fear', 0.15, True),
+            ('At_attachment', 0.15, True),
+            ('W_witness', 0.2, False),
+        ]),
+        'love_capacity': _outcome_config([
+            ('O_openness', 0.25, False),
+            ('F_fear', 0.2, True),
+            ('Se_service', 0.2, False),
+            ('Tr_trust', 0.2, False),
+            ('At_attachment', 0.15, True),
+        ]),
+        'creative_flow': _outcome_config([
+            ('O_openness', 0.2, False),
+            ('J_joy', 0.2, False),
+            ('Sh_shakti', 0.2, False),
+            ('R_resistance', 0.2, True),
+            ('V_void', 0.2, False),
+        ]),
+        'wisdom_access': _outcome_config([
+            ('W_witness', 0.25, False),
+            ('A_aware', 0.2, False),
+            ('M_maya', 0.2, True),
+            ('P_presence', 0.2, False),
+            ('Co_coherence', 0.15, False),
+        ]),
+        'grace_availability': _outcome_config([
+            ('S_surrender', 0.3, False),
+            ('Se_service', 0.2, False),
+            ('D_dharma', 0.2, False),
+            ('At_attachment', 0.15, True),
+            ('Ce_cleaning', 0.15, False),
+        ]),
+        's_level_potential': _outcome_config([
+            ('A_aware', 0.2, False),
+            ('G_grace', 0.2, False),
+            ('Co_coherence', 0.15, False),
+            ('K_karma', 0.15, True),
+            ('At_attachment', 0.15, True),
+            ('S_surrender', 0.15, False),
+        ]),
+        'karma_burn_rate': _outcome_config([
+            ('Ce_cleaning', 0.3, False),
+            ('G_grace', 0.3, False),
+            ('A_aware', 0.2, False),
+            ('At_attachment', 0.2, True),
+        ])
     }
 
-    def __init__(self):
+    def __init__(self, solver: Optional[OutcomeSolver] = None):
         """Initialize the reverse causality engine"""
-        pass
+        self.solver = solver or OutcomeSolver()
+        self._outcome_models = {
+            name: outcome_model(config) for name, config in self.OUTCOME_FORMULAS.items()
+        }
 
     def solve_for_outcome(
         self,
@@ -275,10 +252,7 @@ class ReverseCausalityEngine:
                 desired_outcome, desired_value, current_operators, constraints
             )
 
-        formula_config = self.OUTCOME_FORMULAS[desired_outcome]
-        formula = formula_config['formula']
-        relevant_operators = formula_config['operators']
-        inverse_operators = formula_config.get('inverse')
+        formula = self.OUTCOME_FORMULAS[desired_outcome]['formula']
 
         # Calculate current outcome value
         current_value = formula(current_operators)
@@ -298,19 +272,87 @@ class ReverseCausalityEngine:
                 gap=0.0
             )
 
-        # Gradient descent to find required operator values
-        required_operators = self._gradient_descent_solve(
-            formula=formula,
-            target_value=desired_value,
-            current_operators=current_operators,
-            relevant_operators=relevant_operators,
-            inverse_operators=inverse_operators,
+        solved = self.solver.solve(
+            self._outcome_models[desired_outcome],
+            desired_value,
+            current_operators,
+            mobility=self._mobility(0.5),
             constraints=constraints,
-            max_iterations=max_iterations,
-            tolerance=tolerance
+            tolerance=tolerance,
+            max_iterations=max_iterations
         )
-        if required_operators is None:
+        if solved is None:
             return None
+        return self._outcome_result(
+            desired_outcome, desired_value, current_value, current_operators, solved, tolerance
+        )
+
+    def solve_batch(
+        self,
+        current_operators: Dict[str, float],
+        targets: List[Tuple[str, float]],
+        constraints: Optional[Dict[str, Any]] = None,
+        tolerance: float = 0.01
+    ) -> List[Optional[ReverseMappingResult]]:
+        """
+        Solve many (outcome, desired_value) targets from one current state.
+
+        Registered outcomes are solved together as one array problem; custom
+        outcomes go through solve_for_outcome. Results are in target order,
+        None where solve_for_outcome would return None.
+        """
+        logger.debug(f"[solve_batch] targets={len(targets)} operators={len(current_operators)}")
+        results: List[Optional[ReverseMappingResult]] = [None] * len(targets)
+        pending: List[Tuple[int, str, float, float]] = []
+
+        for i, (outcome, desired_value) in enumerate(targets):
+            model = self._outcome_models.get(outcome)
+            if not isinstance(model, LinearOutcome):
+                results[i] = self.solve_for_outcome(
+                    outcome, desired_value, current_operators, constraints, tolerance=tolerance
+                )
+                continue
+            current_value = model.evaluate(current_operators)
+            if current_value is None:
+                continue
+            if abs(desired_value - current_value) < tolerance:
+                results[i] = self._build_result(
+                    goal_description=f"Achieve {outcome} = {desired_value:.2f}",
+                    goal_achievable=True,
+                    achievement_probability=0.95,
+                    required_operators=current_operators,
+                    current_operators=current_operators,
+                    gap=0.0
+                )
+                continue
+            pending.append((i, outcome, desired_value, current_value))
+
+        solutions = self.solver.solve_batch(
+            [(self._outcome_models[outcome], desired_value) for _i, outcome, desired_value, _c in pending],
+            current_operators,
+            mobility=self._mobility(0.5),
+            constraints=constraints,
+            tolerance=tolerance
+        ) if pending else []
+
+        for (i, outcome, desired_value, current_value), solved in zip(pending, solutions):
+            if solved is not None:
+                results[i] = self._outcome_result(
+                    outcome, desired_value, current_value, current_operators, solved, tolerance
+                )
+        return results
+
+    def _outcome_result(
+        self,
+        outcome: str,
+        desired_value: float,
+        current_value: float,
+        current_operators: Dict[str, float],
+        solved: Tuple[Dict[str, float], SolveDiagnostics],
+        tolerance: float
+    ) -> Optional[ReverseMappingResult]:
+        """ReverseMappingResult for a solved registered outcome."""
+        required_operators, diagnostics = solved
 
         # Calculate achievement probability based on change difficulty
         achievement_prob = self._calculate_achievement_probability(
@@ -318,19 +360,20 @@ class ReverseCausalityEngine:
         )
 
         # Check if goal is achievable
-        final_value = formula(required_operators)
+        final_value = self.OUTCOME_FORMULAS[outcome]['formula'](required_operators)
         if final_value is None:
             return None
 
         achievable = abs(final_value - desired_value) < tolerance * 2
 
         result = self._build_result(
-            goal_description=f"Achieve {desired_outcome} = {desired_value:.2f}",
+            goal_description=f"Achieve {outcome} = {desired_value:.2f}",
             goal_achievable=achievable,
             achievement_probability=achievement_prob,
             required_operators=required_operators,
             current_operators=current_operators,
-            gap=abs(final_value - current_value)
+            gap=abs(final_value - current_value),
+            diagnostics=diagnostics
         )
         logger.debug(f"[solve_for_outcome] result: achievable={achievable} prob={achievement_prob:.3f} changes={len(result.operator_changes)}")
         return result
@@ -370,39 +413,25 @@ class ReverseCausalityEngine:
             return None
         weights = {k: v / total_weight for k, v in weights.items()}
 
-        # Collect all relevant operators
-        all_operators = set()
-        all_inverse = set()
-
-        for outcome in desired_outcomes:
-            if outcome in self.OUTCOME_FORMULAS:
-                config = self.OUTCOME_FORMULAS[outcome]
-                all_operators.update(config['operators'])
-                all_inverse.update(config.get('inverse'))
-
-        # Combined loss function
-        def combined_loss(ops: Dict[str, float]) -> Optional[float]:
-            total_loss = 0.0
-            for outcome, target in desired_outcomes.items():
-                if outcome in self.OUTCOME_FORMULAS:
-                    formula = self.OUTCOME_FORMULAS[outcome]['formula']
-                    current = formula(ops)
-                    if current is None:
-                        return None
-                    loss = (current - target) ** 2
-                    total_loss += loss * weights[outcome]
-            return total_loss
+        # Weighted squared error over the known outcomes
+        targets = [
+            (self._outcome_models[outcome], target, weights.get(outcome, 0.0))
+            for outcome, target in desired_outcomes.items()
+            if outcome in self.OUTCOME_FORMULAS
+        ]
+        if not targets:
+            logger.warning("[solve_multi_outcome] no known outcomes to solve for")
+            return None
 
-        # Optimize
-        required_operators = self._optimize_combined(
-            loss_fn=combined_loss,
-            current_operators=current_operators,
-            relevant_operators=list(all_operators),
-            inverse_operators=list(all_inverse),
+        solved = self.solver.solve_multi(
+            targets,
+            current_operators,
+            mobility=self._mobility(0.3),
             constraints=constraints
         )
-        if required_operators is None:
+        if solved is None:
             return None
+        required_operators, diagnostics = solved
 
         # Calculate overall achievement
         achieved_outcomes = {}
@@ -440,185 +469,22 @@ class ReverseCausalityEngine:
             achievement_probability=achievement_prob,
             required_operators=required_operators,
             current_operators=current_operators,
-            gap=total_gap
+            gap=total_gap,
+            diagnostics=diagnostics
         )
         logger.debug(f"[solve_multi_outcome] result: gap={total_gap:.3f} prob={achievement_prob if achievement_prob is not None else 'None'}")
         return result
 
-    def _gradient_descent_solve(
-        self,
-        formula,
-        target_value: float,
-        current_operators: Dict[str, float],
-        relevant_operators: List[str],
-        inverse_operators: List[str],
-        constraints: Optional[Dict[str, Any]],
-        max_iterations: int,
-        tolerance: float
-    ) -> Optional[Dict[str, float]]:
-        """
-        Use gradient descent to find operator values that achieve target.
-        Returns None if any relevant operator value is missing.
-        """
-        logger.debug(f"[_gradient_descent_solve] target={target_value:.3f} relevant_ops={len(relevant_operators)} max_iter={max_iterations}")
-        # Start from current values
-        operators = current_operators.copy()
-
-        # Check all relevant operators are present
-        for op in relevant_operators:
-            if operators.get(op) is None:
-                logger.warning(f"[_gradient_descent_solve] missing operator: {op}")
-                return None
-
-        # Learning rate (adaptive)
-        lr = 0.1
-        converged = False
-
-        for iteration in range(max_iterations):
-            current_value = formula(operators)
-            if current_value is None:
-                return None
-
-            error = target_value - current_value
-
-            if abs(error) < tolerance:
-                converged = True
-                logger.debug(f"[_gradient_descent_solve] converged at iteration {iteration} error={error:.3f}")
-                break
-
-            # Calculate gradients numerically
-            gradients = {}
-            epsilon = 0.01
-
-            for op in relevant_operators:
-                # Forward difference
-                operators_plus = operators.copy()
-                current_op_val = operators_plus.get(op)
-                if current_op_val is None:
-                    continue
-                operators_plus[op] = min(1.0, current_op_val + epsilon)
-                value_plus = formula(operators_plus)
-                if value_plus is None:
-                    return None
-
-                gradient = (value_plus - current_value) / epsilon
-
-                # Inverse operators need opposite direction
-                if op in inverse_operators:
-                    gradient = -gradient
-
-                gradients[op] = gradient
-
-            # Update operators
-            for op, grad in gradients.items():
-                if abs(grad) > 0.001:
-                    # Consider difficulty (config metadata)
-                    op_config = self.OPERATORS.get(op)
-                    if op_config is None:
-                        continue
-                    difficulty = op_config.get('difficulty')
-                    if difficulty is None:
-                        continue
-                    effective_lr = lr * (1 - difficulty * 0.5)
-
-                    delta = effective_lr * error * (grad / (abs(grad) + 0.1))
-
-                    current_val = operators.get(op)
-                    if current_val is None:
-                        continue
-                    new_value = current_val + delta
-
-                    # Apply constraints
-                    new_value = max(0.0, min(1.0, new_value))
-
-                    if constraints:
-                        if f"{op}_min" in constraints:
-                            new_value = max(new_value, constraints[f"{op}_min"])
-                        if f"{op}_max" in constraints:
-                            new_value = min(new_value, constraints[f"{op}_max"])
-
-                    operators[op] = new_value
-
-            # Adaptive learning rate
-            if iteration > 0 and iteration % 20 == 0:
-                lr *= 0.9
-
-        if not converged:
-            logger.debug(f"[_gradient_descent_solve] did not converge after {max_iterations} iterations")
-        return operators
-
-    def _optimize_combined(
-        self,
-        loss_fn,
-        current_operators: Dict[str, float],
-        relevant_operators: List[str],
-        inverse_operators: List[str],
-        constraints: Optional[Dict[str, Any]]
-    ) -> Optional[Dict[str, float]]:
+    def _mobility(self, difficulty_scale: float) -> Dict[str, float]:
         """
-        Optimize for combined multi-outcome loss function.
-        Returns None if any relevant operator value is missing.
+        How freely each operator moves in a solve: harder operators change
+        less (1 - difficulty * scale). Operators without config stay fixed.
         """
-        logger.debug(f"[_optimize_combined] relevant_ops={len(relevant_operators)}")
-        operators = current_operators.copy()
-
-        # Check all relevant operators are present
-        for op in relevant_operators:
-            if operators.get(op) is None:
-                logger.warning(f"[_optimize_combined] missing operator: {op}")
-                return None
-
-        lr = 0.1
-
-        for iteration in range(150):
-            current_loss = loss_fn(operators)
-            if current_loss is None:
-                return None
-
-            if current_loss < 0.001:
-                logger.debug(f"[_optimize_combined] converged at iteration {iteration} loss={current_loss:.3f}")
-                break
-
-            # Calculate gradients
-            epsilon = 0.01
-
-            for op in relevant_operators:
-                operators_plus = operators.copy()
-                current_op_val = operators_plus.get(op)
-                if current_op_val is None:
-                    continue
-                operators_plus[op] = min(1.0, current_op_val + epsilon)
-                loss_plus = loss_fn(operators_plus)
-                if loss_plus is None:
-                    return None
-
-                gradient = (loss_plus - current_loss) / epsilon
-
-                # Update (gradient descent minimizes loss)
-                # difficulty is config metadata
-                op_config = self.OPERATORS.get(op)
-                if op_config is None:
-                    continue
-                difficulty = op_config.get('difficulty')
-                if difficulty is None:
-                    continue
-                effective_lr = lr * (1 - difficulty * 0.3)
-
-                new_value = operators.get(op) - effective_lr * gradient
-                new_value = max(0.0, min(1.0, new_value))
-
-                if constraints:
-                    if f"{op}_min" in constraints:
-                        new_value = max(new_value, constraints[f"{op}_min"])
-                    if f"{op}_max" in constraints:
-                        new_value = min(new_value, constraints[f"{op}_max"])
-
-                operators[op] = new_value
-
-            if iteration % 30 == 0:
-                lr *= 0.9
-
-        return operators
+        return {
+            op: 1 - config['difficulty'] * difficulty_scale
+            for op, config in self.OPERATORS.items()
+            if config.get('difficulty') is not None
+        }
 
     def _calculate_achievement_probability(
         self,
@@ -706,30 +572,27 @@ class ReverseCausalityEngine:
         inverse_in_relevant = [op for op in inverse_ops if op in relevant_ops]
         positive_ops = [op for op in relevant_ops if op not in inverse_ops]
 
-        def custom_formula(ops):
-            pos_vals = [ops.get(op) for op in positive_ops]
-            inv_vals = [ops.get(op) for op in inverse_in_relevant]
-            if any(v is None for v in pos_vals + inv_vals):
-                return None
-            positive_sum = sum(pos_vals)
-            inverse_sum = sum(1 - v for v in inv_vals)
-            total = positive_sum + inverse_sum
-            count = len(positive_ops) + len(inverse_in_relevant)
-            return total / max(1, count)
+        # Mean of positive values and inverted (1 - value) inverse values
+        count = max(1, len(positive_ops) + len(inverse_in_relevant))
+        custom_model = LinearOutcome(
+            positive_ops + inverse_in_relevant,
+            [1 / count] * len(positive_ops) + [-1 / count] * len(inverse_in_relevant),
+            intercept=len(inverse_in_relevant) / count
+        )
+        custom_formula = custom_model.evaluate
 
         # Optimize
-        required = self._gradient_descent_solve(
-            formula=custom_formula,
-            target_value=target,
-            current_operators=current,
-            relevant_operators=relevant_ops,
-            inverse_operators=inverse_in_relevant,
+        solved = self.solver.solve(
+            custom_model,
+            target,
+            current,
+            mobility=self._mobility(0.5),
             constraints=constraints,
-            max_iterations=100,
             tolerance=0.02
         )
-        if required is None:
+        if solved is None:
             return None
+        required, diagnostics = solved
 
         achievement_prob = self._calculate_achievement_probability(current, required)
         final_value = custom_formula(required)
@@ -746,7 +609,8 @@ class ReverseCausalityEngine:
             achievement_probability=achievement_prob * 0.9,  # Slightly lower for custom
             required_operators=required,
             current_operators=current,
-            gap=abs(final_value - current_value)
+            gap=abs(final_value - current_value),
+            diagnostics=diagnostics
         )
 
     def _build_result(
@@ -756,7 +620,8 @@ class ReverseCausalityEngine:
         achievement_probability: float,
         required_operators: Dict[str, float],
         current_operators: Dict[str, float],
-        gap: float
+        gap: float,
+        diagnostics: Optional[SolveDiagnostics] = None
     ) -> ReverseMappingResult:
         """
         Build complete ReverseMappingResult from computed values.
@@ -853,7 +718,8 @@ class ReverseCausalityEngine:
             karma_requirement=(1 - karma_req) if karma_req is not None else None,
             grace_requirement=grace_req,
             intermediate_goals=intermediate_goals,
-            sensitivity_analysis=sensitivity
+            sensitivity_analysis=sensitivity,
+            solver_diagnostics=diagnostics
         )
 
     def _calculate_sensitivity(
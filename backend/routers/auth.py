@@ -19,6 +19,7 @@ from sqlalchemy.orm import joinedload
 from database import get_db, User, UserSession, Organization, UserRole
 from database.models.enums import is_super_admin
 from logging_config import api_logger
+from auth_session_cache import get_auth_session_cache
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -146,8 +147,10 @@ async def get_current_user(
     - Accepts expired JWT tokens if the DB session is still valid (signature
       verification still required). This lets the DB session control actual
       expiry rather than the immutable JWT exp claim.
-    - Extends the DB session expires_at on every successful auth check, so
-      active users are never unexpectedly logged out.
+    - Extends the DB session expires_at on successful auth checks, so
+      active users are never unexpectedly logged out. Verified sessions are
+      cached by token hash and the extension is written at most once per
+      minute per session, in background batches (see auth_session_cache.py).
     """
     auth_header = request.headers.get("Authorization")
     if not auth_header or not auth_header.startswith("Bearer "):
@@ -176,6 +179,21 @@ async def get_current_user(
             api_logger.debug(f"[AUTH] Token decode failed: {e.detail}")
             raise
 
+    session_cache = get_auth_session_cache()
+    sliding_window = timedelta(hours=JWT_EXPIRATION_HOURS)
+
+    # Fast path: session verified recently — only the user row is read
+    cached = await session_cache.get(token)
+    if cached is not None and cached.user_id == payload["sub"]:
+        if datetime.utcnow() - cached.created_at <= timedelta(days=SESSION_MAX_LIFETIME_DAYS):
+            user = await db.get(User, cached.user_id)
+            if user:
+                await session_cache.touch(cached, sliding_window)
+                api_logger.debug(f"[AUTH] Auth successful (cached session) for user: {user.email}")
+                return user
+        # Past max lifetime or user gone: the database path below rejects it
+        await session_cache.invalidate_token(token, cached.session_id)
+
     # Single query: validate session and get user via join
     try:
         result = await db.execute(
@@ -220,10 +238,9 @@ async def get_current_user(
         await db.commit()
         raise HTTPException(status_code=401, detail="Session expired — please log in again")
 
-    # Sliding window: extend idle timeout on every successful auth check.
-    session.last_active_at = datetime.utcnow()
-    session.expires_at = datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS)
-    await db.commit()
+    # Sliding window: extend idle timeout (write coalesced, flushed in the background)
+    cached = await session_cache.put(token, session)
+    await session_cache.touch(cached, sliding_window)
 
     api_logger.debug(f"[AUTH] Auth successful for user: {session.user.email}")
     return session.user
@@ -366,10 +383,14 @@ async def logout(
         token = auth_header.split(" ")[1]
         result = await db.execute(select(UserSession).where(UserSession.token == token))
         session = result.scalar_one_or_none()
+        session_id = session.id if session else None
         if session:
             await db.delete(session)
             await db.commit()
 
+        # After the commit, so a concurrent request cannot re-cache the session
+        await get_auth_session_cache().invalidate_token(token, session_id)
+
     return {"status": "success"}
 
 
@@ -408,4 +429,7 @@ async def change_password(
     current_user.password_hash = await hash_password(request.new_password)
     await db.commit()
 
+    # Next request of every session re-verifies against the database
+    await get_auth_session_cache().invalidate_user(current_user.id)
+
     return {"status": "success"}
@@ -5,22 +5,27 @@ Integrates with the consciousness inference engine.
 
 import asyncio
 from datetime import datetime
-from typing import Optional, List, AsyncGenerator
+from typing import Optional, List, AsyncGenerator, Tuple
 import json
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic import BaseModel
 from sqlalchemy import select, desc
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 from sqlalchemy.orm.attributes import flag_modified
 from sse_starlette.sse import EventSourceResponse
 
 from database import get_db, User, ChatConversation, ChatMessage, ChatSummary, Session, AsyncSessionLocal
+from database import matrix_store
 from routers.auth import get_current_user, generate_id
 from routers.credits import require_credits, deduct_credit
-from utils import get_or_404, paginate, to_response, to_response_list, safe_json_loads, CamelModel
+from utils import get_or_404, verify_access_or_404, paginate, to_response, to_response_list, CamelModel
+from utils.uploads import read_upload_form, form_model, parse_form_files
 from logging_config import api_logger
-from file_parser import parse_file, ParsedFile
+from file_parser import ParsedFile
+from parse_service import get_parse_service
+from sse_frames import StreamEvent, coalesce_tokens
 from security.guardrails import (
     classify_zone,
     get_crisis_response,
@@ -178,7 +183,7 @@ async def get_conversation_messages(
 ):
     """Get messages for a conversation."""
     # Verify access
-    await get_or_404(db, ChatConversation, conversation_id, user_id=current_user.id)
+    await verify_access_or_404(db, ChatConversation, conversation_id, user_id=current_user.id)
 
     # Get messages
     result = await db.execute(
@@ -192,6 +197,22 @@ async def get_conversation_messages(
     return to_response_list(messages, MessageResponse)
 
 
+async def _parse_attachments(attachments: List[dict]) -> List[Tuple[str, List[ParsedFile]]]:
+    """(file type, parsed files) per base64/text attachment, parsed in parallel in the parse pool."""
+    parsed_lists = await get_parse_service().parse_many([
+        (
+            attachment.get("name", "unnamed"),
+            attachment.get("content", ""),
+            attachment.get("encoding", "text"),
+        )
+        for attachment in attachments
+    ])
+    return [
+        (attachment.get("type", "unknown"), parsed_list)
+        for attachment, parsed_list in zip(attachments, parsed_lists)
+    ]
+
+
 @router.post("/conversations/{conversation_id}/messages")
 async def send_message(
     conversation_id: str,
@@ -204,10 +225,48 @@ async def send_message(
     Send a message and get streaming response.
     This integrates with the consciousness inference engine.
     """
-    # Sequential queries — async sessions don't support concurrent ops on one connection
-    conversation = await get_or_404(
-        db, ChatConversation, conversation_id, user_id=current_user.id
+    # Ownership first: attachments are only parsed for the caller's own conversation
+    conversation = await _get_message_conversation(db, conversation_id, current_user)
+    parsed_attachments = await _parse_attachments(request.attachments) if request.attachments else []
+    return await _send_message(conversation, request, parsed_attachments, http_request, current_user, db)
+
+
+@router.post("/conversations/{conversation_id}/messages/multipart")
+async def send_message_multipart(
+    conversation_id: str,
+    http_request: Request,
+    current_user: User = Depends(require_credits),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    send_message with a multipart/form-data body: the SendMessageRequest
+    fields as form fields, attachments as file parts (streamed to disk, no
+    base64).
+    """
+    conversation = await _get_message_conversation(db, conversation_id, current_user)
+    async with await read_upload_form(http_request) as form:
+        request = form_model(form, SendMessageRequest)
+        parsed_attachments = await parse_form_files(form)
+    return await _send_message(conversation, request, parsed_attachments, http_request, current_user, db)
+
+
+async def _get_message_conversation(db: AsyncSession, conversation_id: str, current_user: User) -> ChatConversation:
+    return await get_or_404(
+        db, ChatConversation, conversation_id, user_id=current_user.id,
+        load_columns=["question_answers"]
     )
+
+
+async def _send_message(
+    conversation: ChatConversation,
+    request: SendMessageRequest,
+    parsed_attachments: List[Tuple[str, List[ParsedFile]]],
+    http_request: Request,
+    current_user: User,
+    db: AsyncSession
+):
+    conversation_id = conversation.id
+    # Sequential queries — async sessions don't support concurrent ops on one connection
     history_result = await db.execute(
         select(ChatMessage)
         .where(ChatMessage.conversation_id == conversation_id)
@@ -246,10 +305,10 @@ async def send_message(
                 })
 
     # Extract matrix state for context (user's selected rows/columns + cell values)
-    # Use active document's matrix_data from generated_documents, fallback to first
+    # Use active document's matrix_data from the stored documents, fallback to first
     matrix_state = None
-    if conversation.generated_documents and len(conversation.generated_documents) > 0:
-        all_docs = conversation.generated_documents
+    all_docs = await matrix_store.load_documents(db, conversation)
+    if all_docs:
 
         # Find active document by ID, or use first document as fallback
         active_doc = None
@@ -338,26 +397,19 @@ async def send_message(
 
     # Add any new file attachments from this request (parse binary formats)
     new_file_summaries = []
-    if request.attachments:
-        for attachment in request.attachments:
-            name = attachment.get("name", "unnamed")
-            content = attachment.get("content", "")
-            file_type = attachment.get("type", "unknown")
-            encoding = attachment.get("encoding", "text")
-
-            parsed_list = parse_file(name, content, encoding)
-            for parsed in parsed_list:
-                file_entry = {
-                    "name": parsed.name,
-                    "summary": (parsed.text_content or "")[:5000],
-                    "type": file_type,
-                }
-                # Preserve image data for vision support in LLM calls
-                if parsed.is_image and parsed.image_base64:
-                    file_entry["image_base64"] = parsed.image_base64
-                    file_entry["image_media_type"] = parsed.image_media_type
-                conversation_context.file_summaries.append(file_entry)
-                new_file_summaries.append(file_entry)
+    for file_type, parsed_list in parsed_attachments:
+        for parsed in parsed_list:
+            file_entry = {
+                "name": parsed.name,
+                "summary": (parsed.text_content or "")[:5000],
+                "type": file_type,
+            }
+            # Preserve image data for vision support in LLM calls
+            if parsed.is_image and parsed.image_base64:
+                file_entry["image_base64"] = parsed.image_base64
+                file_entry["image_media_type"] = parsed.image_media_type
+            conversation_context.file_summaries.append(file_entry)
+            new_file_summaries.append(file_entry)
 
     # Save user message with parsed file summaries (not raw base64) so they
     # can be extracted for context on subsequent messages via the same format
@@ -476,7 +528,7 @@ async def send_message(
         Without this, the user's message would exist in the DB but the response
         would be completely lost.
         """
-        full_response = ""
+        response_parts: List[str] = []  # Joined once when saving
         input_tokens = 0
         output_tokens = 0
         structured_data = None  # Capture matrix_data, paths, documents
@@ -489,72 +541,74 @@ async def send_message(
             if zone_classification.zone == "C":
                 preamble = get_ethical_preamble(zone_classification.ethical_flag)
                 if preamble:
-                    full_response = preamble
+                    response_parts.append(preamble)
                     yield {"event": "token", "data": json.dumps({"text": preamble})}
 
-            async for event in inference_stream(
+            # Tokens arrive coalesced into frames; events the relay reads are
+            # typed (StreamEvent), so nothing is JSON-decoded here. A frame
+            # still buffered on disconnect lands in response_parts too.
+            async for event in coalesce_tokens(inference_stream(
                 request.content,
                 model_config,
                 request.web_search_data,
                 request.web_search_insights,
                 conversation_context.model_dump()  # Pass conversation context
-            ):
-                # Parse SSE event
-                if isinstance(event, dict):
-                    event_type = event.get("event", "token")
-                    data = event.get("data", "")
+            ), unsent=response_parts):
+                if isinstance(event, StreamEvent):
+                    event_type = event.event
+                    payload = event.payload
 
                     if event_type == "token":
-                        token_data = safe_json_loads(data)
-                        full_response += token_data.get("text", "")
+                        response_parts.append(payload["text"])
                     elif event_type == "usage":
-                        usage_data = safe_json_loads(data)
-                        input_tokens = usage_data.get("input_tokens", 0)
-                        output_tokens = usage_data.get("output_tokens", 0)
+                        input_tokens = payload.get("input_tokens", 0)
+                        output_tokens = payload.get("output_tokens", 0)
                     elif event_type == "structured_data":
                         # Capture structured data for saving to conversation
-                        structured_data = safe_json_loads(data)
+                        structured_data = payload
                     elif event_type == "title":
                         # Capture title for saving to conversation
-                        title_data = safe_json_loads(data)
-                        if title_data:
-                            conversation_title = title_data.get("title")
+                        if payload:
+                            conversation_title = payload.get("title")
                     elif event_type in ("question", "validation_question"):
                         # Capture questions for persistence
-                        question_data = safe_json_loads(data)
-                        if question_data:
+                        if payload:
                             pending_questions.append({
-                                "id": question_data.get("question_id"),
-                                "text": question_data.get("question_text"),
-                                "options": question_data.get("options", []),
+                                "id": payload.get("question_id"),
+                                "text": payload.get("question_text"),
+                                "options": payload.get("options", []),
                                 "type": event_type,
                                 "selected_option": None
                             })
+                    event = event.to_sse()
+                else:
+                    event_type = event.get("event", "token")
 
-                    # Zone D: Append disclaimer before "done" event
-                    if event_type == "done" and zone_classification.zone == "D":
-                        disclaimer = get_disclaimer(
-                            ethical_flag=zone_classification.ethical_flag,
-                            user_input=request.content
-                        )
-                        if disclaimer:
-                            full_response += disclaimer
-                            yield {"event": "token", "data": json.dumps({"text": disclaimer})}
+                # Zone D: Append disclaimer before "done" event
+                if event_type == "done" and zone_classification.zone == "D":
+                    disclaimer = get_disclaimer(
+                        ethical_flag=zone_classification.ethical_flag,
+                        user_input=request.content
+                    )
+                    if disclaimer:
+                        response_parts.append(disclaimer)
+                        yield {"event": "token", "data": json.dumps({"text": disclaimer})}
 
-                    # Yield dict directly - EventSourceResponse handles formatting
-                    yield {"event": event_type, "data": data}
+                # Yield dict directly - EventSourceResponse handles formatting
+                yield event
 
             stream_completed = True
 
         except (asyncio.CancelledError, GeneratorExit):
             # Client disconnected mid-stream (page refresh, navigation, network drop)
-            api_logger.warning(f"[CHAT] Stream interrupted for conv {conversation_id}, saving partial response ({len(full_response)} chars)")
+            api_logger.warning(f"[CHAT] Stream interrupted for conv {conversation_id}, saving partial response ({sum(map(len, response_parts))} chars)")
         except Exception as e:
             api_logger.error(f"[CHAT] Stream error for conv {conversation_id}: {e}")
         finally:
             # CRITICAL: Save whatever response was accumulated, even on interruption.
             # Without this, the user's message exists in the DB but the response is
             # completely lost on page refresh, navigation, or network drop.
+            full_response = "".join(response_parts)
             if not full_response:
                 return  # Nothing to save (stream failed before any tokens)
 
@@ -573,7 +627,9 @@ async def send_message(
 
                     # Update conversation totals and save structured data
                     conv_result = await save_db.execute(
-                        select(ChatConversation).where(ChatConversation.id == conversation_id)
+                        select(ChatConversation)
+                        .where(ChatConversation.id == conversation_id)
+                        .options(undefer(ChatConversation.question_answers))
                     )
                     conv = conv_result.scalar_one_or_none()
                     if not conv:
@@ -594,30 +650,7 @@ async def send_message(
 
                         # Merge incoming documents with existing: update matching IDs, preserve the rest
                         if documents:
-                            existing_docs = conv.generated_documents or []
-
-                            if len(existing_docs) == 0:
-                                conv.generated_documents = documents
-                            else:
-                                incoming_by_id = {d.get("id"): d for d in documents}
-                                updated_docs = []
-                                for existing in existing_docs:
-                                    incoming = incoming_by_id.pop(existing.get("id"), None)
-                                    if incoming:
-                                        old_matrix = existing.get("matrix_data", {})
-                                        new_matrix = incoming.get("matrix_data", {})
-                                        existing["name"] = incoming.get("name", existing.get("name"))
-                                        if old_matrix and new_matrix:
-                                            old_matrix["row_options"] = new_matrix.get("row_options", old_matrix.get("row_options", []))
-                                            old_matrix["column_options"] = new_matrix.get("column_options", old_matrix.get("column_options", []))
-                                            old_matrix["selected_rows"] = new_matrix.get("selected_rows", old_matrix.get("selected_rows", [0, 1, 2, 3, 4]))
-                                            old_matrix["selected_columns"] = new_matrix.get("selected_columns", old_matrix.get("selected_columns", [0, 1, 2, 3, 4]))
-                                    updated_docs.append(existing)
-                                for doc in incoming_by_id.values():
-                                    updated_docs.append(doc)
-                                conv.generated_documents = updated_docs
-
-                            flag_modified(conv, "generated_documents")
+                            await matrix_store.merge_documents(save_db, conv, documents)
 
                         if structured_data.get("presets"):
                             conv.generated_presets = structured_data["presets"]
@@ -798,17 +831,38 @@ async def upload_files(
     conversation = await get_or_404(
         db, ChatConversation, conversation_id, user_id=current_user.id
     )
+    parsed_files = await _parse_attachments(request.files[:10])  # Max 10 files
+    return await _store_uploaded_files(conversation, parsed_files, db)
+
 
-    # Process files: parse binary formats, then create summaries
+@router.post("/conversations/{conversation_id}/files/multipart", response_model=FileUploadResponse)
+async def upload_files_multipart(
+    conversation_id: str,
+    http_request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    upload_files with the files as multipart/form-data parts (streamed to
+    disk, no base64).
+    """
+    conversation = await get_or_404(
+        db, ChatConversation, conversation_id, user_id=current_user.id
+    )
+    async with await read_upload_form(http_request) as form:
+        parsed_files = await parse_form_files(form)
+    return await _store_uploaded_files(conversation, parsed_files, db)
+
+
+async def _store_uploaded_files(
+    conversation: ChatConversation,
+    parsed_files: List[Tuple[str, List[ParsedFile]]],
+    db: AsyncSession
+) -> dict:
+    """Summaries of the parsed files, stored as attachments on a system message."""
+    conversation_id = conversation.id
     file_summaries = []
-    for file_data in request.files[:10]:  # Max 10 files
-        name = file_data.get("name", "unnamed")
-        content = file_data.get("content", "")
-        file_type = file_data.get("type", "unknown")
-        encoding = file_data.get("encoding", "text")
-
-        # Parse the file to extract text from binary formats
-        parsed_list = parse_file(name, content, encoding)
+    for file_type, parsed_list in parsed_files:
         for parsed in parsed_list:
             if parsed.is_image:
                 # For images, store a description; image data is too large for summaries
@@ -864,7 +918,8 @@ async def get_conversation_questions(
 ):
     """Get all questions for a conversation."""
     conversation = await get_or_404(
-        db, ChatConversation, conversation_id, user_id=current_user.id
+        db, ChatConversation, conversation_id, user_id=current_user.id,
+        load_columns=["question_answers"]
     )
 
     question_data = conversation.question_answers or {}
@@ -899,7 +954,8 @@ async def answer_question(
 ):
     """Update the selected answer for a question."""
     conversation = await get_or_404(
-        db, ChatConversation, conversation_id, user_id=current_user.id
+        db, ChatConversation, conversation_id, user_id=current_user.id,
+        load_columns=["question_answers"]
     )
 
     question_data = conversation.question_answers or {"questions": []}
@@ -939,7 +995,7 @@ async def set_message_feedback(
 ):
     """Set or clear feedback (thumbs up/down) for a message."""
     # Verify conversation access
-    await get_or_404(db, ChatConversation, conversation_id, user_id=current_user.id)
+    await verify_access_or_404(db, ChatConversation, conversation_id, user_id=current_user.id)
 
     # Get the message
     result = await db.execute(
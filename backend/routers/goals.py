@@ -16,7 +16,7 @@ import httpx
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -25,10 +25,14 @@ from database import get_db, User, Goal, MatrixValue, DiscoveredGoal, UserGoalIn
 from routers.auth import get_current_user, generate_id
 from routers.credits import require_credits_amount, deduct_credit
 from utils import get_or_404, paginate, to_response, to_response_list, CamelModel
+from utils.llm_client import llm_transport, get_adapter
+from utils.uploads import read_upload_form, form_model, parse_form_files
+from formulas.pool import get_formula_pool
 from logging_config import api_logger
 
 # File parser for processing uploads
-from file_parser import parse_all_files, ParseResult, ParsedFile
+from file_parser import ParseResult, ParsedFile, collect_results
+from parse_service import get_parse_service
 
 
 def sanitize_goal_text(text: str) -> str:
@@ -662,7 +666,7 @@ class FileData(BaseModel):
     content: str
     type: Optional[str] = None
     size: Optional[int] = None
-    encoding: Optional[str] = "text"  # "text" or "base64"
+    encoding: Optional[str] = "text"  # "text" or "base64" ("spooled": multipart upload, already parsed)
 
 
 class DiscoverGoalsRequest(BaseModel):
@@ -787,10 +791,13 @@ def build_call2_user_prompt_skeletons(
 ) -> Any:
     """
     Build user prompt for Call 2 when pre-classified skeletons are available.
-    Passes skeletons as JSON for the LLM to articulate.
+    Passes skeletons as JSON for the LLM to articulate (without the
+    backend-only transformation data, which is attached after Call 2).
     Returns multimodal content blocks when images are present.
     """
-    skeletons_json = json.dumps(skeletons, indent=2)
+    skeletons_json = json.dumps(
+        [{k: v for k, v in sk.items() if k != "transformation"} for sk in skeletons], indent=2
+    )
 
     text_prompt = f"""Articulate the following {len(skeletons)} pre-classified goal skeletons.
 
@@ -873,6 +880,41 @@ async def discover_goals_from_files(
     3. Call 2: Generate goals with full creative freedom (signals + OOF values + file data)
     4. Post-filter and return (dedup, cap at 30)
     """
+    return await _discover_goals(request, current_user, db)
+
+
+@router.post("/goals/discover-from-files/multipart", response_model=DiscoverGoalsResponse)
+async def discover_goals_from_files_multipart(
+    http_request: Request,
+    current_user: User = Depends(require_credits_amount(10)),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    discover_goals_from_files with a multipart/form-data body: files as file
+    parts (streamed to disk, no base64); model and web_search as form fields,
+    existing_goals as a JSON-encoded form field.
+    """
+    async with await read_upload_form(http_request) as form:
+        parsed_files = await parse_form_files(form)
+        files = [
+            FileData(name=spooled.filename, content="", type=spooled.type, size=spooled.size, encoding="spooled")
+            for spooled in form.files
+        ] + [FileData(name=filename, content="", encoding="spooled") for filename, _ in form.rejected]
+        request = form_model(form, DiscoverGoalsRequest, json_fields=("existing_goals",), files=files)
+    parse_result = collect_results([parsed_list for _, parsed_list in parsed_files])
+    return await _discover_goals(request, current_user, db, parse_result=parse_result)
+
+
+async def _discover_goals(
+    request: DiscoverGoalsRequest,
+    current_user: User,
+    db: AsyncSession,
+    parse_result: Optional[ParseResult] = None,
+) -> DiscoverGoalsResponse:
+    """
+    File-based goal discovery. `parse_result` is given when the files were
+    already parsed from a multipart upload; otherwise request.files are parsed.
+    """
     start_time = time.time()
     api_logger.info(f"[GOAL DISCOVERY] Starting for user {current_user.id}, {len(request.files)} files")
 
@@ -893,7 +935,8 @@ async def discover_goals_from_files(
     # STEP 0: PARSE ALL UPLOADED FILES
     # =========================================================================
     api_logger.info("[GOAL DISCOVERY] Step 0: Parsing uploaded files")
-    parse_result = parse_all_files(request.files)
+    if parse_result is None:
+        parse_result = await get_parse_service().parse_all(request.files)
 
     if not parse_result.parsed_files and not parse_result.image_files:
         detail = "No readable content extracted from uploaded files."
@@ -995,7 +1038,7 @@ Return valid JSON only. No markdown, no explanation."""
     call1_read = 360.0 if (request.web_search and provider == "anthropic") else 300.0
     call1_timeout = httpx.Timeout(connect=30.0, read=call1_read, write=30.0, pool=30.0)
     try:
-        async with httpx.AsyncClient(timeout=call1_timeout) as client:
+        async with llm_transport.session(provider, timeout=call1_timeout) as client:
             if provider == "anthropic":
                 # Anthropic with prompt caching
                 system_content = [
@@ -1037,15 +1080,8 @@ Return valid JSON only. No markdown, no explanation."""
                         "max_uses": 10
                     }]
 
-                headers = {
-                    "x-api-key": api_key,
-                    "anthropic-version": "2023-06-01",
-                    "Content-Type": "application/json"
-                }
-
-                # Add web-search beta header if enabled
-                if request.web_search:
-                    headers["anthropic-beta"] = "web-search-2025-03-05"
+                # Web-search beta header is added by the adapter when enabled
+                headers = get_adapter(provider).headers(api_key, web_search=request.web_search)
 
                 content_size = len(str(call1_user_content))
                 api_logger.info(f"[GOAL DISCOVERY] Call 1 request to Anthropic: {content_size} chars, web_search={request.web_search}")
@@ -1147,10 +1183,7 @@ Return valid JSON only. No markdown, no explanation."""
                     "response_format": {"type": "json_object"}
                 }
 
-                headers = {
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json"
-                }
+                headers = get_adapter(provider).headers(api_key)
 
                 content_size = len(str(call1_user_content))
                 api_logger.debug(f"[GOAL DISCOVERY] Call 1 request to OpenAI: {content_size} chars")
@@ -1233,11 +1266,8 @@ Return valid JSON only. No markdown, no explanation."""
     api_logger.info("[GOAL DISCOVERY] Step 2: Backend OOF computation")
 
     try:
-        from formulas.inference import OOFInferenceEngine
         from formulas.operators import SHORT_TO_CANONICAL, CANONICAL_OPERATOR_NAMES
 
-        inference_engine = OOFInferenceEngine()
-
         # Extract operators from Call 1 observations
         observations = call1_output.get("observations") or []
         operators: Dict[str, float] = {}
@@ -1267,9 +1297,9 @@ Return valid JSON only. No markdown, no explanation."""
             if match:
                 s_level = float(match.group(1))
 
-        # Run full OOF inference
-        profile = inference_engine.calculate_full_profile(operators, s_level)
-        oof_values = inference_engine._flatten_profile(profile, {})
+        # Run full OOF inference (memoized on the quantized operator vector)
+        # in a warm worker process, off the event loop
+        oof_values = await get_formula_pool().profile_values(operators, s_level)
 
         api_logger.info(
             f"[GOAL DISCOVERY] OOF computation complete: {len(operators)} operators, "
@@ -1289,9 +1319,7 @@ Return valid JSON only. No markdown, no explanation."""
     api_logger.info("[GOAL DISCOVERY] Step 2.5: Goal classification")
 
     try:
-        from goal_classifier import GoalClassifier
-        classifier = GoalClassifier()
-        goal_skeletons = classifier.classify(
+        goal_skeletons = await get_formula_pool().classify_goals(
             call1_output,
             existing_goals=[g for g in (request.existing_goals or [])]
         )
@@ -1370,7 +1398,7 @@ Return valid JSON with a "goals" array containing all skeletons with your 3 arti
     articulated_goals = None
     call2_timeout = httpx.Timeout(connect=30.0, read=300.0, write=30.0, pool=30.0)
     try:
-        async with httpx.AsyncClient(timeout=call2_timeout) as client:
+        async with llm_transport.session(provider, timeout=call2_timeout) as client:
             if provider == "anthropic":
                 # Same cached prefix guarantees cache HIT from Call 1
                 system_content = [
@@ -1395,11 +1423,7 @@ Return valid JSON with a "goals" array containing all skeletons with your 3 arti
                     ]
                 }
 
-                headers = {
-                    "x-api-key": api_key,
-                    "anthropic-version": "2023-06-01",
-                    "Content-Type": "application/json"
-                }
+                headers = get_adapter(provider).headers(api_key)
 
                 call2_size = len(str(call2_user_prompt)) if isinstance(call2_user_prompt, list) else len(call2_user_prompt)
                 api_logger.debug(f"[GOAL DISCOVERY] Call 2 request to Anthropic: {call2_size} chars")
@@ -1440,10 +1464,7 @@ Return valid JSON with a "goals" array containing all skeletons with your 3 arti
                     "response_format": {"type": "json_object"}
                 }
 
-                headers = {
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json"
-                }
+                headers = get_adapter(provider).headers(api_key)
 
                 call2_size = len(str(call2_user_prompt)) if isinstance(call2_user_prompt, list) else len(call2_user_prompt)
                 api_logger.debug(f"[GOAL DISCOVERY] Call 2 request to OpenAI: {call2_size} chars")
@@ -1517,6 +1538,7 @@ Return valid JSON with a "goals" array containing all skeletons with your 3 arti
             goal["source_files"] = skeleton["sourceFiles"]
             goal["classification_reason"] = skeleton.get("classification_reason")
             goal["consciousness_context"] = skeleton.get("consciousness_context")
+            goal["transformation"] = skeleton.get("transformation")
     else:
         # LLM returned different count — enforce from skeleton list by position (capped)
         api_logger.warning(
@@ -1530,6 +1552,7 @@ Return valid JSON with a "goals" array containing all skeletons with your 3 arti
             generated_goals[i]["source_files"] = skeleton["sourceFiles"]
             generated_goals[i]["classification_reason"] = skeleton.get("classification_reason")
             generated_goals[i]["consciousness_context"] = skeleton.get("consciousness_context")
+            generated_goals[i]["transformation"] = skeleton.get("transformation")
     api_logger.info("[GOAL DISCOVERY] Enforced skeleton fields on articulated goals")
 
     # Required fields for a valid goal
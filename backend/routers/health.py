@@ -3,6 +3,7 @@ Health check endpoints.
 """
 
 from datetime import datetime
+from typing import Any, Dict
 
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
@@ -10,6 +11,7 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_db
+from engine_registry import get_engine_registry
 
 router = APIRouter(prefix="/healthz", tags=["health"])
 
@@ -22,6 +24,7 @@ class HealthResponse(BaseModel):
 class ReadinessResponse(BaseModel):
     status: str
     database: str
+    engines: Dict[str, Any]
     timestamp: str
 
 
@@ -44,18 +47,20 @@ async def health_check():
 
 @router.get("/ready", response_model=ReadinessResponse)
 async def readiness_check(db: AsyncSession = Depends(get_db)):
-    """Readiness check - verifies database connection."""
+    """Readiness check - verifies database connection and warm engines."""
     try:
         await db.execute(text("SELECT 1"))
         db_status = "connected"
     except Exception as e:
         db_status = f"error: {str(e)}"
 
-    status = "ready" if db_status == "connected" else "not_ready"
+    engines = get_engine_registry().status()
+    status = "ready" if db_status == "connected" and engines["warm"] else "not_ready"
 
     return ReadinessResponse(
         status=status,
         database=db_status,
+        engines=engines,
         timestamp=datetime.utcnow().isoformat(),
     )
 
@@ -70,13 +75,12 @@ async def full_health_check(db: AsyncSession = Depends(get_db)):
     except Exception as e:
         db_status = f"error: {str(e)}"
 
-    # Inference engine check
-    try:
-        from formulas import OOFInferenceEngine
-        engine = OOFInferenceEngine()
+    # Inference engine check (shared engines, warmed at startup)
+    registry = get_engine_registry()
+    if registry.is_warm:
         inference_status = "loaded"
-    except Exception as e:
-        inference_status = f"error: {str(e)}"
+    else:
+        inference_status = f"error: {registry.status()['error'] or 'not warmed'}"
 
     overall_status = "healthy" if db_status == "connected" and inference_status == "loaded" else "degraded"
 
@@ -1,7 +1,8 @@
 """
 Matrix data endpoints - backend lookups for generated documents/presets.
 
-Architecture: Each document has its own 10x10 matrix stored in generated_documents.
+Architecture: Each document has its own 10x10 matrix, stored as document, option
+and cell rows (database/matrix_store.py) so edits only write the rows they touch.
 Leverage points and risk analysis are generated during matrix data generation
 (generate_matrix_data_llm) and cached per-document - no separate LLM calls needed.
 """
@@ -12,9 +13,9 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm.attributes import flag_modified
 
-from database import get_db, User, ChatConversation, ChatMessage
+from database import get_db, User, ChatConversation, ChatMessage, MatrixDocument
+from database import matrix_store
 from routers.auth import get_current_user
 from routers.credits import require_credits, deduct_credit
 from utils import get_or_404, CamelModel
@@ -56,28 +57,24 @@ def _pop_cached_previews(conversation_id: str) -> Optional[list[dict]]:
     return docs
 
 
-# Helpers to reduce repeated copy/find/save pattern across endpoints
+# Helpers to reduce repeated find pattern across endpoints
 
-async def _find_document(conversation, doc_id: str):
-    """Find document in conversation. Returns (documents_copy, index, doc_dict) or raises."""
-    if not conversation.generated_documents:
+async def _find_document(
+    db: AsyncSession,
+    conversation: ChatConversation,
+    doc_id: str,
+    children: bool = False
+) -> MatrixDocument:
+    """Find document row in conversation (with options and cells if children) or raise."""
+    row = await matrix_store.get_document_row(db, conversation, doc_id, children=children)
+    if row is not None:
+        return row
+
+    if not await matrix_store.document_count(db, conversation):
         raise HTTPException(status_code=400, detail="No documents exist")
-
-    documents = conversation.generated_documents.copy()
-    for i, doc in enumerate(documents):
-        if doc.get("id") == doc_id:
-            return documents, i, doc
-
     raise HTTPException(status_code=404, detail="Document not found")
 
 
-async def _save_documents(conversation, documents, db: AsyncSession):
-    """Write updated documents array back and commit."""
-    conversation.generated_documents = documents
-    flag_modified(conversation, "generated_documents")
-    await db.commit()
-
-
 async def _load_context_messages(conversation_id: str, db: AsyncSession, limit: int = 10) -> list[dict]:
     """Load recent messages for LLM context. Used by design-reality, insights, preview, add-documents."""
     messages_result = await db.execute(
@@ -189,7 +186,10 @@ async def get_presets(
     db: AsyncSession = Depends(get_db)
 ):
     """Get generated strategic presets for a conversation."""
-    conversation = await get_or_404(db, ChatConversation, conversation_id, user_id=current_user.id)
+    conversation = await get_or_404(
+        db, ChatConversation, conversation_id, user_id=current_user.id,
+        load_columns=["generated_presets"]
+    )
 
     if not conversation.generated_presets:
         return []
@@ -205,13 +205,14 @@ async def get_documents(
 ):
     """Get generated documents for a conversation."""
     conversation = await get_or_404(db, ChatConversation, conversation_id, user_id=current_user.id)
+    documents = await matrix_store.load_documents(db, conversation)
 
-    if not conversation.generated_documents:
+    if not documents:
         api_logger.info(f"[MATRIX GET] No documents for conv {conversation_id}")
         return []
 
-    api_logger.info(f"[MATRIX GET] Returning {len(conversation.generated_documents)} docs for conv {conversation_id}")
-    return conversation.generated_documents
+    api_logger.info(f"[MATRIX GET] Returning {len(documents)} docs for conv {conversation_id}")
+    return documents
 
 
 @router.get("/{conversation_id}/document/{doc_id}", response_model=Optional[GeneratedDocument])
@@ -223,15 +224,12 @@ async def get_document(
 ):
     """Get a specific generated document."""
     conversation = await get_or_404(db, ChatConversation, conversation_id, user_id=current_user.id)
+    row = await matrix_store.get_document_row(db, conversation, doc_id, children=True)
 
-    if not conversation.generated_documents:
+    if row is None:
         return None
 
-    for doc in conversation.generated_documents:
-        if doc.get("id") == doc_id:
-            return GeneratedDocument(**doc)
-
-    return None
+    return GeneratedDocument(**matrix_store.document_to_dict(row))
 
 
 @router.delete("/{conversation_id}/document/{doc_id}")
@@ -243,16 +241,17 @@ async def delete_document(
 ):
     """Delete a document from the conversation. Cannot delete the last document."""
     conversation = await get_or_404(db, ChatConversation, conversation_id, user_id=current_user.id)
-    documents, idx, _ = await _find_document(conversation, doc_id)
+    row = await _find_document(db, conversation, doc_id)
+    count = await matrix_store.document_count(db, conversation)
 
-    if len(documents) <= 1:
+    if count <= 1:
         raise HTTPException(status_code=400, detail="Cannot delete the last document")
 
-    documents.pop(idx)
-    await _save_documents(conversation, documents, db)
+    await matrix_store.delete_document(db, row)
+    await db.commit()
 
-    api_logger.info(f"[MATRIX DELETE] Removed document {doc_id} from conv {conversation_id}, {len(documents)} remaining")
-    return {"status": "success", "remaining": len(documents)}
+    api_logger.info(f"[MATRIX DELETE] Removed document {doc_id} from conv {conversation_id}, {count - 1} remaining")
+    return {"status": "success", "remaining": count - 1}
 
 
 # ============================================================================
@@ -281,7 +280,8 @@ async def design_reality(
     from main import generate_matrix_data_llm, get_model_config
 
     conversation = await get_or_404(db, ChatConversation, conversation_id, user_id=current_user.id)
-    documents, doc_index, doc_stub = await _find_document(conversation, doc_id)
+    row = await _find_document(db, conversation, doc_id, children=True)
+    doc_stub = matrix_store.document_to_dict(row)
 
     context_messages = await _load_context_messages(conversation_id, db)
 
@@ -307,14 +307,14 @@ async def design_reality(
         raise HTTPException(status_code=500, detail="LLM returned no cells — check server logs for [MATRIX_GEN] errors")
 
     # Update document with generated data
-    documents[doc_index]["matrix_data"]["cells"] = result["cells"]
-    documents[doc_index]["leverage_points"] = result.get("leverage_points", [])
-    documents[doc_index]["risk_analysis"] = result.get("risk_analysis", [])
-    documents[doc_index]["plays"] = result.get("plays", [])
-    documents[doc_index]["presets"] = result.get("presets", [])
-    documents[doc_index]["selected_play_id"] = None
+    await matrix_store.replace_cells(db, row, result["cells"])
+    row.leverage_points = result.get("leverage_points", [])
+    row.risk_analysis = result.get("risk_analysis", [])
+    row.plays = result.get("plays", [])
+    row.presets = result.get("presets", [])
+    row.selected_play_id = None
 
-    await _save_documents(conversation, documents, db)
+    await db.commit()
 
     # Deduct 1 credit for design-reality generation
     await deduct_credit(
@@ -324,7 +324,13 @@ async def design_reality(
 
     api_logger.info(f"[DESIGN_REALITY] Generated matrix data for doc {doc_id}")
 
-    return documents[doc_index]
+    doc_stub["matrix_data"]["cells"] = result["cells"]
+    doc_stub.pop("selected_play_id", None)
+    doc_stub.update(
+        leverage_points=row.leverage_points, risk_analysis=row.risk_analysis,
+        plays=row.plays, presets=row.presets
+    )
+    return doc_stub
 
 
 # ============================================================================
@@ -353,7 +359,8 @@ async def generate_insights(
     from main import generate_insights_batch_llm, get_model_config
 
     conversation = await get_or_404(db, ChatConversation, conversation_id, user_id=current_user.id)
-    documents, doc_index, doc = await _find_document(conversation, doc_id)
+    row = await _find_document(db, conversation, doc_id, children=True)
+    doc = matrix_store.document_to_dict(row)
 
     matrix_data = doc.get("matrix_data", {})
     row_options = matrix_data.get("row_options", [])
@@ -365,7 +372,8 @@ async def generate_insights(
     first_time_view = request.insight_index not in viewed
     if first_time_view:
         viewed.append(request.insight_index)
-        documents[doc_index]["matrix_data"]["viewed_insight_indices"] = viewed
+        matrix_data["viewed_insight_indices"] = viewed
+        row.viewed_insight_indices = list(viewed)
         needs_save = True
 
     # Find missing insights (indices 0-9 = rows use driver articulation, 10-19 = columns use outcome articulation)
@@ -412,14 +420,16 @@ async def generate_insights(
                 continue
             if idx < 10:
                 # Rows get driver articulation (articulated_insight)
-                if idx < len(row_options):
-                    documents[doc_index]["matrix_data"]["row_options"][idx]["articulated_insight"] = insight_data
+                if 0 <= idx < len(row_options):
+                    row_options[idx]["articulated_insight"] = insight_data
+                    await matrix_store.set_option_field(db, row, "row", idx, articulated_insight=insight_data)
                     insights_applied += 1
             else:
                 # Columns get outcome articulation (articulated_outcome)
                 col_idx = idx - 10
                 if col_idx < len(col_options):
-                    documents[doc_index]["matrix_data"]["column_options"][col_idx]["articulated_outcome"] = insight_data
+                    col_options[col_idx]["articulated_outcome"] = insight_data
+                    await matrix_store.set_option_field(db, row, "column", col_idx, articulated_outcome=insight_data)
                     insights_applied += 1
 
         api_logger.info(f"[INSIGHTS] Generated {insights_applied} insights for doc {doc_id}")
@@ -433,9 +443,9 @@ async def generate_insights(
         )
 
     if needs_save:
-        await _save_documents(conversation, documents, db)
+        await db.commit()
 
-    return documents[doc_index]
+    return doc
 
 
 # ============================================================================
@@ -481,8 +491,8 @@ async def preview_documents(
     context_messages = await _load_context_messages(conversation_id, db)
 
     # Get existing documents
-    existing_docs = conversation.generated_documents or []
-    next_doc_id = len(existing_docs)
+    existing_names = await matrix_store.document_names(db, conversation)
+    next_doc_id = await matrix_store.next_document_number(db, conversation)
 
     try:
         model_config = get_model_config(request.model)
@@ -494,7 +504,7 @@ async def preview_documents(
     # Generate previews
     new_documents = await generate_document_previews_llm(
         context_messages=context_messages,
-        existing_document_names=[doc.get("name", "") for doc in existing_docs],
+        existing_document_names=existing_names,
         start_doc_id=next_doc_id,
         model_config=model_config,
         count=3
@@ -561,8 +571,7 @@ async def add_documents(
     conversation = await get_or_404(db, ChatConversation, conversation_id, user_id=current_user.id)
 
     # Get existing documents
-    existing_docs = conversation.generated_documents or []
-    next_doc_id = len(existing_docs)
+    next_doc_id = await matrix_store.next_document_number(db, conversation)
 
     # Use cached previews (exact same docs the user saw)
     new_documents = _pop_cached_previews(conversation_id)
@@ -574,7 +583,7 @@ async def add_documents(
         model_config = get_model_config(request.model)
         new_documents = await generate_document_previews_llm(
             context_messages=context_messages,
-            existing_document_names=[doc.get("name", "") for doc in existing_docs],
+            existing_document_names=await matrix_store.document_names(db, conversation),
             start_doc_id=next_doc_id,
             model_config=model_config,
             count=3
@@ -603,17 +612,14 @@ async def add_documents(
         added_ids.append(doc["id"])
 
     # Append to existing documents
-    updated_documents = existing_docs + added_docs
-    conversation.generated_documents = updated_documents
-    flag_modified(conversation, "generated_documents")
-
+    await matrix_store.append_documents(db, conversation, added_docs)
     await db.commit()
 
     api_logger.info(f"[ADD_DOCS] Added {len(added_docs)} documents: {added_ids}")
 
     return AddDocumentsResponse(
         added_document_ids=added_ids,
-        total_document_count=len(updated_documents),
+        total_document_count=await matrix_store.document_count(db, conversation),
         success=True
     )
 
@@ -643,11 +649,11 @@ async def update_document_selection(
 ):
     """Update which rows/columns are selected for a specific document."""
     conversation = await get_or_404(db, ChatConversation, conversation_id, user_id=current_user.id)
-    documents, doc_index, doc = await _find_document(conversation, doc_id)
+    row = await _find_document(db, conversation, doc_id)
 
-    matrix_data = doc.get("matrix_data", {})
-    row_count = len(matrix_data.get("row_options", []))
-    col_count = len(matrix_data.get("column_options", []))
+    option_counts = await matrix_store.option_counts(db, row)
+    row_count = option_counts["row"]
+    col_count = option_counts["column"]
 
     if len(request.selected_rows) != 5:
         raise HTTPException(status_code=400, detail="Must select exactly 5 rows")
@@ -662,10 +668,10 @@ async def update_document_selection(
     if any(idx < 0 or idx >= col_count for idx in request.selected_columns):
         raise HTTPException(status_code=400, detail="Invalid column index")
 
-    documents[doc_index]["matrix_data"]["selected_rows"] = request.selected_rows
-    documents[doc_index]["matrix_data"]["selected_columns"] = request.selected_columns
+    row.selected_rows = request.selected_rows
+    row.selected_columns = request.selected_columns
 
-    await _save_documents(conversation, documents, db)
+    await db.commit()
 
     return UpdateDocumentSelectionResponse(
         status="success",
@@ -742,10 +748,10 @@ async def get_leverage_points(
     This endpoint returns cached data - use design-reality endpoint first if not available.
     """
     conversation = await get_or_404(db, ChatConversation, conversation_id, user_id=current_user.id)
-    _, _, doc = await _find_document(conversation, doc_id)
+    row = await _find_document(db, conversation, doc_id)
 
     # Return cached leverage points
-    cached_leverage = doc.get("leverage_points", [])
+    cached_leverage = row.leverage_points or []
     if not cached_leverage:
         api_logger.info(f"[LEVERAGE] No leverage points for {doc_id} - document may not be fully populated")
         return LeveragePointsResponse(
@@ -776,10 +782,10 @@ async def get_risk_analysis(
     This endpoint returns cached data - use design-reality endpoint first if not available.
     """
     conversation = await get_or_404(db, ChatConversation, conversation_id, user_id=current_user.id)
-    _, _, doc = await _find_document(conversation, doc_id)
+    row = await _find_document(db, conversation, doc_id)
 
     # Return cached risk analysis
-    cached_risk = doc.get("risk_analysis", [])
+    cached_risk = row.risk_analysis or []
     if not cached_risk:
         api_logger.info(f"[RISK] No risk analysis for {doc_id} - document may not be fully populated")
         return RiskAnalysisResponse(
@@ -812,12 +818,11 @@ async def explain_cell(
     Returns cached analysis from document population.
     """
     conversation = await get_or_404(db, ChatConversation, conversation_id, user_id=current_user.id)
-    _, _, doc = await _find_document(conversation, doc_id)
+    doc = await _find_document(db, conversation, doc_id)
 
     # Get selected indices to map row/col to actual cell ID
-    matrix_data = doc.get("matrix_data", {})
-    selected_rows = matrix_data.get("selected_rows", list(range(5)))
-    selected_cols = matrix_data.get("selected_columns", list(range(5)))
+    selected_rows = doc.selected_rows if doc.selected_rows is not None else list(range(5))
+    selected_cols = doc.selected_columns if doc.selected_columns is not None else list(range(5))
 
     if row < 0 or row >= len(selected_rows) or col < 0 or col >= len(selected_cols):
         raise HTTPException(status_code=400, detail="Invalid row/col index")
@@ -828,7 +833,7 @@ async def explain_cell(
 
     # Check cached analysis
     if explanation_type == "leverage":
-        cached = doc.get("leverage_points", [])
+        cached = doc.leverage_points or []
         for lp in cached:
             if lp.get("cell_id") == cell_id:
                 return CellExplanationResponse(
@@ -837,7 +842,7 @@ async def explain_cell(
                     cached=True
                 )
     else:  # risk
-        cached = doc.get("risk_analysis", [])
+        cached = doc.risk_analysis or []
         for rp in cached:
             if rp.get("cell_id") == cell_id:
                 return CellExplanationResponse(
@@ -847,10 +852,10 @@ async def explain_cell(
                 )
 
     # Cell not found in analysis - return generic response
-    row_options = matrix_data.get("row_options", [])
-    col_options = matrix_data.get("column_options", [])
-    row_label = row_options[actual_row]["label"] if actual_row < len(row_options) else f"Row {actual_row}"
-    col_label = col_options[actual_col]["label"] if actual_col < len(col_options) else f"Col {actual_col}"
+    row_labels = await matrix_store.option_labels(db, doc, "row", [actual_row])
+    col_labels = await matrix_store.option_labels(db, doc, "column", [actual_col])
+    row_label = row_labels[actual_row] if actual_row in row_labels else f"Row {actual_row}"
+    col_label = col_labels[actual_col] if actual_col in col_labels else f"Col {actual_col}"
 
     return CellExplanationResponse(
         cell_id=cell_id,
@@ -919,11 +924,11 @@ async def get_plays(
     This endpoint returns cached data - use design-reality endpoint first if not available.
     """
     conversation = await get_or_404(db, ChatConversation, conversation_id, user_id=current_user.id)
-    _, _, doc = await _find_document(conversation, doc_id)
+    row = await _find_document(db, conversation, doc_id)
 
     # Return cached plays
-    cached_plays = doc.get("plays", [])
-    selected_play_id = doc.get("selected_play_id")
+    cached_plays = row.plays or []
+    selected_play_id = row.selected_play_id
 
     if not cached_plays:
         api_logger.info(f"[PLAYS] No plays for {doc_id} - document may not be fully populated")
@@ -957,16 +962,16 @@ async def select_play(
     The selected play can be used to highlight relevant cells in the matrix view.
     """
     conversation = await get_or_404(db, ChatConversation, conversation_id, user_id=current_user.id)
-    documents, doc_index, doc = await _find_document(conversation, doc_id)
+    row = await _find_document(db, conversation, doc_id)
 
     if request.play_id is not None:
-        plays = doc.get("plays", [])
+        plays = row.plays or []
         play_ids = [p.get("id") for p in plays]
         if request.play_id not in play_ids:
             raise HTTPException(status_code=400, detail=f"Play '{request.play_id}' not found in document")
 
-    documents[doc_index]["selected_play_id"] = request.play_id
-    await _save_documents(conversation, documents, db)
+    row.selected_play_id = request.play_id
+    await db.commit()
 
     api_logger.info(f"[PLAYS] Selected play '{request.play_id}' for doc {doc_id}")
 
@@ -1012,17 +1017,16 @@ async def save_cell_changes(
 ):
     """Save user-modified cell dimension values."""
     conversation = await get_or_404(db, ChatConversation, conversation_id, user_id=current_user.id)
-    documents, doc_index, doc = await _find_document(conversation, doc_id)
+    row = await _find_document(db, conversation, doc_id)
 
-    matrix_data = doc.get("matrix_data", {})
-    cells = matrix_data.get("cells", {})
-    selected_rows = matrix_data.get("selected_rows", list(range(5)))
-    selected_cols = matrix_data.get("selected_columns", list(range(5)))
+    selected_rows = row.selected_rows if row.selected_rows is not None else list(range(5))
+    selected_cols = row.selected_columns if row.selected_columns is not None else list(range(5))
 
-    if not cells:
+    if not await matrix_store.cell_count(db, row):
         raise HTTPException(status_code=400, detail="Document has no cells to update")
 
-    changes_applied = 0
+    # Only the cells named in the request are loaded and written
+    cell_changes: Dict[str, list] = {}
 
     for change in request.changes:
         if change.row_idx < 0 or change.row_idx >= len(selected_rows):
@@ -1037,20 +1041,10 @@ async def save_cell_changes(
         actual_row = selected_rows[change.row_idx]
         actual_col = selected_cols[change.col_idx]
         cell_key = f"{actual_row}-{actual_col}"
+        cell_changes.setdefault(cell_key, []).append((change.dim_idx, change.value))
 
-        if cell_key not in cells:
-            continue
-
-        cell = cells[cell_key]
-        dimensions = cell.get("dimensions", [])
-
-        if change.dim_idx < len(dimensions):
-            dimensions[change.dim_idx]["value"] = change.value
-            cells[cell_key]["dimensions"] = dimensions
-            changes_applied += 1
-
-    documents[doc_index]["matrix_data"]["cells"] = cells
-    await _save_documents(conversation, documents, db)
+    changes_applied = await matrix_store.update_cell_dimensions(db, row, cell_changes)
+    await db.commit()
 
     api_logger.info(f"[CELLS] Saved {changes_applied} dimension changes for doc {doc_id}")
 
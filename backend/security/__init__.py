@@ -42,6 +42,7 @@ from security.validation import (
     detect_path_traversal,
     sanitize_string,
     validate_input,
+    scan_attacks,
 )
 
 # Encryption (optional cryptography dependency)
@@ -75,7 +76,7 @@ from security.audit_logger import AuditLogger, audit_log
 from security.session_security import SessionSecurity
 
 # File upload (no external dependencies)
-from security.file_upload import FileUploadValidator
+from security.file_upload import FileUploadValidator, FileStreamCheck
 
 # AI security (no external dependencies)
 from security.ai_security import (
@@ -137,6 +138,7 @@ __all__ = [
     "detect_path_traversal",
     "sanitize_string",
     "validate_input",
+    "scan_attacks",
     # Encryption
     "encrypt_data",
     "decrypt_data",
@@ -161,6 +163,7 @@ __all__ = [
     "SessionSecurity",
     # File Upload
     "FileUploadValidator",
+    "FileStreamCheck",
     # AI Security
     "detect_bias",
     "moderate_content",
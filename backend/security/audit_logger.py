@@ -1,9 +1,17 @@
 """
 Audit Logger - Enterprise audit logging with HMAC signatures.
+
+Events are queued in memory and written by a background flusher (start() in
+the app lifespan), so request latency does not include signing, storage or
+alert round trips. Batches are signed together and written in one Redis
+pipeline. When the queue is full, AUDIT_OVERFLOW_POLICY decides:
+"drop_newest" (default), "drop_oldest" or "block" (the caller waits for the
+flusher). Without a running flusher, events are stored inline as before.
 """
 
 import asyncio
 import json
+import logging
 import os
 import time
 from datetime import datetime, timedelta
@@ -18,6 +26,14 @@ from security.encryption import create_hmac, generate_secure_token
 AUDIT_RETENTION_DAYS = int(os.getenv("AUDIT_RETENTION_DAYS", "365"))
 AUDIT_HMAC_SECRET = os.getenv("AUDIT_HMAC_SECRET", os.getenv("JWT_SECRET", ""))
 CRITICAL_ALERT_WEBHOOK = os.getenv("CRITICAL_ALERT_WEBHOOK")
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1.0"))
+AUDIT_OVERFLOW_POLICY = os.getenv("AUDIT_OVERFLOW_POLICY", "drop_newest")
+
+OVERFLOW_POLICIES = {"drop_newest", "drop_oldest", "block"}
+
+logger = logging.getLogger("api")
 
 # Events that trigger immediate alerts
 CRITICAL_EVENTS = {
@@ -37,12 +53,35 @@ class AuditLogger:
     Supports Redis backend or in-memory storage.
     """
 
-    def __init__(self, redis_client=None, max_memory_events: int = 10000):
+    def __init__(
+        self,
+        redis_client=None,
+        max_memory_events: int = 10000,
+        max_queue: int = AUDIT_QUEUE_SIZE,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL,
+        overflow_policy: str = AUDIT_OVERFLOW_POLICY,
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown audit overflow policy: {overflow_policy}")
         self._redis = redis_client
         self._memory_store: deque[AuditEvent] = deque(maxlen=max_memory_events)
         self._lock = asyncio.Lock()
         self._alert_callback: Optional[Callable] = None
 
+        # Write queue, drained by the background flusher
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self._queue: deque[AuditEvent] = deque()
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._flush_lock = asyncio.Lock()
+        self._counters = {"enqueued": 0, "written": 0, "dropped": 0, "blocked": 0, "failed": 0, "batches": 0}
+
     def set_alert_callback(self, callback: Callable) -> None:
         """Set callback for critical event alerts."""
         self._alert_callback = callback
@@ -85,17 +124,105 @@ class AuditLogger:
             details=details or {},
         )
 
-        # Create HMAC signature
-        event.signature = self._sign_event(event)
+        if self._flush_task is None:
+            # No flusher running: sign, store and alert inline
+            await self._write_batch([event])
+        else:
+            # Signed and stored by the flusher
+            await self._enqueue(event)
+
+        return event
 
-        # Store event
-        await self._store(event)
+    # =========================================================================
+    # Write queue
+    # =========================================================================
+
+    async def _enqueue(self, event: AuditEvent) -> None:
+        """Queue an event, applying the overflow policy when the queue is full."""
+        if len(self._queue) >= self.max_queue:
+            if self.overflow_policy == "block":
+                self._counters["blocked"] += 1
+                while len(self._queue) >= self.max_queue and self._flush_task is not None:
+                    self._space.clear()
+                    self._wakeup.set()
+                    await self._space.wait()
+            elif self.overflow_policy == "drop_oldest":
+                self._queue.popleft()
+                self._counters["dropped"] += 1
+            else:
+                self._counters["dropped"] += 1
+                return
+
+        self._queue.append(event)
+        self._counters["enqueued"] += 1
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Write every queued event. Returns the number written."""
+        written = 0
+        async with self._flush_lock:
+            while self._queue:
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                self._space.set()
+                try:
+                    await self._write_batch(batch)
+                    written += len(batch)
+                except Exception as e:
+                    self._counters["failed"] += len(batch)
+                    logger.error(f"[AUDIT] Failed to write {len(batch)} audit events: {e}")
+        return written
+
+    async def _write_batch(self, events: list[AuditEvent]) -> None:
+        """Sign, store and alert for a batch of events."""
+        for event in events:
+            event.signature = self._sign_event(event)
+
+        if self._redis:
+            await self._store_redis_batch(events)
+        else:
+            async with self._lock:
+                self._memory_store.extend(events)
+        self._counters["written"] += len(events)
+        self._counters["batches"] += 1
 
         # Check for critical events
-        if event_type in CRITICAL_EVENTS:
-            await self._alert_critical(event)
+        for event in events:
+            if event.event_type in CRITICAL_EVENTS:
+                await self._alert_critical(event)
 
-        return event
+    async def _flush_loop(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def start(self) -> None:
+        """Start the background flusher; log() only queues from now on."""
+        if self._flush_task is None:
+            self._wakeup = asyncio.Event()
+            self._space = asyncio.Event()
+            self._stopping = False
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def aclose(self) -> None:
+        """Stop the flusher and write what is still queued."""
+        if self._flush_task is not None:
+            # Stop flag rather than cancel(): wait_for can swallow a cancel
+            # that races with the wakeup event
+            self._stopping = True
+            self._wakeup.set()
+            await self._flush_task
+            self._flush_task = None
+            self._space.set()  # release blocked producers
+        await self.flush()
+
+    def stats(self) -> dict[str, int]:
+        """Queue depth and enqueue/write/drop counters."""
+        return {"queued": len(self._queue), **self._counters}
 
     def _sign_event(self, event: AuditEvent) -> str:
         """Create HMAC signature for an event."""
@@ -120,16 +247,8 @@ class AuditLogger:
         import hmac as hmac_lib
         return hmac_lib.compare_digest(expected, event.signature)
 
-    async def _store(self, event: AuditEvent) -> None:
-        """Store an audit event."""
-        if self._redis:
-            await self._store_redis(event)
-        else:
-            await self._store_memory(event)
-
-    async def _store_redis(self, event: AuditEvent) -> None:
-        """Store event in Redis with indexes."""
-        event_data = {
+    def _redis_record(self, event: AuditEvent) -> str:
+        return json.dumps({
             "id": event.id,
             "event_type": event.event_type.value,
             "severity": event.severity.value,
@@ -144,42 +263,41 @@ class AuditLogger:
             "action": event.action,
             "details": event.details,
             "signature": event.signature,
-        }
+        })
 
+    async def _store_redis_batch(self, events: list[AuditEvent]) -> None:
+        """Store events in Redis with indexes, one pipeline per batch."""
+        ttl = AUDIT_RETENTION_DAYS * 86400
         pipe = self._redis.pipeline()
+        index_keys = set()
 
-        # Store event
-        key = f"audit:{event.id}"
-        pipe.setex(key, AUDIT_RETENTION_DAYS * 86400, json.dumps(event_data))
+        for event in events:
+            score = event.timestamp.timestamp()
 
-        # Index by event type
-        type_key = f"audit:type:{event.event_type.value}"
-        pipe.zadd(type_key, {event.id: event.timestamp.timestamp()})
-        pipe.expire(type_key, AUDIT_RETENTION_DAYS * 86400)
+            # Store event
+            pipe.setex(f"audit:{event.id}", ttl, self._redis_record(event))
 
-        # Index by user
-        if event.user_id:
-            user_key = f"audit:user:{event.user_id}"
-            pipe.zadd(user_key, {event.id: event.timestamp.timestamp()})
-            pipe.expire(user_key, AUDIT_RETENTION_DAYS * 86400)
+            # Index by event type, user and organization
+            type_key = f"audit:type:{event.event_type.value}"
+            pipe.zadd(type_key, {event.id: score})
+            index_keys.add(type_key)
+            if event.user_id:
+                user_key = f"audit:user:{event.user_id}"
+                pipe.zadd(user_key, {event.id: score})
+                index_keys.add(user_key)
+            if event.organization_id:
+                org_key = f"audit:org:{event.organization_id}"
+                pipe.zadd(org_key, {event.id: score})
+                index_keys.add(org_key)
 
-        # Index by organization
-        if event.organization_id:
-            org_key = f"audit:org:{event.organization_id}"
-            pipe.zadd(org_key, {event.id: event.timestamp.timestamp()})
-            pipe.expire(org_key, AUDIT_RETENTION_DAYS * 86400)
+            # Timeline index
+            pipe.zadd("audit:timeline", {event.id: score})
 
-        # Timeline index
-        timeline_key = "audit:timeline"
-        pipe.zadd(timeline_key, {event.id: event.timestamp.timestamp()})
+        for key in index_keys:
+            pipe.expire(key, ttl)
 
         await pipe.execute()
 
-    async def _store_memory(self, event: AuditEvent) -> None:
-        """Store event in memory."""
-        async with self._lock:
-            self._memory_store.append(event)
-
     async def _alert_critical(self, event: AuditEvent) -> None:
         """Send alert for critical events."""
         # Custom callback
@@ -219,7 +337,8 @@ class AuditLogger:
         limit: int = 100,
         offset: int = 0,
     ) -> list[AuditEvent]:
-        """Query audit events."""
+        """Query audit events (queued events are written first)."""
+        await self.flush()
         if self._redis:
             return await self._query_redis(
                 event_type, user_id, organization_id,
@@ -337,6 +456,7 @@ class AuditLogger:
 
     async def delete_for_user(self, user_id: str) -> int:
         """Delete all audit data for a user (GDPR compliance)."""
+        await self.flush()
         if self._redis:
             # Get all event IDs for user
             user_key = f"audit:user:{user_id}"
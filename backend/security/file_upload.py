@@ -73,6 +73,13 @@ MAGIC_NUMBERS = {
     "application/gzip": [b"\x1f\x8b"],
 }
 
+# Read size for validate() and streamed uploads
+STREAM_CHUNK_SIZE = 256 * 1024
+
+# Path traversal in text content (bytes, so chunks need no decoding)
+TEXT_PATH_TRAVERSAL = re.compile(rb"\.\./|\.\.\\|%2e%2e", re.IGNORECASE)
+PATH_TRAVERSAL_OVERLAP = 5
+
 # Malware signatures (simplified)
 MALWARE_SIGNATURES = [
     b"MZ",  # PE executable
@@ -93,6 +100,103 @@ class FileValidationResult:
     file_hash: Optional[str] = None
 
 
+# Content types that say nothing about the file: browsers send
+# application/octet-stream for any extension the OS does not know
+UNDECLARED_MIME_TYPES = {"", "application/octet-stream"}
+
+
+def _declared_mime_type(content_type: Optional[str]) -> Optional[str]:
+    """
+    Bare, lower-cased MIME type of a Content-Type header (parameters dropped),
+    or None if it does not declare a type. Undeclared types are left to the
+    extension allow-list and the magic-number check.
+    """
+    mime = (content_type or "").split(";")[0].strip().lower()
+    return None if mime in UNDECLARED_MIME_TYPES else mime
+
+
+class FileStreamCheck:
+    """
+    FileUploadValidator checks for one file fed in chunks.
+
+    Filename, extension and declared MIME type are checked up front, so a
+    rejected upload can be skipped without spooling it. feed() hashes the
+    content, counts its size (writing can stop once `rejected` is set) and
+    scans for path traversal; finish() applies the content checks that need
+    the first bytes and returns the same FileValidationResult as validate().
+    """
+
+    def __init__(self, validator: "FileUploadValidator", filename: str, content_type: Optional[str] = None):
+        self.validator = validator
+        self.content_type = content_type
+        self.size = 0
+        self.sanitized_filename = validator._sanitize_filename(filename)
+        self.rejected: Optional[str] = self._check_name(content_type)
+        self._head = b""
+        self._tail = b""
+        self._hash = hashlib.sha256()
+        self._path_traversal = False
+
+    def _check_name(self, content_type: Optional[str]) -> Optional[str]:
+        if not self.sanitized_filename:
+            return "Invalid filename"
+        ext = os.path.splitext(self.sanitized_filename)[1].lower()
+        if ext in DANGEROUS_EXTENSIONS:
+            return f"Dangerous file extension: {ext}"
+        if ext not in self.validator.allowed_extensions:
+            return f"File extension not allowed: {ext}"
+        declared = _declared_mime_type(content_type)
+        if declared and declared not in self.validator.allowed_mime_types:
+            return f"MIME type not allowed: {declared}"
+        return None
+
+    def feed(self, chunk: bytes) -> bool:
+        """Add the next chunk; False once the file has been rejected."""
+        self.size += len(chunk)
+        if self.rejected:
+            return False
+        if self.size > self.validator.max_size:
+            self.rejected = f"File too large: {self.size} bytes (max: {self.validator.max_size})"
+            return False
+        if len(self._head) < 16:
+            self._head = (self._head + chunk[:16])[:16]
+        self._hash.update(chunk)
+        if not self._path_traversal:
+            window = self._tail + chunk
+            self._path_traversal = TEXT_PATH_TRAVERSAL.search(window) is not None
+            self._tail = window[-PATH_TRAVERSAL_OVERLAP:]
+        return True
+
+    def finish(self) -> FileValidationResult:
+        if self.rejected:
+            if self.rejected.startswith("File too large"):
+                # Report the full size, as validate() does
+                self.rejected = f"File too large: {self.size} bytes (max: {self.validator.max_size})"
+            return FileValidationResult(is_valid=False, error=self.rejected)
+
+        ext = os.path.splitext(self.sanitized_filename)[1].lower()
+        detected_mime = self.validator._detect_mime_type(self._head, ext)
+
+        # Verify magic numbers
+        if not self.validator._verify_magic_number(self._head, detected_mime):
+            return FileValidationResult(is_valid=False, error="File content does not match declared type")
+
+        # Check for malware signatures
+        if self.validator._has_malware_signature(self._head):
+            return FileValidationResult(is_valid=False, error="File contains potentially dangerous content")
+
+        # Check for path traversal in content (for text files)
+        if detected_mime and detected_mime.startswith("text/") and self._path_traversal:
+            return FileValidationResult(is_valid=False, error="File contains path traversal patterns")
+
+        return FileValidationResult(
+            is_valid=True,
+            sanitized_filename=self.sanitized_filename,
+            detected_mime_type=detected_mime,
+            file_hash=self._hash.hexdigest(),
+        )
+
+
 class FileUploadValidator:
     """
     Comprehensive file upload validation.
@@ -119,81 +223,21 @@ class FileUploadValidator:
         Validate an uploaded file.
         Performs comprehensive security checks.
         """
-        # Sanitize filename first
-        sanitized_name = self._sanitize_filename(filename)
-        if not sanitized_name:
-            return FileValidationResult(
-                is_valid=False,
-                error="Invalid filename"
-            )
-
-        # Check extension
-        ext = os.path.splitext(sanitized_name)[1].lower()
-        if ext in DANGEROUS_EXTENSIONS:
-            return FileValidationResult(
-                is_valid=False,
-                error=f"Dangerous file extension: {ext}"
-            )
-
-        if ext not in self.allowed_extensions:
-            return FileValidationResult(
-                is_valid=False,
-                error=f"File extension not allowed: {ext}"
-            )
-
-        # Read file content
+        check = FileStreamCheck(self, filename, content_type)
+        if check.rejected:
+            return check.finish()
         file.seek(0)
-        content = file.read()
+        while True:
+            chunk = file.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            check.feed(chunk)
         file.seek(0)
+        return check.finish()
 
-        # Check size
-        if len(content) > self.max_size:
-            return FileValidationResult(
-                is_valid=False,
-                error=f"File too large: {len(content)} bytes (max: {self.max_size})"
-            )
-
-        # Detect MIME type from content
-        detected_mime = self._detect_mime_type(content, ext)
-
-        # Verify MIME type matches extension
-        if content_type and content_type not in self.allowed_mime_types:
-            return FileValidationResult(
-                is_valid=False,
-                error=f"MIME type not allowed: {content_type}"
-            )
-
-        # Verify magic numbers
-        if not self._verify_magic_number(content, detected_mime):
-            return FileValidationResult(
-                is_valid=False,
-                error="File content does not match declared type"
-            )
-
-        # Check for malware signatures
-        if self._has_malware_signature(content):
-            return FileValidationResult(
-                is_valid=False,
-                error="File contains potentially dangerous content"
-            )
-
-        # Check for path traversal in content (for text files)
-        if detected_mime and detected_mime.startswith("text/"):
-            if self._has_path_traversal(content):
-                return FileValidationResult(
-                    is_valid=False,
-                    error="File contains path traversal patterns"
-                )
-
-        # Calculate file hash
-        file_hash = hashlib.sha256(content).hexdigest()
-
-        return FileValidationResult(
-            is_valid=True,
-            sanitized_filename=sanitized_name,
-            detected_mime_type=detected_mime,
-            file_hash=file_hash,
-        )
+    def begin(self, filename: str, content_type: Optional[str] = None) -> "FileStreamCheck":
+        """Start validating a file that arrives in chunks (see FileStreamCheck)."""
+        return FileStreamCheck(self, filename, content_type)
 
     def _sanitize_filename(self, filename: str) -> Optional[str]:
         """Sanitize a filename."""
@@ -250,15 +294,6 @@ class FileUploadValidator:
                 return True
         return False
 
-    def _has_path_traversal(self, content: bytes) -> bool:
-        """Check for path traversal in text content."""
-        try:
-            text = content.decode("utf-8", errors="ignore")
-            patterns = [r"\.\./", r"\.\.\\", r"%2e%2e"]
-            return any(re.search(p, text, re.IGNORECASE) for p in patterns)
-        except Exception:
-            return False
-
     def generate_safe_filename(self, original_name: str) -> str:
         """Generate a safe random filename preserving extension."""
         ext = os.path.splitext(original_name)[1].lower()
@@ -24,6 +24,7 @@ Each security check happens exactly once per request.
 
 import json
 import os
+import re
 import time
 from functools import wraps
 from typing import Any, Callable, Optional
@@ -63,6 +64,18 @@ ADMIN_ENDPOINTS = {"/admin"}
 # Auth endpoints with auth-specific rate limits
 AUTH_ENDPOINTS = {"/auth/login", "/auth/register"}
 
+# Streamed multipart upload routes: upload_stream.read_multipart enforces its
+# own UPLOAD_MAX_TOTAL_SIZE while reading, so multipart/form-data requests to
+# exactly these routes skip MAX_REQUEST_BODY_SIZE
+STREAMED_UPLOAD_ROUTES = (
+    "/chat/conversations/{conversation_id}/messages/multipart",
+    "/chat/conversations/{conversation_id}/files/multipart",
+    "/goals/discover-from-files/multipart",
+)
+_STREAMED_UPLOAD_PATTERNS = tuple(
+    re.compile(re.sub(r"\{[^/]+\}", "[^/]+", route)) for route in STREAMED_UPLOAD_ROUTES
+)
+
 # Public endpoints (no auth required)
 PUBLIC_ENDPOINTS = {
     "/auth/login",
@@ -94,6 +107,14 @@ def get_client_ip(request: Request) -> str:
     return "unknown"
 
 
+def is_streamed_upload(request: Request) -> bool:
+    """Check for a multipart/form-data request to a streamed upload route."""
+    content_type = request.headers.get("Content-Type", "").lower()
+    return content_type.startswith("multipart/form-data") and any(
+        pattern.fullmatch(request.url.path) for pattern in _STREAMED_UPLOAD_PATTERNS
+    )
+
+
 class UnifiedSecurityMiddleware(BaseHTTPMiddleware):
     """
     Single-pass security middleware.
@@ -154,9 +175,13 @@ class UnifiedSecurityMiddleware(BaseHTTPMiddleware):
                         }
                     )
 
-            # 3. Request body size check
+            # 3. Request body size check (streamed uploads are capped while read)
             content_length = request.headers.get("Content-Length")
-            if content_length and int(content_length) > MAX_REQUEST_BODY_SIZE:
+            if (
+                content_length
+                and int(content_length) > MAX_REQUEST_BODY_SIZE
+                and not is_streamed_upload(request)
+            ):
                 raise HTTPException(status_code=413, detail="Request too large")
 
             # 4. Input validation (for POST/PUT/PATCH with JSON body)
@@ -183,9 +208,8 @@ class UnifiedSecurityMiddleware(BaseHTTPMiddleware):
             # 7. Add request ID header
             response.headers["X-Request-ID"] = ctx.request_id
 
-            # 8. Audit logging (async, don't block response)
+            # 8. Audit logging (queued; signed and stored by the audit flusher)
             duration = time.time() - start_time
-            # Fire and forget audit log
             if self.config.audit_enabled:
                 # Only log non-health endpoints
                 if not request.url.path.startswith("/health"):
@@ -243,6 +267,8 @@ class UnifiedSecurityMiddleware(BaseHTTPMiddleware):
         """Validate request input for attacks."""
         content_type = request.headers.get("Content-Type", "")
 
+        # Multipart uploads are validated while they stream in (upload_stream:
+        # files by security.file_upload, text fields by validate_json_payload)
         if "application/json" not in content_type:
             return
 
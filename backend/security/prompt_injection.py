@@ -6,6 +6,7 @@ import base64
 import re
 from typing import Optional
 
+from security.scanner import PatternScanner
 from security.types import PromptInjectionResult
 
 
@@ -98,13 +99,20 @@ MULTI_TURN_PATTERNS = [
 ]
 
 
-def _check_patterns(text: str, patterns: list[str], category: str) -> list[str]:
-    """Check text against a list of patterns."""
-    matches = []
-    for pattern in patterns:
-        if re.search(pattern, text):
-            matches.append(f"{category}:{pattern[:40]}")
-    return matches
+_CATEGORIES = [
+    ("jailbreak", JAILBREAK_PATTERNS),
+    ("instruction_override", INSTRUCTION_OVERRIDE_PATTERNS),
+    ("role_manipulation", ROLE_MANIPULATION_PATTERNS),
+    ("instruction_injection", INSTRUCTION_INJECTION_PATTERNS),
+    ("output_manipulation", OUTPUT_MANIPULATION_PATTERNS),
+    ("delimiter_attack", DELIMITER_PATTERNS),
+    ("encoding_trick", ENCODING_PATTERNS),
+    ("multi_turn", MULTI_TURN_PATTERNS),
+]
+
+_SCANNER = PatternScanner(_CATEGORIES, label_length=40)
+
+_BASE64_RE = re.compile(r"[A-Za-z0-9+/]{20,}={0,2}")
 
 
 def _decode_and_check(text: str) -> list[str]:
@@ -112,8 +120,7 @@ def _decode_and_check(text: str) -> list[str]:
     matches = []
 
     # Check for base64
-    base64_pattern = r"[A-Za-z0-9+/]{20,}={0,2}"
-    for b64_match in re.finditer(base64_pattern, text):
+    for b64_match in _BASE64_RE.finditer(text):
         try:
             decoded = base64.b64decode(b64_match.group()).decode("utf-8", errors="ignore")
             if decoded:
@@ -136,17 +143,8 @@ def detect_prompt_injection(text: str) -> PromptInjectionResult:
     if not text:
         return PromptInjectionResult(is_injection=False, confidence=0.0)
 
-    all_matches = []
-
-    # Check all pattern categories
-    all_matches.extend(_check_patterns(text, JAILBREAK_PATTERNS, "jailbreak"))
-    all_matches.extend(_check_patterns(text, INSTRUCTION_OVERRIDE_PATTERNS, "instruction_override"))
-    all_matches.extend(_check_patterns(text, ROLE_MANIPULATION_PATTERNS, "role_manipulation"))
-    all_matches.extend(_check_patterns(text, INSTRUCTION_INJECTION_PATTERNS, "instruction_injection"))
-    all_matches.extend(_check_patterns(text, OUTPUT_MANIPULATION_PATTERNS, "output_manipulation"))
-    all_matches.extend(_check_patterns(text, DELIMITER_PATTERNS, "delimiter_attack"))
-    all_matches.extend(_check_patterns(text, ENCODING_PATTERNS, "encoding_trick"))
-    all_matches.extend(_check_patterns(text, MULTI_TURN_PATTERNS, "multi_turn"))
+    # Check all pattern categories (one compiled pass, see security/scanner.py)
+    all_matches = _SCANNER.scan(text)
 
     # Check for encoded content
     all_matches.extend(_decode_and_check(text))
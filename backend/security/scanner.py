@@ -0,0 +1,188 @@
+"""
+Pattern Scanner - Compiled multi-pattern matching with literal prefilters.
+
+The detectors in validation.py and prompt_injection.py each loop over their
+own regex list. Running every regex over every string dominates the cost of
+large payloads (chat history, file contents), although benign text almost
+never contains what the patterns need.
+
+PatternScanner compiles the patterns once and derives, from each pattern's
+parse tree, sets of literals that any match must contain one of (e.g.
+{"or", "and"} and {"="} for the boolean-blind SQL pattern, {"${"} for
+variable expansion). For ASCII text a single lowercase copy is checked for
+those literals with substring search and a regex only runs when every set
+is present. Non-ASCII text, where case folding differs from str.lower, runs
+every regex. Results are identical to searching each pattern.
+
+With pyahocorasick installed (as for the guardrails), the literals present
+in a string are found in one Aho-Corasick pass; without it, by one substring
+search per distinct literal.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+try:
+    import ahocorasick
+    _HAS_AHOCORASICK = True
+except ImportError:
+    _HAS_AHOCORASICK = False
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+
+@dataclass(frozen=True)
+class ScanRule:
+    """One compiled pattern, its report label and its prefilter literals."""
+    label: str
+    regex: re.Pattern
+    literals: Optional[tuple[tuple[str, ...], ...]]  # None: no prefilter, always search
+
+
+# ============================================================================
+# Required-literal extraction
+# ============================================================================
+
+def _best(options: Iterable[frozenset]) -> Optional[frozenset]:
+    """Most selective alternative set: longest shortest literal, then fewest literals."""
+    best = None
+    for option in options:
+        if best is None or (min(map(len, option)), -len(option)) > (min(map(len, best)), -len(best)):
+            best = option
+    return best
+
+
+def _required(items) -> list[frozenset]:
+    """
+    Literal sets required by the parsed sequence: every match contains at
+    least one literal of each set.
+    """
+    requirements = []
+    run = []
+
+    def close_run():
+        if run:
+            requirements.append(frozenset(["".join(run).lower()]))
+            run.clear()
+
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            run.append(chr(av))
+            continue
+        close_run()
+
+        if op is sre_constants.SUBPATTERN:
+            requirements.extend(_required(av[-1]))
+        elif op is getattr(sre_constants, "ATOMIC_GROUP", None):
+            requirements.extend(_required(av))
+        elif op is sre_constants.BRANCH:
+            # One set per branch, merged: the match goes through one of them
+            branches = [_best(_required(branch)) for branch in av[1]]
+            if all(branches):
+                requirements.append(frozenset().union(*branches))
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT,
+                    getattr(sre_constants, "POSSESSIVE_REPEAT", None)):
+            low, _high, item = av
+            if low >= 1:
+                requirements.extend(_required(item))
+        # Anything else (classes, anchors, backreferences): no requirement
+    close_run()
+
+    return requirements
+
+
+def required_literals(pattern: str) -> Optional[tuple[tuple[str, ...], ...]]:
+    """
+    Lowercase literal sets for `pattern`, most selective first: any match
+    contains a literal of every set. None if nothing is required.
+    """
+    try:
+        requirements = set(_required(sre_parse.parse(pattern)))
+    except Exception:
+        return None
+    ordered = sorted(requirements, key=lambda option: (-min(map(len, option)), len(option), sorted(option)))
+    return tuple(tuple(sorted(option)) for option in ordered) or None
+
+
+# ============================================================================
+# Scanner
+# ============================================================================
+
+class PatternScanner:
+    """
+    Compiled pattern set reporting matches as "category:<pattern prefix>".
+
+    Categories are (category, patterns) or (category, patterns, flags).
+
+    Usage:
+        scanner = PatternScanner([("xss", XSS_PATTERNS)], label_length=30)
+        labels = scanner.scan(text)
+    """
+
+    def __init__(
+        self,
+        categories: Iterable[tuple],
+        label_length: int = 30,
+        flags: int = 0
+    ):
+        self.rules: list[ScanRule] = []
+        for category, patterns, *category_flags in categories:
+            pattern_flags = category_flags[0] if category_flags else flags
+            for pattern in patterns:
+                self.rules.append(ScanRule(
+                    label=f"{category}:{pattern[:label_length]}",
+                    regex=re.compile(pattern, pattern_flags),
+                    literals=required_literals(pattern),
+                ))
+
+        self._literals = sorted({
+            literal
+            for rule in self.rules if rule.literals
+            for option in rule.literals
+            for literal in option
+        })
+        self._automaton = None
+        if _HAS_AHOCORASICK and self._literals:
+            self._automaton = ahocorasick.Automaton()
+            for literal in self._literals:
+                self._automaton.add_word(literal, literal)
+            self._automaton.make_automaton()
+
+    def _present(self, lowered: str) -> set[str]:
+        """Literals occurring in `lowered`."""
+        if self._automaton is None:
+            return {literal for literal in self._literals if literal in lowered}
+        present = set()
+        for _end, literal in self._automaton.iter(lowered):
+            present.add(literal)
+            if len(present) == len(self._literals):
+                break
+        return present
+
+    def scan(self, text: str, lowered: Optional[str] = None) -> list[str]:
+        """
+        Labels of the patterns matching `text`, in pattern order.
+
+        `lowered` may pass a precomputed text.lower() shared between scanners.
+        """
+        if not text:
+            return []
+
+        present = None
+        if text.isascii():
+            present = self._present(lowered if lowered is not None else text.lower())
+
+        matches = []
+        for rule in self.rules:
+            if present is not None and rule.literals is not None:
+                if not all(any(literal in present for literal in option) for option in rule.literals):
+                    continue
+            if rule.regex.search(text):
+                matches.append(rule.label)
+        return matches
@@ -3,13 +3,19 @@ Input Validation - Attack pattern detection and sanitization.
 """
 
 import html
+import os
 import re
 from typing import Any, Optional
 from urllib.parse import unquote
 
+from security.scanner import PatternScanner
 from security.types import ThreatLevel, ValidationResult
 
 
+# Scan at most this many characters of each string (0 = whole string)
+MAX_SCAN_CHARS = int(os.getenv("SECURITY_SCAN_MAX_CHARS", "0"))
+
+
 # SQL Injection patterns
 SQL_INJECTION_PATTERNS = [
     # Basic SQL keywords with suspicious context
@@ -75,19 +81,29 @@ PATH_TRAVERSAL_PATTERNS = [
 ]
 
 
+_SQL = ("sql_injection", SQL_INJECTION_PATTERNS)
+_XSS = ("xss", XSS_PATTERNS)
+_COMMAND = ("command_injection", COMMAND_INJECTION_PATTERNS)
+_PATH = ("path_traversal", PATH_TRAVERSAL_PATTERNS, re.IGNORECASE)
+
+_SQL_SCANNER = PatternScanner([_SQL])
+_XSS_SCANNER = PatternScanner([_XSS])
+_COMMAND_SCANNER = PatternScanner([_COMMAND])
+_PATH_SCANNER = PatternScanner([_PATH])
+
+# scan_attacks: everything in one pass when HTML decoding changes nothing,
+# otherwise XSS runs separately on the HTML-decoded text
+_ATTACK_SCANNER = PatternScanner([_SQL, _XSS, _COMMAND, _PATH])
+_URL_DECODED_SCANNER = PatternScanner([_SQL, _COMMAND, _PATH])
+
+
 def detect_sql_injection(value: str) -> tuple[bool, list[str]]:
     """Detect SQL injection attempts."""
     if not value:
         return False, []
 
     # URL decode to catch encoded attacks
-    decoded = unquote(value)
-    matches = []
-
-    for pattern in SQL_INJECTION_PATTERNS:
-        if re.search(pattern, decoded):
-            matches.append(f"sql_injection:{pattern[:30]}")
-
+    matches = _SQL_SCANNER.scan(unquote(value))
     return bool(matches), matches
 
 
@@ -97,13 +113,7 @@ def detect_xss(value: str) -> tuple[bool, list[str]]:
         return False, []
 
     # URL decode and HTML decode
-    decoded = html.unescape(unquote(value))
-    matches = []
-
-    for pattern in XSS_PATTERNS:
-        if re.search(pattern, decoded):
-            matches.append(f"xss:{pattern[:30]}")
-
+    matches = _XSS_SCANNER.scan(html.unescape(unquote(value)))
     return bool(matches), matches
 
 
@@ -112,13 +122,7 @@ def detect_command_injection(value: str) -> tuple[bool, list[str]]:
     if not value:
         return False, []
 
-    decoded = unquote(value)
-    matches = []
-
-    for pattern in COMMAND_INJECTION_PATTERNS:
-        if re.search(pattern, decoded):
-            matches.append(f"command_injection:{pattern[:30]}")
-
+    matches = _COMMAND_SCANNER.scan(unquote(value))
     return bool(matches), matches
 
 
@@ -127,14 +131,42 @@ def detect_path_traversal(value: str) -> tuple[bool, list[str]]:
     if not value:
         return False, []
 
-    decoded = unquote(value)
-    matches = []
+    matches = _PATH_SCANNER.scan(unquote(value))
+    return bool(matches), matches
 
-    for pattern in PATH_TRAVERSAL_PATTERNS:
-        if re.search(pattern, decoded, re.IGNORECASE):
-            matches.append(f"path_traversal:{pattern[:30]}")
 
-    return bool(matches), matches
+def scan_attacks(value: str, max_chars: int = MAX_SCAN_CHARS) -> tuple[list[str], ThreatLevel]:
+    """
+    Run all four detectors over one string, decoding it once.
+
+    Returns the threats (in detect_* order) and the threat level
+    validate_input assigns them: SQL and command injection are CRITICAL,
+    XSS and path traversal HIGH.
+    """
+    if not value:
+        return [], ThreatLevel.NONE
+    if max_chars and len(value) > max_chars:
+        value = value[:max_chars]
+
+    decoded = unquote(value)
+    html_decoded = html.unescape(decoded)
+    if html_decoded == decoded:
+        found = _ATTACK_SCANNER.scan(decoded)
+    else:
+        found = _URL_DECODED_SCANNER.scan(decoded) + _XSS_SCANNER.scan(html_decoded)
+
+    sql = [label for label in found if label.startswith("sql_injection:")]
+    xss = [label for label in found if label.startswith("xss:")]
+    command = [label for label in found if label.startswith("command_injection:")]
+    path = [label for label in found if label.startswith("path_traversal:")]
+
+    if sql or command:
+        threat_level = ThreatLevel.CRITICAL
+    elif xss or path:
+        threat_level = ThreatLevel.HIGH
+    else:
+        threat_level = ThreatLevel.NONE
+    return sql + xss + command + path, threat_level
 
 
 def sanitize_string(value: str, allow_html: bool = False) -> str:
@@ -260,28 +292,7 @@ def validate_input(
         )
 
     # Attack detection
-    threats = []
-    threat_level = ThreatLevel.NONE
-
-    sql_detected, sql_matches = detect_sql_injection(str_value)
-    if sql_detected:
-        threats.extend(sql_matches)
-        threat_level = ThreatLevel.CRITICAL
-
-    xss_detected, xss_matches = detect_xss(str_value)
-    if xss_detected:
-        threats.extend(xss_matches)
-        threat_level = max(threat_level, ThreatLevel.HIGH, key=lambda x: list(ThreatLevel).index(x))
-
-    cmd_detected, cmd_matches = detect_command_injection(str_value)
-    if cmd_detected:
-        threats.extend(cmd_matches)
-        threat_level = ThreatLevel.CRITICAL
-
-    path_detected, path_matches = detect_path_traversal(str_value)
-    if path_detected:
-        threats.extend(path_matches)
-        threat_level = max(threat_level, ThreatLevel.HIGH, key=lambda x: list(ThreatLevel).index(x))
+    threats, threat_level = scan_attacks(str_value)
 
     if threats:
         return ValidationResult(
@@ -302,10 +313,24 @@ def validate_json_payload(
     max_depth: int = 10,
     max_keys: int = 100
 ) -> ValidationResult:
-    """Validate a JSON payload for attacks and structure."""
+    """
+    Validate a JSON payload for attacks and structure.
+
+    Stops walking once a CRITICAL threat is found: the payload's threat
+    level cannot rise further.
+    """
     threats = []
+    critical = False
+
+    def check_string(text: str) -> None:
+        nonlocal critical
+        found, level = scan_attacks(text)
+        threats.extend(found)
+        critical = critical or level == ThreatLevel.CRITICAL
 
     def check_value(val: Any, depth: int = 0) -> None:
+        if critical:
+            return
         if depth > max_depth:
             threats.append("excessive_depth")
             return
@@ -315,17 +340,13 @@ def validate_json_payload(
                 threats.append("excessive_keys")
             for k, v in val.items():
                 # Check key for attacks
-                result = validate_input(k, sanitize=False)
-                if not result.is_valid:
-                    threats.extend(result.threats_detected)
+                check_string(str(k))
                 check_value(v, depth + 1)
         elif isinstance(val, list):
             for item in val:
                 check_value(item, depth + 1)
         elif isinstance(val, str):
-            result = validate_input(val, sanitize=False)
-            if not result.is_valid:
-                threats.extend(result.threats_detected)
+            check_string(val)
 
     check_value(payload)
 
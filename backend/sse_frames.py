@@ -0,0 +1,183 @@
+"""
+SSE Frames - Token coalescing for streamed responses
+====================================================
+
+The inference generators used to yield one `sse_token` dict per provider
+delta, each carrying its own json.dumps, and the chat router json-decoded
+every one of them again to rebuild the response text. With many concurrent
+streams the per-token encode/decode and the tiny socket writes dominate.
+
+Generators now yield typed events:
+- `TextDelta(text)` for streamed text
+- `StreamEvent(event, payload)` for events the relay reads (usage, title,
+  structured_data, question); the payload stays a Python object until
+  `to_sse()` serializes it once
+- plain sse_* dicts for everything else, passed through untouched
+
+`coalesce_tokens` runs the generator in its own task and merges consecutive
+deltas into one token frame, flushed when the frame reaches
+SSE_FRAME_MAX_CHARS, when SSE_FRAME_MS has passed since its first delta, or
+right before any other event (so ordering is unchanged). `encode_frames`
+does the same and yields only SSE dicts, for endpoints that relay the
+stream as-is. If the relay is cancelled (client gone) while a frame is
+still buffered, its text goes to the caller's `unsent` list, so a partial
+response saved on disconnect keeps it.
+
+Configuration (environment):
+    SSE_FRAME_MS          time window per token frame in ms (default: 24; 0 disables coalescing)
+    SSE_FRAME_MAX_CHARS   flush a frame once it holds this many chars (default: 512)
+
+Usage:
+    async for event in coalesce_tokens(inference_stream(...), unsent=parts):
+        if isinstance(event, StreamEvent):
+            if event.event == "token":
+                parts.append(event.payload["text"])
+            event = event.to_sse()
+        yield event
+"""
+
+import asyncio
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+
+
+SSE_FRAME_MS = float(os.getenv("SSE_FRAME_MS", "24"))
+SSE_FRAME_MAX_CHARS = int(os.getenv("SSE_FRAME_MAX_CHARS", "512"))
+
+# Events buffered between the generator task and the relay
+FRAME_QUEUE_SIZE = 256
+
+
+@dataclass(frozen=True, slots=True)
+class TextDelta:
+    """One streamed text delta, before coalescing."""
+    text: str
+
+
+@dataclass(frozen=True, slots=True)
+class StreamEvent:
+    """An SSE event whose payload is serialized only when it is sent."""
+    event: str
+    payload: Any
+
+    def to_sse(self) -> Dict[str, str]:
+        data = self.payload
+        if isinstance(data, (dict, list)):
+            data = json.dumps(data)
+        return {"event": self.event, "data": data}
+
+
+Event = Union[TextDelta, StreamEvent, Dict[str, str]]
+
+
+class _End:
+    __slots__ = ()
+
+
+class _Failure:
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_END = _End()
+
+
+async def _pump(events: AsyncIterator[Event], queue: asyncio.Queue) -> None:
+    try:
+        async for event in events:
+            await queue.put(event)
+        await queue.put(_END)
+    except Exception as e:
+        await queue.put(_Failure(e))
+    finally:
+        aclose = getattr(events, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+async def coalesce_tokens(
+    events: AsyncIterator[Event],
+    window_ms: float = SSE_FRAME_MS,
+    max_chars: int = SSE_FRAME_MAX_CHARS,
+    unsent: Optional[List[str]] = None
+) -> AsyncIterator[Union[StreamEvent, Dict[str, str]]]:
+    """
+    Relay `events` with consecutive TextDeltas merged into
+    StreamEvent("token", {"text": ...}) frames. Other events keep their
+    order and type. An exception raised by the generator is re-raised after
+    the pending frame is flushed. If the relay stops while a frame is still
+    buffered (cancelled or closed), its text is appended to `unsent`.
+    """
+    loop = asyncio.get_running_loop()
+    window = window_ms / 1000
+    queue: asyncio.Queue = asyncio.Queue(maxsize=FRAME_QUEUE_SIZE)
+    producer = asyncio.create_task(_pump(events, queue))
+    parts: List[str] = []
+    size = 0
+    deadline = 0.0
+
+    def frame() -> StreamEvent:
+        nonlocal size
+        text = parts[0] if len(parts) == 1 else "".join(parts)
+        parts.clear()
+        size = 0
+        return StreamEvent("token", {"text": text})
+
+    try:
+        while True:
+            if not parts:
+                item = await queue.get()
+            elif not queue.empty():
+                item = queue.get_nowait()
+            else:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    yield frame()
+                    continue
+                try:
+                    item = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    yield frame()
+                    continue
+
+            if isinstance(item, TextDelta):
+                if not item.text:
+                    continue
+                if not parts:
+                    deadline = loop.time() + window
+                parts.append(item.text)
+                size += len(item.text)
+                if size >= max_chars or window <= 0:
+                    yield frame()
+                continue
+
+            if parts:
+                yield frame()
+            if item is _END:
+                break
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        if parts and unsent is not None:
+            unsent.append("".join(parts))
+        if not producer.done():
+            producer.cancel()
+        try:
+            await producer
+        except (asyncio.CancelledError, Exception):
+            pass
+
+
+async def encode_frames(
+    events: AsyncIterator[Event],
+    window_ms: float = SSE_FRAME_MS,
+    max_chars: int = SSE_FRAME_MAX_CHARS
+) -> AsyncIterator[Dict[str, str]]:
+    """coalesce_tokens, serialized: SSE dicts for EventSourceResponse."""
+    async for event in coalesce_tokens(events, window_ms, max_chars):
+        yield event.to_sse() if isinstance(event, StreamEvent) else event
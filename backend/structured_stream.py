@@ -0,0 +1,503 @@
+"""
+Structured Stream - Marker detection for the articulation token stream
+=====================================================================
+
+The articulation response ends with a structured-data block that must not be
+shown to the user. `StructuredBlockSplitter` consumes the stream one token at
+a time and reports which text is safe to flush and when a structured-block
+start marker has been seen.
+
+Detection uses an Aho-Corasick automaton over all markers, so every input
+character is processed once, however long the response grows. Tokens are
+collected in a list and joined once at the end instead of concatenated
+per token.
+
+Emission is identical to the previous buffer/find/endswith loop:
+- text is held while the end of the pending buffer could still begin a marker
+- otherwise the pending buffer is flushed as one span
+- when a marker appears, the text before it (right-stripped) is flushed and
+  everything after that is withheld
+
+`StructuredDataParser` consumes the withheld block as it arrives and yields
+each top-level member of the structured-data object (matrix_data, paths,
+documents, follow_up_question, ...) as soon as its value closes, so the
+client can render it without waiting for the end of the response.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+# Markers for the code block that precedes structured data, in priority order
+STRUCT_BLOCK_MARKERS: Tuple[str, ...] = ("```json\n===", "```\n===", "===STRUCTURED_DATA_START")
+
+
+class MarkerAutomaton:
+    """
+    Aho-Corasick automaton over a fixed marker set.
+
+    State 0 is the root. A state's depth is the length of the longest suffix
+    of the text so far that is a prefix of some marker.
+    """
+
+    __slots__ = ("markers", "_goto", "_fail", "_output", "_depth")
+
+    def __init__(self, markers: Sequence[str]):
+        if not markers or any(not m for m in markers):
+            raise ValueError("markers must be non-empty strings")
+        self.markers = tuple(markers)
+
+        goto: List[Dict[str, int]] = [{}]
+        depth = [0]
+        output: List[Tuple[int, ...]] = [()]
+        for index, marker in enumerate(self.markers):
+            state = 0
+            for ch in marker:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    depth.append(depth[state] + 1)
+                    output.append(())
+                state = nxt
+            output[state] = output[state] + (index,)
+
+        # Breadth-first failure links; outputs inherit along the failure chain
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                output[nxt] = output[nxt] + output[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+        self._depth = depth
+
+    def step(self, state: int, ch: str) -> int:
+        """Transition from `state` on `ch`."""
+        goto = self._goto
+        while True:
+            nxt = goto[state].get(ch)
+            if nxt is not None:
+                return nxt
+            if state == 0:
+                return 0
+            state = self._fail[state]
+
+    def matches(self, state: int) -> Tuple[int, ...]:
+        """Indices of markers ending at `state`."""
+        return self._output[state]
+
+    def depth(self, state: int) -> int:
+        return self._depth[state]
+
+
+class StructuredBlockSplitter:
+    """
+    Incremental splitter for a token stream with a trailing structured block.
+
+    Usage:
+        splitter = StructuredBlockSplitter()
+        for token in tokens:
+            span = splitter.feed(token)
+            if span:
+                send(span)
+        tail = splitter.finish()
+        if tail:
+            send(tail)
+        full_text = splitter.content
+    """
+
+    __slots__ = (
+        "_automaton", "_state", "_parts", "_pending", "_pending_len",
+        "in_structured_block", "token_count", "marker", "block_text",
+    )
+
+    def __init__(self, markers: Sequence[str] = STRUCT_BLOCK_MARKERS):
+        self._automaton = _automaton_for(tuple(markers))
+        self._state = 0
+        self._parts: List[str] = []
+        self._pending: List[str] = []
+        self._pending_len = 0
+        self.in_structured_block = False
+        self.token_count = 0
+        self.marker: Optional[str] = None
+        # Structured-block text received by the last feed() ("" outside the block)
+        self.block_text = ""
+
+    def feed(self, token: str) -> str:
+        """
+        Consume one token; return the text that is now safe to stream ("" if
+        nothing). After a marker is found every later token is only collected.
+        """
+        self.token_count += 1
+        self._parts.append(token)
+        if self.in_structured_block:
+            self.block_text = token
+            return ""
+        if not token:
+            return ""
+
+        automaton = self._automaton
+        state = self._state
+        offset = self._pending_len
+        # First start position of each marker seen in this token. Earlier
+        # tokens contained no complete marker, so every match ends here.
+        found: Dict[int, int] = {}
+        for i, ch in enumerate(token):
+            state = automaton.step(state, ch)
+            for index in automaton.matches(state):
+                if index not in found:
+                    found[index] = offset + i + 1 - len(automaton.markers[index])
+        self._state = state
+        self._pending.append(token)
+        self._pending_len += len(token)
+
+        if found:
+            index = min(found)
+            self.in_structured_block = True
+            self.marker = automaton.markers[index]
+            pending = "".join(self._pending)
+            self.block_text = pending[found[index]:]
+            self._reset_pending()
+            return pending[:found[index]].rstrip()
+
+        if automaton.depth(state):
+            # Buffer might be building toward a marker; hold it
+            return ""
+
+        span = "".join(self._pending) if len(self._pending) > 1 else token
+        self._reset_pending()
+        return span
+
+    def finish(self) -> str:
+        """Held text to flush at end of stream ("" inside a structured block)."""
+        if self.in_structured_block:
+            return ""
+        span = "".join(self._pending)
+        self._reset_pending()
+        return span
+
+    @property
+    def content(self) -> str:
+        """Full response text, including the structured block."""
+        if len(self._parts) > 1:
+            self._parts[:] = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+    def _reset_pending(self) -> None:
+        self._pending.clear()
+        self._pending_len = 0
+
+
+_AUTOMATA: Dict[Tuple[str, ...], MarkerAutomaton] = {}
+
+
+def _automaton_for(markers: Tuple[str, ...]) -> MarkerAutomaton:
+    """Automata are immutable, so one per marker set is shared by all streams."""
+    automaton = _AUTOMATA.get(markers)
+    if automaton is None:
+        automaton = _AUTOMATA[markers] = MarkerAutomaton(markers)
+    return automaton
+
+
+# =============================================================================
+# STRUCTURED DATA
+# =============================================================================
+
+STRUCTURED_DATA_START = "===STRUCTURED_DATA_START==="
+
+# Runs of characters that cannot change the scanner state
+_STRING_RUN = re.compile(r'[^"\\]*')
+_VALUE_RUN = re.compile(r'[^"{}\[\],]*')
+_SPACE_RUN = re.compile(r'\s*')
+
+
+def repair_truncated_json(text: str) -> str:
+    """
+    Repair truncated JSON from LLM responses.
+
+    LLMs sometimes produce JSON that gets cut off mid-value, leaving
+    unclosed strings, arrays, or objects. This scans the JSON structure
+    and closes anything left open.
+
+    Returns the original text if already structurally valid.
+    """
+    in_string = False
+    escape = False
+    stack = []
+
+    for ch in text:
+        if escape:
+            escape = False
+            continue
+        if in_string:
+            if ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch == '{':
+            stack.append('}')
+        elif ch == '[':
+            stack.append(']')
+        elif ch in ('}', ']') and stack and stack[-1] == ch:
+            stack.pop()
+
+    if not stack and not in_string:
+        return text
+
+    repaired = text
+
+    # Close truncated string
+    if in_string:
+        if repaired.endswith('\\'):
+            repaired = repaired[:-1]
+        repaired += '"'
+
+    # Strip trailing comma/colon left from truncation
+    repaired = repaired.rstrip()
+    while repaired and repaired[-1] in (',', ':'):
+        repaired = repaired[:-1].rstrip()
+
+    # Close all open structures
+    for closer in reversed(stack):
+        repaired += closer
+
+    return repaired
+
+
+class StructuredDataParser:
+    """
+    Incremental parser for the `===STRUCTURED_DATA_START=== {...}` block.
+
+    Only the top level is tracked: each member value is buffered as raw text
+    and decoded with json.loads the moment it closes. Scanning skips runs of
+    uninteresting characters with precompiled patterns, so the cost stays
+    linear in the block size.
+
+    Usage:
+        parser = StructuredDataParser()
+        for key, value in parser.feed(block_text):
+            emit(key, value)
+        data = parser.result()    # None -> fall back to a full-text parse
+    """
+
+    # Phases
+    SEEK_START = "seek_start"
+    SEEK_OBJECT = "seek_object"
+    MEMBERS = "members"
+    KEY = "key"
+    COLON = "colon"
+    VALUE_START = "value_start"
+    VALUE = "value"
+    AFTER_VALUE = "after_value"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self):
+        self.phase = self.SEEK_START
+        self.members: Dict[str, Any] = {}
+        self._carry = ""
+        self._key_parts: List[str] = []
+        self._key: Optional[str] = None
+        self._value_parts: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def failed(self) -> bool:
+        return self.phase == self.FAILED
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """Consume block text; return (key, value) for every member closed by it."""
+        completed: List[Tuple[str, Any]] = []
+        if not text or self.phase in (self.DONE, self.FAILED):
+            return completed
+
+        i = 0
+        if self.phase == self.SEEK_START:
+            buffer = self._carry + text
+            pos = buffer.find(STRUCTURED_DATA_START)
+            if pos == -1:
+                self._carry = buffer[-(len(STRUCTURED_DATA_START) - 1):]
+                return completed
+            self._carry = ""
+            text = buffer
+            i = pos + len(STRUCTURED_DATA_START)
+            self.phase = self.SEEK_OBJECT
+
+        n = len(text)
+        while i < n and self.phase not in (self.DONE, self.FAILED):
+            phase = self.phase
+
+            if phase == self.SEEK_OBJECT:
+                # Skips whitespace and any ```json fence before the object
+                pos = text.find("{", i)
+                if pos == -1:
+                    return completed
+                i = pos + 1
+                self.phase = self.MEMBERS
+
+            elif phase in (self.MEMBERS, self.AFTER_VALUE, self.COLON):
+                i = _SPACE_RUN.match(text, i).end()
+                if i == n:
+                    break
+                ch = text[i]
+                i += 1
+                if phase == self.COLON:
+                    self.phase = self.VALUE_START if ch == ":" else self.FAILED
+                elif ch == "}":
+                    self.phase = self.DONE
+                elif ch == ",":
+                    self.phase = self.MEMBERS
+                elif ch == '"' and phase == self.MEMBERS:
+                    self._key_parts = []
+                    self.phase = self.KEY
+                else:
+                    self.phase = self.FAILED
+
+            elif phase == self.KEY:
+                i = self._scan_string(text, i, self._key_parts)
+                if not self._in_string:
+                    try:
+                        self._key = json.loads('"' + "".join(self._key_parts) + '"')
+                    except json.JSONDecodeError:
+                        self.phase = self.FAILED
+                        break
+                    self.phase = self.COLON
+
+            elif phase == self.VALUE_START:
+                i = _SPACE_RUN.match(text, i).end()
+                if i == n:
+                    break
+                self._value_parts = []
+                self._depth = 0
+                self._in_string = False
+                self.phase = self.VALUE
+
+            else:  # VALUE
+                i = self._scan_value(text, i, completed)
+
+        return completed
+
+    def _scan_string(self, text: str, i: int, parts: List[str]) -> int:
+        """Append string body characters to `parts` up to the closing quote."""
+        self._in_string = True
+        n = len(text)
+        start = i
+        if self._escape:
+            self._escape = False
+            i += 1
+        while i < n:
+            i = _STRING_RUN.match(text, i).end()
+            if i == n:
+                break
+            if text[i] == "\\":
+                if i + 1 == n:
+                    self._escape = True
+                    i = n
+                    break
+                i += 2
+                continue
+            parts.append(text[start:i])
+            self._in_string = False
+            return i + 1
+        parts.append(text[start:i])
+        return i
+
+    def _scan_value(self, text: str, i: int, completed: List[Tuple[str, Any]]) -> int:
+        n = len(text)
+        start = i
+        while i < n:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    i += 1
+                    continue
+                i = _STRING_RUN.match(text, i).end()
+                if i == n:
+                    break
+                if text[i] == "\\":
+                    if i + 1 == n:
+                        self._escape = True
+                        i = n
+                        break
+                    i += 2
+                    continue
+                self._in_string = False
+                i += 1
+                if self._depth == 0:
+                    return self._close_value(text, start, i, self.AFTER_VALUE, completed)
+                continue
+
+            i = _VALUE_RUN.match(text, i).end()
+            if i == n:
+                break
+            ch = text[i]
+            if ch == '"':
+                self._in_string = True
+                i += 1
+            elif ch in "{[":
+                self._depth += 1
+                i += 1
+            elif ch in "}]":
+                if self._depth == 0:
+                    # Object closed right after a scalar value
+                    return self._close_value(text, start, i, self.DONE, completed) + 1
+                self._depth -= 1
+                i += 1
+                if self._depth == 0:
+                    return self._close_value(text, start, i, self.AFTER_VALUE, completed)
+            else:  # ","
+                if self._depth == 0:
+                    return self._close_value(text, start, i, self.MEMBERS, completed) + 1
+                i += 1
+        self._value_parts.append(text[start:i])
+        return i
+
+    def _close_value(self, text: str, start: int, end: int, next_phase: str,
+                     completed: List[Tuple[str, Any]]) -> int:
+        self._value_parts.append(text[start:end])
+        raw = "".join(self._value_parts)
+        self._value_parts = []
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            self.phase = self.FAILED
+            return end
+        self.members[self._key] = value
+        completed.append((self._key, value))
+        self.phase = next_phase
+        return end
+
+    def result(self) -> Optional[Dict[str, Any]]:
+        """
+        The structured-data object, or None when no usable block was seen.
+
+        A block cut off mid-value (max_tokens) keeps every closed member; the
+        open one is kept too when repair_truncated_json can close it.
+        """
+        if self.phase == self.FAILED or self.phase in (self.SEEK_START, self.SEEK_OBJECT):
+            return None
+        if self.phase == self.VALUE and self._value_parts and self._key is not None:
+            raw = "".join(self._value_parts).rstrip()
+            try:
+                self.members[self._key] = json.loads(repair_truncated_json(raw))
+            except json.JSONDecodeError:
+                pass
+        return self.members or None
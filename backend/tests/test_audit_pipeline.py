@@ -0,0 +1,141 @@
+"""
+Tests for the queued audit logging pipeline.
+
+Tests cover batched signing and storage, the overflow policies and their
+counters, draining on aclose, and one Redis pipeline per batch.
+"""
+
+import asyncio
+
+import pytest
+
+from security.audit_logger import AuditLogger
+from security.types import AuditEventType, AuditSeverity
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def _log(logger: AuditLogger, action: str, event_type=AuditEventType.DATA_READ):
+    return await logger.log(event_type=event_type, severity=AuditSeverity.INFO, action=action, user_id="u1")
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name, args))
+
+    async def execute(self):
+        self.redis.executed.append(self.commands)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.executed = []
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class TestQueue:
+    """log() only queues while the flusher runs."""
+
+    def test_events_are_written_in_batches(self):
+        async def scenario():
+            logger = AuditLogger(batch_size=2, flush_interval=60)
+            await logger.start()
+            events = [await _log(logger, f"GET /{i}") for i in range(5)]
+            assert not logger._memory_store and events[0].signature is None
+
+            await logger.aclose()
+            assert [e.action for e in logger._memory_store] == [f"GET /{i}" for i in range(5)]
+            assert all(logger.verify_event(e) for e in logger._memory_store)
+            return logger.stats()
+
+        stats = run(scenario())
+        assert stats["queued"] == 0 and stats["written"] == 5 and stats["batches"] == 3
+
+    def test_inline_without_flusher(self):
+        logger = AuditLogger()
+        event = run(_log(logger, "GET /"))
+        assert logger.verify_event(event) and list(logger._memory_store) == [event]
+
+    def test_critical_alert_sent_by_flusher(self):
+        async def scenario():
+            alerts = []
+
+            async def callback(event):
+                alerts.append(event.action)
+
+            logger = AuditLogger(flush_interval=60)
+            logger.set_alert_callback(callback)
+            await logger.start()
+            await _log(logger, "login", AuditEventType.AUTH_LOGIN_FAILED)
+            assert alerts == []
+            await logger.aclose()
+            return alerts
+
+        assert run(scenario()) == ["login"]
+
+
+class TestOverflow:
+    """Full queue handling and counters."""
+
+    @pytest.mark.parametrize("policy,kept", [
+        ("drop_newest", ["GET /0", "GET /1"]),
+        ("drop_oldest", ["GET /2", "GET /3"]),
+    ])
+    def test_drop_policies(self, policy, kept):
+        async def scenario():
+            logger = AuditLogger(max_queue=2, flush_interval=60, overflow_policy=policy)
+            await logger.start()
+            for i in range(4):
+                await _log(logger, f"GET /{i}")
+            await logger.aclose()
+            return logger
+
+        logger = run(scenario())
+        assert [e.action for e in logger._memory_store] == kept
+        assert logger.stats()["dropped"] == 2
+
+    def test_block_waits_for_flusher(self):
+        async def scenario():
+            logger = AuditLogger(max_queue=2, batch_size=2, flush_interval=60, overflow_policy="block")
+            await logger.start()
+            for i in range(6):
+                await _log(logger, f"GET /{i}")
+            await logger.aclose()
+            return logger
+
+        logger = run(scenario())
+        assert len(logger._memory_store) == 6
+        assert logger.stats()["dropped"] == 0 and logger.stats()["blocked"] > 0
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError):
+            AuditLogger(overflow_policy="spill")
+
+
+class TestRedisBatch:
+    """One pipeline per batch, index expiries set once per key."""
+
+    def test_single_pipeline(self):
+        async def scenario():
+            redis = FakeRedis()
+            logger = AuditLogger(redis_client=redis, flush_interval=60)
+            await logger.start()
+            for i in range(3):
+                await _log(logger, f"GET /{i}")
+            await logger.aclose()
+            return redis
+
+        redis = run(scenario())
+        assert len(redis.executed) == 1
+        commands = redis.executed[0]
+        assert sum(name == "setex" for name, _ in commands) == 3
+        expired = [args[0] for name, args in commands if name == "expire"]
+        assert sorted(expired) == ["audit:type:data.read", "audit:user:u1"]
@@ -0,0 +1,169 @@
+"""
+Tests for the authenticated-session cache.
+
+Tests cover token-hash lookup and TTL, coalesced sliding-expiry touches and
+their batched flush, immediate invalidation, and the optional shared tier.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from auth_session_cache import AuthSessionCache
+
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+WINDOW = timedelta(hours=24)
+
+
+def _session(session_id: str = "s1", user_id: str = "u1", last_active: datetime = T0):
+    return SimpleNamespace(
+        id=session_id, user_id=user_id, created_at=T0 - timedelta(days=1),
+        expires_at=last_active + WINDOW, last_active_at=last_active,
+    )
+
+
+class RecordingWriter:
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+
+    async def __call__(self, rows):
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        self.batches.append(rows)
+
+
+class FakeSharedCache:
+    """Minimal CacheClient stand-in with a live connection."""
+
+    def __init__(self):
+        self.data = {}
+        self.is_connected = True
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl=None):
+        self.data[key] = value
+        return True
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+        return True
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestLookup:
+    """Entries keyed by token hash."""
+
+    def test_put_then_hit(self):
+        cache = AuthSessionCache(writer=RecordingWriter())
+        run(cache.put("tok", _session(), now=T0))
+        entry = run(cache.get("tok", now=T0 + timedelta(seconds=5)))
+        assert entry.session_id == "s1" and entry.user_id == "u1"
+        assert run(cache.get("other", now=T0)) is None
+        assert "tok" not in "".join(cache._entries)
+
+    def test_ttl_and_expiry(self):
+        cache = AuthSessionCache(ttl=60, writer=RecordingWriter())
+        run(cache.put("tok", _session(), now=T0))
+        assert run(cache.get("tok", now=T0 + timedelta(seconds=61))) is None
+
+        run(cache.put("tok", _session(last_active=T0 - WINDOW), now=T0))
+        assert run(cache.get("tok", now=T0)) is None
+
+
+class TestTouch:
+    """Sliding-expiry writes are coalesced and flushed in batches."""
+
+    def test_one_write_per_interval(self):
+        writer = RecordingWriter()
+        cache = AuthSessionCache(touch_interval=60, writer=writer)
+        entry = run(cache.put("tok", _session(), now=T0))
+
+        assert not run(cache.touch(entry, WINDOW, now=T0 + timedelta(seconds=30)))
+        assert run(cache.touch(entry, WINDOW, now=T0 + timedelta(seconds=61)))
+        assert not run(cache.touch(entry, WINDOW, now=T0 + timedelta(seconds=90)))
+        assert entry.expires_at == T0 + timedelta(seconds=61) + WINDOW
+
+        run(cache.put("tok2", _session("s2", last_active=T0 - timedelta(minutes=5)), now=T0))
+        assert run(cache.touch(run(cache.get("tok2", now=T0)), WINDOW, now=T0))
+
+        assert run(cache.flush()) == 2
+        assert len(writer.batches) == 1
+        assert {row["session_id"] for row in writer.batches[0]} == {"s1", "s2"}
+        assert run(cache.flush()) == 0
+
+    def test_failed_flush_is_requeued(self):
+        writer = RecordingWriter(fail=True)
+        cache = AuthSessionCache(touch_interval=0, writer=writer)
+        entry = run(cache.put("tok", _session(), now=T0))
+        run(cache.touch(entry, WINDOW, now=T0 + timedelta(seconds=1)))
+
+        assert run(cache.flush()) == 0
+        assert cache.pending_count() == 1
+        writer.fail = False
+        assert run(cache.flush()) == 1
+
+
+class TestInvalidation:
+    """Logout and password change take effect on the next request."""
+
+    def test_invalidate_token_drops_entry_and_pending_touch(self):
+        writer = RecordingWriter()
+        cache = AuthSessionCache(touch_interval=0, writer=writer)
+        entry = run(cache.put("tok", _session(), now=T0))
+        run(cache.touch(entry, WINDOW, now=T0 + timedelta(seconds=1)))
+
+        run(cache.invalidate_token("tok"))
+        assert run(cache.get("tok", now=T0)) is None
+        assert run(cache.flush()) == 0
+
+    def test_invalidate_user(self):
+        cache = AuthSessionCache(writer=RecordingWriter())
+        run(cache.put("a", _session("s1", "u1"), now=T0))
+        run(cache.put("b", _session("s2", "u1"), now=T0))
+        run(cache.put("c", _session("s3", "u2"), now=T0))
+
+        run(cache.invalidate_user("u1"))
+        assert run(cache.get("a", now=T0)) is None
+        assert run(cache.get("b", now=T0)) is None
+        assert run(cache.get("c", now=T0)) is not None
+
+
+class TestSharedTier:
+    """Redis-backed entries are visible to, and invalidated for, every instance."""
+
+    def test_logout_on_one_instance_reaches_the_other(self):
+        shared = FakeSharedCache()
+        first = AuthSessionCache(shared_cache=shared, writer=RecordingWriter())
+        second = AuthSessionCache(shared_cache=shared, writer=RecordingWriter())
+
+        run(first.put("tok", _session(), now=T0))
+        assert run(second.get("tok", now=T0)).session_id == "s1"
+        assert not first._entries
+
+        run(first.invalidate_token("tok"))
+        assert run(second.get("tok", now=T0)) is None
+
+    def test_invalidate_user_across_instances(self):
+        shared = FakeSharedCache()
+        first = AuthSessionCache(shared_cache=shared, writer=RecordingWriter())
+        second = AuthSessionCache(shared_cache=shared, writer=RecordingWriter())
+
+        run(first.put("a", _session("s1", "u1"), now=T0))
+        run(second.put("b", _session("s2", "u1"), now=T0))
+        run(second.invalidate_user("u1"))
+        assert run(first.get("a", now=T0)) is None
+        assert run(first.get("b", now=T0)) is None
+
+    def test_touch_is_coalesced_across_copies(self):
+        cache = AuthSessionCache(shared_cache=FakeSharedCache(), touch_interval=60, writer=RecordingWriter())
+        run(cache.put("tok", _session(), now=T0))
+        later = T0 + timedelta(seconds=61)
+        assert run(cache.touch(run(cache.get("tok", now=later)), WINDOW, now=later))
+        assert not run(cache.touch(run(cache.get("tok", now=later)), WINDOW, now=later + timedelta(seconds=1)))
@@ -0,0 +1,103 @@
+"""
+Tests for the shared ownership-check helpers.
+
+Tests cover get_or_404 (ownership filters, deferred columns loaded only
+when asked for) and verify_access_or_404 (same checks, nothing loaded into
+the session), against a throwaway SQLite database.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from database import Base, ChatConversation
+from utils.db import get_or_404, verify_access_or_404
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'utils.db'}")
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(engine)() as db:
+            db.add(ChatConversation(
+                id="conv-1", user_id="user-1", organization_id="org-1", title="T",
+                question_answers={"q": "a"}, generated_presets=[{"id": "p"}], generated_documents=[{"id": "doc-0"}],
+            ))
+            await db.commit()
+
+    run(setup())
+    yield async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    run(engine.dispose())
+
+
+class TestGetOr404:
+    """Row lookup with ownership checks."""
+
+    def test_deferred_columns_stay_unloaded(self, sessions):
+        async def scenario():
+            async with sessions() as db:
+                conversation = await get_or_404(db, ChatConversation, "conv-1", user_id="user-1")
+                return conversation.title, inspect(conversation).unloaded
+
+        title, unloaded = run(scenario())
+        assert title == "T"
+        assert {"question_answers", "generated_presets", "generated_documents"} <= unloaded
+
+    def test_load_columns(self, sessions):
+        async def scenario():
+            async with sessions() as db:
+                conversation = await get_or_404(
+                    db, ChatConversation, "conv-1", user_id="user-1", load_columns=["generated_presets"]
+                )
+                return conversation.generated_presets, inspect(conversation).unloaded
+
+        presets, unloaded = run(scenario())
+        assert presets == [{"id": "p"}]
+        assert "generated_presets" not in unloaded
+        assert "question_answers" in unloaded
+
+    @pytest.mark.parametrize("kwargs", [
+        {"user_id": "user-2"},
+        {"user_id": "user-1", "organization_id": "org-2"},
+    ], ids=["other-user", "other-org"])
+    def test_not_owned(self, sessions, kwargs):
+        async def scenario():
+            async with sessions() as db:
+                await get_or_404(db, ChatConversation, "conv-1", error_msg="Conversation not found", **kwargs)
+
+        with pytest.raises(HTTPException) as error:
+            run(scenario())
+        assert (error.value.status_code, error.value.detail) == (404, "Conversation not found")
+
+
+class TestVerifyAccessOr404:
+    """Ownership check without loading the row."""
+
+    def test_owned(self, sessions):
+        async def scenario():
+            async with sessions() as db:
+                await verify_access_or_404(db, ChatConversation, "conv-1", user_id="user-1", organization_id="org-1")
+                return list(db.identity_map.values())
+
+        assert run(scenario()) == []
+
+    @pytest.mark.parametrize("resource_id,user_id", [("conv-1", "user-2"), ("missing", "user-1")],
+                             ids=["other-user", "missing"])
+    def test_not_found(self, sessions, resource_id, user_id):
+        async def scenario():
+            async with sessions() as db:
+                await verify_access_or_404(db, ChatConversation, resource_id, user_id=user_id)
+
+        with pytest.raises(HTTPException) as error:
+            run(scenario())
+        assert (error.value.status_code, error.value.detail) == (404, "ChatConversation not found")
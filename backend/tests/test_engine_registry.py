@@ -0,0 +1,41 @@
+"""
+Tests for the shared engine registry.
+
+Tests cover one instance per component across threads, the GoalClassifier
+sharing the registry's components, and the warm start reported by status().
+"""
+
+import threading
+
+from engine_registry import EngineRegistry
+
+
+class TestEngineRegistry:
+    """Components are built once and shared."""
+
+    def test_single_instance_across_threads(self):
+        registry = EngineRegistry()
+        seen = []
+        threads = [threading.Thread(target=lambda: seen.append(registry.goal_classifier)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len({id(c) for c in seen}) == 1
+
+    def test_classifier_shares_components(self):
+        registry = EngineRegistry()
+        classifier = registry.goal_classifier
+        assert classifier.inference_memo is registry.memo
+        assert classifier.inference_engine is registry.engine
+        assert classifier.value_organizer is registry.value_organizer
+        assert classifier.reverse_engine is registry.reverse_engine
+
+    def test_warm_start(self):
+        registry = EngineRegistry()
+        assert registry.status()["warm"] is False
+        assert registry.warm() is True
+        status = registry.status()
+        assert status["warm"] and status["error"] is None
+        assert {"infer", "value_organizer", "bottlenecks", "leverage", "goal_classifier"} <= set(status["warm_ms"])
+        assert registry.warm() is True  # idempotent
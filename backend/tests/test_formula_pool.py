@@ -0,0 +1,139 @@
+"""
+Tests for the formula process pool.
+
+Tests cover the compact operator wire format, worker-side results matching
+in-process inference (including the session-pinned incremental trace), the
+in-process fallback when the pool is disabled, and a real worker process
+(including which calls count as completed or failed).
+"""
+
+import asyncio
+import json
+import math
+import os
+import random
+
+import pytest
+
+from formulas import OOFInferenceEngine, CANONICAL_OPERATOR_NAMES
+from formulas.batch import OPERATOR_COLUMNS
+from formulas import pool as formula_pool
+from formulas.pool import FormulaPool, decode_operators, encode_operators
+
+
+NAMES = sorted(CANONICAL_OPERATOR_NAMES)
+GOAL = {"goal_text": "Start a company", "goal_category": "career"}
+
+
+def _operators(seed: int, density: float = 1.0) -> dict:
+    rng = random.Random(seed)
+    return {name: round(rng.uniform(0.05, 0.95), 3) for name in NAMES if rng.random() < density}
+
+
+def _normalized(result: dict) -> dict:
+    result = json.loads(json.dumps(result))
+    for key in ("populated_operators", "missing_operators"):
+        result["metadata"][key] = sorted(result["metadata"][key])
+    return result
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return OOFInferenceEngine()
+
+
+@pytest.fixture(scope="module")
+def worker():
+    """Worker-side state built in this process."""
+    formula_pool._init_worker()
+    return formula_pool._worker
+
+
+class TestWireFormat:
+    """Operators travel as a float tuple in column order."""
+
+    def test_round_trip(self):
+        operators = _operators(1, density=0.5)
+        values, extras = encode_operators(operators)
+        assert len(values) == len(OPERATOR_COLUMNS)
+        assert extras is None
+        assert sum(not math.isnan(v) for v in values) == len(operators)
+        assert decode_operators(values, extras) == operators
+
+    def test_unknown_names_travel_separately(self):
+        values, extras = encode_operators({NAMES[0]: 0.5, "custom_op": 0.25})
+        assert extras == {"custom_op": 0.25}
+        assert decode_operators(values, extras) == {NAMES[0]: 0.5, "custom_op": 0.25}
+
+
+class TestWorkerFunctions:
+    """Worker entry points return what the in-process calls return."""
+
+    def test_infer_matches_engine(self, engine, worker):
+        operators = _operators(2, density=0.7)
+        values, extras = encode_operators(operators)
+        result, module_seconds = formula_pool._worker_infer(values, extras, 4.5, (GOAL["goal_text"], GOAL["goal_category"]), None)
+        assert module_seconds is None
+        assert _normalized(result) == _normalized(engine.infer(operators, 4.5, GOAL))
+
+    def test_session_trace_stays_in_worker(self, engine, worker):
+        first, second = _operators(3), _operators(3)
+        second[NAMES[5]] = 0.11
+        for operators in (first, second):
+            values, extras = encode_operators(operators)
+            result, module_seconds = formula_pool._worker_infer(values, extras, 3.0, None, "session-a")
+        assert set(module_seconds) <= set(engine.scheduler.modules)
+        assert _normalized(result) == _normalized(engine.infer(second, 3.0, None))
+        assert formula_pool._worker_forget("session-a") is True
+        assert formula_pool._worker_forget("session-a") is False
+
+
+class TestFormulaPool:
+    """Dispatch, fallback and metrics."""
+
+    def test_disabled_pool_runs_in_process(self, engine):
+        pool = FormulaPool(workers=0, local_engine=engine)
+        operators = _operators(4)
+        result = asyncio.run(pool.infer(operators, 5.0, GOAL))
+        assert _normalized(result) == _normalized(engine.infer(operators, 5.0, GOAL))
+        stats = pool.stats()
+        assert stats["enabled"] is False and stats["local_runs"] == 1
+
+    def test_worker_process(self, engine):
+        async def run():
+            pool = FormulaPool(workers=1, max_pending=2, local_engine=engine)
+            await pool.start()
+            try:
+                operators = [_operators(seed) for seed in range(5)]
+                results = await asyncio.gather(*(
+                    pool.infer(ops, 4.0, GOAL, session_key=f"s{i}") for i, ops in enumerate(operators)
+                ))
+                return operators, results, pool.stats()
+            finally:
+                pool.shutdown()
+
+        operators, results, stats = asyncio.run(run())
+        for ops, result in zip(operators, results):
+            assert _normalized(result) == _normalized(engine.infer(ops, 4.0, GOAL))
+        assert stats["submitted"] == 5 and stats["local_runs"] == 0
+        assert stats["max_queued"] >= 3
+        assert stats["per_worker"][0]["completed"] == 5
+
+    def test_only_successful_calls_count_as_completed(self, engine):
+        async def run():
+            pool = FormulaPool(workers=1, local_engine=engine)
+            await pool.start()
+            try:
+                assert await pool._submit(math.sqrt, (4.0,), lambda: None) == 2.0
+                with pytest.raises(ValueError):
+                    await pool._submit(math.sqrt, (-1.0,), lambda: None)
+                # The worker dies: the call falls back in-process
+                assert await pool._submit(os._exit, (1,), lambda: "local") == "local"
+                return pool.stats()
+            finally:
+                pool.shutdown()
+
+        stats = asyncio.run(run())
+        assert stats["per_worker"][0]["completed"] == 1
+        assert stats["per_worker"][0]["failed"] == 2
+        assert stats["local_runs"] == 1
@@ -0,0 +1,99 @@
+"""
+Tests for vision image normalization.
+
+Tests cover downscaling with EXIF orientation applied and stripped, keeping
+small originals, alpha handling per output format, tiling, and the cached
+result in the parse service.
+"""
+
+import asyncio
+import base64
+import io
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+import file_parser
+from file_parser import ImageSettings, normalize_image
+from parse_service import FileParseService
+
+
+def _jpeg(size=(4000, 3000), orientation=None) -> bytes:
+    img = Image.new("RGB", size, (180, 40, 40))
+    exif = Image.Exif()
+    exif[0x010F] = "PhoneMaker"
+    if orientation:
+        exif[0x0112] = orientation
+    buffer = io.BytesIO()
+    img.save(buffer, "JPEG", quality=95, exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+def _png(size=(40, 30), mode="RGBA") -> bytes:
+    buffer = io.BytesIO()
+    Image.new(mode, size).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _decode(parsed):
+    return Image.open(io.BytesIO(base64.b64decode(parsed.image_base64)))
+
+
+class TestNormalize:
+    """Longest edge capped, EXIF applied and stripped."""
+
+    def test_phone_photo(self):
+        raw = _jpeg(orientation=6)  # rotated 90 degrees: portrait once applied
+        (parsed,) = normalize_image("photo.jpg", raw, ImageSettings(max_edge=1000))
+        img = _decode(parsed)
+        assert img.format == "WEBP" and img.size == (750, 1000)
+        assert not img.getexif()
+        assert parsed.image_media_type == "image/webp"
+        assert parsed.text_content == "[Image: photo.jpg, 750x1000 pixels, image/webp, downscaled from 3000x4000]"
+        assert len(base64.b64decode(parsed.image_base64)) < len(raw)
+
+    def test_small_original_kept(self):
+        raw = _png()
+        (parsed,) = normalize_image("icon.png", raw)
+        assert base64.b64decode(parsed.image_base64) == raw
+        assert parsed.text_content == "[Image: icon.png, 40x30 pixels, image/png]"
+
+    @pytest.mark.parametrize("image_format,mode", [("webp", "RGBA"), ("jpeg", "RGB")])
+    def test_alpha(self, image_format, mode):
+        settings = ImageSettings(max_edge=20, format=image_format)
+        (parsed,) = normalize_image("logo.png", _png(), settings)
+        assert _decode(parsed).mode == mode
+
+
+class TestTiling:
+    """Overview plus tiles for very large images."""
+
+    def test_grid_within_limits(self):
+        settings = ImageSettings(max_edge=1000, tiling=True, tile_threshold=3000, max_tiles=6, format="jpeg")
+        parsed = normalize_image("scan.jpg", _jpeg(), settings)
+        assert [p.name for p in parsed[:2]] == ["scan.jpg", "scan.jpg [tile 1/6]"]
+        assert len(parsed) == 7
+        assert all(max(_decode(p).size) <= 1000 for p in parsed)
+
+    def test_below_threshold(self):
+        settings = ImageSettings(max_edge=1000, tiling=True, tile_threshold=5000)
+        assert len(normalize_image("scan.jpg", _jpeg(), settings)) == 1
+
+
+class TestParsePath:
+    """parse_file / parse service integration."""
+
+    def test_disabled_sends_original(self, monkeypatch):
+        monkeypatch.setattr(file_parser, "IMAGE_SETTINGS", ImageSettings(normalize=False))
+        raw = _jpeg(size=(2000, 1000))
+        (parsed,) = file_parser.parse_file("a.jpg", base64.b64encode(raw).decode(), "base64")
+        assert base64.b64decode(parsed.image_base64) == raw and parsed.image_media_type == "image/jpeg"
+
+    def test_cached_by_content(self):
+        content = base64.b64encode(_jpeg(size=(2000, 1500))).decode()
+        service = FileParseService(workers=0)
+        first = asyncio.run(service.parse_file("a.jpg", content, "base64"))
+        second = asyncio.run(service.parse_file("b.jpg", content, "base64"))
+        assert service.cache.hits == 1 and second[0].image_base64 == first[0].image_base64
+        assert second[0].text_content.startswith("[Image: b.jpg, 1568x1176 pixels")
@@ -0,0 +1,119 @@
+"""
+Tests for incremental re-inference.
+
+Tests cover read tracing, parity of delta updates with a full run, the
+full-run fallback on S-level changes, and in-place ConsciousnessState
+patching.
+"""
+
+import dataclasses
+import random
+
+import pytest
+
+from formulas import OOFInferenceEngine, CANONICAL_OPERATOR_NAMES
+from formulas.incremental import ALL_KEYS, KEY_SET, IncrementalInference, TracingDict
+from value_organizer import ValueOrganizer
+
+
+NAMES = sorted(CANONICAL_OPERATOR_NAMES)
+
+
+def _operators(seed: int) -> dict:
+    rng = random.Random(seed)
+    return {name: round(rng.uniform(0.05, 0.95), 3) for name in NAMES}
+
+
+def _normalized(result: dict) -> dict:
+    for key in ("populated_operators", "missing_operators"):
+        result["metadata"][key] = sorted(result["metadata"][key])
+    return result
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return OOFInferenceEngine()
+
+
+@pytest.fixture(scope="module")
+def incremental(engine):
+    return IncrementalInference(engine)
+
+
+class TestTracing:
+    """Read recording."""
+
+    def test_key_reads_are_recorded(self):
+        traced = TracingDict({"a": 1, "b": 2})
+        traced.get("a")
+        "c" in traced
+        assert traced.reads == {"a", "c"}
+
+    def test_whole_mapping_reads_are_marked(self):
+        traced = TracingDict({"a": 1})
+        list(traced)
+        assert KEY_SET in traced.reads
+        traced.copy()
+        assert ALL_KEYS in traced.reads
+
+
+class TestIncrementalUpdate:
+    """Delta updates reproduce a full run."""
+
+    def test_run_matches_infer(self, engine, incremental):
+        operators = _operators(1)
+        trace = incremental.run(operators, 4.5)
+        assert _normalized(trace.result) == _normalized(engine.infer(operators, 4.5))
+
+    def test_updates_match_full_runs(self, engine, incremental):
+        rng = random.Random(7)
+        operators = _operators(2)
+        trace = incremental.run(operators, 5.0)
+        for _ in range(15):
+            changed = dict(operators)
+            for name in rng.sample(NAMES, rng.randint(1, 3)):
+                changed[name] = round(rng.uniform(0.05, 0.95), 3)
+            trace = incremental.update(trace, changed, 5.0)
+            assert _normalized(trace.result) == _normalized(engine.infer(changed, 5.0))
+            operators = changed
+
+    def test_single_operator_change_skips_unaffected_modules(self, incremental):
+        operators = _operators(3)
+        trace = incremental.run(operators, 4.0)
+        updated = incremental.update(trace, {**operators, "Co_coherence": 0.5}, 4.0)
+        assert "network" in updated.recomputed
+        assert "platform" not in updated.recomputed
+        assert len(updated.recomputed) < len(trace.plan.modules)
+
+    def test_no_change_recomputes_nothing(self, incremental):
+        operators = _operators(4)
+        trace = incremental.run(operators, 4.0)
+        assert incremental.update(trace, dict(operators), 4.0).recomputed == ()
+
+    def test_s_level_change_runs_everything(self, incremental):
+        operators = _operators(5)
+        trace = incremental.run(operators, 4.0)
+        assert incremental.update(trace, operators, 6.0).recomputed == trace.plan.modules
+
+
+class TestStatePatch:
+    """ConsciousnessState patching matches a fresh organize."""
+
+    def test_patch_matches_organize(self, incremental):
+        organizer = ValueOrganizer()
+        evidence = {"observations": [], "s_level": "S4.2", "targets": ["growth"]}
+        operators = _operators(6)
+        trace = incremental.run(operators, 4.2)
+
+        value_reads = {}
+        state = organizer.organize(trace.result, evidence, value_reads=value_reads)
+        previous_values = dict(trace.result["values"])
+
+        trace = incremental.update(trace, {**operators, "W_witness": 0.9, "M_maya": 0.1}, 4.2)
+        organizer.patch(state, trace.result, evidence, previous_values, value_reads)
+        expected = organizer.organize(trace.result, evidence)
+
+        patched, fresh = dataclasses.asdict(state), dataclasses.asdict(expected)
+        patched.pop("timestamp")
+        fresh.pop("timestamp")
+        assert patched == fresh
@@ -0,0 +1,167 @@
+"""
+Tests for the run_inference memoization layer.
+
+Tests cover hit/miss accounting, parity with the unmemoized engine
+(observation confidences included), quantized keys over exact-input
+entries, LRU eviction, and the optional shared (L2) tier.
+"""
+
+import asyncio
+
+import pytest
+
+from formulas import OOFInferenceEngine, CANONICAL_OPERATOR_NAMES
+from formulas.memo import InferenceMemo
+
+
+def _evidence(offset: float = 0.0, goal: bool = False, confidence_shift: int = 0) -> dict:
+    evidence = {
+        "observations": [
+            {"var": name, "value": round(0.2 + (i % 8) * 0.09 + offset, 4),
+             "confidence": round(0.1 + ((i + confidence_shift) % 5) * 0.2, 2)}
+            for i, name in enumerate(sorted(CANONICAL_OPERATOR_NAMES))
+        ],
+        "s_level": "S4.5",
+    }
+    if goal:
+        evidence["goal_context"] = {"goal_text": "grow revenue", "goal_category": "achievement"}
+    return evidence
+
+
+def _normalized(result: dict) -> dict:
+    for key in ("populated_operators", "missing_operators"):
+        result["metadata"][key] = sorted(result["metadata"][key])
+    return result
+
+
+class ObservedEngine(OOFInferenceEngine):
+    """Also reports the raw operators, so observation confidences reach the result."""
+
+    def _flatten_profile(self, profile, confidence):
+        values = super()._flatten_profile(profile, confidence)
+        values.update(profile.operators)
+        return values
+
+
+class FakeSharedCache:
+    """Minimal CacheClient stand-in with a live connection."""
+
+    def __init__(self):
+        self.data = {}
+        self.is_connected = True
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl=None):
+        self.data[key] = value
+        return True
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return OOFInferenceEngine()
+
+
+class TestMemo:
+    """L1 behavior."""
+
+    def test_hit_matches_engine(self, engine):
+        memo = InferenceMemo(engine)
+        evidence = _evidence(goal=True)
+        expected = _normalized(engine.run_inference(evidence))
+
+        assert _normalized(memo.run_inference(evidence)) == expected
+        assert _normalized(memo.run_inference(evidence)) == expected
+        stats = memo.stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    def test_confidences_match_engine(self):
+        engine = ObservedEngine()
+        memo = InferenceMemo(engine)
+        for shift in (0, 1, 0):  # miss, hit with other confidences, hit
+            evidence = _evidence(goal=True, confidence_shift=shift)
+            expected = _normalized(engine.run_inference(evidence))
+            assert _normalized(memo.run_inference(evidence)) == expected
+            assert _normalized(asyncio.run(memo.run_inference_async(evidence))) == expected
+        assert expected["confidence"]["W_witness"] is not None
+        assert memo.stats()["misses"] == 1
+
+    def test_hits_are_independent_copies(self, engine):
+        memo = InferenceMemo(engine)
+        memo.run_inference(_evidence())
+        first = memo.run_inference(_evidence())
+        first["values"].clear()
+        assert memo.run_inference(_evidence())["values"]
+
+    def test_near_identical_operators_share_entry(self, engine):
+        memo = InferenceMemo(engine, precision=3)
+        memo.run_inference(_evidence())
+        memo.run_inference(_evidence(offset=0.0001))
+        assert memo.stats()["hits"] == 1
+
+    def test_goal_context_is_part_of_key(self, engine):
+        memo = InferenceMemo(engine)
+        memo.run_inference(_evidence())
+        memo.run_inference(_evidence(goal=True))
+        assert memo.stats()["misses"] == 2
+
+    def test_lru_eviction(self, engine):
+        memo = InferenceMemo(engine, max_entries=2)
+        for offset in (0.0, 0.01, 0.02):
+            memo.run_inference(_evidence(offset=offset))
+        stats = memo.stats()
+        assert stats["size"] == 2
+        assert stats["evictions"] == 1
+
+    def test_profile_matches_engine(self, engine):
+        memo = InferenceMemo(engine)
+        operators = {name: 0.5 for name in CANONICAL_OPERATOR_NAMES}
+        _, values = memo.profile(operators, 4.0)
+        _, cached = memo.profile(operators, 4.0)
+        expected = engine._flatten_profile(engine.calculate_full_profile(operators, 4.0), {})
+        assert values == cached == expected
+
+    def test_entries_are_computed_from_exact_inputs(self, engine):
+        memo = InferenceMemo(engine, precision=3)
+        exact = {name: 0.2 + (i % 8) * 0.09 + 0.00037 for i, name in enumerate(sorted(CANONICAL_OPERATOR_NAMES))}
+        _, values = memo.profile(exact, 4.5)
+        assert values == engine._flatten_profile(engine.calculate_full_profile(exact, 4.5), {})
+
+        # A nearby vector in the same bucket hits and stays within tolerance
+        nearby = {name: value + 0.0001 for name, value in exact.items()}
+        _, cached = memo.profile(nearby, 4.5)
+        fresh = engine._flatten_profile(engine.calculate_full_profile(nearby, 4.5), {})
+        assert memo.stats()["hits"] == 1
+        assert cached.keys() == fresh.keys()
+        for key, value in fresh.items():
+            if isinstance(value, float):
+                assert cached[key] == pytest.approx(value, abs=5e-3), key
+
+    def test_inference_miss_uses_exact_operators(self, engine):
+        memo = InferenceMemo(engine, precision=3)
+        evidence = _evidence(offset=0.00037)
+        assert _normalized(memo.run_inference(evidence)) == _normalized(engine.run_inference(evidence))
+
+
+class TestSharedTier:
+    """L2 through a CacheClient-compatible object."""
+
+    def test_second_process_hits_shared_tier(self, engine):
+        shared = FakeSharedCache()
+        writer = InferenceMemo(engine, shared_cache=shared)
+        reader = InferenceMemo(engine, shared_cache=shared)
+
+        expected = _normalized(asyncio.run(writer.run_inference_async(_evidence())))
+        result = _normalized(asyncio.run(reader.run_inference_async(_evidence())))
+
+        assert result == expected
+        assert reader.stats()["l2_hits"] == 1
+        assert reader.stats()["misses"] == 0
+
+    def test_disconnected_shared_tier_is_ignored(self, engine):
+        shared = FakeSharedCache()
+        shared.is_connected = False
+        memo = InferenceMemo(engine, shared_cache=shared)
+        asyncio.run(memo.run_inference_async(_evidence()))
+        assert shared.data == {}
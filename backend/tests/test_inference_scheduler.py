@@ -0,0 +1,101 @@
+"""
+Tests for the OOF module graph scheduler.
+
+Tests cover plan resolution (pruning, s_level skipping, cycle detection),
+shared intermediate reuse, and parity with direct engine calls.
+"""
+
+import pytest
+
+from formulas import OOFInferenceEngine, CANONICAL_OPERATOR_NAMES
+from formulas.intermediates import OperatorSnapshot
+from formulas.module_graph import (
+    DEFAULT_MODULES,
+    ModuleNode,
+    ModuleScheduler,
+    default_scheduler,
+)
+
+
+SAMPLE_OPERATORS = {
+    name: 0.3 + (i % 7) * 0.08
+    for i, name in enumerate(sorted(CANONICAL_OPERATOR_NAMES))
+}
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return OOFInferenceEngine()
+
+
+class TestPlan:
+    """Plan resolution."""
+
+    def test_full_plan_covers_every_module(self):
+        plan = default_scheduler.plan(DEFAULT_MODULES, has_s_level=True)
+        assert set(plan.modules) == set(DEFAULT_MODULES)
+        assert plan.skipped == ()
+
+    def test_unconsumed_intermediates_are_pruned(self):
+        plan = default_scheduler.plan(["cascade", "emotions"], has_s_level=True)
+        assert plan.intermediates == ()
+
+    def test_intermediate_dependencies_are_ordered(self):
+        plan = default_scheduler.plan(["operators"], has_s_level=True)
+        assert plan.intermediates.index("klesha_total") < plan.intermediates.index("maya_effective")
+
+    def test_missing_s_level_skips_dependent_modules(self):
+        plan = default_scheduler.plan(["cascade", "drives", "unity"], has_s_level=False)
+        assert plan.modules == ("cascade",)
+        assert plan.skipped == ("drives", "unity")
+
+    def test_plans_are_cached_per_request_shape(self):
+        first = default_scheduler.plan(["drives", "death"], has_s_level=True)
+        second = default_scheduler.plan(["death", "drives"], has_s_level=True)
+        assert first is second
+
+    def test_cycles_are_rejected(self):
+        nodes = [
+            ModuleNode("a", "a_profile", lambda e, o, s: 1, after=("b",)),
+            ModuleNode("b", "b_profile", lambda e, o, s: 2, after=("a",)),
+        ]
+        with pytest.raises(ValueError):
+            ModuleScheduler(modules=nodes)
+
+    def test_after_dependencies_form_waves(self):
+        nodes = [
+            ModuleNode("a", "a_profile", lambda e, o, s: 1),
+            ModuleNode("b", "b_profile", lambda e, o, s: 2, after=("a",)),
+            ModuleNode("c", "c_profile", lambda e, o, s: 3),
+        ]
+        plan = ModuleScheduler(modules=nodes).plan(["b", "c"], has_s_level=True)
+        assert plan.waves == (("a", "c"), ("b",))
+
+
+class TestSharedIntermediates:
+    """Shared intermediates are computed once and reused by engines."""
+
+    def test_snapshot_value_short_circuits_engine(self, engine):
+        snapshot = OperatorSnapshot(SAMPLE_OPERATORS, {"ego_separation": 0.123})
+        assert engine.drives_engine._calculate_ego_separation(snapshot) == 0.123
+        assert engine.death_engine._calculate_ego_separation(snapshot) == 0.123
+
+    def test_plain_dict_still_computes(self, engine):
+        expected = engine.operator_engine.calculate_ego_separation(SAMPLE_OPERATORS)
+        assert engine.matrices_engine._calculate_ego_separation(SAMPLE_OPERATORS) == expected
+
+
+class TestParity:
+    """Scheduled profile matches direct engine calls."""
+
+    def test_profile_matches_direct_calls(self, engine):
+        profile = engine.calculate_full_profile(SAMPLE_OPERATORS, 4.5)
+        assert profile._computed_modules == list(DEFAULT_MODULES)
+        assert profile.operator_scores == engine.operator_engine.calculate_all_derived(SAMPLE_OPERATORS)
+        assert profile.drives_profile == engine.drives_engine.calculate_all_drives(SAMPLE_OPERATORS, 4.5)
+        assert profile.death_profile == engine.death_engine.calculate_death_profile(SAMPLE_OPERATORS, 4.5)
+
+    def test_include_modules_limits_output(self, engine):
+        profile = engine.calculate_full_profile(SAMPLE_OPERATORS, 4.5, include_modules=["cascade"])
+        assert profile._computed_modules == ["cascade"]
+        assert profile.drives_profile is None
@@ -0,0 +1,176 @@
+"""
+Tests for the shared LLM transport and provider adapters.
+
+Tests cover each adapter's headers, request bodies, text extraction and
+usage parsing, SSE line decoding, and LLMTransport pooling, timeouts and
+error handling against an httpx.MockTransport.
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from utils.llm_client import (
+    AnthropicAdapter,
+    LLMTransport,
+    OpenAIAdapter,
+    ProviderAdapter,
+    get_adapter,
+    iter_sse_json,
+)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class MockedTransport(LLMTransport):
+    """LLMTransport whose pooled clients answer from `handler`."""
+
+    def __init__(self, handler, **kwargs):
+        super().__init__(http2=False, **kwargs)
+        self.handler = handler
+        self.created = 0
+
+    def _new_client(self) -> httpx.AsyncClient:
+        self.created += 1
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+class TestAdapters:
+    """Provider-specific request and response details."""
+
+    def test_base_adapter_is_abstract(self):
+        with pytest.raises(TypeError):
+            ProviderAdapter()
+
+    def test_get_adapter(self):
+        assert isinstance(get_adapter("anthropic"), AnthropicAdapter)
+        assert isinstance(get_adapter("openai"), OpenAIAdapter)
+        assert get_adapter("groq") is get_adapter(None) is get_adapter("openai")
+
+    def test_anthropic_request(self):
+        adapter = AnthropicAdapter()
+        assert adapter.headers("k") == {
+            "x-api-key": "k", "anthropic-version": "2023-06-01", "Content-Type": "application/json"
+        }
+        assert adapter.headers("k", web_search=True)["anthropic-beta"] == "web-search-2025-03-05"
+        assert adapter.build_json_request("m", "hi", 50) == {
+            "model": "m", "max_tokens": 50, "messages": [{"role": "user", "content": "hi"}]
+        }
+
+    @pytest.mark.parametrize("content,text", [
+        ([{"type": "thinking", "thinking": "..."}, {"type": "text", "text": "answer"}], "answer"),
+        ([{"text": "untyped"}], "untyped"),
+        ([], ""),
+    ], ids=["skips-thinking", "untyped-fallback", "empty"])
+    def test_anthropic_extract_text(self, content, text):
+        assert AnthropicAdapter().extract_text({"content": content}) == text
+
+    def test_openai_request(self):
+        adapter = OpenAIAdapter()
+        assert adapter.headers("k", web_search=True) == {
+            "Authorization": "Bearer k", "Content-Type": "application/json"
+        }
+        assert adapter.build_json_request("m", "hi", 50) == {
+            "model": "m",
+            "max_output_tokens": 50,
+            "input": [{"type": "message", "role": "user", "content": "hi"}],
+            "text": {"format": {"type": "json_object"}},
+        }
+
+    @pytest.mark.parametrize("data,text", [
+        ({"output_text": "direct"}, "direct"),
+        ({"output": [
+            {"type": "reasoning"},
+            {"type": "message", "content": [{"type": "output_text", "text": ""}, {"type": "text", "text": "nested"}]},
+        ]}, "nested"),
+        ({"output": []}, ""),
+    ], ids=["output-text", "output-array", "empty"])
+    def test_openai_extract_text(self, data, text):
+        assert OpenAIAdapter().extract_text(data) == text
+
+    @pytest.mark.parametrize("adapter", [AnthropicAdapter(), OpenAIAdapter()], ids=["anthropic", "openai"])
+    def test_usage(self, adapter):
+        assert adapter.usage({"usage": {"input_tokens": 12, "output_tokens": 34}}) == (12, 34)
+        assert adapter.usage({}) == (None, None)
+
+    def test_iter_sse_json(self):
+        body = b'event: x\ndata: {"a": 1}\n\ndata: not json\ndata: [1, 2]\ndata: [DONE]\ndata: {"late": true}\n'
+
+        async def collect():
+            response = httpx.Response(200, content=body)
+            return [item async for item in iter_sse_json(response)]
+
+        assert run(collect()) == [{"a": 1}, [1, 2]]
+
+
+class TestTransport:
+    """Pooled clients per provider."""
+
+    def test_complete_json_text(self):
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(200, json={
+                "content": [{"type": "text", "text": '{"ok": true}'}],
+                "usage": {"input_tokens": 3, "output_tokens": 4},
+            })
+
+        async def scenario():
+            transport = MockedTransport(handler)
+            try:
+                return await transport.complete_json_text(
+                    "anthropic", "https://llm.test/v1/messages", "key", "model-a", "prompt", 100, timeout=5.0
+                ), transport.stats()
+            finally:
+                await transport.aclose()
+
+        text, stats = run(scenario())
+        assert text == '{"ok": true}'
+        (request,) = seen
+        assert request.headers["x-api-key"] == "key"
+        assert json.loads(request.content) == AnthropicAdapter().build_json_request("model-a", "prompt", 100)
+        assert stats["providers"]["anthropic"]["requests"] == 1
+
+    def test_error_status_raises(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(429, text="rate limited")
+
+        async def scenario():
+            transport = MockedTransport(handler)
+            try:
+                await transport.complete_json_text("openai", "https://llm.test/v1/responses", "k", "m", "p", 10)
+            finally:
+                await transport.aclose()
+
+        with pytest.raises(RuntimeError, match="OpenAI API 429: rate limited"):
+            run(scenario())
+
+    def test_pools_are_shared_and_recreated(self):
+        async def scenario():
+            transport = MockedTransport(lambda request: httpx.Response(200))
+            await transport.start()
+            created_at_start = transport.created
+            # Non-Anthropic providers borrow the OpenAI-compatible pool
+            same = transport.client("groq") is transport.client("openai")
+            async with transport.session("groq") as session:
+                await session.post("https://llm.test/")
+            requests = transport.stats()["providers"]["openai"]["requests"]
+            await transport.aclose()
+            transport.client("openai")
+            return created_at_start, same, requests, transport.created
+
+        created_at_start, same, requests, created = run(scenario())
+        assert (created_at_start, same, requests, created) == (2, True, 1, 3)
+
+    def test_session_timeout(self):
+        transport = LLMTransport(connect_timeout=10.0, http2=False)
+        timeout = transport._timeout(120.0)
+        assert (timeout.read, timeout.connect, timeout.pool) == (120.0, 10.0, 10.0)
+        assert transport._timeout(3.0).connect == 3.0
+        explicit = httpx.Timeout(7.0)
+        assert transport._timeout(explicit) is explicit
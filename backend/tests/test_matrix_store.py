@@ -0,0 +1,238 @@
+"""
+Tests for row-level document matrix storage.
+
+Tests cover the document dict <-> rows round-trip, moving legacy
+generated_documents JSON into rows (startup migration, duplicate ids,
+a concurrent request winning the move), doc-N numbering and targeted cell
+dimension updates, against a throwaway SQLite database.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import database.config
+from database import Base, ChatConversation, MatrixDocument
+from database import matrix_store
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def _document(doc_id, name, cells=True):
+    matrix = {
+        "row_options": [{"id": "r0", "label": "Row 0", "tone": "warm"}, {"id": "r1", "label": "Row 1"}],
+        "column_options": [{"id": "c0", "label": "Col 0", "articulated_outcome": {"text": "out"}}],
+        "selected_rows": [0, 1],
+        "selected_columns": [0],
+        "layout": "grid",
+    }
+    if cells:
+        matrix["cells"] = {
+            "0-0": {"dimensions": [{"name": "a", "value": 10}, {"name": "b", "value": 20}], "note": "n"},
+            "1-0": {"dimensions": [{"name": "a", "value": 30}]},
+        }
+    return {"id": doc_id, "name": name, "matrix_data": matrix, "plays": [{"id": "p1"}], "source": "llm"}
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'matrix.db'}")
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    run(setup())
+    yield async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    run(engine.dispose())
+
+
+async def _add_conversation(Session, conversation_id="conv-1", documents=None):
+    async with Session() as db:
+        db.add(ChatConversation(
+            id=conversation_id, user_id="user-1", organization_id="org-1", generated_documents=documents
+        ))
+        await db.commit()
+
+
+async def _conversation(db, conversation_id="conv-1"):
+    return (await db.execute(select(ChatConversation).where(ChatConversation.id == conversation_id))).scalar_one()
+
+
+async def _column(Session, conversation_id="conv-1"):
+    async with Session() as db:
+        return await db.scalar(
+            select(ChatConversation.generated_documents).where(ChatConversation.id == conversation_id)
+        )
+
+
+class TestRoundTrip:
+    """Document dicts survive the split into rows."""
+
+    @pytest.mark.parametrize("cells", [True, False], ids=["cells", "no-cells"])
+    def test_build_then_read(self, sessions, cells):
+        document = _document("doc-0", "First", cells=cells)
+
+        async def scenario():
+            await _add_conversation(sessions)
+            async with sessions() as db:
+                db.add_all(matrix_store.build_document("conv-1", document, 0))
+                await db.commit()
+            async with sessions() as db:
+                return await matrix_store.load_documents(db, await _conversation(db))
+
+        assert run(scenario()) == [document]
+
+
+class TestLegacyMigration:
+    """generated_documents JSON moved into rows."""
+
+    def test_duplicate_ids_keep_every_document(self, sessions):
+        legacy = [_document("doc-0", "A"), _document("doc-1", "B"), _document("doc-1", "C", cells=False)]
+
+        async def scenario():
+            await _add_conversation(sessions, documents=legacy)
+            async with sessions() as db:
+                documents = await matrix_store.load_documents(db, await _conversation(db))
+            return documents, await _column(sessions)
+
+        documents, column = run(scenario())
+        assert [(d["id"], d["name"]) for d in documents] == [("doc-0", "A"), ("doc-1", "B"), ("doc-1-2", "C")]
+        assert documents[2] == {**legacy[2], "id": "doc-1-2"}
+        assert column is None
+
+    def test_startup_migration(self, sessions, monkeypatch):
+        monkeypatch.setattr(database.config, "AsyncSessionLocal", sessions)
+
+        async def scenario():
+            await _add_conversation(sessions, "conv-1", [_document("doc-0", "A")])
+            await _add_conversation(sessions, "conv-2", [_document("doc-0", "B"), _document("doc-1", "C")])
+            await _add_conversation(sessions, "conv-3")
+            await database.config._migrate_generated_documents()
+            async with sessions() as db:
+                rows = (await db.execute(
+                    select(MatrixDocument.conversation_id, MatrixDocument.doc_id).order_by(
+                        MatrixDocument.conversation_id, MatrixDocument.position
+                    )
+                )).all()
+            return rows, [await _column(sessions, c) for c in ("conv-1", "conv-2")]
+
+        rows, columns = run(scenario())
+        assert rows == [("conv-1", "doc-0"), ("conv-2", "doc-0"), ("conv-2", "doc-1")]
+        assert columns == [None, None]
+
+    def test_concurrent_move(self, sessions, monkeypatch):
+        """The losing request hits the unique constraint, reads the winner's rows and its session stays usable."""
+        legacy = [_document("doc-0", "A"), _document("doc-1", "B")]
+        next_position = matrix_store._next_position
+
+        async def scenario():
+            await _add_conversation(sessions, documents=legacy)
+            async with sessions() as winner, sessions() as loser:
+                conversation = await _conversation(loser)
+
+                async def racing_next_position(db, conversation_id):
+                    # The winner moves the documents between the loser's existence check and its insert
+                    if db is loser:
+                        assert await matrix_store.materialize_legacy_documents(winner, await _conversation(winner)) == 2
+                    return await next_position(db, conversation_id)
+
+                monkeypatch.setattr(matrix_store, "_next_position", racing_next_position)
+                moved = await matrix_store.materialize_legacy_documents(loser, conversation)
+                monkeypatch.setattr(matrix_store, "_next_position", next_position)
+
+                documents = await matrix_store.load_documents(loser, conversation)
+                loser.add(ChatConversation(id="conv-2", user_id="user-1", organization_id="org-1"))
+                await loser.commit()
+            async with sessions() as db:
+                kept = await db.get(ChatConversation, "conv-2")
+            return moved, documents, kept
+
+        moved, documents, kept = run(scenario())
+        assert moved == 0
+        assert documents == legacy
+        assert kept is not None
+
+
+class TestLegacyColumnReads:
+    """The deferred generated_documents column is read once per session."""
+
+    def _count_legacy_selects(self, sessions, documents):
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            if "generated_documents" in statement and statement.lstrip().upper().startswith("SELECT"):
+                statements.append(statement)
+
+        async def scenario():
+            await _add_conversation(sessions, documents=documents)
+            engine = sessions.kw["bind"]
+            event.listen(engine.sync_engine, "before_cursor_execute", record)
+            try:
+                async with sessions() as db:
+                    conversation = await _conversation(db)
+                    await matrix_store.document_count(db, conversation)
+                    await matrix_store.document_names(db, conversation)
+                    await matrix_store.next_document_number(db, conversation)
+                    await matrix_store.get_document_row(db, conversation, "doc-0")
+            finally:
+                event.remove(engine.sync_engine, "before_cursor_execute", record)
+            return len(statements)
+
+        return run(scenario())
+
+    @pytest.mark.parametrize("documents", [None, [_document("doc-0", "A")]], ids=["migrated", "legacy"])
+    def test_single_select(self, sessions, documents):
+        assert self._count_legacy_selects(sessions, documents) == 1
+
+
+class TestReadsAndWrites:
+    """Numbering and targeted updates."""
+
+    def test_next_document_number(self, sessions):
+        async def scenario():
+            await _add_conversation(sessions, documents=[_document(f"doc-{i}", str(i)) for i in range(3)])
+            async with sessions() as db:
+                conversation = await _conversation(db)
+                numbers = [await matrix_store.next_document_number(db, conversation)]
+                # Deleting doc-1 leaves two documents; doc-2 must not be reissued
+                await matrix_store.delete_document(db, await matrix_store.get_document_row(db, conversation, "doc-1"))
+                numbers.append(await matrix_store.next_document_number(db, conversation))
+                await matrix_store.append_documents(db, conversation, [_document("custom", "X")])
+                numbers.append(await matrix_store.next_document_number(db, conversation))
+                return numbers
+
+        assert run(scenario()) == [3, 3, 3]
+
+    def test_next_document_number_counts_custom_ids(self, sessions):
+        async def scenario():
+            await _add_conversation(sessions, documents=[_document("a", "A"), _document("b", "B")])
+            async with sessions() as db:
+                return await matrix_store.next_document_number(db, await _conversation(db))
+
+        assert run(scenario()) == 2
+
+    def test_update_cell_dimensions(self, sessions):
+        async def scenario():
+            await _add_conversation(sessions, documents=[_document("doc-0", "A")])
+            async with sessions() as db:
+                row = await matrix_store.get_document_row(db, await _conversation(db), "doc-0")
+                applied = await matrix_store.update_cell_dimensions(db, row, {
+                    "0-0": [(1, 99), (5, 1)],
+                    "1-0": [(0, 77)],
+                    "9-9": [(0, 1)],
+                })
+                await db.commit()
+            async with sessions() as db:
+                document = (await matrix_store.load_documents(db, await _conversation(db)))[0]
+            return applied, document["matrix_data"]["cells"]
+
+        applied, cells = run(scenario())
+        assert applied == 2
+        assert cells["0-0"] == {"note": "n", "dimensions": [{"name": "a", "value": 10}, {"name": "b", "value": 99}]}
+        assert cells["1-0"] == {"dimensions": [{"name": "a", "value": 77}]}
+        assert "9-9" not in cells
@@ -0,0 +1,152 @@
+"""
+Tests for the reverse-causality outcome solver.
+
+Tests cover the analytic outcome models matching the registered formulas,
+the closed-form single-outcome solve (exact target, bounds, unreachable
+targets), batched solves matching individual ones, bounded least squares
+for several outcomes, and the numeric fallback for formulas given only as
+a callable.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from reverse_causality import ReverseCausalityEngine
+from reverse_causality.outcome_solver import CallableOutcome, LinearOutcome, OutcomeSolver
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return ReverseCausalityEngine()
+
+
+def _operators(seed: int) -> dict:
+    rng = random.Random(seed)
+    return {op: round(rng.uniform(0.2, 0.8), 3) for op in ReverseCausalityEngine.OPERATORS}
+
+
+class TestOutcomeModels:
+    """Linear models reproduce the registered formulas."""
+
+    @pytest.mark.parametrize("outcome", sorted(ReverseCausalityEngine.OUTCOME_FORMULAS))
+    def test_linear_model_matches_formula(self, engine, outcome):
+        formula = engine.OUTCOME_FORMULAS[outcome]['formula']
+        model = engine._outcome_models[outcome]
+        assert isinstance(model, LinearOutcome)
+        for seed in range(5):
+            ops = _operators(seed)
+            assert model.evaluate(ops) == pytest.approx(formula(ops))
+
+
+class TestSingleOutcome:
+    """Closed-form projected solve."""
+
+    def test_hits_target_with_inverse_operators_decreasing(self, engine):
+        ops = _operators(1)
+        result = engine.solve_for_outcome('breakthrough_probability', 0.8, ops)
+        required = result.required_state.operator_values
+        formula = engine.OUTCOME_FORMULAS['breakthrough_probability']['formula']
+        assert formula(required) == pytest.approx(0.8)
+        assert result.goal_achievable
+        assert result.solver_diagnostics.method == 'closed_form'
+        # Raising the outcome lowers attachment and resistance
+        assert required['At_attachment'] < ops['At_attachment']
+        assert required['R_resistance'] < ops['R_resistance']
+        # Operators outside the formula are untouched
+        assert required['F_fear'] == ops['F_fear']
+
+    def test_constraints_are_respected(self, engine):
+        ops = _operators(2)
+        constraints = {'G_grace_max': ops['G_grace'], 'S_surrender_min': 0.7}
+        result = engine.solve_for_outcome('breakthrough_probability', 0.75, ops, constraints=constraints)
+        required = result.required_state.operator_values
+        assert required['G_grace'] <= ops['G_grace'] + 1e-12
+        assert required['S_surrender'] >= 0.7 - 1e-12
+
+    def test_unreachable_target_pins_bounds(self, engine):
+        ops = _operators(3)
+        result = engine.solve_for_outcome('karma_burn_rate', 1.5, ops)
+        required = result.required_state.operator_values
+        assert not result.goal_achievable
+        assert not result.solver_diagnostics.converged
+        assert (required['Ce_cleaning'], required['G_grace'], required['At_attachment']) == (1.0, 1.0, 0.0)
+
+    def test_closed_form_is_minimal_change(self):
+        # Free coordinates move along mobility * gradient
+        model = LinearOutcome(['a', 'b', 'c'], [0.5, 0.3, -0.2], intercept=0.2)
+        mobility = {'a': 1.0, 'b': 0.5, 'c': 0.8}
+        required, _ = OutcomeSolver().solve(model, 0.6, {'a': 0.3, 'b': 0.4, 'c': 0.5}, mobility)
+        step = np.array([required['a'] - 0.3, required['b'] - 0.4, required['c'] - 0.5])
+        direction = np.array([1.0 * 0.5, 0.5 * 0.3, 0.8 * -0.2])
+        assert np.allclose(step / direction, step[0] / direction[0])
+        assert model.evaluate(required) == pytest.approx(0.6)
+
+
+class TestMultiOutcome:
+    """Bounded least squares over several outcomes."""
+
+    def test_compatible_targets_are_met(self, engine):
+        ops = _operators(4)
+        targets = {'breakthrough_probability': 0.8, 'peace_depth': 0.75, 'love_capacity': 0.7}
+        result = engine.solve_multi_outcome(targets, ops)
+        required = result.required_state.operator_values
+        for outcome, target in targets.items():
+            assert engine.OUTCOME_FORMULAS[outcome]['formula'](required) == pytest.approx(target, abs=1e-3)
+        assert result.goal_achievable and result.solver_diagnostics.converged
+
+    def test_conflicting_targets_stay_in_bounds(self, engine):
+        ops = _operators(5)
+        targets = {'creative_flow': 1.0, 'breakthrough_probability': 0.0}
+        result = engine.solve_multi_outcome(targets, ops)
+        diagnostics = result.solver_diagnostics
+        values = np.array(list(result.required_state.operator_values.values()))
+        assert np.all((values >= 0.0) & (values <= 1.0))
+        assert diagnostics.converged and diagnostics.active_bounds
+        assert diagnostics.iterations > 1
+
+    def test_missing_operator_returns_none(self, engine):
+        ops = _operators(6)
+        del ops['G_grace']
+        assert engine.solve_multi_outcome({'karma_burn_rate': 0.9}, ops) is None
+
+
+class TestNumericFallback:
+    """Callable-only outcomes use projected gradient."""
+
+    def test_matches_closed_form(self):
+        linear = LinearOutcome(['a', 'b'], [0.6, 0.4])
+        callable_outcome = CallableOutcome(lambda ops: 0.6 * ops['a'] + 0.4 * ops['b'], ['a', 'b'])
+        start, mobility = {'a': 0.2, 'b': 0.3}, {'a': 1.0, 'b': 1.0}
+        solver = OutcomeSolver()
+        exact, _ = solver.solve(linear, 0.7, start, mobility)
+        approx, diagnostics = solver.solve(callable_outcome, 0.7, start, mobility)
+        assert diagnostics.method == 'projected_gradient' and diagnostics.converged
+        assert approx['a'] == pytest.approx(exact['a'], abs=0.02)
+        assert approx['b'] == pytest.approx(exact['b'], abs=0.02)
+
+
+class TestBatch:
+    """Many targets from one current state."""
+
+    def test_batch_matches_individual_solves(self, engine):
+        ops = _operators(7)
+        targets = [
+            ('breakthrough_probability', 0.8), ('peace_depth', 0.3), ('karma_burn_rate', 1.5),
+            ('love_capacity', 0.7), ('wealth and success', 0.8),
+        ]
+        batch = engine.solve_batch(ops, targets)
+        for (outcome, value), result in zip(targets, batch):
+            single = engine.solve_for_outcome(outcome, value, ops)
+            assert result.goal_achievable == single.goal_achievable
+            for op, required in single.required_state.operator_values.items():
+                assert result.required_state.operator_values[op] == pytest.approx(required, abs=1e-9)
+
+    def test_missing_operators_and_reached_targets(self, engine):
+        ops = _operators(8)
+        current = engine.OUTCOME_FORMULAS['creative_flow']['formula'](ops)
+        del ops['I_intention']
+        batch = engine.solve_batch(ops, [('manifestation_power', 0.9), ('creative_flow', current)])
+        assert batch[0] is None
+        assert batch[1].current_gap == 0.0 and batch[1].solver_diagnostics is None
@@ -0,0 +1,208 @@
+"""
+Tests for the upload parse service.
+
+Tests cover parity with file_parser for zips and plain text, the
+content-hash cache (hits across filenames, relabelling), per-file
+timeouts and error results from a real worker process, that start()
+spawns every worker, and that a worker crash or a stuck worker only fails
+its own file.
+"""
+
+import asyncio
+import base64
+import io
+import os
+import re
+import signal
+import time
+import zipfile
+
+import file_parser
+import parse_service
+from parse_service import FileParseService, _relabel
+from file_parser import ParsedFile
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def _zip_b64(entries: dict) -> str:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for name, data in entries.items():
+            zf.writestr(name, data)
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+def _slow_parse(name, raw_bytes):
+    time.sleep(5)
+    return [ParsedFile(name=name, text_content="late")]
+
+
+def _crashing_parse(name, raw_bytes):
+    if name.startswith("crash"):
+        os._exit(1)
+    time.sleep(0.5)
+    return [ParsedFile(name=name, text_content="ok")]
+
+
+def _stuck_parse(name, raw_bytes):
+    if name.startswith("stuck"):
+        # Stuck where SIGALRM cannot reach, until the parent kills the pool
+        signal.signal(signal.SIGALRM, signal.SIG_IGN)
+        time.sleep(30)
+    return [ParsedFile(name=name, text_content="ok")]
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode()
+
+
+ZIP = _zip_b64({"b.md": "# Plan", "a.txt": "notes", "__MACOSX/x.txt": "skip", "deck.pptx": b"not a deck"})
+
+
+class TestParity:
+    """Same results as the synchronous parser."""
+
+    def test_zip_and_text(self):
+        service = FileParseService(workers=0)
+        uploads = [("bundle.zip", ZIP, "base64"), ("goals.md", "Grow revenue", "text"), ("x.exe", "", "text")]
+        parsed = run(service.parse_many(uploads))
+        assert parsed == [file_parser.parse_file(*upload) for upload in uploads]
+        assert [p.name for p in parsed[0]] == ["bundle.zip/a.txt", "bundle.zip/b.md", "bundle.zip/deck.pptx"]
+
+    def test_parse_all(self):
+        class Upload:
+            def __init__(self, name, content, encoding):
+                self.name, self.content, self.encoding = name, content, encoding
+
+        files = [Upload("bundle.zip", ZIP, "base64"), Upload("bad.zip", "bm90IGEgemlw", "base64")]
+        result = run(FileParseService(workers=0).parse_all(files))
+        assert result == file_parser.parse_all_files(files)
+        assert result.errors[-1] == "bad.zip: Invalid zip file"
+
+
+class TestCache:
+    """Keyed by SHA-256 of the raw bytes."""
+
+    def test_hit_under_another_name(self):
+        service = FileParseService(workers=0)
+        first = run(service.parse_file("q3.zip", ZIP, "base64"))
+        second = run(service.parse_file("renamed.zip", ZIP, "base64"))
+        assert [p.name for p in second] == [p.name.replace("q3.zip", "renamed.zip") for p in first]
+        assert [p.text_content for p in second] == [p.text_content for p in first]
+        assert service.cache.hits == 1 and service.stats()["tasks"] == 2  # extraction + one binary entry
+
+    def test_relabel_image_description(self):
+        image = ParsedFile(name="a.png", text_content="[Image: a.png, 2x2 pixels, image/png]", is_image=True)
+        (relabelled,) = _relabel([image], "a.png", "b.png")
+        assert relabelled.name == "b.png"
+        assert relabelled.text_content == "[Image: b.png, 2x2 pixels, image/png]"
+
+    def test_size_bound(self):
+        service = FileParseService(workers=0, cache_mb=600 / (1024 * 1024))
+        for i in range(3):
+            service.cache.put((str(i), ".docx"), f"{i}.docx", [ParsedFile(name=f"{i}.docx", text_content="x" * 40)])
+        assert len(service.cache) == 2 and service.cache.get(("0", ".docx"), "0.docx") is None
+
+
+class TestWorkers:
+    """Parsing in a real worker process."""
+
+    def test_start_spawns_every_worker(self, monkeypatch):
+        logged = []
+        monkeypatch.setattr(parse_service.api_logger, "info", logged.append)
+        monkeypatch.setattr(parse_service.api_logger, "warning", logged.append)
+
+        async def scenario():
+            service = FileParseService(workers=3)
+            try:
+                await service.start()
+            finally:
+                service.shutdown()
+
+        run(scenario())
+        # Every warm-up ping was answered by a different process
+        pids = re.search(r"pids=\[([^\]]*)\]", logged[-1]).group(1).split(", ")
+        assert len(logged) == 1 and len(set(pids)) == 3
+
+    def test_start_warns_when_workers_are_missing(self, monkeypatch):
+        warnings = []
+        monkeypatch.setattr(parse_service.api_logger, "warning", warnings.append)
+        monkeypatch.setattr(parse_service, "WARMUP_TIMEOUT_SECONDS", 0.3)
+
+        async def scenario():
+            service = FileParseService(workers=2, start_method="fork")
+            # A pool that can only ever start one process
+            monkeypatch.setattr(service, "_new_executor", lambda workers: FileParseService._new_executor(service, 1))
+            try:
+                await service.start()
+            finally:
+                service.shutdown()
+
+        run(scenario())
+        assert warnings == ["[FILE_PARSER] Only 1 of 2 parse workers started within 0.3s"]
+
+    def test_worker_results_and_timeout(self, monkeypatch):
+        # fork so the worker inherits the patched parser
+        monkeypatch.setattr(parse_service, "parse_bytes", _slow_parse)
+
+        async def scenario():
+            service = FileParseService(workers=1, timeout=0.2, start_method="fork")
+            try:
+                await service.start()
+                timed_out = await service.parse_file("slow.docx", base64.b64encode(b"x").decode(), "base64")
+                zipped = await service.parse_file("bundle.zip", ZIP, "base64")
+                retried = await service.parse_file("slow.docx", base64.b64encode(b"x").decode(), "base64")
+                return timed_out, zipped, retried, service.stats()
+            finally:
+                service.shutdown()
+
+        timed_out, zipped, retried, stats = run(scenario())
+        assert timed_out[0].parse_error == "Parsing timed out after 0.2s"
+        assert retried == timed_out  # timeouts are not cached
+        assert zipped == file_parser.parse_file("bundle.zip", ZIP, "base64")
+        assert stats["timeouts"] == 2 and stats["restarts"] == 0 and stats["cache"]["entries"] == 2
+
+    def test_crash_fails_only_its_file(self, monkeypatch):
+        monkeypatch.setattr(parse_service, "parse_bytes", _crashing_parse)
+
+        async def scenario():
+            service = FileParseService(workers=2, timeout=10, start_method="fork")
+            try:
+                await service.start()
+                results = await service.parse_many([
+                    ("crash.docx", _b64(b"a"), "base64"),
+                    ("good.docx", _b64(b"b"), "base64"),
+                    ("other.docx", _b64(b"c"), "base64"),
+                ])
+                return results, service.stats()
+            finally:
+                service.shutdown()
+
+        (crashed, good, other), stats = run(scenario())
+        assert crashed[0].parse_error == "Parser process crashed (file too large or malformed)"
+        assert good[0].text_content == other[0].text_content == "ok"
+        assert stats["crashes"] == 1 and stats["isolated_runs"] >= 2
+
+    def test_stuck_worker_fails_only_its_file(self, monkeypatch):
+        monkeypatch.setattr(parse_service, "parse_bytes", _stuck_parse)
+        monkeypatch.setattr(parse_service, "KILL_GRACE_SECONDS", 1.0)
+
+        async def scenario():
+            service = FileParseService(workers=1, timeout=0.2, start_method="fork")
+            try:
+                await service.start()
+                stuck = asyncio.create_task(service.parse_file("stuck.docx", _b64(b"a"), "base64"))
+                await asyncio.sleep(0.5)
+                # Queued behind the stuck parse when the pool is killed
+                queued = await service.parse_file("queued.docx", _b64(b"b"), "base64")
+                return await stuck, queued, service.stats()
+            finally:
+                service.shutdown()
+
+        stuck, queued, stats = run(scenario())
+        assert stuck[0].parse_error == "Parsing timed out after 0.2s"
+        assert queued[0].text_content == "ok"
+        assert stats["restarts"] == 1 and stats["isolated_runs"] == 1 and stats["crashes"] == 0
@@ -0,0 +1,98 @@
+"""
+Tests for pathway ranking over cached dimension vectors.
+
+Tests cover the Pareto frontier of a generated pathway set, re-ranking a
+cached frontier for new preference weights (matching a fresh optimization),
+and frontier cache eviction.
+"""
+
+import random
+from dataclasses import replace
+
+import pytest
+
+from reverse_causality import PathwayGenerator, PathwayOptimizer
+
+
+# Operators the generator has both practices and step descriptions for
+OPERATORS = sorted(set(PathwayGenerator.OPERATOR_PRACTICES) - {'E_equanimity', 'Tr_trust'})
+
+
+def _pathways(seed: int):
+    rng = random.Random(seed)
+    current = {op: round(rng.uniform(0.2, 0.6), 3) for op in OPERATORS}
+    required = {op: min(1.0, v + rng.uniform(0.0, 0.3)) for op, v in current.items()}
+    return PathwayGenerator().generate_pathways(current, required, 3.0, 4.5)
+
+
+def _ranking(result):
+    return [(s.pathway_id, round(s.total_score, 12), s.recommended, s.recommendation_reason) for s in result.scored_pathways]
+
+
+class TestFrontier:
+    """Dimension vectors and dominance."""
+
+    def test_frontier_is_non_dominated(self):
+        optimizer = PathwayOptimizer()
+        frontier = optimizer.build_frontier(_pathways(1))
+        assert frontier.frontier
+        for i, v in enumerate(frontier.vectors):
+            dominated = any(
+                all(x >= y for x, y in zip(w, v)) and w != v for j, w in enumerate(frontier.vectors) if j != i
+            )
+            assert dominated == (i not in frontier.frontier)
+
+    def test_totals_are_weighted_dimension_sums(self):
+        result = PathwayOptimizer().optimize_pathways(_pathways(2), {'speed': 3, 'effort': 0})
+        for s in result.scored_pathways:
+            dims = (s.speed_score, s.stability_score, s.effort_score, s.side_effect_score, s.success_score)
+            assert s.total_score == pytest.approx(sum(d.weighted_score for d in dims))
+            assert sum(d.weight for d in dims) == pytest.approx(1.0)
+        assert result.best_pathway.pathway_id in result.pareto_frontier
+
+
+class TestRerank:
+    """Slider changes re-weight the cached vectors."""
+
+    @pytest.mark.parametrize("seed", range(4))
+    def test_rerank_matches_fresh_optimization(self, seed):
+        pathways = _pathways(seed)
+        optimizer = PathwayOptimizer()
+        first = optimizer.optimize_pathways(pathways)
+        rng = random.Random(seed)
+        preferences = {d: rng.uniform(0.0, 1.0) for d in PathwayOptimizer.DIMENSIONS}
+        reranked = optimizer.rerank(first.frontier_id, preferences)
+        assert _ranking(reranked) == _ranking(PathwayOptimizer().optimize_pathways(pathways, preferences))
+        # The cached scores stay unweighted
+        assert _ranking(optimizer.rerank(first.frontier_id)) == _ranking(first)
+
+    def test_ties_keep_generation_order(self):
+        optimizer = PathwayOptimizer()
+        built = optimizer.build_frontier(_pathways(3))
+        # Equal speed; the second pathway dominates the first on stability
+        frontier = replace(
+            built,
+            scores=built.scores[:2],
+            vectors=[(0.5, 0.2, 0.0, 0.0, 0.0), (0.5, 0.4, 0.0, 0.0, 0.0)],
+            frontier=[1],
+        )
+        weights = {d: 0.0 for d in PathwayOptimizer.DIMENSIONS}
+        weights['speed'] = 1.0
+        result = optimizer.rank_frontier(frontier, weights)
+        assert [s.pathway_id for s in result.scored_pathways] == [s.pathway_id for s in built.scores[:2]]
+
+    def test_zero_weights_rejected(self):
+        optimizer = PathwayOptimizer()
+        result = optimizer.optimize_pathways(_pathways(5))
+        with pytest.raises(ValueError):
+            optimizer.rerank(result.frontier_id, {d: 0 for d in PathwayOptimizer.DIMENSIONS})
+
+    def test_evicted_frontier_returns_none(self):
+        optimizer = PathwayOptimizer()
+        optimizer.FRONTIER_CACHE_SIZE = 2
+        pathways = _pathways(6)
+        first = optimizer.optimize_pathways(pathways)
+        optimizer.optimize_pathways(pathways)
+        optimizer.optimize_pathways(pathways)
+        assert optimizer.rerank(first.frontier_id) is None
+        assert optimizer.rerank("unknown") is None
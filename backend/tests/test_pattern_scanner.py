@@ -0,0 +1,114 @@
+"""
+Tests for the compiled input-validation scanner.
+
+Tests cover required-literal extraction, parity with searching every
+pattern separately (with and without the Aho-Corasick prefilter), and the
+threat levels reported for strings and JSON payloads.
+"""
+
+import html
+import random
+import re
+from urllib.parse import unquote
+
+import pytest
+
+from security import validation, prompt_injection
+from security.scanner import PatternScanner, required_literals
+from security.types import ThreatLevel
+
+
+FRAGMENTS = [
+    "select ", " from ", "Union Select", "update x set", "drop table", "exec(", " or 1=1", "' OR '1'='1",
+    "/*", "--", "\n", ";drop", "sleep(", "<script>", "onError =", "JavaScript :", "data:text/html",
+    "<iframe>", "<embed ", "&lt;script&gt;", "%3Cscript%3E", "$(", "`ls`", "bash", "Sh", "cat /",
+    "/bin/sh", "${HOME}", "../", "%2E%2E\\", "..%5C", "DAN", "developer mode", "ignore all instructions",
+    "[SYSTEM]", "<|im_start|>", "### System:", "bypass filters", "``````", "\\u0041", "&#x41;",
+    "when I say 'x'", "the plan ", "ſh", "é", " ", "=", "'", "1", ";", "<", ">", "/", "%", "&",
+]
+
+
+def _reference_attacks(value: str) -> list[str]:
+    decoded = unquote(value)
+    html_decoded = html.unescape(decoded)
+    return (
+        [f"sql_injection:{p[:30]}" for p in validation.SQL_INJECTION_PATTERNS if re.search(p, decoded)]
+        + [f"xss:{p[:30]}" for p in validation.XSS_PATTERNS if re.search(p, html_decoded)]
+        + [f"command_injection:{p[:30]}" for p in validation.COMMAND_INJECTION_PATTERNS if re.search(p, decoded)]
+        + [f"path_traversal:{p[:30]}" for p in validation.PATH_TRAVERSAL_PATTERNS
+           if re.search(p, decoded, re.IGNORECASE)]
+    )
+
+
+def _reference_prompt(text: str) -> list[str]:
+    return [
+        f"{category}:{p[:40]}"
+        for category, patterns in prompt_injection._CATEGORIES
+        for p in patterns if re.search(p, text)
+    ]
+
+
+def _samples(count: int = 3000):
+    rng = random.Random(7)
+    for _ in range(count):
+        sample = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 8)))
+        yield sample.upper() if rng.random() < 0.3 else sample
+
+
+class TestRequiredLiterals:
+    """Literals every match must contain."""
+
+    def test_conjunction_of_alternatives(self):
+        literals = required_literals(r"(?i)(\bor\b|\band\b)\s*['\"]?\d+['\"]?\s*=\s*['\"]?\d+['\"]?")
+        assert set(map(frozenset, literals)) == {frozenset({"or", "and"}), frozenset({"="})}
+
+    def test_optional_parts_are_not_required(self):
+        assert required_literals(r"/bin/(ba)?sh") == (("/bin/",), ("sh",))
+        assert required_literals(r"\s*") is None
+
+
+class TestParity:
+    """Prefiltered scans report exactly what per-pattern searches report."""
+
+    @pytest.mark.parametrize("automaton", [True, False])
+    def test_attacks_match_reference(self, automaton, monkeypatch):
+        if not automaton:
+            for scanner in (validation._ATTACK_SCANNER, validation._URL_DECODED_SCANNER, validation._XSS_SCANNER):
+                monkeypatch.setattr(scanner, "_automaton", None)
+        for sample in _samples():
+            assert validation.scan_attacks(sample)[0] == _reference_attacks(sample), sample
+
+    def test_prompt_injection_matches_reference(self):
+        for sample in _samples():
+            assert prompt_injection._SCANNER.scan(sample) == _reference_prompt(sample), sample
+
+    def test_category_flags(self):
+        scanner = PatternScanner([("a", [r"abc"]), ("b", [r"abc"], re.IGNORECASE)])
+        assert scanner.scan("ABC") == ["b:abc"]
+
+
+class TestThreatLevels:
+    """Same levels as running each detector in validate_input."""
+
+    @pytest.mark.parametrize("value,level", [
+        ("quarterly revenue plan", ThreatLevel.NONE),
+        ("<script>alert(1)</script>", ThreatLevel.HIGH),
+        ("../../etc/passwd", ThreatLevel.HIGH),
+        ("1' OR '1'='1", ThreatLevel.CRITICAL),
+        ("&lt;script&gt; and $(whoami)", ThreatLevel.CRITICAL),
+    ])
+    def test_validate_input(self, value, level):
+        result = validation.validate_input(value, sanitize=False)
+        assert result.threat_level == level
+        assert result.is_valid == (level == ThreatLevel.NONE)
+
+    def test_payload_stops_at_critical(self):
+        payload = {"a": "<iframe>", "b": ["x; DROP TABLE users"], "c": {"d": "$(id)"}}
+        result = validation.validate_json_payload(payload)
+        assert result.threat_level == ThreatLevel.CRITICAL
+        assert not any(t.startswith("command_injection") for t in result.threats_detected)
+
+    def test_size_cap(self):
+        value = "a" * 100 + "<script>"
+        assert validation.scan_attacks(value, max_chars=100)[1] == ThreatLevel.NONE
+        assert validation.scan_attacks(value)[1] == ThreatLevel.HIGH
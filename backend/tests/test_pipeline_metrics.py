@@ -0,0 +1,97 @@
+"""
+Tests for the inference pipeline metrics.
+
+Tests cover histogram buckets and quantile estimates, the Prometheus text
+rendering, and folding a finished StagePipeline (inline, timed and
+background stages) into the stage histograms.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from pipeline_metrics import Histogram, PipelineMetrics
+from pipeline_stages import StagePipeline
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def _boom():
+    raise ValueError("boom")
+
+
+class TestHistogram:
+    """Cumulative buckets with Prometheus semantics."""
+
+    def test_buckets_sum_and_count(self):
+        histogram = Histogram("h", "help", ("stage",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, stage="call1")
+        lines = list(histogram.lines())
+        assert lines == [
+            'h_bucket{stage="call1",le="0.1"} 2',
+            'h_bucket{stage="call1",le="1"} 3',
+            'h_bucket{stage="call1",le="+Inf"} 4',
+            'h_sum{stage="call1"} 3.65',
+            'h_count{stage="call1"} 4',
+        ]
+
+    def test_quantiles_interpolate_within_bucket(self):
+        histogram = Histogram("h", "help", buckets=(1.0, 2.0))
+        for value in (0.5, 1.5, 1.5, 1.5):
+            histogram.observe(value)
+        snapshot = histogram.snapshot()["_"]
+        assert snapshot["count"] == 4
+        assert snapshot["p50"] == pytest.approx(1.333333, rel=1e-4)
+        assert 1.0 < snapshot["p95"] <= 2.0
+
+
+class TestPipelineMetrics:
+    """Stage timings and LLM throughput."""
+
+    def test_record_pipeline(self):
+        async def run():
+            stages = StagePipeline("test")
+            stages.start("background", _sleep, 0.02)
+            stages.begin("call1")
+            await asyncio.sleep(0.01)
+            stages.end("call1")
+            assert await stages.timed("bottleneck_detection", _sleep, 0.01) == 0.01
+            with pytest.raises(ValueError):
+                await stages.timed("leverage_identification", _boom)
+            await stages.result("background")
+            return stages
+
+        stages = asyncio.run(run())
+        assert stages.duration("call1") >= 0.01 and stages.duration("missing") is None
+        assert stages.summary()[-1]["failed"] is True
+
+        metrics = PipelineMetrics(otel_export=False)
+        metrics.record_pipeline(stages, success=True)
+        snapshot = metrics.snapshot()
+        assert set(snapshot["oof_pipeline_stage_seconds"]) == {
+            "background", "call1", "bottleneck_detection", "leverage_identification"
+        }
+        assert set(snapshot["oof_pipeline_stage_wait_seconds"]) == {"background"}
+        assert snapshot["oof_pipeline_seconds"]["success"]["count"] == 1
+
+    def test_llm_tokens_and_rate(self):
+        metrics = PipelineMetrics(otel_export=False)
+        metrics.observe_llm("call2", input_tokens=1000, output_tokens=500, generation_seconds=10.0)
+        metrics.observe_llm("call2", output_tokens=100, generation_seconds=None)
+        snapshot = metrics.snapshot()
+        assert snapshot["oof_llm_tokens_total"] == {"call2,input": 1000, "call2,output": 600}
+        assert snapshot["oof_llm_tokens_per_second"]["call2"]["count"] == 1
+
+    def test_render_exposition(self):
+        metrics = PipelineMetrics(otel_export=False)
+        metrics.observe_modules({"bottlenecks": 0.0004})
+        text = metrics.render()
+        assert "# TYPE oof_inference_module_seconds histogram" in text
+        assert 'oof_inference_module_seconds_bucket{module="bottlenecks",le="0.0005"} 1' in text
+        assert "# TYPE oof_llm_tokens_total counter" in text
+        assert text.endswith("\n")
@@ -0,0 +1,71 @@
+"""
+Tests for overlapped pipeline stages.
+
+Tests cover background stages running concurrently with inline work,
+fallback on failure, and the per-stage timing summary.
+"""
+
+import asyncio
+import time
+
+from pipeline_stages import StagePipeline
+
+
+def _slow_sync(value, delay=0.05):
+    time.sleep(delay)
+    return value
+
+
+async def _slow_async(value, delay=0.05):
+    await asyncio.sleep(delay)
+    return value
+
+
+def _boom():
+    raise ValueError("boom")
+
+
+class TestStagePipeline:
+    """Background stages overlap the critical path."""
+
+    def test_background_overlaps_inline_stage(self):
+        async def run():
+            stages = StagePipeline("test")
+            stages.start("sync_bg", _slow_sync, "a")
+            stages.start("async_bg", _slow_async, "b")
+            stages.begin("call1")
+            await asyncio.sleep(0.08)
+            stages.end("call1")
+            results = (await stages.result("sync_bg"), await stages.result("async_bg"))
+            return results, {row["stage"]: row for row in stages.summary()}
+
+        start = time.perf_counter()
+        results, rows = asyncio.run(run())
+        assert results == ("a", "b")
+        assert time.perf_counter() - start < 0.15
+        assert rows["call1"]["background"] is False
+        assert rows["sync_bg"]["waited_ms"] < 20
+        assert rows["async_bg"]["end_ms"] <= rows["call1"]["end_ms"]
+
+    def test_failed_stage_returns_default(self):
+        async def run():
+            stages = StagePipeline("test")
+            stages.start("bad", _boom)
+            value = await stages.result("bad", default="fallback")
+            missing = await stages.result("never_started", default=0)
+            return value, missing, stages.summary()
+
+        value, missing, summary = asyncio.run(run())
+        assert (value, missing) == ("fallback", 0)
+        assert summary[0]["failed"] is True
+
+    def test_cancel_stops_pending_stages(self):
+        async def run():
+            stages = StagePipeline("test")
+            stages.start("slow", _slow_async, "x", delay=5)
+            await asyncio.sleep(0)
+            stages.cancel()
+            await asyncio.sleep(0)
+            return stages._tasks["slow"].cancelled()
+
+        assert asyncio.run(run())
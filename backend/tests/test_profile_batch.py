@@ -0,0 +1,186 @@
+"""
+Tests for batched profile computation.
+
+Tests cover parity of the columnar batch output with the scalar
+calculate_full_profile + _flatten_profile path (including rows that fall
+back to the scalar engines), missing-value handling, input validation,
+and that in-range rows never touch the scalar engines. The wall-clock
+comparison with a per-row loop is a benchmark, skipped unless
+RUN_BENCHMARKS is set.
+"""
+
+import math
+import os
+import time
+
+import numpy as np
+import pytest
+
+from formulas import OOFInferenceEngine
+from formulas.batch import OPERATOR_COLUMNS, SUMMARY_COLUMNS, to_operator_matrix
+
+
+def _rows():
+    full = {name: 0.2 + (i % 9) * 0.07 for i, name in enumerate(OPERATOR_COLUMNS)}
+    shifted = {name: min(0.95, v + 0.11) for name, v in full.items()}
+    sparse = {name: full[name] for name in ('W_witness', 'A_aware', 'P_presence', 'M_maya', 'Co_coherence')}
+    return [full, shifted, sparse, full], [4.5, 6.0, 3.0, None]
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return OOFInferenceEngine()
+
+
+def _random_rows(n: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    rows, s_levels = [], []
+    for i in range(n):
+        keep = rng.random(len(OPERATOR_COLUMNS)) > (0.3 if i % 3 == 0 else 0.0)
+        values = rng.uniform(0, 1, len(OPERATOR_COLUMNS))
+        rows.append({name: float(v) for name, v, k in zip(OPERATOR_COLUMNS, values, keep) if k})
+        # Half-step s-levels land on realism range boundaries
+        s_levels.append(None if i % 11 == 0 else float(np.round(rng.uniform(0, 9) * 2) / 2))
+    return rows, s_levels
+
+
+def _edge_rows(n: int, seed: int = 11):
+    """Boundary values, very sparse rows, out-of-range operators and s-levels."""
+    rng = np.random.default_rng(seed)
+    rows, s_levels = [], []
+    for i in range(n):
+        values = rng.choice([0.0, 0.5, 1.0], len(OPERATOR_COLUMNS))
+        if i % 4 == 3:
+            values = rng.uniform(-0.5, 1.5, len(OPERATOR_COLUMNS))
+        keep = rng.random(len(OPERATOR_COLUMNS)) > (0.2, 0.5, 0.8, 0.1)[i % 4]
+        rows.append({name: float(v) for name, v, k in zip(OPERATOR_COLUMNS, values, keep) if k})
+        s_levels.append(None if i % 13 == 0 else float(rng.choice([-1.0, 0.0, 1.0, 4.0, 4.5, 6.0, 7.5, 9.0])))
+    return rows, s_levels
+
+
+def _scalar_values(engine, operators, s_level, modules=None):
+    try:
+        profile = engine.calculate_full_profile(operators, s_level, include_modules=modules)
+    except Exception as e:
+        return {"_error": f"{type(e).__name__}: {e}"}
+    return engine._flatten_profile(profile, {})
+
+
+def _assert_parity(engine, rows, s_levels, modules=None):
+    columns = engine.calculate_profiles_batch(to_operator_matrix(rows), s_levels, include_modules=modules)
+    for i, (operators, s_level) in enumerate(zip(rows, s_levels)):
+        values = _scalar_values(engine, operators, s_level, modules)
+        for key, expected in values.items():
+            assert key in columns, key
+            assert _matches(expected, columns[key][i]), (i, key, expected, columns[key][i])
+        for key, column in columns.items():
+            if key not in values:
+                assert _matches(None, column[i]), (i, key, column[i])
+    return columns
+
+
+def _matches(expected, actual) -> bool:
+    if expected is None:
+        return actual is None or (isinstance(actual, float) and math.isnan(actual))
+    if isinstance(expected, str):
+        return actual == expected
+    return math.isclose(expected, actual, rel_tol=1e-9, abs_tol=1e-12)
+
+
+class TestBatchParity:
+    """Batch columns equal the scalar flattened profile row by row."""
+
+    def test_every_scalar_value_matches(self, engine):
+        rows, s_levels = _rows()
+        _assert_parity(engine, rows, s_levels)
+
+    def test_all_modules_match_on_random_rows(self, engine):
+        rows, s_levels = _random_rows(150)
+        _assert_parity(engine, rows, s_levels)
+
+    def test_edge_rows_match_including_errors(self, engine):
+        rows, s_levels = _edge_rows(120)
+        columns = _assert_parity(engine, rows, s_levels)
+        # Rows where the scalar engines raise are reported, not dropped
+        assert any(error is not None for error in columns["_error"])
+
+    @pytest.mark.parametrize("modules", [
+        ["emotions", "realism"],
+        ["cascade", "circles", "panchakritya"],
+        ["death", "multi_reality"],
+        ["hierarchical"],
+    ])
+    def test_module_subsets_match(self, engine, modules):
+        rows, s_levels = _edge_rows(60, seed=5)
+        _assert_parity(engine, rows, s_levels, modules)
+
+    def test_missing_operators_are_nan(self, engine):
+        rows, s_levels = _rows()
+        columns = engine.calculate_profiles_batch(to_operator_matrix(rows), s_levels)
+        assert math.isnan(columns["op_K_karma"][2])
+        assert math.isnan(columns["unity_vector"][3])
+
+    def test_scalar_s_level_broadcasts(self, engine):
+        rows, _ = _rows()
+        columns = engine.calculate_profiles_batch(to_operator_matrix(rows[:2]), 5.0, include_modules=["unity"])
+        assert set(columns) == {
+            "unity_separation_distance", "unity_distortion_field", "unity_percolation_quality",
+            "unity_vector", "unity_net_direction", *SUMMARY_COLUMNS,
+        }
+        assert columns["unity_separation_distance"][0] == columns["unity_separation_distance"][1]
+
+
+class TestBatchValidation:
+    """Input validation."""
+
+    def test_wrong_width_rejected(self, engine):
+        with pytest.raises(ValueError):
+            engine.calculate_profiles_batch(np.zeros((2, 3)), [4.0, 4.0])
+
+    def test_unknown_column_rejected(self, engine):
+        with pytest.raises(ValueError):
+            engine.calculate_profiles_batch(np.zeros((1, 1)), [4.0], columns=["Not_an_operator"])
+
+    def test_s_level_length_checked(self, engine):
+        with pytest.raises(ValueError):
+            engine.calculate_profiles_batch(to_operator_matrix(_rows()[0]), [4.0])
+
+
+class TestBatchCost:
+    """The batch path does less work than calling the scalar engine per row."""
+
+    def test_in_range_rows_skip_scalar_engines(self, engine, monkeypatch):
+        def fail(*args, **kwargs):
+            raise AssertionError("scalar engine called for an in-range row")
+
+        monkeypatch.setattr(engine, "calculate_full_profile", fail)
+        monkeypatch.setattr(engine.emotion_analyzer, "analyze", fail)
+        monkeypatch.setattr(engine.realism_engine, "calculate_realism_profile", fail)
+        rng = np.random.default_rng(3)
+        matrix = rng.uniform(0.05, 0.95, (20, len(OPERATOR_COLUMNS)))
+        engine.calculate_profiles_batch(matrix, rng.uniform(1.0, 8.0, 20))
+
+
+@pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="Wall-clock benchmark (set RUN_BENCHMARKS=1)")
+class TestBatchBenchmark:
+    """Batch vs. per-row loop timing; opt-in since wall-clock races are flaky."""
+
+    def test_not_slower_than_loop(self, engine):
+        rng = np.random.default_rng(3)
+        matrix = rng.uniform(0.05, 0.95, (80, len(OPERATOR_COLUMNS)))
+        rows = [dict(zip(OPERATOR_COLUMNS, map(float, row))) for row in matrix]
+        s_levels = list(rng.uniform(1.0, 8.0, 80))
+
+        def loop():
+            for operators, s_level in zip(rows, s_levels):
+                engine._flatten_profile(engine.calculate_full_profile(operators, s_level), {})
+
+        def best(fn, repeat=3):
+            times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                fn()
+                times.append(time.perf_counter() - start)
+            return min(times)
+
+        assert best(lambda: engine.calculate_profiles_batch(matrix, s_levels)) <= best(loop)
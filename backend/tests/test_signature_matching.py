@@ -0,0 +1,91 @@
+"""
+Tests for consciousness signature matching.
+
+Tests cover ranking parity with the original per-signature substring scan,
+the (goal, S-level bucket) result cache, and signature packs round-tripped
+through export_to_json / load_from_json.
+"""
+
+import dataclasses
+import random
+
+import pytest
+
+from reverse_causality.consciousness_signatures import ConsciousnessSignatureLibrary
+
+
+def _reference(library, goal_text, current_s_level):
+    """The original scan, with keywords lowercased like the index."""
+    goal_lower = goal_text.lower()
+    matches = []
+    for sig in library.signatures.values():
+        keyword_matches = sum(1 for kw in sig.keywords if kw.lower() in goal_lower)
+        if keyword_matches > 0:
+            s_level_gap = sig.min_s_level - current_s_level
+            relevance = keyword_matches * 10
+            if s_level_gap <= 1.5:
+                relevance += 20
+            if s_level_gap <= 0:
+                relevance += 10
+            matches.append((sig, relevance))
+    matches.sort(key=lambda x: -x[1])
+    return [sig.id for sig, _ in matches]
+
+
+@pytest.fixture(scope="module")
+def library():
+    return ConsciousnessSignatureLibrary()
+
+
+def _goal(rng, keywords):
+    words = ["I", "want", "to", "start", "deeper", "my", "the", "newest", "a"] + keywords
+    return " ".join(rng.choice(words) for _ in range(rng.randint(3, 14)))
+
+
+class TestMatching:
+    """Single-pass matching ranks exactly like the scan."""
+
+    @pytest.mark.parametrize("seed", range(25))
+    def test_parity_with_reference(self, library, seed):
+        rng = random.Random(seed)
+        keywords = sorted({kw for sig in library.signatures.values() for kw in sig.keywords})
+        goal = _goal(rng, keywords)
+        if rng.random() < 0.5:
+            goal = goal.upper()
+        s_level = rng.choice([1.0, 2.5, 3.0, 4.2, 5.5, 7.0])
+        found = [sig.id for sig in library.find_signatures_for_goal(goal, s_level)]
+        assert found == _reference(library, goal, s_level)
+
+    def test_substring_and_case_matches(self, library):
+        found = [sig.id for sig in library.find_signatures_for_goal("Become a better CEO and restart my Artwork", 4.0)]
+        assert found == _reference(library, "Become a better CEO and restart my Artwork", 4.0)
+        assert any("ceo" in [kw.lower() for kw in library.signatures[i].keywords] for i in found)
+
+    def test_cache_reuses_ranking_within_bucket(self, library):
+        goal = "build wealth and abundance through my business"
+        first = library.find_signatures_for_goal(goal, 3.05)
+        cached = len(library._match_cache)
+        second = library.find_signatures_for_goal(goal, 3.1)
+        assert [s.id for s in first] == [s.id for s in second]
+        assert len(library._match_cache) == cached
+        assert [s.id for s in library.find_signatures_for_goal(goal, 9.0)] == _reference(library, goal, 9.0)
+
+
+class TestSignaturePacks:
+    """Custom packs refresh the index."""
+
+    def test_round_trip_with_custom_signature(self, library, tmp_path):
+        custom = dataclasses.replace(
+            library.signatures["wealth_foundation"], id="podcast_launch", name="Podcast Launch",
+            keywords=["podcast", "audience"]
+        )
+        source = ConsciousnessSignatureLibrary()
+        source.add_signature(custom)
+        path = tmp_path / "pack.json"
+        source.export_to_json(str(path))
+
+        loaded = ConsciousnessSignatureLibrary()
+        loaded.signatures.clear()
+        assert loaded.load_from_json(str(path)) == len(source.signatures)
+        assert loaded.signatures["podcast_launch"] == custom
+        assert [s.id for s in loaded.find_signatures_for_goal("grow my podcast audience", 4.0)] == ["podcast_launch"]
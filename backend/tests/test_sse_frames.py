@@ -0,0 +1,137 @@
+"""
+Tests for SSE token coalescing.
+
+Tests cover frame boundaries (size, time window, other events), that the
+relayed text and event order are unchanged, error propagation, and closing
+the generator when the client goes away (without losing a buffered frame).
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from sse_frames import StreamEvent, TextDelta, coalesce_tokens, encode_frames
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def _collect(stream):
+    return [event async for event in stream]
+
+
+async def _events(items, delay=0.0):
+    for item in items:
+        if delay:
+            await asyncio.sleep(delay)
+        yield item
+
+
+def _texts(events):
+    return [e.payload["text"] for e in events if isinstance(e, StreamEvent) and e.event == "token"]
+
+
+class TestFrames:
+    """Where frames are cut."""
+
+    def test_other_events_flush_and_keep_order(self):
+        items = [
+            {"event": "status", "data": "{}"},
+            TextDelta("Hel"), TextDelta("lo"), TextDelta(""),
+            StreamEvent("usage", {"output_tokens": 3}),
+            TextDelta(" world"),
+        ]
+        out = run(_collect(coalesce_tokens(_events(items), window_ms=1000)))
+        assert out == [
+            {"event": "status", "data": "{}"},
+            StreamEvent("token", {"text": "Hello"}),
+            StreamEvent("usage", {"output_tokens": 3}),
+            StreamEvent("token", {"text": " world"}),
+        ]
+
+    def test_size_limit(self):
+        items = [TextDelta("ab")] * 5
+        out = run(_collect(coalesce_tokens(_events(items), window_ms=1000, max_chars=4)))
+        assert _texts(out) == ["abab", "abab", "ab"]
+
+    def test_time_window(self):
+        # Deltas 30 ms apart with a 10 ms window: each goes out on its own
+        items = [TextDelta("a"), TextDelta("b"), TextDelta("c")]
+        out = run(_collect(coalesce_tokens(_events(items, delay=0.03), window_ms=10)))
+        assert _texts(out) == ["a", "b", "c"]
+
+    def test_encode_frames(self):
+        items = [TextDelta("x"), TextDelta("y"), StreamEvent("title", {"title": "T"})]
+        out = run(_collect(encode_frames(_events(items), window_ms=1000)))
+        assert out == [
+            {"event": "token", "data": json.dumps({"text": "xy"})},
+            {"event": "title", "data": json.dumps({"title": "T"})},
+        ]
+
+
+class TestLifecycle:
+    """Errors and early close."""
+
+    def test_error_after_flush(self):
+        async def failing():
+            yield TextDelta("partial")
+            raise ValueError("boom")
+
+        async def scenario():
+            seen = []
+            with pytest.raises(ValueError):
+                async for event in coalesce_tokens(failing(), window_ms=1000):
+                    seen.append(event)
+            return seen
+
+        assert _texts(run(scenario())) == ["partial"]
+
+    def test_close_stops_generator(self):
+        closed = []
+
+        async def endless():
+            try:
+                while True:
+                    yield TextDelta("t")
+                    await asyncio.sleep(0)
+            finally:
+                closed.append(True)
+
+        async def scenario():
+            stream = coalesce_tokens(endless(), window_ms=1000, max_chars=3)
+            first = await stream.__anext__()
+            await stream.aclose()
+            return first
+
+        assert run(scenario()) == StreamEvent("token", {"text": "ttt"})
+        assert closed == [True]
+
+    def test_cancel_mid_frame_keeps_buffered_text(self):
+        async def stalled():
+            yield TextDelta("Hel")
+            yield TextDelta("lo")
+            await asyncio.sleep(10)
+
+        async def scenario():
+            unsent, seen = [], []
+
+            async def relay():
+                async for event in coalesce_tokens(stalled(), window_ms=5000, unsent=unsent):
+                    seen.append(event)
+
+            task = asyncio.create_task(relay())
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return seen, unsent
+
+        assert run(scenario()) == ([], ["Hello"])
+
+    def test_nothing_unsent_after_full_stream(self):
+        unsent = []
+        items = [TextDelta("a"), StreamEvent("usage", {}), TextDelta("b")]
+        out = run(_collect(coalesce_tokens(_events(items), window_ms=1000, unsent=unsent)))
+        assert _texts(out) == ["a", "b"] and unsent == []
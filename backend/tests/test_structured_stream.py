@@ -0,0 +1,171 @@
+"""
+Tests for structured-block marker detection in the articulation stream.
+
+Tests cover span-for-span parity with the original buffer/find/endswith
+loop on randomized token streams, marker priority, content collection, and
+the incremental structured-data parser (chunking parity with json.loads,
+truncation repair, fallback on malformed blocks).
+"""
+
+import json
+import random
+
+import pytest
+
+from structured_stream import (
+    STRUCT_BLOCK_MARKERS,
+    MarkerAutomaton,
+    StructuredBlockSplitter,
+    StructuredDataParser,
+)
+
+
+def _reference(tokens):
+    """The original inference_stream loop, kept as the parity oracle."""
+    spans, full_content, pending_buffer, in_block = [], "", "", False
+    for token in tokens:
+        full_content += token
+        if in_block:
+            continue
+        pending_buffer += token
+        marker_pos = -1
+        for marker in STRUCT_BLOCK_MARKERS:
+            pos = pending_buffer.find(marker)
+            if pos != -1:
+                marker_pos = pos
+                break
+        if marker_pos != -1:
+            in_block = True
+            before = pending_buffer[:marker_pos].rstrip()
+            if before:
+                spans.append(before)
+        elif not any(
+            pending_buffer.endswith(marker[:i])
+            for marker in STRUCT_BLOCK_MARKERS
+            for i in range(1, min(len(marker), len(pending_buffer)) + 1)
+        ):
+            spans.append(pending_buffer)
+            pending_buffer = ""
+    if pending_buffer and not in_block:
+        spans.append(pending_buffer)
+    return spans, full_content
+
+
+def _split(tokens):
+    splitter = StructuredBlockSplitter()
+    spans = [span for span in (splitter.feed(t) for t in tokens) if span]
+    tail = splitter.finish()
+    if tail:
+        spans.append(tail)
+    return spans, splitter.content
+
+
+def _tokenize(text, rng):
+    tokens, i = [], 0
+    while i < len(text):
+        n = rng.randint(1, 6)
+        tokens.append(text[i:i + n])
+        i += n
+    return tokens
+
+
+class TestParity:
+    """Emitted spans match the original loop exactly."""
+
+    @pytest.mark.parametrize("seed", range(40))
+    def test_random_streams(self, seed):
+        rng = random.Random(seed)
+        alphabet = ["`", "```", "=", "===", "\n", "json", "a", " ", "STRUCTURED_DATA_START", "x\n"]
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(5, 120)))
+        if rng.random() < 0.5:
+            text += rng.choice(STRUCT_BLOCK_MARKERS) + "===\n{}\n===STRUCTURED_DATA_END==="
+        tokens = _tokenize(text, rng)
+        assert _split(tokens) == _reference(tokens)
+
+    def test_marker_split_across_tokens(self):
+        tokens = ["Answer text. ", "``", "`js", "on\n=", "==STRUCTURED_DATA_START===", "{}"]
+        spans, content = _split(tokens)
+        assert (spans, content) == _reference(tokens)
+        assert spans == ["Answer text. "]
+        assert content == "".join(tokens)
+
+    def test_priority_follows_marker_order(self):
+        # Both markers complete in one token: the first listed marker wins
+        tokens = ["intro ===STRUCTURED_DATA_START then ```json\n=== rest"]
+        assert _split(tokens) == _reference(tokens)
+        assert _split(tokens)[0] == ["intro ===STRUCTURED_DATA_START then"]
+
+
+class TestAutomaton:
+    """Automaton construction."""
+
+    def test_overlapping_markers(self):
+        automaton = MarkerAutomaton(["abc", "bc", "c"])
+        state, seen = 0, []
+        for ch in "xabc":
+            state = automaton.step(state, ch)
+            seen.append(sorted(automaton.matches(state)))
+        assert seen == [[], [], [], [0, 1, 2]]
+
+    def test_empty_marker_rejected(self):
+        with pytest.raises(ValueError):
+            MarkerAutomaton(["ok", ""])
+
+
+STRUCTURED = {
+    "matrix_data": {"cells": {"0-0": {"dimensions": [{"value": 67, "note": "a \"quoted\" }, ]"}]}}},
+    "paths": [{"name": "release", "steps": [1, 2.5, -3e2]}],
+    "documents": [],
+    "score": 12,
+    "flag": True,
+    "follow_up_question": {"question_text": "Which?", "options": [{"id": "a", "text": "{x}"}]},
+}
+RESPONSE = (
+    "Answer prose.\n```json\n===STRUCTURED_DATA_START===\n```json\n"
+    + json.dumps(STRUCTURED, indent=2)
+    + "\n```\n===STRUCTURED_DATA_END==="
+)
+
+
+def _parse_stream(tokens):
+    splitter, parser, events = StructuredBlockSplitter(), StructuredDataParser(), []
+    for token in tokens:
+        splitter.feed(token)
+        if splitter.in_structured_block:
+            events.extend(parser.feed(splitter.block_text))
+    return parser, events
+
+
+class TestStructuredDataParser:
+    """Incremental parse of the structured-data block."""
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_chunked_parse_matches_json_loads(self, seed):
+        parser, events = _parse_stream(_tokenize(RESPONSE, random.Random(seed)))
+        assert parser.result() == STRUCTURED
+        assert [key for key, _ in events] == list(STRUCTURED)
+        assert dict(events) == STRUCTURED
+
+    def test_member_emitted_when_it_closes(self):
+        head, tail = RESPONSE.split('"documents"')
+        parser = StructuredDataParser()
+        keys = [key for key, _ in parser.feed(head)]
+        assert keys == ["matrix_data", "paths"]
+        assert [key for key, _ in parser.feed('"documents"' + tail)] == ["documents", "score", "flag", "follow_up_question"]
+
+    def test_truncated_block_is_repaired(self):
+        cut = RESPONSE[:RESPONSE.index('"options"') + 20]
+        parser = StructuredDataParser()
+        parser.feed(cut)
+        data = parser.result()
+        assert data["paths"] == STRUCTURED["paths"]
+        assert data["follow_up_question"]["question_text"] == "Which?"
+
+    def test_malformed_or_missing_block_falls_back(self):
+        parser = StructuredDataParser()
+        parser.feed("===STRUCTURED_DATA_START===\n{\"a\": [1, 2}, \"b\": 1}")
+        assert parser.failed and parser.result() is None
+
+        parser = StructuredDataParser()
+        parser.feed("no structured data here")
+        assert parser.result() is None
@@ -0,0 +1,204 @@
+"""
+Tests for streaming multipart uploads.
+
+Tests cover parsing bodies split at every chunk size, incremental file
+validation (rejections, size limits, temp-file cleanup), form field
+scanning, and parsing spooled files through the parse service with the
+same cache as base64 uploads, and which requests the security middleware
+exempts from its body-size limit.
+"""
+
+import asyncio
+import base64
+import io
+import os
+import zipfile
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+from starlette.responses import Response
+
+import file_parser
+from parse_service import FileParseService
+from security import middleware
+from security.file_upload import FileUploadValidator
+from security.rate_limiter import RateLimiter
+from security.types import SecurityConfig
+from upload_stream import UploadError, read_multipart, scan_fields
+
+
+BOUNDARY = "----formBoundary7MA4YWxkTrZu0gW"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def _zip_bytes() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("notes.md", "# Q3 plan")
+        zf.writestr("deck.pptx", b"not a deck")
+    return buffer.getvalue()
+
+
+def _body(fields: dict, files: list) -> bytes:
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'.encode() + value.encode()
+        )
+    for name, filename, content_type, data in files:
+        parts.append(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n".encode() + data
+        )
+    return b"\r\n".join(parts) + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+async def _chunks(body: bytes, size: int):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+ZIP = _zip_bytes()
+BODY = _body(
+    {"content": "What should I focus on?", "web_search_data": "false"},
+    [
+        ("attachments", "bundle.zip", "application/zip", ZIP),
+        ("attachments", "plan.md", "text/markdown", "Grow revenue\r\n--not a boundary".encode()),
+        ("attachments", "tool.exe", "application/octet-stream", b"MZ\x90\x00"),
+    ],
+)
+
+
+class TestReader:
+    """Fields and spooled files, whatever the chunking."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+    def test_parts(self, chunk_size):
+        form = run(read_multipart(CONTENT_TYPE, _chunks(BODY, chunk_size)))
+        try:
+            assert form.get("content") == "What should I focus on?"
+            assert form.get_bool("web_search_data", True) is False
+            assert [f.filename for f in form.files] == ["bundle.zip", "plan.md"]
+            with form.files[0].open() as f:
+                assert f.read() == ZIP
+            assert form.files[0].size == len(ZIP) and form.files[0].detected_mime_type == "application/zip"
+            assert form.rejected == [("tool.exe", "Dangerous file extension: .exe")]
+        finally:
+            form.discard()
+        assert not any(os.path.exists(f.path) for f in form.files)
+
+    def test_oversized_file_is_rejected_and_not_kept(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("upload_stream.UPLOAD_SPOOL_DIR", str(tmp_path))
+        body = _body({}, [("f", "big.txt", "text/plain", b"x" * 5000), ("f", "ok.txt", "text/plain", b"fine")])
+        form = run(read_multipart(CONTENT_TYPE, _chunks(body, 512), validator=FileUploadValidator(max_size=1000)))
+        assert form.rejected == [("big.txt", "File too large: 5000 bytes (max: 1000)")]
+        assert [f.filename for f in form.files] == ["ok.txt"] and len(os.listdir(tmp_path)) == 1
+        form.discard()
+        assert os.listdir(tmp_path) == []
+
+    def test_declared_content_types(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("upload_stream.UPLOAD_SPOOL_DIR", str(tmp_path))
+        body = _body({}, [
+            ("f", "data.csv", "text/csv; charset=utf-8", b"a,b\r\n1,2"),
+            ("f", "a.xlsx", "application/octet-stream", ZIP),
+            ("f", "notes.md", "application/octet-stream", b"# Notes"),
+            ("f", "plain.txt", "", b"text"),
+            ("f", "page.csv", "Text/HTML; charset=utf-8", b"<p>"),
+        ])
+        form = run(read_multipart(CONTENT_TYPE, _chunks(body, 1024)))
+        try:
+            assert [f.filename for f in form.files] == ["data.csv", "a.xlsx", "notes.md", "plain.txt"]
+            assert form.rejected == [("page.csv", "MIME type not allowed: text/html")]
+        finally:
+            form.discard()
+
+    @pytest.mark.parametrize("content_type,body,kwargs,status", [
+        ("application/json", BODY, {}, 415),
+        (CONTENT_TYPE, BODY[:-40], {}, 400),
+        (CONTENT_TYPE, BODY, {"max_total_size": 500}, 413),
+        (CONTENT_TYPE, BODY, {"max_files": 2}, 400),
+        (CONTENT_TYPE, BODY, {"max_field_size": 10}, 413),
+    ], ids=["not-multipart", "truncated", "total-size", "file-count", "field-size"])
+    def test_errors_clean_up(self, content_type, body, kwargs, status, tmp_path, monkeypatch):
+        monkeypatch.setattr("upload_stream.UPLOAD_SPOOL_DIR", str(tmp_path))
+        with pytest.raises(UploadError) as error:
+            run(read_multipart(content_type, _chunks(body, 256), **kwargs))
+        assert error.value.status_code == status
+        assert os.listdir(tmp_path) == []
+
+    def test_field_scan(self):
+        body = _body({"content": "x'; DROP TABLE users; --"}, [])
+        form = run(read_multipart(CONTENT_TYPE, _chunks(body, 64)))
+        with pytest.raises(UploadError):
+            scan_fields(form)
+
+
+class TestParsePaths:
+    """Spooled files parse like base64 uploads and share their cache."""
+
+    def test_parity_and_shared_cache(self):
+        async def scenario():
+            service = FileParseService(workers=0)
+            form = await read_multipart(CONTENT_TYPE, _chunks(BODY, 4096))
+            async with form:
+                from_paths = await service.parse_paths(form.parse_inputs())
+            from_base64 = await service.parse_file("bundle.zip", base64.b64encode(ZIP).decode(), "base64")
+            return from_paths, from_base64, service.cache.hits
+
+        from_paths, from_base64, hits = run(scenario())
+        assert from_paths[0] == from_base64 == file_parser.parse_file("bundle.zip", base64.b64encode(ZIP).decode(), "base64")
+        assert from_paths[1] == [file_parser.parse_text_file("plan.md", "Grow revenue\r\n--not a boundary")]
+        assert hits == 1
+
+
+class TestBodySizeLimit:
+    """Only multipart bodies to streamed upload routes skip MAX_REQUEST_BODY_SIZE."""
+
+    @staticmethod
+    def _dispatch(path: str, content_type: str, monkeypatch):
+        monkeypatch.setattr(middleware, "MAX_REQUEST_BODY_SIZE", 1024)
+        app = middleware.UnifiedSecurityMiddleware(
+            None,
+            config=SecurityConfig(rate_limit_enabled=False, audit_enabled=False),
+            rate_limiter=RateLimiter(),
+        )
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def call_next(request):
+            return Response(status_code=200)
+
+        request = Request({
+            "type": "http",
+            "method": "POST",
+            "path": path,
+            "query_string": b"",
+            "headers": [(b"content-type", content_type.encode()), (b"content-length", b"4096")],
+            "client": ("127.0.0.1", 5000),
+        }, receive=receive)
+        return run(app.dispatch(request, call_next))
+
+    @pytest.mark.parametrize("path", [
+        "/chat/conversations/conv-1/files/multipart",
+        "/chat/conversations/conv-1/messages/multipart",
+        "/goals/discover-from-files/multipart",
+    ])
+    def test_streamed_upload_routes_are_exempt(self, path, monkeypatch):
+        assert self._dispatch(path, CONTENT_TYPE, monkeypatch).status_code == 200
+
+    @pytest.mark.parametrize("path,content_type", [
+        ("/chat/conversations/conv-1/files/multipart", "application/json"),
+        ("/goals/discover-from-files/multipart", "application/json"),
+        ("/chat/conversations/conv-1/multipart", CONTENT_TYPE),
+        ("/admin/import/multipart", CONTENT_TYPE),
+        ("/chat/conversations/conv-1/files/multipart/extra", CONTENT_TYPE),
+    ])
+    def test_other_large_bodies_get_413(self, path, content_type, monkeypatch):
+        with pytest.raises(HTTPException) as exc:
+            self._dispatch(path, content_type, monkeypatch)
+        assert exc.value.status_code == 413
@@ -0,0 +1,364 @@
+"""
+Upload Stream - Streaming multipart/form-data ingestion
+=======================================================
+
+The JSON upload endpoints carry files as base64 strings: the client inflates
+them by 4/3, the security middleware json.loads the whole body and
+regex-scans every string (blobs included), then the router decodes them
+again for the parser. The `/multipart` siblings of those endpoints read the
+request with `read_multipart` instead:
+
+- the body is consumed chunk by chunk from request.stream(); nothing holds
+  the whole request in memory
+- each file part is written straight to a temp file while
+  security.file_upload.FileStreamCheck validates it (filename, extension
+  and declared MIME type before the first byte; size, SHA-256 and content
+  checks as it streams). A rejected file stops being written and is
+  reported in `UploadForm.rejected`; the request carries on.
+- text fields are collected (size-capped) and scanned with the same
+  validate_json_payload the middleware applies to JSON bodies
+  (`scan_fields`)
+- parse_service.parse_paths hands the spooled paths, with their hashes, to
+  the parser workers, which open the files themselves
+
+The security middleware only scans application/json bodies, so multipart
+requests skip the JSON pass entirely. It also exempts multipart/form-data
+requests to the routes in STREAMED_UPLOAD_ROUTES from its
+MAX_REQUEST_BODY_SIZE Content-Length check: read_multipart caps the body at
+UPLOAD_MAX_TOTAL_SIZE as it streams, chunked bodies included.
+
+Configuration (environment):
+    UPLOAD_SPOOL_DIR            temp directory for spooled files (default: system temp)
+    UPLOAD_MAX_FILES            files per request (default: 10)
+    UPLOAD_MAX_TOTAL_SIZE       bytes across all parts (default: 50 MB)
+    UPLOAD_MAX_FIELD_SIZE       bytes per text field (default: 64 KB)
+
+Usage:
+    async with await read_multipart(http_request.headers.get("content-type", ""), http_request.stream()) as form:
+        scan_fields(form)
+        parsed_lists = await get_parse_service().parse_paths(form.parse_inputs())
+"""
+
+import os
+import re
+import tempfile
+from dataclasses import dataclass, field
+from typing import AsyncIterator, BinaryIO, Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+from logging_config import api_logger
+from security.file_upload import FileUploadValidator, get_file_validator
+from security.types import ThreatLevel, ValidationResult
+from security.validation import validate_json_payload
+
+
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR") or None
+UPLOAD_MAX_FILES = int(os.getenv("UPLOAD_MAX_FILES", "10"))
+UPLOAD_MAX_TOTAL_SIZE = int(os.getenv("UPLOAD_MAX_TOTAL_SIZE", str(50 * 1024 * 1024)))
+UPLOAD_MAX_FIELD_SIZE = int(os.getenv("UPLOAD_MAX_FIELD_SIZE", str(64 * 1024)))
+
+# Part headers larger than this are not a browser upload
+MAX_PART_HEADER_SIZE = 16 * 1024
+
+_PARAM_RE = re.compile(r';\s*([\w*-]+)\s*=\s*("(?:[^"\\]|\\.)*"|[^;]*)')
+
+
+class UploadError(Exception):
+    """Malformed or oversized multipart request (routers map it to an HTTP error)."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass
+class SpooledFile:
+    """One validated file part, spooled to disk."""
+    field_name: str
+    filename: str               # sanitized
+    path: str
+    size: int
+    sha256: str
+    content_type: Optional[str] = None
+    detected_mime_type: Optional[str] = None
+
+    @property
+    def type(self) -> str:
+        """File type label as the JSON uploads send it ("pdf", "xlsx", ...)."""
+        return os.path.splitext(self.filename)[1].lstrip(".").lower() or "unknown"
+
+    def open(self) -> BinaryIO:
+        return open(self.path, "rb")
+
+    def discard(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+@dataclass
+class UploadForm:
+    """Fields, spooled files and rejected files of one multipart request."""
+    fields: Dict[str, List[str]] = field(default_factory=dict)
+    files: List[SpooledFile] = field(default_factory=list)
+    rejected: List[Tuple[str, str]] = field(default_factory=list)  # (filename, reason)
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        values = self.fields.get(name)
+        return values[0] if values else default
+
+    def get_bool(self, name: str, default: bool) -> bool:
+        value = self.get(name)
+        if value is None:
+            return default
+        return value.strip().lower() in ("1", "true", "yes", "on")
+
+    def parse_inputs(self) -> List[Tuple[str, str, str]]:
+        """(filename, path, sha256) for parse_service.parse_paths."""
+        return [(f.filename, f.path, f.sha256) for f in self.files]
+
+    def discard(self) -> None:
+        """Delete the spooled files."""
+        for spooled in self.files:
+            spooled.discard()
+
+    async def __aenter__(self) -> "UploadForm":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.discard()
+
+
+# =============================================================================
+# HEADER PARSING
+# =============================================================================
+
+def _params(header_value: str) -> Dict[str, str]:
+    """Parameters of a header value (`; name="x"; filename*=UTF-8''y`)."""
+    params = {}
+    for key, value in _PARAM_RE.findall(header_value):
+        value = value.strip()
+        if value.startswith('"') and value.endswith('"'):
+            value = re.sub(r"\\(.)", r"\1", value[1:-1])
+        key = key.lower()
+        if key.endswith("*"):
+            # RFC 5987: charset'language'percent-encoded
+            charset, _, encoded = value.partition("'")
+            _, _, encoded = encoded.partition("'")
+            params[key[:-1]] = unquote(encoded, encoding=charset or "utf-8", errors="replace")
+        else:
+            params.setdefault(key, value)
+    return params
+
+
+def boundary_of(content_type: str) -> bytes:
+    """The multipart boundary of a Content-Type header."""
+    if not content_type.lower().startswith("multipart/form-data"):
+        raise UploadError(415, "Expected multipart/form-data")
+    boundary = _params(content_type).get("boundary")
+    if not boundary or len(boundary) > 200:
+        raise UploadError(400, "Missing multipart boundary")
+    return boundary.encode("latin-1")
+
+
+def _part_headers(raw: bytes) -> Dict[str, str]:
+    headers = {}
+    for line in raw.decode("utf-8", errors="replace").split("\r\n"):
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return headers
+
+
+# =============================================================================
+# PART SINKS
+# =============================================================================
+
+class _FieldSink:
+    def __init__(self, name: str, max_size: int):
+        self.name = name
+        self.max_size = max_size
+        self.data = bytearray()
+
+    def write(self, chunk: bytes) -> None:
+        self.data += chunk
+        if len(self.data) > self.max_size:
+            raise UploadError(413, f"Field {self.name!r} is too large")
+
+    def close(self, form: UploadForm) -> None:
+        form.fields.setdefault(self.name, []).append(self.data.decode("utf-8", errors="replace"))
+
+
+class _FileSink:
+    def __init__(self, name: str, filename: str, content_type: Optional[str], validator: FileUploadValidator):
+        self.name = name
+        self.filename = filename
+        self.content_type = content_type
+        self.check = validator.begin(filename, content_type)
+        self._file = None
+        self.path = None
+        if not self.check.rejected:
+            fd, self.path = tempfile.mkstemp(prefix="upload-", dir=UPLOAD_SPOOL_DIR)
+            self._file = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        if self.check.feed(chunk):
+            self._file.write(chunk)
+        elif self._file is not None:
+            self._drop()
+
+    def _drop(self) -> None:
+        self._file.close()
+        self._file = None
+        os.unlink(self.path)
+        self.path = None
+
+    def close(self, form: UploadForm) -> None:
+        result = self.check.finish()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            if not result.is_valid:
+                os.unlink(self.path)
+        if not result.is_valid:
+            api_logger.warning(f"[UPLOAD] Rejected {self.filename!r}: {result.error}")
+            form.rejected.append((self.check.sanitized_filename or self.filename, result.error))
+            return
+        form.files.append(SpooledFile(
+            field_name=self.name,
+            filename=result.sanitized_filename,
+            path=self.path,
+            size=self.check.size,
+            sha256=result.file_hash,
+            content_type=self.content_type,
+            detected_mime_type=result.detected_mime_type,
+        ))
+
+    def abort(self) -> None:
+        if self._file is not None:
+            self._drop()
+
+
+# =============================================================================
+# READER
+# =============================================================================
+
+async def read_multipart(
+    content_type: str,
+    chunks: AsyncIterator[bytes],
+    validator: Optional[FileUploadValidator] = None,
+    max_files: int = UPLOAD_MAX_FILES,
+    max_total_size: int = UPLOAD_MAX_TOTAL_SIZE,
+    max_field_size: int = UPLOAD_MAX_FIELD_SIZE
+) -> UploadForm:
+    """
+    Read a multipart/form-data body from `chunks`, spooling file parts to
+    disk as they arrive. Raises UploadError for malformed or oversized
+    requests (spooled files are removed first).
+    """
+    validator = validator or get_file_validator()
+    delimiter = b"\r\n--" + boundary_of(content_type)
+    form = UploadForm()
+    sink = None
+    # The body starts with "--boundary"; prefixing CRLF makes every
+    # delimiter, the first included, "\r\n--boundary"
+    buffer = bytearray(b"\r\n")
+    state = "preamble"
+    total = 0
+
+    def start_part(raw_headers: bytes):
+        headers = _part_headers(raw_headers)
+        disposition = headers.get("content-disposition", "")
+        params = _params(disposition)
+        if not disposition.lower().startswith("form-data") or "name" not in params:
+            raise UploadError(400, "Malformed multipart part")
+        if "filename" in params:
+            if len(form.files) + len(form.rejected) >= max_files:
+                raise UploadError(400, f"Too many files (max: {max_files})")
+            return _FileSink(params["name"], params["filename"], headers.get("content-type"), validator)
+        return _FieldSink(params["name"], max_field_size)
+
+    try:
+        async for chunk in chunks:
+            total += len(chunk)
+            if total > max_total_size:
+                raise UploadError(413, "Request too large")
+            buffer += chunk
+
+            while True:
+                if state == "preamble":
+                    index = buffer.find(delimiter)
+                    if index < 0:
+                        del buffer[:max(0, len(buffer) - len(delimiter))]
+                        break
+                    del buffer[:index + len(delimiter)]
+                    state = "after_delimiter"
+
+                if state == "after_delimiter":
+                    if len(buffer) < 2:
+                        break
+                    if buffer[:2] == b"--":
+                        state = "done"
+                        break
+                    if buffer[:2] != b"\r\n":
+                        raise UploadError(400, "Malformed multipart delimiter")
+                    del buffer[:2]
+                    state = "headers"
+
+                if state == "headers":
+                    index = buffer.find(b"\r\n\r\n")
+                    if index < 0:
+                        if len(buffer) > MAX_PART_HEADER_SIZE:
+                            raise UploadError(400, "Multipart part headers too large")
+                        break
+                    sink = start_part(bytes(buffer[:index]))
+                    del buffer[:index + 4]
+                    state = "body"
+
+                if state == "body":
+                    index = buffer.find(delimiter)
+                    if index < 0:
+                        # Keep a possible partial delimiter for the next chunk
+                        keep = len(delimiter) - 1
+                        if len(buffer) > keep:
+                            sink.write(bytes(buffer[:-keep]))
+                            del buffer[:-keep]
+                        break
+                    sink.write(bytes(buffer[:index]))
+                    sink.close(form)
+                    sink = None
+                    del buffer[:index + len(delimiter)]
+                    state = "after_delimiter"
+                    continue
+
+                break
+
+            if state == "done":
+                break
+
+        if state != "done":
+            raise UploadError(400, "Incomplete multipart body")
+    except BaseException:
+        if isinstance(sink, _FileSink):
+            sink.abort()
+        form.discard()
+        raise
+
+    return form
+
+
+def scan_fields(form: UploadForm) -> ValidationResult:
+    """
+    Run the middleware's JSON attack scan over the text fields. Raises
+    UploadError(400) on a critical threat, as the middleware does.
+    """
+    payload = {name: values[0] if len(values) == 1 else values for name, values in form.fields.items()}
+    result = validate_json_payload(payload)
+    if not result.is_valid:
+        api_logger.warning(f"[UPLOAD] Attack patterns in form fields: {result.threats_detected}")
+        if result.threat_level == ThreatLevel.CRITICAL:
+            form.discard()
+            raise UploadError(400, "Invalid request")
+    return result
@@ -5,6 +5,7 @@ Follows Svelte principles: minimal code, maximum efficiency.
 
 from .db import (
     get_or_404,
+    verify_access_or_404,
     paginate,
     safe_json_loads,
 )
@@ -48,6 +49,7 @@ from .framework_translation import (
 __all__ = [
     # Database utilities
     "get_or_404",
+    "verify_access_or_404",
     "paginate",
     "safe_json_loads",
     # Response utilities
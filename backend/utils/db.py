@@ -4,15 +4,35 @@ Eliminates duplicated access verification and pagination logic.
 """
 
 import json
-from typing import TypeVar, Type, Optional, Any, List, Tuple
+from typing import TypeVar, Type, Optional, Any, List, Tuple, Sequence
 
 from fastapi import HTTPException
 from sqlalchemy import select, desc, func
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
 T = TypeVar("T")
 
 
+def _access_conditions(
+    model: Type[T],
+    resource_id: str,
+    user_id: Optional[str],
+    organization_id: Optional[str],
+    user_field: str,
+    org_field: str,
+) -> list:
+    conditions = [getattr(model, "id") == resource_id]
+
+    if user_id and hasattr(model, user_field):
+        conditions.append(getattr(model, user_field) == user_id)
+
+    if organization_id and hasattr(model, org_field):
+        conditions.append(getattr(model, org_field) == organization_id)
+
+    return conditions
+
+
 async def get_or_404(
     db: AsyncSession,
     model: Type[T],
@@ -22,6 +42,7 @@ async def get_or_404(
     user_field: str = "user_id",
     org_field: str = "organization_id",
     error_msg: Optional[str] = None,
+    load_columns: Sequence[str] = (),
 ) -> T:
     """
     Get a resource by ID with ownership verification, or raise 404.
@@ -35,6 +56,8 @@ async def get_or_404(
         user_field: Name of user_id field on model (default: "user_id")
         org_field: Name of organization_id field on model (default: "organization_id")
         error_msg: Custom error message (default: "{ModelName} not found")
+        load_columns: Deferred columns to load with the row (default: none).
+            Deferred columns must be loaded here: lazy loads fail on async sessions.
 
     Returns:
         The model instance
@@ -42,15 +65,13 @@ async def get_or_404(
     Raises:
         HTTPException: 404 if not found or access denied
     """
-    conditions = [getattr(model, "id") == resource_id]
+    conditions = _access_conditions(model, resource_id, user_id, organization_id, user_field, org_field)
 
-    if user_id and hasattr(model, user_field):
-        conditions.append(getattr(model, user_field) == user_id)
+    query = select(model).where(*conditions)
+    if load_columns:
+        query = query.options(*(undefer(getattr(model, column)) for column in load_columns))
 
-    if organization_id and hasattr(model, org_field):
-        conditions.append(getattr(model, org_field) == organization_id)
-
-    result = await db.execute(select(model).where(*conditions))
+    result = await db.execute(query)
     instance = result.scalar_one_or_none()
 
     if not instance:
@@ -60,6 +81,33 @@ async def get_or_404(
     return instance
 
 
+async def verify_access_or_404(
+    db: AsyncSession,
+    model: Type[T],
+    resource_id: str,
+    user_id: Optional[str] = None,
+    organization_id: Optional[str] = None,
+    user_field: str = "user_id",
+    org_field: str = "organization_id",
+    error_msg: Optional[str] = None,
+) -> None:
+    """
+    Ownership check for endpoints that never touch the resource itself.
+
+    Same checks as get_or_404, but selects only the primary key so no row
+    is loaded into the session.
+
+    Raises:
+        HTTPException: 404 if not found or access denied
+    """
+    conditions = _access_conditions(model, resource_id, user_id, organization_id, user_field, org_field)
+
+    result = await db.execute(select(getattr(model, "id")).where(*conditions))
+    if result.scalar_one_or_none() is None:
+        msg = error_msg or f"{model.__name__} not found"
+        raise HTTPException(status_code=404, detail=msg)
+
+
 async def paginate(
     db: AsyncSession,
     query,
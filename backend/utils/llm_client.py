@@ -0,0 +1,318 @@
+"""
+Shared LLM transport and provider adapters.
+
+One app-lifetime httpx.AsyncClient per provider, so LLM calls reuse pooled
+(HTTP/2 when `h2` is installed) keep-alive connections instead of paying a
+TCP+TLS handshake per request. Provider adapters hold the request/response
+details that differ between Anthropic and OpenAI.
+
+Usage:
+    await llm_transport.start()                       # in lifespan
+    async with llm_transport.session(provider, timeout=120.0) as client:
+        response = await client.post(endpoint, headers=adapter.headers(api_key), json=body)
+    await llm_transport.aclose()                      # on shutdown
+
+Configuration (environment):
+    LLM_HTTP2                    "1"/"0" (default: on when h2 is installed)
+    LLM_POOL_MAX_CONNECTIONS     per provider (default 100)
+    LLM_POOL_MAX_KEEPALIVE       idle connections kept per provider (default 20)
+    LLM_POOL_KEEPALIVE_EXPIRY    seconds an idle connection is kept (default 60)
+    LLM_CONNECT_TIMEOUT          connect/pool timeout cap in seconds (default 30)
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple, Union
+
+import httpx
+
+from logging_config import api_logger
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+TimeoutLike = Union[float, httpx.Timeout]
+
+
+# =============================================================================
+# PROVIDER ADAPTERS
+# =============================================================================
+
+class ProviderAdapter(ABC):
+    """Request building and response parsing for one LLM provider."""
+
+    name = "llm"
+    label = "LLM"
+
+    @abstractmethod
+    def headers(self, api_key: str, **options: Any) -> Dict[str, str]:
+        """Request headers carrying `api_key`."""
+
+    @abstractmethod
+    def build_json_request(self, model: str, prompt_text: str, max_tokens: int) -> Dict[str, Any]:
+        """Single-prompt request asking for a JSON object."""
+
+    @abstractmethod
+    def extract_text(self, data: dict) -> str:
+        """Response text of a non-streaming response ("" if there is none)."""
+
+    def usage(self, data: dict) -> Tuple[Optional[int], Optional[int]]:
+        """(input_tokens, output_tokens) from a non-streaming response."""
+        usage = data.get("usage") or {}
+        return usage.get("input_tokens"), usage.get("output_tokens")
+
+
+class AnthropicAdapter(ProviderAdapter):
+    """Anthropic Messages API."""
+
+    name = "anthropic"
+    label = "Anthropic"
+    api_version = "2023-06-01"
+
+    def headers(self, api_key: str, web_search: bool = False, **options: Any) -> Dict[str, str]:
+        headers = {
+            "x-api-key": api_key,
+            "anthropic-version": self.api_version,
+            "Content-Type": "application/json"
+        }
+        if web_search:
+            headers["anthropic-beta"] = "web-search-2025-03-05"
+        return headers
+
+    def build_json_request(self, model: str, prompt_text: str, max_tokens: int) -> Dict[str, Any]:
+        return {
+            "model": model,
+            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": prompt_text}]
+        }
+
+    def extract_text(self, data: dict) -> str:
+        """Extract text from a Messages response, skipping thinking blocks."""
+        content_blocks = data.get("content", [])
+        # Find the first text block (skip thinking blocks)
+        for block in content_blocks:
+            if block.get("type") == "text":
+                return block.get("text", "")
+        # Fallback: grab first block's text if no typed blocks
+        if content_blocks:
+            return content_blocks[0].get("text", "")
+        return ""
+
+
+class OpenAIAdapter(ProviderAdapter):
+    """OpenAI Responses API (and chat completions for header purposes)."""
+
+    name = "openai"
+    label = "OpenAI"
+
+    def headers(self, api_key: str, **options: Any) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        }
+
+    def build_json_request(self, model: str, prompt_text: str, max_tokens: int) -> Dict[str, Any]:
+        return {
+            "model": model,
+            "max_output_tokens": max_tokens,
+            "input": [{"type": "message", "role": "user", "content": prompt_text}],
+            "text": {"format": {"type": "json_object"}}
+        }
+
+    def extract_text(self, data: dict) -> str:
+        """Extract text from a Responses API response."""
+        # Path 1: Direct output_text field
+        if data.get("output_text"):
+            return data["output_text"]
+        # Path 2: output array with message type
+        for item in data.get("output", []):
+            if item.get("type") == "message":
+                for c in item.get("content", []):
+                    if c.get("type") in ("output_text", "text"):
+                        text = c.get("text", "")
+                        if text:
+                            return text
+        return ""
+
+
+_ADAPTERS: Dict[str, ProviderAdapter] = {
+    "anthropic": AnthropicAdapter(),
+    "openai": OpenAIAdapter(),
+}
+
+
+def get_adapter(provider: Optional[str]) -> ProviderAdapter:
+    """Adapter for `provider`; anything that is not Anthropic is OpenAI-compatible."""
+    return _ADAPTERS.get(provider or "", _ADAPTERS["openai"])
+
+
+async def iter_sse_json(response: httpx.Response) -> AsyncIterator[Any]:
+    """
+    Yield decoded JSON payloads of `data:` lines from a streaming response.
+
+    Stops at `[DONE]`; lines that are not valid JSON are skipped.
+    """
+    async for line in response.aiter_lines():
+        if not line.startswith("data: "):
+            continue
+        data_str = line[6:]
+        if data_str == "[DONE]":
+            break
+        try:
+            yield json.loads(data_str)
+        except json.JSONDecodeError:
+            continue
+
+
+# =============================================================================
+# TRANSPORT
+# =============================================================================
+
+class _PooledSession:
+    """Per-call view of a pooled client that applies the call's timeout."""
+
+    def __init__(self, client: httpx.AsyncClient, timeout: httpx.Timeout):
+        self._client = client
+        self._timeout = timeout
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        kwargs.setdefault("timeout", self._timeout)
+        return await self._client.post(url, **kwargs)
+
+    def stream(self, method: str, url: str, **kwargs: Any):
+        kwargs.setdefault("timeout", self._timeout)
+        return self._client.stream(method, url, **kwargs)
+
+
+class LLMTransport:
+    """App-lifetime pooled HTTP clients, one per provider."""
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        connect_timeout: Optional[float] = None,
+        http2: Optional[bool] = None
+    ):
+        self.max_connections = max_connections or int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "100"))
+        self.max_keepalive_connections = max_keepalive_connections or int(os.getenv("LLM_POOL_MAX_KEEPALIVE", "20"))
+        self.keepalive_expiry = keepalive_expiry or float(os.getenv("LLM_POOL_KEEPALIVE_EXPIRY", "60"))
+        self.connect_timeout = connect_timeout or float(os.getenv("LLM_CONNECT_TIMEOUT", "30"))
+        if http2 is None:
+            http2 = os.getenv("LLM_HTTP2", "1") not in ("0", "false", "False")
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._requests: Dict[str, int] = {}
+
+    def _pool_key(self, provider: Optional[str]) -> str:
+        return get_adapter(provider).name
+
+    def _new_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry
+            ),
+            timeout=httpx.Timeout(300.0, connect=self.connect_timeout)
+        )
+
+    async def start(self) -> None:
+        """Create the provider pools up front (called from lifespan)."""
+        for name in _ADAPTERS:
+            self.client(name)
+        api_logger.info(
+            f"[LLM TRANSPORT] Pools ready: providers={list(self._clients)} http2={self.http2} "
+            f"max_connections={self.max_connections} keepalive={self.max_keepalive_connections}"
+        )
+
+    def client(self, provider: Optional[str]) -> httpx.AsyncClient:
+        """Pooled client for `provider`, created on first use."""
+        key = self._pool_key(provider)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = self._new_client()
+            self._clients[key] = client
+        return client
+
+    def _timeout(self, timeout: Optional[TimeoutLike]) -> httpx.Timeout:
+        if isinstance(timeout, httpx.Timeout):
+            return timeout
+        total = float(timeout) if timeout is not None else 300.0
+        limit = min(self.connect_timeout, total)
+        return httpx.Timeout(total, connect=limit, pool=limit)
+
+    @asynccontextmanager
+    async def session(self, provider: Optional[str], timeout: Optional[TimeoutLike] = None):
+        """
+        Drop-in replacement for `async with httpx.AsyncClient(timeout=...)`
+        that borrows the provider pool instead of opening new connections.
+        """
+        key = self._pool_key(provider)
+        self._requests[key] = self._requests.get(key, 0) + 1
+        yield _PooledSession(self.client(provider), self._timeout(timeout))
+
+    async def complete_json_text(
+        self,
+        provider: Optional[str],
+        endpoint: str,
+        api_key: str,
+        model: str,
+        prompt_text: str,
+        max_tokens: int,
+        timeout: Optional[TimeoutLike] = None,
+        log_tag: str = "LLM"
+    ) -> str:
+        """
+        Send a single-prompt JSON request and return the response text.
+
+        Raises RuntimeError with the provider's status and error body on
+        non-200 responses.
+        """
+        adapter = get_adapter(provider)
+        async with self.session(provider, timeout=timeout) as client:
+            response = await client.post(
+                endpoint,
+                headers=adapter.headers(api_key),
+                json=adapter.build_json_request(model, prompt_text, max_tokens)
+            )
+        if response.status_code != 200:
+            error_detail = response.text[:500]
+            api_logger.error(f"[{log_tag}] {adapter.label} error: {response.status_code} - {error_detail}")
+            raise RuntimeError(f"{adapter.label} API {response.status_code}: {error_detail}")
+
+        data = response.json()
+        input_tokens, output_tokens = adapter.usage(data)
+        api_logger.info(f"[{log_tag}] Tokens - Input: {input_tokens}, Output: {output_tokens}")
+        return adapter.extract_text(data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool configuration and per-provider request counts."""
+        return {
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "max_keepalive_connections": self.max_keepalive_connections,
+            "keepalive_expiry": self.keepalive_expiry,
+            "providers": {
+                key: {"requests": self._requests.get(key, 0), "open": not client.is_closed}
+                for key, client in self._clients.items()
+            },
+        }
+
+    async def aclose(self) -> None:
+        """Close all provider pools (called on shutdown)."""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+
+# Global transport instance
+llm_transport = LLMTransport()
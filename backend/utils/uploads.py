@@ -0,0 +1,64 @@
+"""
+Multipart upload helpers for the `/multipart` endpoint variants.
+Read the streamed form, build the endpoint's request model from its text
+fields, and parse the spooled files.
+"""
+
+import json
+from typing import List, Sequence, Tuple, Type, TypeVar
+
+from fastapi import HTTPException, Request
+from pydantic import BaseModel, ValidationError
+
+from file_parser import ParsedFile
+from parse_service import get_parse_service
+from upload_stream import UploadError, UploadForm, read_multipart, scan_fields
+
+M = TypeVar("M", bound=BaseModel)
+
+
+async def read_upload_form(request: Request) -> UploadForm:
+    """
+    Stream a multipart/form-data body to spooled files and scan its text
+    fields. Use as `async with await read_upload_form(request) as form:` so
+    the spooled files are removed afterwards.
+    """
+    try:
+        form = await read_multipart(request.headers.get("content-type", ""), request.stream())
+        scan_fields(form)
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    return form
+
+
+def form_model(form: UploadForm, model: Type[M], json_fields: Sequence[str] = (), **values) -> M:
+    """
+    `model` from the form's text fields (JSON-decoded for `json_fields`) plus
+    `values`. Invalid input raises 422, as a JSON body would.
+    """
+    data = {name: form.get(name) for name in form.fields}
+    try:
+        for name in json_fields:
+            if data.get(name):
+                data[name] = json.loads(data[name])
+        data.update(values)
+        return model.model_validate(data)
+    except json.JSONDecodeError as e:
+        form.discard()
+        raise HTTPException(status_code=422, detail=f"Invalid JSON in form field: {e.msg}")
+    except ValidationError as e:
+        form.discard()
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+
+
+async def parse_form_files(form: UploadForm) -> List[Tuple[str, List[ParsedFile]]]:
+    """
+    (file type, parsed files) per uploaded file, in upload order; files the
+    upload validator rejected come last, as parse errors.
+    """
+    parsed_lists = await get_parse_service().parse_paths(form.parse_inputs())
+    results = [(spooled.type, parsed_list) for spooled, parsed_list in zip(form.files, parsed_lists)]
+    for filename, reason in form.rejected:
+        file_type = filename.rsplit(".", 1)[-1].lower() if "." in filename else "unknown"
+        results.append((file_type, [ParsedFile(name=filename, parse_error=f"Upload rejected: {reason}")]))
+    return results
@@ -3,7 +3,7 @@ Value Organizer Service for Articulation Bridge
 Transforms flat backend calculations into semantic structure
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, FrozenSet, List, Optional
 from datetime import datetime
 
 from logging_config import articulation_logger as logger
@@ -23,6 +23,7 @@ from consciousness_state import (
 from nomenclature import (
     get_s_level_label, get_matrix_position, get_manifestation_time_label, get_dominant
 )
+from formulas.incremental import TracingDict, is_stale
 
 
 class ValueOrganizer:
@@ -32,18 +33,34 @@ class ValueOrganizer:
     Output: Structured ConsciousnessState object
     """
 
+    # ConsciousnessState attributes built from computed values, in build order.
+    # Each is rebuilt independently by patch() when a value it read changes.
+    VALUE_SECTIONS = (
+        ("tier2", "_organize_tier2"),
+        ("tier3", "_organize_tier3"),
+        ("tier4", "_organize_tier4"),
+        ("tier5", "_organize_tier5"),
+        ("tier6", "_organize_tier6"),
+        ("unity_metrics", "_extract_unity_metrics"),
+        ("dual_pathways", "_extract_dual_pathways"),
+    )
+
     def organize(
         self,
         raw_values: Dict[str, Any],
         tier1_values: Dict[str, Any],
         user_id: str = "",
-        session_id: str = ""
+        session_id: str = "",
+        value_reads: Optional[Dict[str, FrozenSet[str]]] = None
     ) -> ConsciousnessState:
         """
         Transform flat backend output into organized consciousness state.
 
         PURE ARCHITECTURE: Pass context from Call 1 to guide Call 2 value selection.
         UNITY PRINCIPLE: Extract unity metrics and dual pathways for Jeevatma-Paramatma analysis.
+
+        If `value_reads` is given, it is filled with the value keys each
+        section read, which lets patch() rebuild only stale sections later.
         """
         values_count = len(raw_values.get('values')) if isinstance(raw_values, dict) and 'values' in raw_values else len(raw_values)
         logger.info(f"[VALUE_ORGANIZER] Organizing {values_count} computed values into consciousness state")
@@ -56,24 +73,26 @@ class ValueOrganizer:
         # Extract LLM Call 1's missing operator priority (if provided)
         missing_operator_priority = tier1_values.get('missing_operator_priority') or []
 
+        sections = self._organize_sections(raw_values, value_reads)
+
         state = ConsciousnessState(
             timestamp=datetime.now().isoformat(),
             user_id=user_id,
             session_id=session_id,
             tier1=self._organize_tier1(tier1_values),
-            tier2=self._organize_tier2(raw_values),
-            tier3=self._organize_tier3(raw_values),
-            tier4=self._organize_tier4(raw_values),
-            tier5=self._organize_tier5(raw_values),
-            tier6=self._organize_tier6(raw_values),
+            tier2=sections['tier2'],
+            tier3=sections['tier3'],
+            tier4=sections['tier4'],
+            tier5=sections['tier5'],
+            tier6=sections['tier6'],
             bottlenecks=[],  # Will be populated by BottleneckDetector
             leverage_points=[],  # Will be populated by LeverageIdentifier
             # PURE ARCHITECTURE: Pass Call 1 context to guide Call 2 value selection
             targets=tier1_values.get('targets'),
             query_pattern=tier1_values.get('query_pattern'),
             # UNITY PRINCIPLE: Extract unity metrics and dual pathways
-            unity_metrics=self._extract_unity_metrics(raw_values),
-            dual_pathways=self._extract_dual_pathways(raw_values),
+            unity_metrics=sections['unity_metrics'],
+            dual_pathways=sections['dual_pathways'],
             goal_context=self._extract_goal_context(tier1_values),
             # ZERO-DEFAULT ARCHITECTURE: Split calculated vs non-calculated (two buckets)
             calculated_values=calculated_values,
@@ -96,6 +115,81 @@ class ValueOrganizer:
 
         return state
 
+    def patch(
+        self,
+        state: ConsciousnessState,
+        raw_values: Dict[str, Any],
+        tier1_values: Dict[str, Any],
+        previous_values: Dict[str, Any],
+        value_reads: Dict[str, FrozenSet[str]],
+        session_id: Optional[str] = None
+    ) -> List[str]:
+        """
+        Update a previously organized state in place for a new inference result.
+
+        Only value sections that read a changed value are rebuilt (and their
+        reads re-recorded in `value_reads`); Tier 1, the Call 1 context and
+        the calculated/non-calculated split are always refreshed. Bottlenecks
+        and leverage points are cleared for the caller to re-detect.
+
+        Returns:
+            Names of the rebuilt value sections
+        """
+        values = raw_values.get('values') or {}
+        changed = {
+            key for key in previous_values.keys() | values.keys()
+            if key not in previous_values or key not in values or previous_values[key] != values[key]
+        }
+        key_set_changed = previous_values.keys() != values.keys()
+        stale = [
+            attr for attr, _ in self.VALUE_SECTIONS
+            if attr not in value_reads or is_stale(value_reads[attr], changed, key_set_changed)
+        ]
+
+        for attr, section in self._organize_sections(raw_values, value_reads, only=stale).items():
+            setattr(state, attr, section)
+
+        calculated_values, non_calc_question, non_calc_context = self._split_calculated_values(raw_values)
+        state.timestamp = datetime.now().isoformat()
+        if session_id is not None:
+            state.session_id = session_id
+        state.tier1 = self._organize_tier1(tier1_values)
+        state.targets = tier1_values.get('targets')
+        state.query_pattern = tier1_values.get('query_pattern')
+        state.goal_context = self._extract_goal_context(tier1_values)
+        state.calculated_values = calculated_values
+        state.non_calculated_question_addressable = non_calc_question
+        state.non_calculated_context_addressable = non_calc_context
+        state.missing_operator_priority = tier1_values.get('missing_operator_priority') or []
+        state.bottlenecks = []
+        state.leverage_points = []
+
+        logger.info(
+            f"[VALUE_ORGANIZER] Patched consciousness state: changed_values={len(changed)} "
+            f"rebuilt={stale} reused={len(self.VALUE_SECTIONS) - len(stale)}"
+        )
+        return stale
+
+    def _organize_sections(
+        self,
+        raw_values: Dict[str, Any],
+        value_reads: Optional[Dict[str, FrozenSet[str]]] = None,
+        only: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Build the value sections, recording the keys each one reads if requested."""
+        sections = {}
+        for attr, method_name in self.VALUE_SECTIONS:
+            if only is not None and attr not in only:
+                continue
+            builder = getattr(self, method_name)
+            if value_reads is None or not isinstance(raw_values.get('values'), dict):
+                sections[attr] = builder(raw_values)
+                continue
+            traced = TracingDict(raw_values.get('values'))
+            sections[attr] = builder({**raw_values, 'values': traced})
+            value_reads[attr] = frozenset(traced.reads)
+        return sections
+
     def _split_calculated_values(
         self,
         raw_values: Dict[str, Any]